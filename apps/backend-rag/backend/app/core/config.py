@@ -35,6 +35,12 @@ class Settings(BaseSettings):
             return 1536  # OpenAI text-embedding-3-small
         return 384  # sentence-transformers fallback
 
+    embedding_cache_size: int = 10000  # In-memory LRU entries for repeated texts
+    embedding_cache_backend: str = "memory"  # memory | redis | disk (L2 behind the LRU)
+    embedding_cache_dir: str = "./data/embedding_cache"  # Used when backend is "disk"
+    embedding_batch_max_size: int = 64  # Max concurrent queries merged into one API call
+    embedding_batch_max_wait_ms: float = 5.0  # Max wait to fill a micro-batch
+
     # ========================================
     # ZANTARA AI CONFIGURATION (PRIMARY)
     # ========================================
@@ -49,6 +55,9 @@ class Settings(BaseSettings):
     qdrant_url: str = "https://nuzantara-qdrant.fly.dev"
     qdrant_api_key: str | None = None  # Set via QDRANT_API_KEY env var
     qdrant_collection_name: str = "knowledge_base"
+    qdrant_upsert_batch_size: int = 256  # Points per upsert request (larger inputs stream)
+    qdrant_upsert_max_in_flight: int = 4  # Concurrent bulk upsert requests
+    qdrant_upsert_max_retries: int = 3  # Retries per batch on network errors/429/5xx
 
     # ========================================
     # CHUNKING CONFIGURATION
@@ -70,6 +79,9 @@ class Settings(BaseSettings):
     timeout_default: float = 30.0  # Default timeout for API calls
     timeout_ai_response: float = 60.0  # AI response timeout
     timeout_rag_query: float = 10.0  # RAG query timeout
+    timeout_collection_search: float = 3.0  # Per-collection deadline in multi-collection search
+    timeout_query_rewrite: float = 3.0  # Chat query rewrite deadline (original query on timeout)
+    timeout_context_source: float = 2.0  # Per-source deadline for cultural/CRM chat context
     timeout_tool_execution: float = 30.0  # Tool execution timeout
     timeout_streaming: float = 120.0  # Streaming timeout
     timeout_internal_api: float = 5.0  # Internal API calls timeout
@@ -84,6 +96,11 @@ class Settings(BaseSettings):
     reranker_cache_enabled: bool = True
     reranker_cache_size: int = 1000
     reranker_batch_enabled: bool = True
+    reranker_backend: str = "torch"  # torch | onnx (ONNX Runtime CPU, optionally int8)
+    reranker_onnx_model_dir: str | None = None  # Exported ONNX model + tokenizer directory
+    reranker_onnx_quantize: bool = True  # Use int8 dynamic quantization for ONNX
+    reranker_batch_max_pairs: int = 128  # Pairs per dynamic batch across requests
+    reranker_batch_max_wait_ms: float = 5.0  # Max wait for a dynamic batch to fill
     reranker_audit_enabled: bool = True
     reranker_rate_limit_per_minute: int = 100
     reranker_rate_limit_per_hour: int = 1000
@@ -102,6 +119,24 @@ class Settings(BaseSettings):
     raw_books_dir: str = "./data/raw_books"
     processed_dir: str = "./data/processed"
     batch_size: int = 10
+    ingest_parse_workers: int = 4  # Process pool size for batch parsing (0 = threads)
+    ingest_embed_batch_size: int = 64  # Chunks per embedding call (across documents)
+    ingest_upsert_batch_size: int = 256  # Points per Qdrant upsert request
+    ingest_queue_size: int = 8  # Parsed documents buffered ahead of embedding
+    pdf_extract_workers: int = 4  # Processes for page-parallel PDF extraction (<= 1 = in-process)
+    pdf_extract_pages_per_task: int = 16  # Pages per extraction task
+    pdf_extract_min_pages: int = 48  # Smaller PDFs are extracted in-process
+    parser_cache_dir: str | None = None  # Extracted-page cache keyed by file hash (None = off)
+    document_store_dir: str = "/tmp/zantara_documents"  # Smart Oracle PDF + extracted text cache
+    document_store_max_mb: int = 2048  # LRU-evicted beyond this size on disk
+    document_store_backend: str = "drive"  # drive | local (document_store_local_dir)
+    document_store_local_dir: str | None = None  # PDF directory used by the "local" backend
+    auto_ingestion_seen_path: str | None = "./data/auto_ingestion_seen.log"  # Ingested content IDs
+    auto_ingestion_embed_batch_size: int = 64  # Scraped items per embedding call
+    auto_ingestion_max_concurrent_jobs: int = 4  # Sources ingested concurrently per sweep
+    auto_ingestion_host_max_concurrent: int = 1  # In-flight scrapes per host
+    auto_ingestion_host_min_interval_s: float = 2.0  # Min delay between scrapes of a host
+    auto_ingestion_filter_batch_size: int = 10  # Items classified per LLM filter prompt
 
     # ========================================
     # TIER OVERRIDES (Optional)
@@ -112,11 +147,20 @@ class Settings(BaseSettings):
     # DATABASE CONFIGURATION
     # ========================================
     database_url: str | None = None  # Set via DATABASE_URL env var
+    golden_answer_index_path: str | None = None  # Persisted question-embedding matrix (None = off)
+    golden_answer_index_refresh_s: float = 60.0  # Min seconds between golden_answers delta syncs
+    crm_context_cache_ttl_s: float = 30.0  # Per-email CRM chat context TTL (dropped on writes)
 
     # ========================================
     # REDIS CONFIGURATION
     # ========================================
     redis_url: str | None = None  # Set via REDIS_URL env var
+    cache_memory_max_entries: int = 2000  # In-process cache entry limit
+    cache_memory_max_bytes: int = 64 * 1024 * 1024  # In-process cache size limit (64MB)
+    cache_memory_policy: str = "lru"  # lru | lfu eviction for the in-process cache
+    cache_l1_enabled: bool = True  # Keep hot keys in-process in front of Redis
+    cache_l1_ttl: int = 30  # Max seconds an L1 entry may lag behind Redis
+    cache_version_ttl: float = 1.0  # Seconds invalidation versions are reused locally
 
     # ========================================
     # AUTHENTICATION CONFIGURATION
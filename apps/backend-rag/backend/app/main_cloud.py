@@ -50,6 +50,8 @@ try:
 except ImportError:
     pass  # OpenTelemetry not installed - skip tracing
 
+# --- Core (Qdrant HTTP client lifecycle) ---
+from core.qdrant_db import close_async_http_client
 from prometheus_fastapi_instrumentator import Instrumentator
 
 # --- Sanitizer for final safety net ---
@@ -485,6 +487,7 @@ async def initialize_services() -> None:
         search_service = SearchService()
         dependencies.search_service = search_service
         app.state.search_service = search_service
+        agents.auto_ingestion.search = search_service
         service_registry.register("search", ServiceStatus.HEALTHY)
         logger.info("✅ SearchService initialized")
     except Exception as e:
@@ -593,6 +596,10 @@ async def initialize_services() -> None:
             app.state.ts_service = ts_service
             app.state.db_pool = db_pool  # Store pool for other services
 
+            from services.context.crm_context import init_crm_context_provider
+
+            init_crm_context_provider(db_pool)  # Chat-turn CRM context on the shared pool
+
             # Start background tasks
             await ts_service.start_auto_logout_monitor()
             service_registry.register("database", ServiceStatus.HEALTHY, critical=False)
@@ -747,6 +754,9 @@ async def on_shutdown() -> None:
         await handler_proxy.client.aclose()
         logger.info("✅ HTTP clients closed")
 
+    # Close shared Qdrant connection pool
+    await close_async_http_client()
+
     logger.info("✅ ZANTARA shutdown complete")
 
 
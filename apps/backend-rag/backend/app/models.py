@@ -86,7 +86,7 @@ class BookIngestionResponse(BaseModel):
     success: bool
     book_title: str
     book_author: str
-    tier: TierLevel
+    tier: TierLevel | str  # "Unknown" when ingestion failed before classification
     chunks_created: int
     message: str
     error: str | None = None
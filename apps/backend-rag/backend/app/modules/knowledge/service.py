@@ -6,7 +6,7 @@ Business logic for RAG, Search, and Vector Database operations
 import logging
 from typing import Any
 
-from core.cache import cached
+from core.cache import ALL_COLLECTIONS_TAG, cached
 from core.embeddings import EmbeddingsGenerator
 from core.qdrant_db import QdrantClient
 
@@ -108,7 +108,7 @@ class KnowledgeService:
 
         logger.info(f"KnowledgeService initialized with Qdrant URL: {qdrant_url}")
 
-    @cached(ttl=300, prefix="rag_search")
+    @cached(ttl=300, prefix="rag_search", tags=[ALL_COLLECTIONS_TAG])
     async def search(
         self,
         query: str,
@@ -13,6 +13,7 @@ from psycopg2.extras import Json, RealDictCursor
 from pydantic import BaseModel, EmailStr
 
 from app.core.config import settings
+from services.context.crm_context import invalidate_crm_context
 
 logger = logging.getLogger(__name__)
 
@@ -146,6 +147,7 @@ async def create_client(
 
         new_client = cursor.fetchone()
         conn.commit()
+        invalidate_crm_context(email=client.email)
 
         cursor.close()
         conn.close()
@@ -359,6 +361,7 @@ async def update_client(
         )
 
         conn.commit()
+        invalidate_crm_context(email=updated_client.get("email"), client_id=client_id)
 
         cursor.close()
         conn.close()
@@ -415,6 +418,7 @@ async def delete_client(
         )
 
         conn.commit()
+        invalidate_crm_context(client_id=client_id)
 
         cursor.close()
         conn.close()
@@ -14,6 +14,7 @@ from psycopg2.extras import Json, RealDictCursor
 from pydantic import BaseModel
 
 from app.core.config import settings
+from services.context.crm_context import invalidate_crm_context
 
 logger = logging.getLogger(__name__)
 
@@ -176,6 +177,7 @@ async def create_practice(
         )
 
         conn.commit()
+        invalidate_crm_context(client_id=practice.client_id)
 
         cursor.close()
         conn.close()
@@ -469,6 +471,7 @@ async def update_practice(
             )
 
         conn.commit()
+        invalidate_crm_context(client_id=updated_practice.get("client_id"))
 
         cursor.close()
         conn.close()
@@ -11,6 +11,7 @@ from pathlib import Path
 from core.qdrant_db import QdrantClient
 from fastapi import APIRouter, BackgroundTasks, File, HTTPException, UploadFile
 
+from services.ingestion_pipeline import MANIFEST_FILENAME, IngestionPipeline
 from services.ingestion_service import IngestionService
 
 from ..models import (
@@ -112,7 +113,7 @@ async def batch_ingest(request: BatchIngestionRequest, _background_tasks: Backgr
 
     - **directory_path**: Path to directory containing books
     - **file_patterns**: File patterns to match (default: ["*.pdf", "*.epub"])
-    - **skip_existing**: Skip books already in database
+    - **skip_existing**: Skip books already ingested (and unchanged)
     """
     try:
         start_time = time.time()
@@ -123,10 +124,11 @@ async def batch_ingest(request: BatchIngestionRequest, _background_tasks: Backgr
                 status_code=404, detail=f"Directory not found: {request.directory_path}"
             )
 
-        # Get all matching files
+        # Get all matching files (patterns may overlap)
         book_files = []
         for pattern in request.file_patterns:
             book_files.extend(directory.glob(pattern))
+        book_files = list(dict.fromkeys(book_files))
 
         if not book_files:
             raise HTTPException(
@@ -135,36 +137,17 @@ async def batch_ingest(request: BatchIngestionRequest, _background_tasks: Backgr
 
         logger.info(f"Found {len(book_files)} books to ingest")
 
-        # Process each book
-        service = IngestionService()
-        results = []
-        successful = 0
-        failed = 0
-
-        for book_path in book_files:
-            try:
-                result = await service.ingest_book(str(book_path))
-                results.append(BookIngestionResponse(**result))
-
-                if result["success"]:
-                    successful += 1
-                else:
-                    failed += 1
-
-            except Exception as e:
-                logger.error(f"Error ingesting {book_path}: {e}")
-                results.append(
-                    BookIngestionResponse(
-                        success=False,
-                        book_title=book_path.stem,
-                        book_author="Unknown",
-                        tier="Unknown",
-                        chunks_created=0,
-                        message="Ingestion failed",
-                        error=str(e),
-                    )
-                )
-                failed += 1
+        # Parse in parallel, embed/store in batches, resume from the directory manifest
+        pipeline = IngestionPipeline(
+            IngestionService(), manifest_path=directory / MANIFEST_FILENAME
+        )
+        raw_results = await pipeline.run(
+            [str(path) for path in book_files], skip_existing=request.skip_existing
+        )
+
+        results = [BookIngestionResponse(**result) for result in raw_results]
+        successful = sum(1 for result in results if result.success)
+        failed = len(results) - successful
 
         execution_time = time.time() - start_time
 
@@ -174,7 +157,7 @@ async def batch_ingest(request: BatchIngestionRequest, _background_tasks: Backgr
         )
 
         return BatchIngestionResponse(
-            total_books=len(book_files),
+            total_books=len(results),
             successful=successful,
             failed=failed,
             results=results,
@@ -17,6 +17,7 @@ from pydantic import BaseModel, Field
 # Add backend to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from core.cache import invalidate_collection
 from core.embeddings import EmbeddingsGenerator
 
 from app.dependencies import get_search_service
@@ -157,6 +158,7 @@ async def ingest_documents(
         vector_db.upsert_documents(
             chunks=documents, embeddings=embeddings, metadatas=metadatas, ids=ids
         )
+        invalidate_collection(vector_db.collection_name)
 
         execution_time = (time.time() - start_time) * 1000
 
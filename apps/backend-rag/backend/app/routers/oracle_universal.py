@@ -24,7 +24,6 @@ Language Protocol:
 
 import asyncio
 import hashlib
-import io
 import json
 import logging
 import os
@@ -45,7 +44,6 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
 from pydantic import BaseModel, ConfigDict, Field
 
 sys.path.append(str(Path(__file__).parent.parent.parent))  # noqa: E402
@@ -57,6 +55,7 @@ from psycopg2.extras import RealDictCursor  # noqa: E402
 
 from app.dependencies import get_search_service  # noqa: E402
 from app.models import UserProfile  # noqa: E402
+from services.document_store import get_document_store  # noqa: E402
 from services.personality_service import PersonalityService  # noqa: E402
 from services.search_service import SearchService  # noqa: E402
 from services.smart_oracle import smart_oracle  # noqa: E402
@@ -574,60 +573,19 @@ IMPORTANTE: Rispondi SOLO in {target_language}. Sii professionale MA anche umano
 def download_pdf_from_drive(filename: str) -> str | None:
     """
     Download PDF from Google Drive using fuzzy search
-    Handles filename mismatches with intelligent search
+    Handles filename mismatches with intelligent search; search results, PDFs and
+    their text are cached in the local DocumentStore (the returned file is kept)
     """
     if not google_services.drive_service:
         logger.warning("⚠️ Google Drive service not available")
         return None
 
     try:
-        # Clean filename for search
-        clean_name = os.path.splitext(os.path.basename(filename))[0]
-        logger.info(f"🔍 Searching for document: {clean_name}")
-
-        # Fuzzy search with multiple strategies
-        search_queries = [
-            f"name contains '{clean_name}' and mimeType = 'application/pdf' and trashed = false",
-            f"name contains '{clean_name.replace('_', ' ')}' and mimeType = 'application/pdf' and trashed = false",
-            f"name contains '{clean_name.replace('-', ' ')}' and mimeType = 'application/pdf' and trashed = false",
-            f"name contains '{clean_name.replace('_', '')}' and mimeType = 'application/pdf' and trashed = false",
-        ]
-
-        for query in search_queries:
-            logger.debug(f"🔍 Trying search query: {query}")
-
-            results = (
-                google_services.drive_service.files()
-                .list(q=query, fields="files(id, name, size, createdTime)", pageSize=1)
-                .execute()
-            )
-
-            files = results.get("files", [])
-            if files:
-                found_file = files[0]
-                logger.info(f"✅ Found match: '{found_file['name']}' (ID: {found_file['id']})")
-
-                # Download file
-                request = google_services.drive_service.files().get_media(fileId=found_file["id"])
-                file_stream = io.BytesIO()
-                downloader = MediaIoBaseDownload(file_stream, request)
-
-                done = False
-                while done is False:
-                    status, done = downloader.next_chunk()
-                    if status:
-                        logger.debug(f"Download progress: {int(status.progress() * 100)}%")
-
-                file_stream.seek(0)
-                temp_path = f"/tmp/{found_file['name']}"
-
-                with open(temp_path, "wb") as temp_file:
-                    temp_file.write(file_stream.read())
-
-                logger.info(f"✅ Successfully downloaded: {temp_path}")
-                return temp_path
-
-        logger.warning(f"⚠️ No file found for: {filename}")
+        logger.info(f"🔍 Searching for document: {os.path.splitext(os.path.basename(filename))[0]}")
+        path = get_document_store().get_pdf(filename)
+        if path:
+            logger.info(f"✅ Document available locally: {path}")
+            return str(path)
         return None
 
     except Exception as e:
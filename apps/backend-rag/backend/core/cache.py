@@ -5,27 +5,236 @@ Provides intelligent caching for expensive operations
 Features:
 - TTL-based expiration
 - Automatic key generation
-- Cache invalidation
+- Cache invalidation (O(1) version bumps per prefix/tag, no KEYS scans)
 - Hit/miss metrics
+- Bounded in-process tier (entries + bytes, LRU/LFU) used as Redis fallback
+  and as an L1 in front of Redis for hot keys
 """
 
 import hashlib
 import json
 import logging
-from collections.abc import Callable
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, MutableMapping
+from dataclasses import dataclass
 from functools import wraps
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass(slots=True)
+class _CacheEntry:
+    value: Any
+    expires_at: float
+    size: int
+    hits: int = 0
+
+
+class MemoryCache(MutableMapping):
+    """
+    Thread-safe in-process cache with TTL expiry and entry/byte limits.
+
+    Entries are kept in recency order. When a limit is exceeded the victim is
+    chosen among the EVICTION_SAMPLE least recently used entries: expired entries
+    first, then the oldest (lru) or the least frequently hit (lfu, approximated
+    over the sample like Redis does).
+    """
+
+    EVICTION_SAMPLE = 16
+
+    def __init__(
+        self,
+        max_entries: int = 2000,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: int = 300,
+        policy: str = "lru",
+    ):
+        self._data: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.default_ttl = default_ttl
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self.configure(max_entries=max_entries, max_bytes=max_bytes, policy=policy)
+
+    def configure(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        policy: str | None = None,
+    ):
+        """Update limits/policy, evicting immediately if the cache is now over budget"""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if policy is not None:
+                self.policy = policy if policy in ("lru", "lfu") else "lru"
+            self._evict_if_needed()
+
+    @staticmethod
+    def _estimate_size(key: str, value: Any) -> int:
+        try:
+            value_size = len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            value_size = sys.getsizeof(value)
+        return len(key) + value_size
+
+    def _get_live(self, key: str) -> _CacheEntry | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats["expirations"] += 1
+            return None
+        return entry
+
+    def _remove(self, key: str) -> _CacheEntry | None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
+        return entry
+
+    def _evict_if_needed(self, protect: str | None = None):
+        while self._data and (
+            len(self._data) > self.max_entries or self.current_bytes > self.max_bytes
+        ):
+            now = time.monotonic()
+            sample = []
+            for key, entry in self._data.items():
+                # The entry just written has had no chance to be hit yet
+                if key == protect and len(self._data) > 1:
+                    continue
+                sample.append((key, entry))
+                if len(sample) >= self.EVICTION_SAMPLE:
+                    break
+
+            expired = [key for key, entry in sample if entry.expires_at <= now]
+            if expired:
+                for key in expired:
+                    self._remove(key)
+                self.stats["expirations"] += len(expired)
+                continue
+
+            if self.policy == "lfu":
+                victim = min(sample, key=lambda item: item[1].hits)[0]
+            else:
+                victim = sample[0][0]
+            self._remove(victim)
+            self.stats["evictions"] += 1
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a live value (refreshing its recency), or default"""
+        with self._lock:
+            entry = self._get_live(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return default
+            entry.hits += 1
+            self._data.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: int | None = None):
+        """Store a value for ttl seconds (default_ttl if None)"""
+        size = self._estimate_size(key, value)
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                # Never let a single oversized value flush the whole cache
+                return
+            self._data[key] = _CacheEntry(value=value, expires_at=expires_at, size=size)
+            self.current_bytes += size
+            self._evict_if_needed(protect=key)
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry, returning how many were removed"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, entry in self._data.items() if entry.expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            self.stats["expirations"] += len(expired)
+            return len(expired)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.current_bytes = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "policy": self.policy,
+                **self.stats,
+            }
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            entry = self._get_live(key)
+            if entry is None:
+                raise KeyError(key)
+            return entry.value
+
+    def __setitem__(self, key: str, value: Any):
+        self.set(key, value)
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            if self._remove(key) is None:
+                raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return isinstance(key, str) and self._get_live(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        # Snapshot so callers may delete while iterating
+        now = time.monotonic()
+        with self._lock:
+            return iter([key for key, entry in self._data.items() if entry.expires_at > now])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _setting(settings: Any, name: str, default: Any) -> Any:
+    """Read an optional setting, falling back to default if missing or mis-typed"""
+    value = getattr(settings, name, default)
+    return value if isinstance(value, type(default)) else default
+
+
 # In-memory cache fallback (if Redis not available)
-_memory_cache = {}
+_memory_cache = MemoryCache()
+_MISSING = object()
+
+# Invalidation generations: every cached key folds in the current version of its
+# namespaces (global, prefix, tags). Bumping a version orphans the old keys in O(1);
+# they are never read again and expire through their TTL.
+VERSION_KEY_PREFIX = "zantara:version:"
+GLOBAL_NAMESPACE = "*"
+ALL_COLLECTIONS_TAG = "collection:*"
+_memory_versions: dict[str, int] = {}
 
 
 class CacheService:
     """
     Intelligent caching service with Redis backend
     Falls back to in-memory cache if Redis unavailable
+
+    With Redis up, an optional per-process L1 (short TTL) serves hot keys
+    without a network round trip.
     """
 
     def __init__(self):
@@ -36,6 +245,21 @@ class CacheService:
         # Try to connect to Redis (Fly.io provides REDIS_URL)
         from app.core.config import settings
 
+        max_entries = _setting(settings, "cache_memory_max_entries", 2000)
+        max_bytes = _setting(settings, "cache_memory_max_bytes", 64 * 1024 * 1024)
+        policy = _setting(settings, "cache_memory_policy", "lru")
+        _memory_cache.configure(max_entries=max_entries, max_bytes=max_bytes, policy=policy)
+
+        self.version_ttl = _setting(settings, "cache_version_ttl", 1.0)
+        self._version_cache: dict[str, tuple[int, float]] = {}
+
+        self.l1_ttl = _setting(settings, "cache_l1_ttl", 30)
+        self.l1 = (
+            MemoryCache(max_entries=max_entries, max_bytes=max_bytes, policy=policy)
+            if _setting(settings, "cache_l1_enabled", True)
+            else None
+        )
+
         redis_url = settings.redis_url
         if redis_url:
             try:
@@ -61,21 +285,92 @@ class CacheService:
         key_hash = hashlib.md5(key_data.encode()).hexdigest()[:12]
         return f"zantara:{prefix}:{key_hash}"
 
+    def _generate_versioned_key(
+        self, prefix: str, tags: list[str], args: tuple, kwargs: dict
+    ) -> str:
+        """Generate a cache key that changes whenever its prefix or any tag is invalidated"""
+        namespaces = [GLOBAL_NAMESPACE, prefix, *sorted(set(tags))]
+        versions = self.get_versions(namespaces)
+        generation = ".".join(str(versions.get(ns, 0)) for ns in namespaces)
+        return f"{self._generate_key(prefix, *args, **kwargs)}:g{generation}"
+
+    def get_versions(self, namespaces: list[str]) -> dict[str, int]:
+        """
+        Get current invalidation versions for namespaces.
+
+        Versions read from Redis are reused for version_ttl seconds, which bounds how
+        long another pod's invalidation takes to become visible here.
+        """
+        now = time.monotonic()
+        versions: dict[str, int] = {}
+        missing = []
+        for ns in namespaces:
+            cached_version = self._version_cache.get(ns)
+            if cached_version and now - cached_version[1] < self.version_ttl:
+                versions[ns] = cached_version[0]
+            else:
+                missing.append(ns)
+
+        if not missing:
+            return versions
+
+        try:
+            if self.redis_available and self.redis_client:
+                values = self.redis_client.mget([f"{VERSION_KEY_PREFIX}{ns}" for ns in missing])
+            else:
+                values = [_memory_versions.get(ns, 0) for ns in missing]
+        except Exception as e:
+            logger.error(f"Cache version lookup error: {e}")
+            self.stats["errors"] += 1
+            return {**versions, **dict.fromkeys(missing, 0)}
+
+        for ns, value in zip(missing, values, strict=False):
+            version = int(value or 0)
+            versions[ns] = version
+            self._version_cache[ns] = (version, now)
+        return versions
+
+    def bump_version(self, namespace: str) -> int:
+        """Invalidate every key in a namespace (prefix or tag) in O(1)"""
+        try:
+            if self.redis_available and self.redis_client:
+                version = int(self.redis_client.incr(f"{VERSION_KEY_PREFIX}{namespace}"))
+            else:
+                version = _memory_versions.get(namespace, 0) + 1
+                _memory_versions[namespace] = version
+        except Exception as e:
+            logger.error(f"Cache version bump error: {e}")
+            self.stats["errors"] += 1
+            return 0
+
+        self._version_cache[namespace] = (version, time.monotonic())
+        return version
+
     def get(self, key: str) -> Any | None:
         """Get value from cache"""
         try:
             if self.redis_available and self.redis_client:
+                if self.l1 is not None:
+                    value = self.l1.get(key)
+                    if value is not None:
+                        self.stats["hits"] += 1
+                        return value
+
                 value = self.redis_client.get(key)
                 if value:
                     self.stats["hits"] += 1
-                    return json.loads(value)
+                    result = json.loads(value)
+                    if self.l1 is not None:
+                        self.l1.set(key, result, self.l1_ttl)
+                    return result
                 self.stats["misses"] += 1
                 return None
             else:
                 # In-memory fallback
-                if key in _memory_cache:
+                value = _memory_cache.get(key, _MISSING)
+                if value is not _MISSING:
                     self.stats["hits"] += 1
-                    return _memory_cache[key]
+                    return value
                 self.stats["misses"] += 1
                 return None
         except Exception as e:
@@ -88,10 +383,12 @@ class CacheService:
         try:
             if self.redis_available and self.redis_client:
                 self.redis_client.setex(key, ttl, json.dumps(value))
+                if self.l1 is not None:
+                    self.l1.set(key, value, min(ttl, self.l1_ttl))
                 return True
             else:
-                # In-memory fallback (no TTL support)
-                _memory_cache[key] = value
+                # In-memory fallback (bounded, TTL-aware)
+                _memory_cache.set(key, value, ttl)
                 return True
         except Exception as e:
             logger.error(f"Cache set error: {e}")
@@ -102,6 +399,8 @@ class CacheService:
         """Delete key from cache"""
         try:
             if self.redis_available and self.redis_client:
+                if self.l1 is not None:
+                    self.l1.pop(key, None)
                 self.redis_client.delete(key)
                 return True
             else:
@@ -112,23 +411,51 @@ class CacheService:
             return False
 
     def clear_pattern(self, pattern: str) -> int:
-        """Clear all keys matching pattern"""
+        """
+        Clear all keys matching pattern.
+
+        Prefix patterns ("zantara:*", "zantara:<prefix>:*") bump the namespace
+        version, which invalidates versioned keys in O(1). Redis keys are then
+        removed incrementally with SCAN (never the blocking KEYS command).
+
+        Returns:
+            Number of keys deleted eagerly
+        """
+        namespace = _pattern_namespace(pattern)
+        if namespace is not None:
+            self.bump_version(namespace)
+
         try:
+            if self.l1 is not None:
+                self._clear_memory_pattern(self.l1, pattern)
+
             if self.redis_available and self.redis_client:
-                keys = self.redis_client.keys(pattern)
-                if keys:
-                    return self.redis_client.delete(*keys)
-                return 0
+                deleted = 0
+                batch = []
+                for key in self.redis_client.scan_iter(match=pattern, count=500):
+                    if key.startswith(VERSION_KEY_PREFIX):
+                        continue
+                    batch.append(key)
+                    if len(batch) >= 500:
+                        deleted += self.redis_client.unlink(*batch)
+                        batch = []
+                if batch:
+                    deleted += self.redis_client.unlink(*batch)
+                return deleted
             else:
                 # In-memory: clear keys matching pattern
-                keys_to_delete = [k for k in _memory_cache if pattern.replace("*", "") in k]
-                for key in keys_to_delete:
-                    del _memory_cache[key]
-                return len(keys_to_delete)
+                return self._clear_memory_pattern(_memory_cache, pattern)
         except Exception as e:
             logger.error(f"Cache clear error: {e}")
             return 0
 
+    @staticmethod
+    def _clear_memory_pattern(memory: MemoryCache, pattern: str) -> int:
+        keys_to_delete = [k for k in memory if pattern.replace("*", "") in k]
+        for key in keys_to_delete:
+            memory.pop(key, None)
+        return len(keys_to_delete)
+
     def get_stats(self) -> dict:
         """Get cache statistics"""
         total = self.stats["hits"] + self.stats["misses"]
@@ -141,20 +468,38 @@ class CacheService:
             "misses": self.stats["misses"],
             "errors": self.stats["errors"],
             "hit_rate": f"{hit_rate:.1f}%",
+            "memory": _memory_cache.get_stats(),
+            "l1": self.l1.get_stats() if self.l1 is not None else None,
         }
 
 
+def _pattern_namespace(pattern: str) -> str | None:
+    """Map "zantara:*" / "zantara:<prefix>:*" to its invalidation namespace"""
+    if pattern == "zantara:*":
+        return GLOBAL_NAMESPACE
+    parts = pattern.split(":")
+    if len(parts) == 3 and parts[0] == "zantara" and parts[2] == "*" and "*" not in parts[1]:
+        return parts[1]
+    return None
+
+
 # Global cache instance
 cache = CacheService()
 
 
-def cached(ttl: int = 300, prefix: str = "default"):
+def cached(
+    ttl: int = 300,
+    prefix: str = "default",
+    tags: list[str] | Callable[..., list[str]] | None = None,
+):
     """
     Decorator to cache function results
 
     Args:
         ttl: Time to live in seconds (default: 5 minutes)
         prefix: Cache key prefix
+        tags: Invalidation tags for the entry, or a callable receiving the
+            function's arguments and returning them (see invalidate_tag)
 
     Example:
         @cached(ttl=600, prefix="agents")
@@ -166,7 +511,8 @@ def cached(ttl: int = 300, prefix: str = "default"):
         @wraps(func)
         async def wrapper(*args, **kwargs):
             # Generate cache key
-            cache_key = cache._generate_key(prefix, *args, **kwargs)
+            entry_tags = tags(*args, **kwargs) if callable(tags) else list(tags or [])
+            cache_key = cache._generate_versioned_key(prefix, entry_tags, args, kwargs)
 
             # Try to get from cache
             cached_value = cache.get(cache_key)
@@ -199,5 +545,35 @@ def invalidate_cache(pattern: str = "zantara:*"):
         invalidate_cache("zantara:agents:*")
     """
     count = cache.clear_pattern(pattern)
-    logger.info(f"🗑️ Invalidated {count} cache entries matching '{pattern}'")
+    logger.info(f"🗑️ Invalidated cache entries matching '{pattern}' ({count} deleted)")
     return count
+
+
+def invalidate_tag(tag: str) -> int:
+    """
+    Invalidate every cached entry carrying a tag in O(1)
+
+    Args:
+        tag: Tag passed to @cached(tags=...)
+
+    Returns:
+        New tag version
+    """
+    version = cache.bump_version(tag)
+    logger.info(f"🗑️ Invalidated cache tag '{tag}' (version {version})")
+    return version
+
+
+def invalidate_collection(collection_name: str) -> None:
+    """
+    Invalidate cached search results after a collection changes
+
+    Entries tagged with the collection and multi-collection entries (tagged
+    ALL_COLLECTIONS_TAG) are invalidated; searches on other collections stay cached.
+
+    Args:
+        collection_name: Physical Qdrant collection name (QdrantClient.collection_name).
+            Searches are tagged by it, so every routed alias of the collection is dropped.
+    """
+    invalidate_tag(f"collection:{collection_name}")
+    invalidate_tag(ALL_COLLECTIONS_TAG)
@@ -0,0 +1,252 @@
+"""
+ZANTARA RAG - Chunk Manifest
+Deterministic point IDs and incremental re-ingestion of documents
+
+Every chunk is stored under a point ID derived from its source and text hash
+only, so ingesting a document twice rewrites the same points instead of adding
+duplicates, and inserting a chunk does not shift the IDs of the ones after it.
+Each point also carries a content_hash of its text and metadata. The chunk
+manifest of a document - point ID -> content_hash of everything stored for it -
+is read back from the collection with one filtered scroll, so it cannot drift
+from what is actually indexed. Re-ingestion diffs the new chunks against it:
+- a point ID not stored yet means new text: embed and upsert
+- a stored ID with another content_hash means only metadata changed (e.g.
+  chunk_index, total_chunks): rewrite the payload, no embedding call
+- stored IDs the document no longer produces are deleted
+"""
+
+import hashlib
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Fixed namespace: point IDs must stay stable across releases
+POINT_ID_NAMESPACE = uuid.UUID("6f1c5c1e-3d4b-5a8e-9b7f-2c1d0e4a8b61")
+
+CONTENT_HASH_FIELD = "content_hash"
+SOURCE_FIELD = "file_path"
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 hex digest of a chunk text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_point_id(source: str, text: str, occurrence: int = 0) -> str:
+    """
+    Deterministic Qdrant point ID for a chunk.
+
+    The chunk position is deliberately not part of the ID: the same text keeps
+    its point (and embedding) when other chunks are inserted or removed.
+
+    Args:
+        source: Document identifier (file path)
+        text: Chunk text
+        occurrence: Earlier chunks of the document with the same text
+
+    Returns:
+        UUID string (Qdrant accepts UUIDs or unsigned ints as IDs)
+    """
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{source}\x1f{occurrence}\x1f{text_hash(text)}"))
+
+
+def content_hash(text: str, metadata: dict[str, Any]) -> str:
+    """Hash of everything stored for a chunk (text + metadata, order-independent)"""
+    stored = {k: v for k, v in metadata.items() if k != CONTENT_HASH_FIELD}
+    blob = json.dumps({"text": text, "metadata": stored}, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class ChunkSyncPlan:
+    """Difference between a document's new chunks and its stored chunk manifest"""
+
+    source: str
+    ids: list[str]  # Point ID of every new chunk, in chunk order
+    metadatas: list[dict[str, Any]]  # New metadatas (with content_hash added)
+    changed: list[int]  # Indices of chunks with new text: embed and upsert
+    vanished: list[str]  # Stored point IDs no longer produced by the document
+    relabeled: list[int] = field(default_factory=list)  # Same text, new metadata
+
+    @property
+    def unchanged(self) -> int:
+        """Number of chunks already stored as-is"""
+        return len(self.ids) - len(self.changed) - len(self.relabeled)
+
+
+def load_chunk_manifest(vector_db, source: str) -> dict[str, str] | None:
+    """
+    Read a document's chunk manifest from the collection.
+
+    Args:
+        vector_db: QdrantClient of the target collection
+        source: Document identifier (metadata.file_path)
+
+    Returns:
+        Point ID -> content_hash ("" for points stored before content hashes),
+        or None if the collection could not be read
+    """
+    try:
+        points = vector_db.scroll_points(
+            filter={SOURCE_FIELD: source},
+            payload_fields=[f"metadata.{CONTENT_HASH_FIELD}"],
+        )
+        return {
+            point["id"]: (point["payload"].get("metadata") or {}).get(CONTENT_HASH_FIELD, "")
+            for point in points
+        }
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read chunk manifest for {source}: {e}")
+        return None
+
+
+def plan_chunk_sync(
+    source: str,
+    chunk_texts: list[str],
+    metadatas: list[dict[str, Any]],
+    manifest: dict[str, str] | None,
+) -> ChunkSyncPlan:
+    """
+    Diff a document's new chunks against its stored manifest.
+
+    Args:
+        source: Document identifier (file path)
+        chunk_texts: New chunk texts, in order
+        metadatas: Metadata for each chunk (copied, content_hash added)
+        manifest: Stored manifest (None = unknown: upsert everything, delete nothing)
+
+    Returns:
+        ChunkSyncPlan
+    """
+    stored = manifest or {}
+    ids: list[str] = []
+    new_metadatas: list[dict[str, Any]] = []
+    changed: list[int] = []
+    relabeled: list[int] = []
+    occurrences: dict[str, int] = {}
+
+    for index, (text, metadata) in enumerate(zip(chunk_texts, metadatas, strict=True)):
+        digest = text_hash(text)
+        point_id = make_point_id(source, text, occurrences.get(digest, 0))
+        occurrences[digest] = occurrences.get(digest, 0) + 1
+        meta = {**metadata, CONTENT_HASH_FIELD: content_hash(text, metadata)}
+        ids.append(point_id)
+        new_metadatas.append(meta)
+        # The ID encodes the text: a stored ID already has the right embedding
+        if point_id not in stored:
+            changed.append(index)
+        elif stored[point_id] != meta[CONTENT_HASH_FIELD]:
+            relabeled.append(index)
+
+    current = set(ids)
+    vanished = [point_id for point_id in stored if point_id not in current]
+    return ChunkSyncPlan(
+        source=source,
+        ids=ids,
+        metadatas=new_metadatas,
+        changed=changed,
+        vanished=vanished,
+        relabeled=relabeled,
+    )
+
+
+def prepare_chunk_sync(
+    vector_db, source: str, chunk_texts: list[str], metadatas: list[dict[str, Any]]
+) -> ChunkSyncPlan:
+    """Load the stored manifest of a document and diff its new chunks against it"""
+    return plan_chunk_sync(source, chunk_texts, metadatas, load_chunk_manifest(vector_db, source))
+
+
+def update_relabeled_chunks(vector_db, plan: ChunkSyncPlan) -> int:
+    """
+    Rewrite the metadata of chunks whose text (and embedding) is unchanged.
+
+    Returns:
+        Number of points updated
+
+    Raises:
+        RuntimeError: If the payload update is rejected
+    """
+    if not plan.relabeled:
+        return 0
+    result = vector_db.set_payloads(
+        [(plan.ids[i], {"metadata": plan.metadatas[i]}) for i in plan.relabeled]
+    )
+    if isinstance(result, dict) and result.get("success") is False:
+        raise RuntimeError(f"Payload update failed: {result.get('error')}")
+    return len(plan.relabeled)
+
+
+def delete_vanished_chunks(vector_db, plan: ChunkSyncPlan) -> int:
+    """
+    Delete the points a document no longer produces.
+
+    Call only after the changed chunks were stored, so the document never
+    disappears from search while it is being updated.
+
+    Returns:
+        Number of points deleted
+
+    Raises:
+        RuntimeError: If the delete is rejected
+    """
+    if not plan.vanished:
+        return 0
+    result = vector_db.delete(plan.vanished)
+    if isinstance(result, dict) and result.get("success") is False:
+        raise RuntimeError(f"Delete failed: {result.get('error')}")
+    return len(plan.vanished)
+
+
+def sync_document_chunks(
+    vector_db,
+    embedder,
+    source: str,
+    chunk_texts: list[str],
+    metadatas: list[dict[str, Any]],
+) -> ChunkSyncPlan:
+    """
+    Store a document's chunks incrementally.
+
+    Embeds and upserts only chunks with new text (under deterministic IDs),
+    rewrites the payload of chunks whose metadata alone changed, then deletes
+    the chunks that vanished.
+
+    Args:
+        vector_db: QdrantClient of the target collection
+        embedder: EmbeddingsGenerator
+        source: Document identifier (file path)
+        chunk_texts: Chunk texts, in order
+        metadatas: Metadata for each chunk
+
+    Returns:
+        The executed ChunkSyncPlan
+
+    Raises:
+        RuntimeError: If the upsert or payload update is rejected
+    """
+    plan = prepare_chunk_sync(vector_db, source, chunk_texts, metadatas)
+
+    if plan.changed:
+        texts = [chunk_texts[i] for i in plan.changed]
+        embeddings = embedder.generate_embeddings(texts)
+        result = vector_db.upsert_documents(
+            chunks=texts,
+            embeddings=embeddings,
+            metadatas=[plan.metadatas[i] for i in plan.changed],
+            ids=[plan.ids[i] for i in plan.changed],
+        )
+        if isinstance(result, dict) and result.get("success") is False:
+            raise RuntimeError(f"Upsert failed: {result.get('error')}")
+
+    relabeled = update_relabeled_chunks(vector_db, plan)
+    deleted = delete_vanished_chunks(vector_db, plan)
+    logger.info(
+        f"🔁 Chunk sync {source}: {len(plan.changed)} upserted, {relabeled} relabeled, "
+        f"{plan.unchanged} unchanged, {deleted} deleted"
+    )
+    return plan
@@ -1,10 +1,22 @@
 """
 ZANTARA RAG - Embeddings Generation
 Supports both OpenAI and Sentence Transformers
+
+Repeated texts are served from a content-addressed EmbeddingCache, and concurrent
+async query embeddings are merged into single batch calls by EmbeddingBatcher.
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Optional
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +36,234 @@ except ImportError:
         _default_settings = None
 
 
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache keyed by provider + model + text.
+
+    L1 is an in-process LRU; an optional L2 (Redis or a local directory) lets
+    embeddings survive restarts and be shared between workers. Thread-safe, since
+    embeddings may be generated from worker threads.
+    """
+
+    REDIS_PREFIX = "zantara:embedding:"
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        redis_client: Any | None = None,
+        cache_dir: str | None = None,
+        ttl: int = 7 * 24 * 3600,
+    ):
+        """
+        Args:
+            max_entries: Max embeddings kept in memory (0 disables the L1 tier)
+            redis_client: Optional sync Redis client (binary responses) for L2
+            cache_dir: Optional directory for an on-disk L2 (ignored if redis_client set)
+            ttl: Redis TTL in seconds for L2 entries
+        """
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self.cache_dir = Path(cache_dir) if cache_dir and redis_client is None else None
+        self.ttl = ttl
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "l2_hits": 0, "misses": 0}
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(provider: str, model: str, text: str) -> str:
+        """Stable key for an embedding of text by provider/model"""
+        return hashlib.sha256(f"{provider}\x00{model}\x00{text}".encode()).hexdigest()
+
+    @property
+    def backend(self) -> str:
+        if self.redis is not None:
+            return "memory+redis"
+        if self.cache_dir is not None:
+            return "memory+disk"
+        return "memory"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> list[float] | None:
+        """Get a cached embedding (a copy), or None"""
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return list(embedding)
+
+        embedding = self._l2_get(key)
+        if embedding is not None:
+            self._l1_set(key, embedding)
+            with self._lock:
+                self.stats["hits"] += 1
+                self.stats["l2_hits"] += 1
+            return list(embedding)
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def peek(self, key: str) -> list[float] | None:
+        """Get an embedding (a copy) from the in-memory tier only, without counting it"""
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                return None
+            self._entries.move_to_end(key)
+            return list(embedding)
+
+    def set(self, key: str, embedding: list[float]):
+        """Store an embedding in every configured tier"""
+        self._l1_set(key, list(embedding))
+        self._l2_set(key, embedding)
+
+    def clear(self):
+        """Drop the in-memory tier"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        hit_rate = (self.stats["hits"] / lookups * 100) if lookups > 0 else 0
+        return {
+            "backend": self.backend,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            **self.stats,
+            "hit_rate": f"{hit_rate:.1f}%",
+        }
+
+    def _l1_set(self, key: str, embedding: list[float]):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.f32"
+
+    def _l2_get(self, key: str) -> list[float] | None:
+        try:
+            if self.redis is not None:
+                raw = self.redis.get(f"{self.REDIS_PREFIX}{key}")
+            elif self.cache_dir is not None:
+                path = self._disk_path(key)
+                raw = path.read_bytes() if path.exists() else None
+            else:
+                return None
+        except Exception as e:
+            logger.warning(f"⚠️ Embedding cache L2 read failed: {e}")
+            return None
+
+        if not raw:
+            return None
+        return np.frombuffer(raw, dtype=np.float32).tolist()
+
+    def _l2_set(self, key: str, embedding: list[float]):
+        try:
+            raw = np.asarray(embedding, dtype=np.float32).tobytes()
+            if self.redis is not None:
+                self.redis.setex(f"{self.REDIS_PREFIX}{key}", self.ttl, raw)
+            elif self.cache_dir is not None:
+                path = self._disk_path(key)
+                path.parent.mkdir(exist_ok=True)
+                # Write-then-rename so concurrent readers never see a partial file
+                tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(raw)
+                tmp_path.replace(path)
+        except Exception as e:
+            logger.warning(f"⚠️ Embedding cache L2 write failed: {e}")
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batcher for async single-text embedding requests.
+
+    Requests arriving within max_wait_ms of the first pending one (up to
+    max_batch_size) are merged into one embed_fn call, run in a worker thread so
+    the event loop is never blocked by the provider call.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[list[str]], list[list[float]]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        self.embed_fn = embed_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.stats = {"requests": 0, "batches": 0, "texts_embedded": 0}
+
+    async def submit(self, text: str) -> list[float]:
+        """Queue text for the next batch and wait for its embedding"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        self.stats["requests"] += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[str, asyncio.Future]]):
+        # Identical concurrent queries are embedded once
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        self.stats["batches"] += 1
+        self.stats["texts_embedded"] += len(texts)
+
+        try:
+            embeddings = await asyncio.to_thread(self.embed_fn, texts)
+            if len(embeddings) != len(texts):
+                raise ValueError(f"Expected {len(texts)} embeddings, got {len(embeddings)}")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_text = dict(zip(texts, embeddings, strict=True))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(list(by_text[text]))
+
+    def get_stats(self) -> dict[str, Any]:
+        requests = self.stats["requests"]
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "avg_batch_size": round(requests / batches, 2) if batches else 0.0,
+        }
+
+
 class EmbeddingsGenerator:
     """
     Generate embeddings using configured provider (OpenAI or Sentence Transformers).
@@ -82,6 +322,45 @@ class EmbeddingsGenerator:
             # Default to sentence-transformers (local, no API key needed)
             self._init_sentence_transformers(model)
 
+        self._init_cache()
+        self._batcher = EmbeddingBatcher(
+            self.generate_embeddings,
+            max_batch_size=self._get_setting("embedding_batch_max_size", 64),
+            max_wait_ms=self._get_setting("embedding_batch_max_wait_ms", 5.0),
+        )
+
+    def _get_setting(self, name: str, default):
+        """Read an optional setting, falling back to default if missing or mis-typed"""
+        value = getattr(self._settings, name, default) if self._settings else default
+        return value if isinstance(value, type(default)) else default
+
+    def _init_cache(self):
+        """Initialize the embedding cache (memory LRU, optionally backed by Redis or disk)"""
+        backend = self._get_setting("embedding_cache_backend", "memory")
+        max_entries = self._get_setting("embedding_cache_size", 10000)
+        redis_client = None
+        cache_dir = None
+
+        if backend == "redis":
+            redis_url = self._get_setting("redis_url", "")
+            try:
+                import redis
+
+                redis_client = redis.from_url(redis_url)
+                redis_client.ping()
+            except Exception as e:
+                logger.warning(f"⚠️ Embedding cache Redis unavailable, using memory only: {e}")
+                redis_client = None
+        elif backend == "disk":
+            cache_dir = self._get_setting("embedding_cache_dir", "./data/embedding_cache")
+
+        self.cache = EmbeddingCache(
+            max_entries=max_entries, redis_client=redis_client, cache_dir=cache_dir
+        )
+        logger.info(
+            f"🔌 [EmbeddingsGenerator] Embedding cache: {self.cache.backend} ({max_entries} entries)"
+        )
+
     def _init_openai(self, api_key: str | None = None, model: str | None = None):
         """Initialize OpenAI embeddings provider"""
         from openai import OpenAI
@@ -167,21 +446,50 @@ class EmbeddingsGenerator:
 
         Raises:
             Exception: If API call fails
+            ValueError: If the provider returns a different number of embeddings
         """
         if not texts:
             logger.warning("Empty text list provided for embedding")
             return []
 
+        keys = [EmbeddingCache.make_key(self.provider, self.model, text) for text in texts]
+        results = [self.cache.get(key) for key in keys]
+
+        # Embed each distinct uncached text once
+        missing_texts = list(
+            dict.fromkeys(
+                text for text, result in zip(texts, results, strict=True) if result is None
+            )
+        )
+        if not missing_texts:
+            logger.debug(f"Embedding cache: all {len(texts)} texts cached")
+            return results
+
         try:
             if self.provider == "openai":
-                return self._generate_embeddings_openai(texts)
+                fresh = self._generate_embeddings_openai(missing_texts)
             else:
-                return self._generate_embeddings_sentence_transformers(texts)
+                fresh = self._generate_embeddings_sentence_transformers(missing_texts)
 
         except Exception as e:
             logger.error(f"Error generating embeddings: {e}")
             raise
 
+        if len(fresh) != len(missing_texts):
+            # Vectors can no longer be paired with their texts: fail instead of misaligning
+            raise ValueError(
+                f"Expected {len(missing_texts)} embeddings, provider returned {len(fresh)}"
+            )
+
+        fresh_by_text = dict(zip(missing_texts, fresh, strict=True))
+        for i, text in enumerate(texts):
+            if results[i] is None:
+                results[i] = fresh_by_text[text]
+        for text, embedding in fresh_by_text.items():
+            self.cache.set(EmbeddingCache.make_key(self.provider, self.model, text), embedding)
+
+        return results
+
     def _generate_embeddings_openai(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings using OpenAI API"""
         logger.info(f"Generating embeddings for {len(texts)} texts using OpenAI")
@@ -241,6 +549,35 @@ class EmbeddingsGenerator:
         # For text-embedding-3-small, same process as document embedding
         return self.generate_single_embedding(query)
 
+    async def async_generate_query_embedding(self, query: str) -> list[float]:
+        """
+        Non-blocking query embedding.
+
+        Served from the in-memory cache tier when possible; otherwise merged with
+        other concurrent requests into one batch call by the micro-batcher, whose
+        worker thread does the L2 lookup and counts the hit or miss.
+
+        Args:
+            query: Search query text
+
+        Returns:
+            Query embedding vector
+        """
+        cached = self.cache.peek(EmbeddingCache.make_key(self.provider, self.model, query))
+        if cached is not None:
+            return cached
+
+        return await self._batcher.submit(query)
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """
+        Get embedding cache and micro-batcher statistics.
+
+        Returns:
+            Dictionary with cache hit/miss counts and batching efficiency
+        """
+        return {"cache": self.cache.get_stats(), "batcher": self._batcher.get_stats()}
+
     def generate_batch_embeddings(self, texts: list[str]) -> list[list[float]]:
         """
         Generate embeddings for a batch of texts.
@@ -7,10 +7,12 @@ from .chunker import LegalChunker
 from .cleaner import LegalCleaner
 from .metadata_extractor import LegalMetadataExtractor
 from .structure_parser import LegalStructureParser
+from .tokenizer import LegalTokenizer
 
 __all__ = [
     "LegalCleaner",
     "LegalMetadataExtractor",
     "LegalStructureParser",
     "LegalChunker",
+    "LegalTokenizer",
 ]
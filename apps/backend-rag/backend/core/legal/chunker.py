@@ -7,6 +7,8 @@ import logging
 from typing import Any
 
 from .constants import MAX_PASAL_TOKENS, PASAL_PATTERN
+from .structure_parser import build_pasal_bab_map
+from .tokenizer import LegalTokens, pasal_spans, tokenize
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +34,7 @@ class LegalChunker:
         text: str,
         metadata: dict[str, Any],
         structure: dict[str, Any] | None = None,
+        tokens: LegalTokens | None = None,
     ) -> list[dict[str, Any]]:
         """
         Chunk legal document with Pasal-aware strategy and context injection.
@@ -40,6 +43,7 @@ class LegalChunker:
             text: Cleaned legal document text
             metadata: Document metadata (type, number, year, topic)
             structure: Parsed structure (optional, for better context)
+            tokens: Token stream of text (LegalTokenizer.tokenize), built if missing
 
         Returns:
             List of chunk dictionaries with injected context
@@ -49,9 +53,10 @@ class LegalChunker:
             return []
 
         chunks = []
+        pasal_to_bab = self._pasal_bab_map(structure) if structure else {}
 
         # Strategy: Split by Pasal first
-        pasal_chunks = self._split_by_pasal(text)
+        pasal_chunks = self._split_by_pasal(text, tokens)
 
         for pasal_chunk in pasal_chunks:
             # Extract Pasal number
@@ -68,9 +73,7 @@ class LegalChunker:
             pasal_text = pasal_match.group(2).strip()
 
             # Find BAB context if structure provided
-            bab_context = None
-            if structure:
-                bab_context = self._find_bab_for_pasal(structure, pasal_num)
+            bab_context = pasal_to_bab.get(pasal_num)
 
             # Check if Pasal is too large
             pasal_length = len(pasal_text)
@@ -100,18 +103,26 @@ class LegalChunker:
 
         return chunks
 
-    def _split_by_pasal(self, text: str) -> list[str]:
+    def _split_by_pasal(self, text: str, tokens: LegalTokens | None = None) -> list[str]:
         """
         Split text by Pasal markers.
 
         Args:
             text: Document text
+            tokens: Token stream of text (built if missing)
 
         Returns:
             List of Pasal text chunks
         """
-        # Split by Pasal pattern
-        splits = PASAL_PATTERN.split(text)
+        # Split by Pasal pattern (same pieces as PASAL_PATTERN.split(text))
+        splits = []
+        last_end = 0
+        for span in pasal_spans(text, tokens if tokens is not None else tokenize(text)):
+            splits.extend(
+                (text[last_end : span.start], span.number, text[span.body_start : span.end])
+            )
+            last_end = span.end
+        splits.append(text[last_end:])
 
         # First split is usually preamble (before first Pasal)
         pasal_chunks = []
@@ -233,6 +244,24 @@ class LegalChunker:
 
         return chunk
 
+    def _pasal_bab_map(self, structure: dict[str, Any]) -> dict[str, str]:
+        """
+        Get the Pasal number -> BAB map of a parsed structure.
+
+        Uses the index built by LegalStructureParser.parse(); structures without
+        one (e.g. built by hand) are indexed here, once per document.
+
+        Args:
+            structure: Parsed structure dictionary
+
+        Returns:
+            Pasal number -> BAB context string
+        """
+        index = structure.get("index") or {}
+        if "pasal_to_bab" in index:
+            return index["pasal_to_bab"]
+        return build_pasal_bab_map(structure.get("batang_tubuh", []))
+
     def _find_bab_for_pasal(self, structure: dict[str, Any], pasal_num: str) -> str | None:
         """
         Find which BAB a Pasal belongs to from structure.
@@ -244,12 +273,4 @@ class LegalChunker:
         Returns:
             BAB context string or None
         """
-        batang_tubuh = structure.get("batang_tubuh", [])
-
-        for bab in batang_tubuh:
-            pasal_list = bab.get("pasal", [])
-            for pasal in pasal_list:
-                if pasal.get("number") == pasal_num:
-                    return f"BAB {bab.get('number')} - {bab.get('title', '')}"
-
-        return None
+        return self._pasal_bab_map(structure).get(pasal_num)
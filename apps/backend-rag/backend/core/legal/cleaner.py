@@ -10,6 +10,16 @@ from .constants import NOISE_PATTERNS, WHITESPACE_FIXES
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_FIXES = [
+    (re.compile(pattern), replacement) for pattern, replacement in WHITESPACE_FIXES
+]
+_CERTIFICATION_FOOTER = re.compile(
+    r"Salinan sesuai dengan aslinya.*?(?=\n|$)", re.IGNORECASE | re.MULTILINE | re.DOTALL
+)
+_PASAL_SPACING = re.compile(r"Pasal\s+(\d+[A-Z]?)", re.IGNORECASE)
+_STANDALONE_NUMBER = re.compile(r"^\s*\d+\s*$", re.MULTILINE)
+_EXCESS_BLANK_LINES = re.compile(r"\n{3,}")
+
 
 class LegalCleaner:
     """
@@ -37,33 +47,27 @@ class LegalCleaner:
 
         cleaned = text
 
-        # Step 1: Remove noise patterns
+        # Step 1: Remove noise patterns (one pass each: subn counts while replacing)
         for pattern in NOISE_PATTERNS:
-            matches_before = len(re.findall(pattern, cleaned))
-            cleaned = pattern.sub("", cleaned)
-            if matches_before > 0:
-                logger.debug(f"Removed {matches_before} matches of pattern: {pattern.pattern[:50]}")
+            cleaned, removed = pattern.subn("", cleaned)
+            if removed > 0:
+                logger.debug(f"Removed {removed} matches of pattern: {pattern.pattern[:50]}")
 
         # Step 2: Normalize whitespace
-        for pattern, replacement in WHITESPACE_FIXES:
-            cleaned = re.sub(pattern, replacement, cleaned)
+        for pattern, replacement in _WHITESPACE_FIXES:
+            cleaned = pattern.sub(replacement, cleaned)
 
         # Step 3: Remove "Salinan sesuai dengan aslinya" footer (more aggressive)
-        cleaned = re.sub(
-            r"Salinan sesuai dengan aslinya.*?(?=\n|$)",
-            "",
-            cleaned,
-            flags=re.IGNORECASE | re.MULTILINE | re.DOTALL,
-        )
+        cleaned = _CERTIFICATION_FOOTER.sub("", cleaned)
 
         # Step 4: Normalize Pasal spacing (ensure consistent format)
-        cleaned = re.sub(r"Pasal\s+(\d+[A-Z]?)", r"Pasal \1", cleaned, flags=re.IGNORECASE)
+        cleaned = _PASAL_SPACING.sub(r"Pasal \1", cleaned)
 
         # Step 5: Remove standalone page numbers (lines with only numbers)
-        cleaned = re.sub(r"^\s*\d+\s*$", "", cleaned, flags=re.MULTILINE)
+        cleaned = _STANDALONE_NUMBER.sub("", cleaned)
 
         # Step 6: Final cleanup - remove excessive blank lines
-        cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
+        cleaned = _EXCESS_BLANK_LINES.sub("\n\n", cleaned)
 
         # Step 7: Trim whitespace
         cleaned = cleaned.strip()
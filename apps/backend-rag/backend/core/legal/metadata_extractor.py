@@ -15,6 +15,10 @@ from .constants import (
     TOPIC_PATTERN,
     YEAR_PATTERN,
 )
+from .tokenizer import KONSIDERANS, LegalTokens
+
+# Start of the Konsiderans: the title block (type, number, year, topic) precedes it
+_KONSIDERANS_START = re.compile(r"^(?:Menimbang|Mengingat)", re.IGNORECASE | re.MULTILINE)
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +33,16 @@ class LegalMetadataExtractor:
         """Initialize the metadata extractor"""
         logger.info("LegalMetadataExtractor initialized")
 
-    def extract(self, text: str) -> dict[str, Any]:
+    def extract(self, text: str, tokens: LegalTokens | None = None) -> dict[str, Any]:
         """
         Extract all metadata from legal document text.
 
+        Type, number, year and topic are searched in the title block before the
+        Konsiderans first, and in the whole text only if the block lacks them.
+
         Args:
             text: Cleaned legal document text
+            tokens: Token stream of text (LegalTokenizer.tokenize, optional)
 
         Returns:
             Dictionary with extracted metadata:
@@ -53,9 +61,10 @@ class LegalMetadataExtractor:
             return {}
 
         metadata = {}
+        header_end = self._header_end(text, tokens)
 
         # Extract document type
-        type_match = LEGAL_TYPE_PATTERN.search(text)
+        type_match = self._search(LEGAL_TYPE_PATTERN, text, header_end)
         if type_match:
             doc_type = type_match.group(1).upper()
             metadata["type"] = doc_type
@@ -67,7 +76,7 @@ class LegalMetadataExtractor:
             metadata["type_abbrev"] = "UNKNOWN"
 
         # Extract document number
-        number_match = NUMBER_PATTERN.search(text)
+        number_match = self._search(NUMBER_PATTERN, text, header_end)
         if number_match:
             metadata["number"] = number_match.group(1)
             logger.debug(f"Extracted number: {metadata['number']}")
@@ -76,7 +85,7 @@ class LegalMetadataExtractor:
             metadata["number"] = "UNKNOWN"
 
         # Extract year
-        year_match = YEAR_PATTERN.search(text)
+        year_match = self._search(YEAR_PATTERN, text, header_end)
         if year_match:
             metadata["year"] = year_match.group(1)
             logger.debug(f"Extracted year: {metadata['year']}")
@@ -85,7 +94,7 @@ class LegalMetadataExtractor:
             metadata["year"] = "UNKNOWN"
 
         # Extract topic (text after "TENTANG")
-        topic_match = TOPIC_PATTERN.search(text)
+        topic_match = self._search(TOPIC_PATTERN, text, header_end)
         if topic_match:
             topic = topic_match.group(1).strip()
             # Clean up topic text
@@ -118,6 +127,33 @@ class LegalMetadataExtractor:
 
         return metadata
 
+    def _header_end(self, text: str, tokens: LegalTokens | None) -> int:
+        """End of the title block: start of the Konsiderans (end of text if none)"""
+        if tokens is not None:
+            token = tokens.first(KONSIDERANS)
+            return token.start if token else len(text)
+        match = _KONSIDERANS_START.search(text)
+        return match.start() if match else len(text)
+
+    def _search(self, pattern: re.Pattern, text: str, header_end: int) -> re.Match | None:
+        """
+        Search the title block first, then the whole text.
+
+        Args:
+            pattern: Metadata pattern
+            text: Document text
+            header_end: End of the title block
+
+        Returns:
+            First match in the document (same as pattern.search(text))
+        """
+        if header_end < len(text):
+            match = pattern.search(text, 0, header_end)
+            # A match emptied by the block end (e.g. bare "TENTANG") is not final
+            if match and match.group(match.lastindex or 0).strip():
+                return match
+        return pattern.search(text)
+
     def _build_full_title(self, metadata: dict[str, Any]) -> str:
         """
         Build full document title from metadata.
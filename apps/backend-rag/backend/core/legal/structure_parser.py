@@ -4,22 +4,65 @@ Recognizes hierarchical structure of Indonesian legal documents
 """
 
 import logging
-import re
+from bisect import bisect_left
 from typing import Any
 
-from .constants import (
-    AYAT_PATTERN,
-    BAB_PATTERN,
-    BAGIAN_PATTERN,
-    KONSIDERANS_MARKERS,
-    PARAGRAF_PATTERN,
-    PASAL_PATTERN,
-    PENJELASAN_PATTERN,
+from .constants import AYAT_PATTERN, KONSIDERANS_MARKERS
+from .tokenizer import (
+    BAB,
+    BAGIAN,
+    KONSIDERANS,
+    MEMUTUSKAN,
+    PARAGRAF,
+    PASAL,
+    PENJELASAN,
+    LegalToken,
+    LegalTokens,
+    match_headings,
+    pasal_spans,
+    tokenize,
 )
 
 logger = logging.getLogger(__name__)
 
 
+def _bab_label(number: str, title: str) -> str:
+    return f"BAB {number} - {title}"
+
+
+def build_pasal_bab_map(batang_tubuh: list[dict[str, Any]]) -> dict[str, str]:
+    """
+    Map every Pasal number to the BAB containing it (first BAB wins on duplicates).
+
+    Args:
+        batang_tubuh: BAB list from LegalStructureParser.parse()
+
+    Returns:
+        Pasal number -> "BAB <number> - <title>"
+    """
+    pasal_to_bab: dict[str, str] = {}
+    for bab in batang_tubuh:
+        label = _bab_label(bab.get("number"), bab.get("title", ""))
+        for pasal in bab.get("pasal", []):
+            pasal_to_bab.setdefault(pasal.get("number"), label)
+    return pasal_to_bab
+
+
+def find_bab_at(index: dict[str, Any], position: int) -> str | None:
+    """
+    Find the BAB a character position belongs to (binary search).
+
+    Args:
+        index: Structure index from parse() (uses bab_offsets / bab_labels)
+        position: Character position in the parsed text
+
+    Returns:
+        BAB label or None if the position precedes every BAB
+    """
+    i = bisect_left(index["bab_offsets"], position)
+    return index["bab_labels"][i - 1] if i else None
+
+
 class LegalStructureParser:
     """
     Parses the hierarchical structure of Indonesian legal documents.
@@ -30,12 +73,13 @@ class LegalStructureParser:
         """Initialize the structure parser"""
         logger.info("LegalStructureParser initialized")
 
-    def parse(self, text: str) -> dict[str, Any]:
+    def parse(self, text: str, tokens: LegalTokens | None = None) -> dict[str, Any]:
         """
         Parse legal document structure.
 
         Args:
             text: Cleaned legal document text
+            tokens: Token stream of text (LegalTokenizer.tokenize), built if missing
 
         Returns:
             Dictionary with parsed structure:
@@ -44,12 +88,16 @@ class LegalStructureParser:
                 "batang_tubuh": list,    # List of BAB (chapters)
                 "penjelasan": str,        # Elucidation section
                 "pasal_list": list,      # List of all Pasal with their structure
+                "index": dict,           # Lookup index (see _build_index)
             }
         """
         if not text or not text.strip():
             logger.warning("Empty text provided to structure parser")
             return {}
 
+        if tokens is None:
+            tokens = tokenize(text)
+
         structure = {
             "konsiderans": None,
             "batang_tubuh": [],
@@ -58,27 +106,45 @@ class LegalStructureParser:
         }
 
         # Step 1: Extract Konsiderans
-        structure["konsiderans"], body_start_index = self._extract_konsiderans_with_index(text)
+        structure["konsiderans"], body_start_index = self._extract_konsiderans_with_index(
+            text, tokens
+        )
 
         # Step 2: Split document into sections
-        penjelasan_match = PENJELASAN_PATTERN.search(text)
-        penjelasan_start = penjelasan_match.start() if penjelasan_match else len(text)
+        penjelasan = next((t for t in tokens.of_kind(PENJELASAN) if t.title), None)
+        penjelasan_start = penjelasan.start if penjelasan else len(text)
 
         # Batang Tubuh starts after Konsiderans (or at 0 if no Konsiderans)
         start_index = body_start_index if body_start_index is not None else 0
-        batang_tubuh_text = text[start_index:penjelasan_start]
 
-        penjelasan_text = text[penjelasan_start:] if penjelasan_match else ""
+        # Batang Tubuh is parsed in place as text[body_start:body_end]
+        body_text, body_tokens, offset = text, tokens, 0
+        body_start, body_end = start_index, penjelasan_start
+        if 0 < start_index < penjelasan_start and text[start_index - 1] != "\n":
+            # Konsiderans was cut at its size limit mid-line: lex the body on its own
+            body_text = text[start_index:penjelasan_start]
+            body_tokens, offset = tokenize(body_text), start_index
+            body_start, body_end = 0, len(body_text)
 
         # Step 3: Parse Batang Tubuh (Body)
-        structure["batang_tubuh"] = self._parse_batang_tubuh(batang_tubuh_text)
+        bab_headings = match_headings(body_text, body_tokens, BAB, body_start, body_end)
+        structure["batang_tubuh"] = self._parse_batang_tubuh(
+            body_text, bab_headings, body_tokens, body_start, body_end
+        )
 
-        # Step 4: Extract all Pasal
-        structure["pasal_list"] = self._extract_pasal_list(batang_tubuh_text)
+        # Step 4: Index BAB offsets and Pasal -> BAB (lookups without rescanning)
+        structure["index"] = self._build_index(
+            structure["batang_tubuh"], bab_headings, offset=offset
+        )
+
+        # Step 5: Extract all Pasal
+        structure["pasal_list"] = self._extract_pasal_list(
+            body_text, structure["index"], offset, body_tokens, body_start, body_end
+        )
 
-        # Step 5: Extract Penjelasan
-        if penjelasan_text:
-            structure["penjelasan"] = penjelasan_text.strip()
+        # Step 6: Extract Penjelasan
+        if penjelasan:
+            structure["penjelasan"] = text[penjelasan_start:].strip()
 
         logger.info(
             f"Parsed structure: {len(structure['batang_tubuh'])} BAB, "
@@ -87,59 +153,50 @@ class LegalStructureParser:
 
         return structure
 
-    def _extract_konsiderans_with_index(self, text: str) -> tuple[str | None, int | None]:
+    def _extract_konsiderans_with_index(
+        self, text: str, tokens: LegalTokens | None = None
+    ) -> tuple[str | None, int | None]:
         """
         Extract Konsiderans and return its text and end index.
 
         Args:
             text: Document text
+            tokens: Token stream of text (built if missing)
 
         Returns:
             Tuple (konsiderans_text, end_index)
         """
-        konsiderans_start = None
-        konsiderans_end = None
+        if tokens is None:
+            tokens = tokenize(text)
 
-        # Find start of Konsiderans
+        # Find start of Konsiderans (first marker in KONSIDERANS_MARKERS order)
+        konsiderans_start = None
         for marker in KONSIDERANS_MARKERS:
-            match = re.search(rf"^{marker}", text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                konsiderans_start = match.start()
+            token = next(
+                (t for t in tokens.of_kind(KONSIDERANS) if t.title.lower() == marker.lower()),
+                None,
+            )
+            if token:
+                konsiderans_start = token.start
                 break
 
         if konsiderans_start is None:
             return None, None
 
-        # Find end of Konsiderans (start of Batang Tubuh)
-        # Usually marked by "MEMUTUSKAN:" or first "BAB" or first "Pasal"
-        end_markers = [
-            r"^MEMUTUSKAN:",
-            r"^BAB\s+",
-            r"^Pasal\s+\d+",
-        ]
-
-        for marker in end_markers:
-            match = re.search(marker, text[konsiderans_start:], re.IGNORECASE | re.MULTILINE)
-            if match:
-                konsiderans_end = konsiderans_start + match.start()
-                # If marker is MEMUTUSKAN, we want to include it in Konsiderans or skip it?
-                # Usually MEMUTUSKAN: Menetapkan: ... is the bridge.
-                # The actual body starts after "Menetapkan: ...".
-                # But for simplicity, let's say body starts at the marker match if it's BAB or Pasal,
-                # or after MEMUTUSKAN block if it's MEMUTUSKAN.
-
-                # If marker is MEMUTUSKAN, let's try to find "Menetapkan:" and go after that.
-                if "MEMUTUSKAN" in marker.upper() or "MEMUTUSKAN" in match.group(0).upper():
-                    # Look for "Menetapkan" after this
-                    menetapkan_match = re.search(
-                        r"Menetapkan\s*:", text[konsiderans_start + match.start() :], re.IGNORECASE
-                    )
-                    if menetapkan_match:
-                        # The body usually starts after the title of the law in Menetapkan.
-                        # E.g. Menetapkan: UNDANG-UNDANG TENTANG ...
-                        # Then BAB I.
-                        # So we might want to look for the first BAB or Pasal after this.
-                        pass
+        # Find end of Konsiderans (start of Batang Tubuh):
+        # "MEMUTUSKAN:", else the first BAB, else the first Pasal heading
+        konsiderans_end = None
+        for kind in (MEMUTUSKAN, BAB, PASAL):
+            token = next(
+                (
+                    t
+                    for t in tokens.of_kind(kind, konsiderans_start)
+                    if kind != PASAL or t.number is not None
+                ),
+                None,
+            )
+            if token:
+                konsiderans_end = token.start
                 break
 
         if konsiderans_end is None:
@@ -154,141 +211,190 @@ class LegalStructureParser:
         content, _ = self._extract_konsiderans_with_index(text)
         return content
 
-    def _parse_batang_tubuh(self, text: str) -> list[dict[str, Any]]:
+    def _build_index(
+        self,
+        batang_tubuh: list[dict[str, Any]],
+        bab_headings: list[LegalToken],
+        offset: int = 0,
+    ) -> dict[str, Any]:
         """
-        Parse Batang Tubuh (Body) into BAB (Chapters).
+        Build the structure lookup index.
 
         Args:
-            text: Batang Tubuh text
+            batang_tubuh: Parsed BAB list
+            bab_headings: BAB heading tokens of the Batang Tubuh
+            offset: Position of the tokenized text within the parsed document
 
         Returns:
-            List of BAB dictionaries with their structure
+            {
+                "bab_offsets": list,   # Sorted BAB heading positions (for find_bab_at)
+                "bab_labels": list,    # "BAB <number> - <title>" per offset
+                "pasal_to_bab": dict,  # Pasal number -> BAB label
+            }
         """
-        bab_list = []
-        bab_matches = list(BAB_PATTERN.finditer(text))
-
-        for i, bab_match in enumerate(bab_matches):
-            bab_num = bab_match.group(1)
-            bab_title = bab_match.group(2).strip()
+        return {
+            "bab_offsets": [offset + heading.start for heading in bab_headings],
+            "bab_labels": [_bab_label(heading.number, heading.title) for heading in bab_headings],
+            "pasal_to_bab": build_pasal_bab_map(batang_tubuh),
+        }
 
-            # Find end of this BAB (start of next BAB or end of text)
-            start_pos = bab_match.end()
-            end_pos = bab_matches[i + 1].start() if i + 1 < len(bab_matches) else len(text)
+    def _parse_batang_tubuh(
+        self,
+        text: str,
+        bab_headings: list[LegalToken] | None = None,
+        tokens: LegalTokens | None = None,
+        start: int = 0,
+        end: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Parse Batang Tubuh (Body) into BAB (Chapters).
 
-            bab_text = text[start_pos:end_pos]
+        Args:
+            text: Document text (Batang Tubuh = text[start:end])
+            bab_headings: Precomputed BAB headings in the range (optional)
+            tokens: Token stream of text (built if missing)
+            start: Batang Tubuh start
+            end: Batang Tubuh end (None = end of text)
 
-            # Parse Bagian within this BAB
-            bagian_list = self._parse_bagian(bab_text)
+        Returns:
+            List of BAB dictionaries with their structure
+        """
+        bab_list = []
+        if tokens is None:
+            tokens = tokenize(text)
+        end = len(text) if end is None else end
+        if bab_headings is None:
+            bab_headings = match_headings(text, tokens, BAB, start, end)
 
-            # Parse Pasal within this BAB
-            pasal_list = self._parse_pasal_in_section(bab_text)
+        for i, bab in enumerate(bab_headings):
+            # Find end of this BAB (start of next BAB or end of Batang Tubuh)
+            start_pos = bab.end
+            end_pos = bab_headings[i + 1].start if i + 1 < len(bab_headings) else end
 
             bab_dict = {
-                "number": bab_num,
-                "title": bab_title,
-                "text": bab_text,
-                "bagian": bagian_list,
-                "pasal": pasal_list,
+                "number": bab.number,
+                "title": bab.title,
+                "text": text[start_pos:end_pos],
+                # Bagian and Pasal within this BAB
+                "bagian": self._parse_bagian(text, tokens, start_pos, end_pos),
+                "pasal": self._parse_pasal_in_section(text, tokens, start_pos, end_pos),
             }
 
             bab_list.append(bab_dict)
 
         return bab_list
 
-    def _parse_bagian(self, text: str) -> list[dict[str, Any]]:
+    def _parse_bagian(
+        self,
+        text: str,
+        tokens: LegalTokens | None = None,
+        start: int = 0,
+        end: int | None = None,
+    ) -> list[dict[str, Any]]:
         """
         Parse Bagian (Parts) within a BAB.
 
         Args:
-            text: Text section (BAB or standalone)
+            text: Document text (section = text[start:end])
+            tokens: Token stream of text (built if missing)
+            start: Section start
+            end: Section end (None = end of text)
 
         Returns:
             List of Bagian dictionaries
         """
         bagian_list = []
-        bagian_matches = list(BAGIAN_PATTERN.finditer(text))
-
-        for i, bagian_match in enumerate(bagian_matches):
-            bagian_num = bagian_match.group(1)
-            bagian_title = bagian_match.group(2).strip()
-
-            start_pos = bagian_match.end()
-            end_pos = bagian_matches[i + 1].start() if i + 1 < len(bagian_matches) else len(text)
-
-            bagian_text = text[start_pos:end_pos]
+        if tokens is None:
+            tokens = tokenize(text)
+        end = len(text) if end is None else end
+        bagian_headings = match_headings(text, tokens, BAGIAN, start, end)
 
-            # Parse Paragraf within this Bagian
-            paragraf_list = self._parse_paragraf(bagian_text)
+        for i, bagian in enumerate(bagian_headings):
+            start_pos = bagian.end
+            end_pos = bagian_headings[i + 1].start if i + 1 < len(bagian_headings) else end
 
             bagian_dict = {
-                "number": bagian_num,
-                "title": bagian_title,
-                "text": bagian_text,
-                "paragraf": paragraf_list,
+                "number": bagian.number,
+                "title": bagian.title,
+                "text": text[start_pos:end_pos],
+                # Paragraf within this Bagian
+                "paragraf": self._parse_paragraf(text, tokens, start_pos, end_pos),
             }
 
             bagian_list.append(bagian_dict)
 
         return bagian_list
 
-    def _parse_paragraf(self, text: str) -> list[dict[str, Any]]:
+    def _parse_paragraf(
+        self,
+        text: str,
+        tokens: LegalTokens | None = None,
+        start: int = 0,
+        end: int | None = None,
+    ) -> list[dict[str, Any]]:
         """
         Parse Paragraf (Paragraphs) within a Bagian.
 
         Args:
-            text: Text section
+            text: Document text (section = text[start:end])
+            tokens: Token stream of text (built if missing)
+            start: Section start
+            end: Section end (None = end of text)
 
         Returns:
             List of Paragraf dictionaries
         """
         paragraf_list = []
-        paragraf_matches = list(PARAGRAF_PATTERN.finditer(text))
-
-        for i, paragraf_match in enumerate(paragraf_matches):
-            paragraf_num = paragraf_match.group(1)
-            paragraf_title = paragraf_match.group(2).strip()
-
-            start_pos = paragraf_match.end()
-            end_pos = (
-                paragraf_matches[i + 1].start() if i + 1 < len(paragraf_matches) else len(text)
-            )
+        if tokens is None:
+            tokens = tokenize(text)
+        end = len(text) if end is None else end
+        paragraf_headings = match_headings(text, tokens, PARAGRAF, start, end)
 
-            paragraf_text = text[start_pos:end_pos]
+        for i, paragraf in enumerate(paragraf_headings):
+            start_pos = paragraf.end
+            end_pos = paragraf_headings[i + 1].start if i + 1 < len(paragraf_headings) else end
 
             paragraf_dict = {
-                "number": paragraf_num,
-                "title": paragraf_title,
-                "text": paragraf_text,
+                "number": paragraf.number,
+                "title": paragraf.title,
+                "text": text[start_pos:end_pos],
             }
 
             paragraf_list.append(paragraf_dict)
 
         return paragraf_list
 
-    def _parse_pasal_in_section(self, text: str) -> list[dict[str, Any]]:
+    def _parse_pasal_in_section(
+        self,
+        text: str,
+        tokens: LegalTokens | None = None,
+        start: int = 0,
+        end: int | None = None,
+    ) -> list[dict[str, Any]]:
         """
         Parse Pasal (Articles) within a section.
 
         Args:
-            text: Text section
+            text: Document text (section = text[start:end])
+            tokens: Token stream of text (built if missing)
+            start: Section start
+            end: Section end (None = end of text)
 
         Returns:
             List of Pasal dictionaries with Ayat
         """
         pasal_list = []
-        pasal_matches = list(PASAL_PATTERN.finditer(text))
+        if tokens is None:
+            tokens = tokenize(text)
 
-        for pasal_match in pasal_matches:
-            pasal_num = pasal_match.group(1)
-            pasal_text = pasal_match.group(2).strip()
-
-            # Parse Ayat within this Pasal
-            ayat_list = self._parse_ayat(pasal_text)
+        for span in pasal_spans(text, tokens, start, end):
+            pasal_text = text[span.body_start : span.end].strip()
 
             pasal_dict = {
-                "number": pasal_num,
+                "number": span.number,
                 "text": pasal_text,
-                "ayat": ayat_list,
+                # Parse Ayat within this Pasal
+                "ayat": self._parse_ayat(pasal_text),
             }
 
             pasal_list.append(pasal_dict)
@@ -321,34 +427,44 @@ class LegalStructureParser:
 
         return ayat_list
 
-    def _extract_pasal_list(self, text: str) -> list[dict[str, Any]]:
+    def _extract_pasal_list(
+        self,
+        text: str,
+        index: dict[str, Any] | None = None,
+        offset: int = 0,
+        tokens: LegalTokens | None = None,
+        start: int = 0,
+        end: int | None = None,
+    ) -> list[dict[str, Any]]:
         """
         Extract all Pasal from document with full context.
 
         Args:
             text: Document text
+            index: Structure index (built from text[start:end] if missing)
+            offset: Position of text within the text the index was built for
+            tokens: Token stream of text (built if missing)
+            start: Range start
+            end: Range end (None = end of text)
 
         Returns:
             List of Pasal with their hierarchical context
         """
         pasal_list = []
-        pasal_matches = list(PASAL_PATTERN.finditer(text))
-
-        for pasal_match in pasal_matches:
-            pasal_num = pasal_match.group(1)
-            pasal_text = pasal_match.group(2).strip()
-
-            # Find which BAB this Pasal belongs to
-            bab_context = self._find_bab_context(text, pasal_match.start())
+        if tokens is None:
+            tokens = tokenize(text)
+        if index is None:
+            index = self._build_index([], match_headings(text, tokens, BAB, start, end))
 
-            # Parse Ayat
-            ayat_list = self._parse_ayat(pasal_text)
+        for span in pasal_spans(text, tokens, start, end):
+            pasal_text = text[span.body_start : span.end].strip()
 
             pasal_dict = {
-                "number": pasal_num,
+                "number": span.number,
                 "text": pasal_text,
-                "ayat": ayat_list,
-                "bab_context": bab_context,
+                "ayat": self._parse_ayat(pasal_text),
+                # Find which BAB this Pasal belongs to
+                "bab_context": find_bab_at(index, offset + span.start),
             }
 
             pasal_list.append(pasal_dict)
@@ -359,6 +475,9 @@ class LegalStructureParser:
         """
         Find which BAB a position belongs to.
 
+        Tokenizes text on every call; use find_bab_at() with a structure index
+        for repeated lookups.
+
         Args:
             text: Document text
             position: Character position
@@ -366,10 +485,5 @@ class LegalStructureParser:
         Returns:
             BAB number/title or None
         """
-        bab_matches = list(BAB_PATTERN.finditer(text))
-
-        for bab_match in reversed(bab_matches):
-            if bab_match.start() < position:
-                return f"BAB {bab_match.group(1)} - {bab_match.group(2).strip()}"
-
-        return None
+        headings = match_headings(text, tokenize(text), BAB)
+        return find_bab_at(self._build_index([], headings), position)
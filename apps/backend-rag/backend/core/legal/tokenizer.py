@@ -0,0 +1,281 @@
+"""
+Legal Document Tokenizer - Stage 0: The Scanner
+Single-pass lexer for the structural markers of Indonesian legal documents
+
+One scan of the cleaned text yields every structural marker (KONSIDERANS, BAB,
+Bagian, Paragraf, Pasal, Ayat, PENJELASAN) with its character offsets. The
+extractor, parser and chunker then work on offset ranges of the same string
+(regex pos/endpos, one slice per emitted section) instead of re-scanning the
+document and slicing intermediate copies at every level.
+"""
+
+import logging
+import re
+from bisect import bisect_left
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from .constants import (
+    BAB_PATTERN,
+    BAGIAN_PATTERN,
+    PARAGRAF_PATTERN,
+    PASAL_PATTERN,
+    PENJELASAN_PATTERN,
+)
+
+logger = logging.getLogger(__name__)
+
+# Token kinds
+KONSIDERANS = "KONSIDERANS"
+MEMUTUSKAN = "MEMUTUSKAN"
+BAB = "BAB"
+BAGIAN = "BAGIAN"
+PARAGRAF = "PARAGRAF"
+PASAL = "PASAL"
+AYAT = "AYAT"
+PENJELASAN = "PENJELASAN"
+
+# Every marker sits at a line start and only its keyword is consumed, so no line
+# start (and no marker) is ever skipped by the scan
+_MARKER_PATTERN = re.compile(
+    r"^(?:(?P<KONSIDERANS>Menimbang|Mengingat)"
+    r"|(?P<MEMUTUSKAN>MEMUTUSKAN:)"
+    r"|(?P<BAB>BAB)(?=\s)"
+    r"|(?P<BAGIAN>Bagian)(?=\s)"
+    r"|(?P<PARAGRAF>Paragraf)(?=\s)"
+    r"|(?P<PASAL>Pasal)(?=\s)"
+    r"|(?P<PENJELASAN>Penjelasan)"
+    r"|[ \t]*\((?P<AYAT>\d+)\))",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Heading patterns anchored at a marker (number and title)
+_HEADING_PATTERNS = {
+    BAB: BAB_PATTERN,
+    BAGIAN: BAGIAN_PATTERN,
+    PARAGRAF: PARAGRAF_PATTERN,
+}
+_PASAL_HEADING = re.compile(r"Pasal\s+(\d+[A-Z]?)\s*", re.IGNORECASE)
+
+# What ends a Pasal body (the lookahead of PASAL_PATTERN)
+_PASAL_BOUNDARY_KINDS = frozenset({PASAL, BAB, PENJELASAN})
+_PASAL_BOUNDARY = re.compile(r"Pasal\s+\d|BAB\s|Penjelasan", re.IGNORECASE)
+
+
+class LegalToken(NamedTuple):
+    """A structural marker of a legal document"""
+
+    kind: str
+    start: int  # Offset of the marker (line start)
+    end: int  # End of the heading (or of the keyword if it is not a full heading)
+    number: str | None = None  # BAB/Bagian/Paragraf/Pasal/Ayat number
+    title: str | None = None  # Heading title, Konsiderans keyword, Penjelasan heading
+
+
+class PasalSpan(NamedTuple):
+    """A Pasal as matched by PASAL_PATTERN: heading at start, body from body_start to end"""
+
+    start: int
+    end: int
+    number: str
+    body_start: int
+
+
+class LegalTokens:
+    """Token stream of a document, with range queries by kind"""
+
+    def __init__(self, tokens: list[LegalToken]):
+        self.tokens = tokens
+        self._by_kind: dict[str, list[LegalToken]] = {}
+        for token in tokens:
+            self._by_kind.setdefault(token.kind, []).append(token)
+        self._starts = {
+            kind: [token.start for token in kind_tokens]
+            for kind, kind_tokens in self._by_kind.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __iter__(self) -> Iterator[LegalToken]:
+        return iter(self.tokens)
+
+    def of_kind(self, kind: str, start: int = 0, end: int | None = None) -> list[LegalToken]:
+        """
+        Tokens of one kind starting in [start, end).
+
+        Args:
+            kind: Token kind (BAB, PASAL, ...)
+            start: First offset
+            end: Offset past the range (None = end of document)
+
+        Returns:
+            Tokens in document order
+        """
+        kind_tokens = self._by_kind.get(kind, [])
+        starts = self._starts.get(kind, [])
+        lo = bisect_left(starts, start)
+        hi = len(starts) if end is None else bisect_left(starts, end, lo)
+        return kind_tokens[lo:hi]
+
+    def first(self, kind: str, start: int = 0, end: int | None = None) -> LegalToken | None:
+        """First token of a kind starting in [start, end), or None"""
+        starts = self._starts.get(kind, [])
+        i = bisect_left(starts, start)
+        if i < len(starts) and (end is None or starts[i] < end):
+            return self._by_kind[kind][i]
+        return None
+
+
+def tokenize(text: str) -> LegalTokens:
+    """
+    Scan a document once for its structural markers.
+
+    Args:
+        text: Cleaned legal document text
+
+    Returns:
+        LegalTokens with absolute offsets into text
+    """
+    tokens = []
+    for match in _MARKER_PATTERN.finditer(text):
+        kind = match.lastgroup
+        start = match.start()
+        number = title = None
+        end = match.end()
+
+        if kind in _HEADING_PATTERNS:
+            heading = _HEADING_PATTERNS[kind].match(text, start)
+            if heading:
+                number, title, end = heading.group(1), heading.group(2).strip(), heading.end()
+        elif kind == PASAL:
+            heading = _PASAL_HEADING.match(text, start)
+            if heading:
+                number, end = heading.group(1), heading.end(1)
+        elif kind == PENJELASAN:
+            heading = PENJELASAN_PATTERN.match(text, start)
+            if heading:
+                title, end = heading.group(0), heading.end()
+        elif kind == AYAT:
+            number = match.group(AYAT)
+        else:
+            title = match.group(kind)
+
+        tokens.append(LegalToken(kind, start, end, number, title))
+
+    return LegalTokens(tokens)
+
+
+def match_headings(
+    text: str, tokens: LegalTokens, kind: str, start: int = 0, end: int | None = None
+) -> list[LegalToken]:
+    """
+    BAB/Bagian/Paragraf headings in text[start:end], without slicing it.
+
+    Same headings as finditer() of the kind's pattern over the slice: overlapping
+    headings are dropped and a heading cut by the range end is re-matched.
+
+    Args:
+        text: Document text the tokens were built from
+        tokens: Token stream of text
+        kind: BAB, BAGIAN or PARAGRAF
+        start: Range start (a line start, or the end of a heading line)
+        end: Range end (None = end of document)
+
+    Returns:
+        Heading tokens in document order
+    """
+    end = len(text) if end is None else end
+    headings = []
+    last_end = start
+    for token in tokens.of_kind(kind, start, end):
+        if token.number is None or token.start < last_end:
+            continue
+        if token.end > end:
+            heading = _HEADING_PATTERNS[kind].match(text, token.start, end)
+            if not heading:
+                continue
+            token = LegalToken(
+                kind, token.start, heading.end(), heading.group(1), heading.group(2).strip()
+            )
+        headings.append(token)
+        last_end = token.end
+    return headings
+
+
+def pasal_spans(
+    text: str, tokens: LegalTokens, start: int = 0, end: int | None = None
+) -> list[PasalSpan]:
+    """
+    Pasal in text[start:end], exactly as PASAL_PATTERN.finditer() over the slice.
+
+    A Pasal body runs to the next Pasal heading, BAB or Penjelasan marker, which
+    are looked up in the token stream instead of being searched for character by
+    character.
+
+    Args:
+        text: Document text the tokens were built from
+        tokens: Token stream of text
+        start: Range start (a line start, or the end of a heading line)
+        end: Range end (None = end of document)
+
+    Returns:
+        PasalSpan list in document order
+    """
+    end = len(text) if end is None else end
+    boundary_starts = sorted(
+        token.start for kind in _PASAL_BOUNDARY_KINDS for token in tokens.of_kind(kind, start, end)
+    )
+
+    spans = []
+    last_end = start
+    for token in tokens.of_kind(PASAL, start, end):
+        if token.number is None or token.start < last_end:
+            continue
+        heading = _PASAL_HEADING.match(text, token.start, end)
+        if not heading:
+            continue
+
+        body_start = heading.end()
+        if body_start >= end:
+            # Nothing after the heading: let the pattern backtrack into it
+            match = PASAL_PATTERN.match(text, token.start, end)
+            if not match:
+                continue
+            span = PasalSpan(token.start, match.end(), match.group(1), match.start(2))
+        else:
+            body_end = end
+            for i in range(bisect_left(boundary_starts, body_start + 1), len(boundary_starts)):
+                if _PASAL_BOUNDARY.match(text, boundary_starts[i], end):
+                    body_end = boundary_starts[i]
+                    break
+            span = PasalSpan(token.start, body_end, heading.group(1), body_start)
+
+        spans.append(span)
+        last_end = span.end
+    return spans
+
+
+class LegalTokenizer:
+    """
+    Single-pass lexer for Indonesian legal documents.
+    Emits KONSIDERANS, MEMUTUSKAN, BAB, BAGIAN, PARAGRAF, PASAL, AYAT and PENJELASAN tokens.
+    """
+
+    def __init__(self):
+        """Initialize the legal tokenizer"""
+        logger.info("LegalTokenizer initialized")
+
+    def tokenize(self, text: str) -> LegalTokens:
+        """
+        Tokenize a cleaned legal document.
+
+        Args:
+            text: Cleaned legal document text
+
+        Returns:
+            LegalTokens (pass to extract/parse/chunk as tokens=)
+        """
+        tokens = tokenize(text or "")
+        logger.debug(f"Tokenized legal document: {len(tokens)} structural tokens")
+        return tokens
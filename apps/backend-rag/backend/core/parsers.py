@@ -1,10 +1,21 @@
 """
 ZANTARA RAG - Document Parsers
 Extract text from PDF and EPUB files
+
+Large PDFs are split into page ranges extracted in parallel by a shared process
+pool. Extracted pages can be cached on disk by file hash
+(settings.parser_cache_dir), so re-ingesting an unchanged file skips parsing.
 """
 
+import hashlib
+import json
 import logging
+import multiprocessing
 import os
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 try:
@@ -16,8 +27,24 @@ import ebooklib
 from bs4 import BeautifulSoup
 from ebooklib import epub
 
+try:
+    from app.config import settings
+except ImportError:
+    settings = None
+
 logger = logging.getLogger(__name__)
 
+# Parallel PDF extraction defaults (overridable via settings.pdf_extract_*)
+PDF_EXTRACT_WORKERS = 4
+PDF_EXTRACT_PAGES_PER_TASK = 16
+PDF_EXTRACT_MIN_PAGES = 48  # Smaller PDFs are extracted in-process
+
+EXTRACTION_CACHE_VERSION = 1  # Bump when extraction output changes
+
+# Shared by all extractions of this process, so concurrent uploads share its workers
+_pdf_pool: ProcessPoolExecutor | None = None
+_pdf_pool_lock = threading.Lock()
+
 
 class DocumentParseError(Exception):
     """Custom exception for document parsing errors"""
@@ -25,6 +52,205 @@ class DocumentParseError(Exception):
     pass
 
 
+def _pdf_setting(name: str, default: int) -> int:
+    """Read an integer pdf_extract_* setting, falling back to the module default"""
+    value = getattr(settings, f"pdf_extract_{name}", None) if settings else None
+    return value if isinstance(value, int) and not isinstance(value, bool) else default
+
+
+class ExtractionCache:
+    """
+    On-disk cache of extracted PDF pages, keyed by the SHA-256 of the file.
+
+    Same bytes under any path hit the same entry. Entries are written with
+    write-then-rename, so concurrent workers never read a partial file.
+    """
+
+    def __init__(self, cache_dir: str | Path):
+        """
+        Args:
+            cache_dir: Directory holding the cache entries (created if missing)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def file_hash(file_path: str) -> str:
+        """SHA-256 hex digest of a file's content"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.v{EXTRACTION_CACHE_VERSION}.json"
+
+    def get(self, key: str) -> list[tuple[int, str]] | None:
+        """Cached (page_number, text) list for a file hash, or None"""
+        path = self._path(key)
+        try:
+            if not path.exists():
+                return None
+            return [(number, text) for number, text in json.loads(path.read_text("utf-8"))]
+        except Exception as e:
+            logger.warning(f"⚠️ Extraction cache read failed for {key[:12]}: {e}")
+            return None
+
+    def set(self, key: str, pages: list[tuple[int, str]]):
+        """Store the pages of a file hash (failures are logged, not raised)"""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(pages, ensure_ascii=False), "utf-8")
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.warning(f"⚠️ Extraction cache write failed for {key[:12]}: {e}")
+
+
+def get_extraction_cache() -> ExtractionCache | None:
+    """The configured extraction cache (None if settings.parser_cache_dir is unset)"""
+    cache_dir = getattr(settings, "parser_cache_dir", None) if settings else None
+    if not isinstance(cache_dir, str) or not cache_dir:
+        return None
+    try:
+        return ExtractionCache(cache_dir)
+    except Exception as e:
+        logger.warning(f"⚠️ Extraction cache unavailable at {cache_dir}: {e}")
+        return None
+
+
+def _extract_pages(reader, start: int, stop: int) -> list[tuple[int, str]]:
+    """Extract pages [start, stop) of an open PDF ("" for unreadable pages)"""
+    pages = []
+    for index in range(start, stop):
+        try:
+            text = reader.pages[index].extract_text() or ""
+        except Exception as e:
+            logger.warning(f"Error extracting page {index + 1}: {e}")
+            text = ""
+        pages.append((index + 1, text))
+    return pages
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> list[tuple[int, str]]:
+    """Extract pages [start, stop) of a PDF file (runs in a worker process)"""
+    return _extract_pages(PdfReader(file_path), start, stop)
+
+
+def _extract_pages_lazily(reader, page_count: int) -> Iterator[tuple[int, str]]:
+    """In-process extraction, one page at a time"""
+    for index in range(page_count):
+        yield from _extract_pages(reader, index, index + 1)
+
+
+def _get_pdf_pool(workers: int) -> ProcessPoolExecutor:
+    """Shared extraction pool (sized by the first caller)"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"🧵 PDF extraction pool started ({workers} processes)")
+        return _pdf_pool
+
+
+def _reset_pdf_pool():
+    """Drop a broken extraction pool (the next large PDF starts a new one)"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        pool, _pdf_pool = _pdf_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_pages_parallel(
+    file_path: str, page_count: int, workers: int, pages_per_task: int
+) -> Iterator[tuple[int, str]]:
+    """Extract page ranges in the process pool, yielding them in page order"""
+    ranges = [
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+    next_page = 0
+    futures = []
+    try:
+        pool = _get_pdf_pool(workers)
+        futures = [
+            pool.submit(_extract_page_range, file_path, start, stop) for start, stop in ranges
+        ]
+        for (_, stop), future in zip(ranges, futures, strict=True):
+            yield from future.result()
+            next_page = stop
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning(f"⚠️ PDF extraction pool failed, continuing in-process: {e}")
+        _reset_pdf_pool()
+        yield from _extract_pages(PdfReader(file_path), next_page, page_count)
+    finally:
+        # Consumer stopped early (or a range failed): drop ranges not yet started
+        for future in futures:
+            future.cancel()
+
+
+def iter_pdf_pages(
+    file_path: str,
+    workers: int | None = None,
+    pages_per_task: int | None = None,
+    use_cache: bool = True,
+) -> Iterator[tuple[int, str]]:
+    """
+    Yield the text of every page of a PDF, in page order, as soon as it is extracted.
+
+    PDFs with at least settings.pdf_extract_min_pages pages are split into page
+    ranges extracted by a shared process pool. Smaller PDFs, and calls from a
+    worker process (e.g. the batch ingestion pool), are extracted in-process.
+
+    Args:
+        file_path: Path to PDF file
+        workers: Extraction processes (default settings.pdf_extract_workers; <= 1 = in-process)
+        pages_per_task: Pages per pool task (default settings.pdf_extract_pages_per_task)
+        use_cache: Read/write the extraction cache (if configured)
+
+    Yields:
+        (page_number, text) tuples, 1-based; text is "" for empty or unreadable pages
+    """
+    cache = get_extraction_cache() if use_cache else None
+    key = ExtractionCache.file_hash(file_path) if cache else None
+    if cache:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"📦 Extraction cache hit: {file_path} ({len(cached)} pages)")
+            yield from cached
+            return
+
+    workers = _pdf_setting("workers", PDF_EXTRACT_WORKERS) if workers is None else workers
+    pages_per_task = max(
+        1, pages_per_task or _pdf_setting("pages_per_task", PDF_EXTRACT_PAGES_PER_TASK)
+    )
+
+    reader = PdfReader(file_path)
+    page_count = len(reader.pages)
+    if (
+        workers <= 1
+        or page_count < _pdf_setting("min_pages", PDF_EXTRACT_MIN_PAGES)
+        or multiprocessing.parent_process() is not None
+    ):
+        pages = _extract_pages_lazily(reader, page_count)
+    else:
+        logger.info(f"Extracting {page_count} PDF pages with {workers} processes")
+        pages = _iter_pages_parallel(file_path, page_count, workers, pages_per_task)
+
+    extracted = []
+    for page in pages:
+        extracted.append(page)
+        yield page
+
+    if cache:
+        cache.set(key, extracted)
+
+
 def extract_text_from_pdf(file_path: str) -> str:
     """
     Extract text content from PDF file.
@@ -41,18 +267,7 @@ def extract_text_from_pdf(file_path: str) -> str:
     try:
         logger.info(f"Parsing PDF: {file_path}")
 
-        reader = PdfReader(file_path)
-        text_parts = []
-
-        for page_num, page in enumerate(reader.pages, 1):
-            try:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-            except Exception as e:
-                logger.warning(f"Error extracting page {page_num}: {e}")
-                continue
-
+        text_parts = [text for _, text in iter_pdf_pages(file_path) if text]
         full_text = "\n\n".join(text_parts)
 
         if not full_text.strip():
@@ -3,9 +3,15 @@ ZANTARA RAG - Vector Database (Qdrant)
 Qdrant client wrapper for embeddings storage and retrieval
 """
 
+import asyncio
 import logging
+import time
+import uuid
+from collections.abc import Iterable
+from concurrent import futures
 from typing import Any
 
+import httpx
 import requests
 
 try:
@@ -15,6 +21,66 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Shared async HTTP pool for all QdrantClient instances (keep-alive across requests)
+_async_http_client: httpx.AsyncClient | None = None
+_async_http_loop: asyncio.AbstractEventLoop | None = None
+
+ASYNC_POOL_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
+)
+ASYNC_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# Bulk upsert defaults (overridable via settings.qdrant_upsert_*)
+UPSERT_BATCH_SIZE = 256
+UPSERT_MAX_IN_FLIGHT = 4
+UPSERT_MAX_RETRIES = 3
+UPSERT_RETRY_BACKOFF = 0.5  # seconds, doubled on every retry
+UPSERT_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def _upsert_setting(name: str, default: int) -> int:
+    """Read an integer qdrant_upsert_* setting, falling back to the module default"""
+    value = getattr(settings, f"qdrant_upsert_{name}", None) if settings else None
+    return value if isinstance(value, int) and not isinstance(value, bool) else default
+
+
+def _empty_search_result() -> dict[str, Any]:
+    """Fresh empty search result (new lists each call so callers can mutate safely)"""
+    return {"ids": [], "documents": [], "metadatas": [], "distances": [], "total_found": 0}
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide pooled AsyncClient used for Qdrant REST calls.
+
+    Created lazily on first use and re-created if the previous client was closed
+    or belongs to a different event loop (e.g. between test runs).
+    """
+    global _async_http_client, _async_http_loop
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if _async_http_client is None or _async_http_client.is_closed or _async_http_loop is not loop:
+        _async_http_client = httpx.AsyncClient(limits=ASYNC_POOL_LIMITS, timeout=ASYNC_TIMEOUT)
+        _async_http_loop = loop
+        logger.info("🔌 Qdrant async HTTP pool created")
+
+    return _async_http_client
+
+
+async def close_async_http_client() -> None:
+    """Close the shared Qdrant AsyncClient (call on application shutdown)"""
+    global _async_http_client, _async_http_loop
+
+    if _async_http_client is not None and not _async_http_client.is_closed:
+        await _async_http_client.aclose()
+        logger.info("✅ Qdrant async HTTP pool closed")
+    _async_http_client = None
+    _async_http_loop = None
+
 
 class QdrantClient:
     """
@@ -110,12 +176,39 @@ class QdrantClient:
 
         return result if result else None
 
+    def _build_search_payload(
+        self, query_embedding: list[float], filter: dict[str, Any] | None, limit: int
+    ) -> dict[str, Any]:
+        """Build the JSON body for a single Qdrant points search"""
+        payload = {"vector": query_embedding, "limit": limit, "with_payload": True}
+
+        # Add filter if provided (Qdrant filter format)
+        if filter:
+            qdrant_filter = self._convert_filter_to_qdrant_format(filter)
+            if qdrant_filter:
+                payload["filter"] = qdrant_filter
+
+        return payload
+
+    @staticmethod
+    def _format_search_results(results: list[dict[str, Any]]) -> dict[str, Any]:
+        """Transform raw Qdrant scored points into the search result format"""
+        return {
+            "ids": [str(r["id"]) for r in results],
+            "documents": [r["payload"].get("text", "") for r in results],
+            "metadatas": [r["payload"].get("metadata", {}) for r in results],
+            "distances": [1.0 - r["score"] for r in results],  # Convert similarity to distance
+            "total_found": len(results),
+        }
+
     def search(
         self, query_embedding: list[float], filter: dict[str, Any] | None = None, limit: int = 5
     ) -> dict[str, Any]:
         """
         Search for similar documents.
 
+        Blocking call - from async code use async_search() instead.
+
         Args:
             query_embedding: Query embedding vector
             filter: Metadata filter (not implemented yet)
@@ -127,36 +220,18 @@ class QdrantClient:
         try:
             url = f"{self.qdrant_url}/collections/{self.collection_name}/points/search"
 
-            payload = {"vector": query_embedding, "limit": limit, "with_payload": True}
-
-            # Add filter if provided (Qdrant filter format)
-            if filter:
-                qdrant_filter = self._convert_filter_to_qdrant_format(filter)
-                if qdrant_filter:
-                    payload["filter"] = qdrant_filter
+            payload = self._build_search_payload(query_embedding, filter, limit)
 
             response = requests.post(url, json=payload, headers=self._get_headers(), timeout=30)
 
             if response.status_code != 200:
                 logger.error(f"Qdrant search failed: {response.status_code} - {response.text}")
-                return {
-                    "ids": [],
-                    "documents": [],
-                    "metadatas": [],
-                    "distances": [],
-                    "total_found": 0,
-                }
+                return _empty_search_result()
 
             results = response.json().get("result", [])
 
             # Transform Qdrant results to Qdrant-compatible format
-            formatted_results = {
-                "ids": [str(r["id"]) for r in results],
-                "documents": [r["payload"].get("text", "") for r in results],
-                "metadatas": [r["payload"].get("metadata", {}) for r in results],
-                "distances": [1.0 - r["score"] for r in results],  # Convert similarity to distance
-                "total_found": len(results),
-            }
+            formatted_results = self._format_search_results(results)
 
             logger.info(
                 f"Qdrant search: collection={self.collection_name}, found {len(results)} results"
@@ -165,7 +240,103 @@ class QdrantClient:
 
         except Exception as e:
             logger.error(f"Qdrant search error: {e}")
-            return {"ids": [], "documents": [], "metadatas": [], "distances": [], "total_found": 0}
+            return _empty_search_result()
+
+    async def async_search(
+        self, query_embedding: list[float], filter: dict[str, Any] | None = None, limit: int = 5
+    ) -> dict[str, Any]:
+        """
+        Non-blocking search over the shared keep-alive connection pool.
+
+        Same arguments and return format as search().
+        """
+        try:
+            url = f"{self.qdrant_url}/collections/{self.collection_name}/points/search"
+
+            payload = self._build_search_payload(query_embedding, filter, limit)
+
+            client = get_async_http_client()
+            response = await client.post(url, json=payload, headers=self._get_headers())
+
+            if response.status_code != 200:
+                logger.error(f"Qdrant search failed: {response.status_code} - {response.text}")
+                return _empty_search_result()
+
+            results = response.json().get("result", [])
+            formatted_results = self._format_search_results(results)
+
+            logger.info(
+                f"Qdrant async search: collection={self.collection_name}, found {len(results)} results"
+            )
+            return formatted_results
+
+        except Exception as e:
+            logger.error(f"Qdrant async search error: {e}")
+            return _empty_search_result()
+
+    async def search_batch(
+        self,
+        query_embeddings: list[list[float]],
+        filters: list[dict[str, Any] | None] | None = None,
+        limit: int | list[int] = 5,
+    ) -> list[dict[str, Any]]:
+        """
+        Run several searches against this collection in one round trip.
+
+        Uses Qdrant's /points/search/batch endpoint.
+
+        Args:
+            query_embeddings: One embedding vector per search
+            filters: Optional metadata filter per search (same length as query_embeddings)
+            limit: Max results, either shared or one per search
+
+        Returns:
+            List of search results (same format as search()), one per query embedding
+        """
+        if not query_embeddings:
+            return []
+
+        filters = filters or [None] * len(query_embeddings)
+        limits = limit if isinstance(limit, list) else [limit] * len(query_embeddings)
+
+        try:
+            url = f"{self.qdrant_url}/collections/{self.collection_name}/points/search/batch"
+
+            searches = [
+                self._build_search_payload(embedding, search_filter, search_limit)
+                for embedding, search_filter, search_limit in zip(
+                    query_embeddings, filters, limits, strict=True
+                )
+            ]
+
+            client = get_async_http_client()
+            response = await client.post(
+                url, json={"searches": searches}, headers=self._get_headers()
+            )
+
+            if response.status_code != 200:
+                logger.error(
+                    f"Qdrant batch search failed: {response.status_code} - {response.text}"
+                )
+                return [_empty_search_result() for _ in query_embeddings]
+
+            batch_results = response.json().get("result", [])
+            if len(batch_results) != len(searches):
+                logger.error(
+                    f"Qdrant batch search returned {len(batch_results)} results "
+                    f"for {len(searches)} searches"
+                )
+                return [_empty_search_result() for _ in query_embeddings]
+
+            logger.info(
+                f"Qdrant batch search: collection={self.collection_name}, "
+                f"{len(searches)} searches in one request"
+            )
+            return [self._format_search_results(results) for results in batch_results]
+
+        except Exception as e:
+            logger.error(f"Qdrant batch search error: {e}")
+            return [_empty_search_result() for _ in query_embeddings]
 
     def get_collection_stats(self) -> dict[str, Any]:
         """
@@ -237,6 +408,88 @@ class QdrantClient:
             logger.error(f"Error creating collection: {e}")
             return False
 
+    def count(self, filter: dict[str, Any] | None = None) -> int:
+        """
+        Count points in the collection.
+
+        Args:
+            filter: Metadata filter (same format as search)
+
+        Returns:
+            Exact number of matching points (0 on error)
+        """
+        try:
+            url = f"{self.qdrant_url}/collections/{self.collection_name}/points/count"
+
+            payload: dict[str, Any] = {"exact": True}
+            if filter:
+                qdrant_filter = self._convert_filter_to_qdrant_format(filter)
+                if qdrant_filter:
+                    payload["filter"] = qdrant_filter
+
+            response = requests.post(url, json=payload, headers=self._get_headers(), timeout=30)
+
+            if response.status_code != 200:
+                logger.error(f"Qdrant count failed: {response.status_code} - {response.text}")
+                return 0
+
+            return response.json().get("result", {}).get("count", 0)
+
+        except Exception as e:
+            logger.error(f"Qdrant count error: {e}")
+            return 0
+
+    def scroll_points(
+        self,
+        filter: dict[str, Any] | None = None,
+        payload_fields: list[str] | None = None,
+        page_size: int = 1000,
+    ) -> list[dict[str, Any]]:
+        """
+        Fetch all points matching a filter (follows every scroll page).
+
+        Args:
+            filter: Metadata filter (same format as search)
+            payload_fields: Payload paths to return, e.g. ["metadata.content_hash"]
+                (None = IDs only)
+            page_size: Points fetched per scroll request
+
+        Returns:
+            List of {"id": str, "payload": dict}
+
+        Raises:
+            RuntimeError: If a scroll request fails (a partial list is never returned)
+        """
+        url = f"{self.qdrant_url}/collections/{self.collection_name}/points/scroll"
+        payload: dict[str, Any] = {
+            "limit": page_size,
+            "with_payload": {"include": payload_fields} if payload_fields else False,
+            "with_vector": False,
+        }
+        if filter:
+            qdrant_filter = self._convert_filter_to_qdrant_format(filter)
+            if qdrant_filter:
+                payload["filter"] = qdrant_filter
+
+        points: list[dict[str, Any]] = []
+        offset = None
+        while True:
+            body = payload if offset is None else {**payload, "offset": offset}
+            response = requests.post(url, json=body, headers=self._get_headers(), timeout=30)
+            if response.status_code != 200:
+                raise RuntimeError(
+                    f"Qdrant scroll failed: {response.status_code} - {response.text}"
+                )
+
+            result = response.json().get("result", {})
+            points.extend(
+                {"id": str(point["id"]), "payload": point.get("payload") or {}}
+                for point in result.get("points", [])
+            )
+            offset = result.get("next_page_offset")
+            if offset is None:
+                return points
+
     def upsert_documents(
         self,
         chunks: list[str],
@@ -253,16 +506,39 @@ class QdrantClient:
             metadatas: List of metadata dictionaries
             ids: Optional list of document IDs (auto-generated if not provided)
 
+        More than settings.qdrant_upsert_batch_size documents are sent through
+        upsert_points() in batches.
+
         Returns:
             Dictionary with operation results
+
+        Raises:
+            RuntimeError: If a batch still fails after its retries
         """
+        # Large documents: stream in batches instead of one giant request
+        if len(chunks) > _upsert_setting("batch_size", UPSERT_BATCH_SIZE):
+            ids = ids or [str(uuid.uuid4()) for _ in range(len(chunks))]
+            result = self.upsert_points(
+                (
+                    (point_id, vector, {"text": chunk, "metadata": metadata})
+                    for point_id, vector, chunk, metadata in zip(
+                        ids, embeddings, chunks, metadatas, strict=True
+                    )
+                )
+            )
+            # Callers rely on an exception, not on checking "success"
+            if not result["success"]:
+                raise RuntimeError(
+                    f"Qdrant upsert failed: {result['failed_batches']}/{result['batches']} "
+                    f"batches for collection '{self.collection_name}': {result['error']}"
+                )
+            return result
+
         try:
             url = f"{self.qdrant_url}/collections/{self.collection_name}/points"
 
             # Generate IDs if not provided
             if not ids:
-                import uuid
-
                 ids = [str(uuid.uuid4()) for _ in range(len(chunks))]
 
             # Build points array
@@ -302,6 +578,152 @@ class QdrantClient:
             logger.error(f"Error upserting to Qdrant: {e}")
             raise
 
+    def upsert_points(
+        self,
+        points: Iterable[tuple[str | int, Any, dict[str, Any]]],
+        batch_size: int | None = None,
+        max_in_flight: int | None = None,
+        wait: bool = True,
+        max_retries: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Stream points into the collection in fixed-size batches.
+
+        The iterator is consumed lazily: at most batch_size * max_in_flight points
+        are materialized at a time. Batches carry explicit IDs, so a failed batch
+        can be resent as-is (upserts are idempotent). With wait=False the
+        batches are acknowledged before indexing completes; the last batch is then
+        resent with wait=true as a barrier - Qdrant applies updates in order, so
+        when it returns every earlier batch is applied too.
+
+        Args:
+            points: Iterable of (id, vector, payload); vectors may be numpy arrays
+            batch_size: Points per request (default settings.qdrant_upsert_batch_size)
+            max_in_flight: Concurrent requests (default settings.qdrant_upsert_max_in_flight)
+            wait: Send every batch with wait=true (False = final barrier only)
+            max_retries: Retries per batch on network errors, 429 and 5xx
+
+        Returns:
+            Dictionary with success, documents_added, batches, failed_batches
+        """
+        batch_size = max(1, batch_size or _upsert_setting("batch_size", UPSERT_BATCH_SIZE))
+        max_in_flight = max(
+            1, max_in_flight or _upsert_setting("max_in_flight", UPSERT_MAX_IN_FLIGHT)
+        )
+        if max_retries is None:
+            max_retries = _upsert_setting("max_retries", UPSERT_MAX_RETRIES)
+
+        added = 0
+        batches = 0
+        errors: list[str] = []
+        last_batch: list[dict[str, Any]] | None = None
+        in_flight: dict[futures.Future, int] = {}
+
+        def collect(done: set[futures.Future]):
+            nonlocal added
+            for future in done:
+                size = in_flight.pop(future)
+                error = future.result()
+                if error:
+                    errors.append(error)
+                else:
+                    added += size
+
+        with futures.ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            batch: list[dict[str, Any]] = []
+            iterator = iter(points)
+            while True:
+                point = next(iterator, None)
+                if point is not None:
+                    point_id, vector, payload = point
+                    if hasattr(vector, "tolist"):
+                        vector = vector.tolist()
+                    batch.append({"id": point_id, "vector": vector, "payload": payload})
+                    if len(batch) < batch_size:
+                        continue
+                if not batch:
+                    break
+
+                # Backpressure: wait for a free slot before building more batches
+                if len(in_flight) >= max_in_flight:
+                    done, _ = futures.wait(in_flight, return_when=futures.FIRST_COMPLETED)
+                    collect(done)
+
+                future = executor.submit(self._put_points, batch, wait, max_retries)
+                in_flight[future] = len(batch)
+                batches += 1
+                last_batch, batch = batch, []
+                if point is None:
+                    break
+
+            collect(set(in_flight))
+
+        if not wait and last_batch and not errors:
+            error = self._put_points(last_batch, True, max_retries)
+            if error:
+                errors.append(f"consistency barrier: {error}")
+
+        if errors:
+            logger.error(
+                f"Qdrant bulk upsert: {len(errors)}/{batches} batches failed "
+                f"for collection '{self.collection_name}': {errors[0]}"
+            )
+        else:
+            logger.info(
+                f"Upserted {added} documents to Qdrant collection '{self.collection_name}' "
+                f"in {batches} batches"
+            )
+
+        result = {
+            "success": not errors,
+            "documents_added": added,
+            "batches": batches,
+            "failed_batches": len(errors),
+            "collection": self.collection_name,
+        }
+        if errors:
+            result["error"] = errors[0]
+        return result
+
+    def _put_points(
+        self, points: list[dict[str, Any]], wait_for_result: bool, max_retries: int
+    ) -> str | None:
+        """
+        PUT one batch of points, retrying transient failures.
+
+        Returns:
+            None on success, otherwise a description of the last error
+        """
+        url = f"{self.qdrant_url}/collections/{self.collection_name}/points"
+        params = {"wait": "true" if wait_for_result else "false"}
+        error = None
+
+        for attempt in range(max_retries + 1):
+            if attempt:
+                time.sleep(UPSERT_RETRY_BACKOFF * 2 ** (attempt - 1))
+            try:
+                response = requests.put(
+                    url,
+                    json={"points": points},
+                    headers=self._get_headers(),
+                    params=params,
+                    timeout=60,
+                )
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                logger.warning(f"⚠️ Qdrant upsert batch attempt {attempt + 1} failed: {error}")
+                continue
+
+            if response.status_code == 200:
+                return None
+            error = f"HTTP {response.status_code}"
+            if response.status_code not in UPSERT_RETRY_STATUS:
+                logger.error(f"Qdrant upsert batch rejected: {error} - {response.text}")
+                return error
+            logger.warning(f"⚠️ Qdrant upsert batch attempt {attempt + 1} failed: {error}")
+
+        return error
+
     @property
     def collection(self):
         """
@@ -399,6 +821,51 @@ class QdrantClient:
             logger.error(f"Error deleting from Qdrant: {e}")
             raise
 
+    def set_payloads(self, updates: list[tuple[str, dict[str, Any]]]) -> dict[str, Any]:
+        """
+        Overwrite payload keys of existing points, without touching their vectors.
+
+        All updates are sent as one batch request.
+
+        Args:
+            updates: List of (point ID, payload keys to set)
+
+        Returns:
+            Dictionary with operation results
+        """
+        if not updates:
+            return {"success": True, "updated_count": 0}
+        try:
+            url = f"{self.qdrant_url}/collections/{self.collection_name}/points/batch"
+
+            operations = [
+                {"set_payload": {"payload": payload, "points": [point_id]}}
+                for point_id, payload in updates
+            ]
+            response = requests.post(
+                url,
+                json={"operations": operations},
+                headers=self._get_headers(),
+                params={"wait": "true"},
+                timeout=60,
+            )
+
+            if response.status_code == 200:
+                logger.info(
+                    f"Updated payload of {len(updates)} points in Qdrant collection "
+                    f"'{self.collection_name}'"
+                )
+                return {"success": True, "updated_count": len(updates)}
+            else:
+                logger.error(
+                    f"Qdrant payload update failed: {response.status_code} - {response.text}"
+                )
+                return {"success": False, "error": f"HTTP {response.status_code}"}
+
+        except Exception as e:
+            logger.error(f"Error updating payload in Qdrant: {e}")
+            raise
+
     def peek(self, limit: int = 10) -> dict[str, Any]:
         """
         Peek at points in the collection (Qdrant-compatible interface).
@@ -11,6 +11,7 @@ from psycopg2 import sql
 from psycopg2.extras import Json, RealDictCursor
 
 from services.ai_crm_extractor import get_extractor
+from services.context.crm_context import invalidate_crm_context
 
 logger = logging.getLogger(__name__)
 
@@ -270,6 +271,8 @@ class AutoCRMService:
                 )
 
             conn.commit()
+            if client_updated or practice_created:
+                invalidate_crm_context(client_id=client_id)
 
             cursor.close()
             conn.close()
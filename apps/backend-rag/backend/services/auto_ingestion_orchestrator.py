@@ -25,17 +25,55 @@ Integration with bali-intel-scraper:
 - Uses same 2-tier filtering (LLAMA → ZANTARA AI)
 - Adds to Qdrant instead of just logging
 - LEGACY CODE CLEANED: Claude references removed
+
+Ingestion is batched: new items are grouped by target collection, embedded in
+batches and bulk-upserted under deterministic point IDs. The content IDs of
+ingested items are kept in a SeenContentStore, which is persisted to an
+append-only log (settings.auto_ingestion_seen_path) so that after a restart
+scheduled runs still skip - and never re-embed - items already in the knowledge base.
+
+Scheduled runs execute due sources concurrently under a global job cap, while a
+HostRateLimiter keeps requests to each government host serialized and spaced.
+The LLM relevance filter classifies several items per prompt, and each job
+reports its progress (status, counters, progress fraction) via get_job_status.
 """
 
+import asyncio
 import hashlib
 import logging
-from dataclasses import dataclass, field
+import re
+import threading
+import time
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from enum import Enum
+from pathlib import Path
 from typing import Any
+from urllib.parse import urlparse
+
+from core.cache import invalidate_collection
+from core.chunk_manifest import CONTENT_HASH_FIELD, content_hash, make_point_id
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Defaults (overridable via settings.auto_ingestion_*)
+EMBED_BATCH_SIZE = 64  # Scraped items per embedding call
+MAX_CONCURRENT_JOBS = 4  # Sources scraped/filtered/ingested at the same time
+HOST_MAX_CONCURRENT = 1  # In-flight scrapes per host
+HOST_MIN_INTERVAL_S = 2.0  # Minimum delay between scrapes of the same host
+FILTER_BATCH_SIZE = 10  # Items classified per LLM prompt
+
+# Progress fraction reached at the end of each job step
+SCRAPE_PROGRESS = 0.2
+FILTER_PROGRESS = 0.7
+
+# One verdict line of a batched filter answer: "3: YES - new regulation"
+_VERDICT_LINE = re.compile(r"^\W*(\d+)\s*[:.)\]-]\s*(YES|NO)\b(.*)$", re.IGNORECASE | re.MULTILINE)
+
 
 class SourceType(str, Enum):
     """Types of external sources"""
@@ -116,6 +154,133 @@ class IngestionJob:
     items_ingested: int = 0
     items_failed: int = 0
     error: str | None = None
+    progress: float = 0.0  # 0.0-1.0 across scrape, filter and ingest
+    updated_at: str | None = None
+
+
+class SeenContentStore:
+    """
+    Set of ingested content IDs, optionally persisted to an append-only log.
+
+    The log holds one content ID per line and is loaded into memory on start;
+    new IDs are appended as they are added, so the set survives restarts without
+    rewriting the file. A torn last line (crash mid-write) is simply ignored.
+    """
+
+    def __init__(self, path: str | None = None):
+        """
+        Args:
+            path: Log file (None = in-memory only)
+        """
+        self.path = Path(path) if path else None
+        self._ids: set[str] = set()
+        self._lock = threading.Lock()
+        self._torn_tail = False  # Log ends mid-line: start the next append on a new line
+
+        if self.path:
+            self._load()
+
+    def __contains__(self, content_id: object) -> bool:
+        return content_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, content_id: str):
+        """Mark one content ID as ingested"""
+        self.update([content_id])
+
+    def update(self, content_ids: Iterable[str]):
+        """
+        Mark content IDs as ingested and append the new ones to the log.
+
+        Args:
+            content_ids: Content IDs (already known IDs are ignored)
+        """
+        with self._lock:
+            new_ids = [cid for cid in dict.fromkeys(content_ids) if cid not in self._ids]
+            if not new_ids:
+                return
+            self._ids.update(new_ids)
+            if not self.path:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open("a", encoding="utf-8") as f:
+                    if self._torn_tail:
+                        f.write("\n")
+                    f.write("".join(f"{cid}\n" for cid in new_ids))
+                self._torn_tail = False
+            except OSError as e:
+                logger.warning(f"⚠️ Failed to persist seen content IDs: {e}")
+
+    def _load(self):
+        try:
+            if not self.path.exists():
+                return
+            with self.path.open(encoding="utf-8") as f:
+                data = f.read()
+        except OSError as e:
+            logger.warning(f"⚠️ Failed to load seen content IDs from {self.path}: {e}")
+            return
+
+        # Without a trailing newline the last line may be a torn write: drop it
+        lines = data.split("\n")
+        self._torn_tail = bool(lines[-1])
+        self._ids.update(line for line in lines[:-1] if line)
+        logger.info(f"📚 Loaded {len(self._ids)} seen content IDs from {self.path}")
+
+
+def _ingestion_setting(name: str, default: int | float) -> int | float:
+    """Read a numeric auto_ingestion_* setting, falling back to the module default"""
+    value = getattr(settings, f"auto_ingestion_{name}", None)
+    if isinstance(value, int | float) and not isinstance(value, bool) and value >= 0:
+        return value
+    return default
+
+
+class HostRateLimiter:
+    """
+    Per-host politeness for source scraping.
+
+    At most max_concurrent requests run against one host at a time, and
+    consecutive requests to a host start at least min_interval_s apart.
+    Different hosts never wait on each other.
+    """
+
+    def __init__(self, max_concurrent: int = 1, min_interval_s: float = 0.0):
+        """
+        Args:
+            max_concurrent: In-flight requests per host
+            min_interval_s: Minimum seconds between request starts on a host
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval_s = max(0.0, min_interval_s)
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._last_start: dict[str, float] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """Rate-limit key of a URL"""
+        return urlparse(url).netloc.lower() or url
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Hold a request slot for the host of url"""
+        host = self.host_of(url)
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.max_concurrent))
+        lock = self._locks.setdefault(host, asyncio.Lock())
+
+        async with semaphore:
+            async with lock:
+                last_start = self._last_start.get(host)
+                if last_start is not None:
+                    delay = last_start + self.min_interval_s - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                self._last_start[host] = time.monotonic()
+            yield
 
 
 class AutoIngestionOrchestrator:
@@ -169,7 +334,13 @@ class AutoIngestionOrchestrator:
         ),
     }
 
-    def __init__(self, search_service=None, claude_service=None, scraper_service=None):
+    def __init__(
+        self,
+        search_service=None,
+        claude_service=None,
+        scraper_service=None,
+        seen_store_path: str | None = None,
+    ):
         """
         Initialize Auto-Ingestion Orchestrator.
 
@@ -177,6 +348,7 @@ class AutoIngestionOrchestrator:
             search_service: SearchService for adding to collections
             claude_service: LEGACY - ZANTARA AI for filtering and extraction (renamed for compatibility)
             scraper_service: Optional scraper service (bali-intel-scraper)
+            seen_store_path: Dedup log path (default settings.auto_ingestion_seen_path)
         """
         self.search = search_service
         self.claude = claude_service  # LEGACY: Actually ZANTARA AI service
@@ -185,11 +357,19 @@ class AutoIngestionOrchestrator:
         # Storage
         self.sources: dict[str, MonitoredSource] = {}
         self.jobs: dict[str, IngestionJob] = {}
-        self.content_hashes: set = set()  # For deduplication
+        if seen_store_path is None:
+            seen_store_path = getattr(settings, "auto_ingestion_seen_path", None)
+        self.content_hashes = SeenContentStore(
+            seen_store_path if isinstance(seen_store_path, str) else None
+        )  # For deduplication (survives restarts when persisted)
+        self.host_limiter = HostRateLimiter(
+            max_concurrent=int(_ingestion_setting("host_max_concurrent", HOST_MAX_CONCURRENT)),
+            min_interval_s=float(_ingestion_setting("host_min_interval_s", HOST_MIN_INTERVAL_S)),
+        )
 
-        # Initialize default sources
+        # Initialize default sources (copies: scrape state is per orchestrator)
         for source_id, source in self.DEFAULT_SOURCES.items():
-            self.sources[source_id] = source
+            self.sources[source_id] = replace(source, metadata=dict(source.metadata))
 
         self.orchestrator_stats = {
             "total_jobs": 0,
@@ -197,6 +377,7 @@ class AutoIngestionOrchestrator:
             "failed_jobs": 0,
             "total_items_ingested": 0,
             "items_by_collection": {},
+            "items_skipped_seen": 0,
             "last_run": None,
         }
 
@@ -248,41 +429,29 @@ class AutoIngestionOrchestrator:
         """
         logger.info(f"🔍 Scraping: {source.name}")
 
-        # In production, integrate with actual scraper
-        # For now, simulate scraping
-        scraped_items = []
+        if not self.scraper:
+            # Never fabricate content: anything returned here ends up in Qdrant
+            logger.warning(f"⚠️ No scraper service configured, skipping {source.url}")
+            return []
 
-        if self.scraper:
-            # Use external scraper service
-            try:
+        scraped_items = []
+        try:
+            async with self.host_limiter.slot(source.url):
                 items = await self.scraper.scrape(source.url)
-                for item in items:
-                    content = ScrapedContent(
-                        content_id=self._generate_content_id(item.get("content", "")),
-                        source_id=source.source_id,
-                        title=item.get("title", ""),
-                        content=item.get("content", ""),
-                        url=item.get("url", source.url),
-                        scraped_at=datetime.now().isoformat(),
-                        metadata=item.get("metadata", {}),
-                    )
-                    scraped_items.append(content)
-            except Exception as e:
-                logger.error(f"Scraping error: {e}")
-                return []
-        else:
-            # Simulate scraping for demo
-            logger.info(f"   [DEMO MODE] Simulated scraping from {source.url}")
-            scraped_items = [
-                ScrapedContent(
-                    content_id=self._generate_content_id(f"{source.source_id}_demo"),
+            for item in items:
+                content = ScrapedContent(
+                    content_id=self._generate_content_id(item.get("content", "")),
                     source_id=source.source_id,
-                    title=f"Demo content from {source.name}",
-                    content=f"This is simulated content from {source.url}",
-                    url=source.url,
+                    title=item.get("title", ""),
+                    content=item.get("content", ""),
+                    url=item.get("url", source.url),
                     scraped_at=datetime.now().isoformat(),
+                    metadata=item.get("metadata", {}),
                 )
-            ]
+                scraped_items.append(content)
+        except Exception as e:
+            logger.error(f"Scraping error: {e}")
+            return []
 
         # Update last scraped
         source.last_scraped = datetime.now().isoformat()
@@ -290,15 +459,18 @@ class AutoIngestionOrchestrator:
         logger.info(f"   Scraped {len(scraped_items)} items")
         return scraped_items
 
-    async def filter_content(self, content_list: list[ScrapedContent]) -> list[ScrapedContent]:
+    async def filter_content(
+        self, content_list: list[ScrapedContent], job: IngestionJob | None = None
+    ) -> list[ScrapedContent]:
         """
         Filter scraped content for relevance (2-tier filtering).
 
         Tier 1: Quick keyword filter
-        Tier 2: ZANTARA AI analysis (legacy: was Claude)
+        Tier 2: ZANTARA AI analysis (legacy: was Claude), several items per prompt
 
         Args:
             content_list: List of scraped content
+            job: Optional job whose progress is updated after each Tier 2 batch
 
         Returns:
             Filtered content list
@@ -334,61 +506,111 @@ class AutoIngestionOrchestrator:
 
         # Tier 2: ZANTARA AI analysis (smart) - LEGACY: was Claude
         tier2_filtered = []
+        batch_size = max(1, int(_ingestion_setting("filter_batch_size", FILTER_BATCH_SIZE)))
+        batches = [
+            tier1_filtered[i : i + batch_size] for i in range(0, len(tier1_filtered), batch_size)
+        ]
 
-        for content in tier1_filtered:
-            try:
-                # Ask ZANTARA AI if this is a relevant regulation/update
-                prompt = f"""Analyze this content and determine if it's a relevant regulation, policy, or business requirement update.
+        for done, batch in enumerate(batches, start=1):
+            tier2_filtered.extend(await self._filter_batch(batch))
+            if job:
+                self._set_progress(
+                    job,
+                    SCRAPE_PROGRESS + (FILTER_PROGRESS - SCRAPE_PROGRESS) * done / len(batches),
+                )
 
-Title: {content.title}
-Content: {content.content[:500]}...
+        logger.info(
+            f"   Tier 2: {len(tier2_filtered)}/{len(tier1_filtered)} passed ZANTARA AI filter "
+            f"({len(batches)} prompts)"
+        )  # LEGACY: was Claude
 
-Is this:
+        return tier2_filtered
+
+    async def _filter_batch(self, batch: list[ScrapedContent]) -> list[ScrapedContent]:
+        """
+        Classify a batch of items with one ZANTARA AI prompt.
+
+        Items the answer gives no verdict for (or the whole batch, on error) are
+        kept, as a failed check must not drop a regulation.
+
+        Args:
+            batch: Items that passed the keyword filter
+
+        Returns:
+            Relevant items, with relevance_score and update_type set
+        """
+        items = "\n\n".join(
+            f"[{i}] Title: {content.title}\nContent: {content.content[:500]}..."
+            for i, content in enumerate(batch, start=1)
+        )
+        # Ask ZANTARA AI which items are relevant regulations/updates
+        prompt = f"""Analyze each numbered item and determine if it's a relevant regulation, policy, or business requirement update.
+
+{items}
+
+For each item, is this:
 1. A new/amended regulation?
 2. A policy change?
 3. A business requirement update?
 
-Answer with YES or NO and a brief reason."""
-
-                # LEGACY: claude renamed but actually uses ZANTARA AI
-                response = await self.claude.conversational(
-                    message=prompt,
-                    user_id="auto_ingestion",
-                    conversation_history=[],
-                    max_tokens=100,
-                )
-
-                answer = response.get("text", "").lower()
+Answer with one line per item, in the form "<number>: YES or NO - brief reason"."""
 
-                if "yes" in answer:
-                    # Calculate relevance score (simple)
-                    content.relevance_score = 0.8 if "new regulation" in answer else 0.6
+        try:
+            # LEGACY: claude renamed but actually uses ZANTARA AI
+            response = await self.claude.conversational(
+                message=prompt,
+                user_id="auto_ingestion",
+                conversation_history=[],
+                max_tokens=100 * len(batch),
+            )
+        except Exception as e:
+            logger.error(f"ZANTARA AI filtering error: {e}")  # LEGACY: was Claude
+            # Include by default if error
+            return list(batch)
+
+        text = response.get("text", "")
+        # item number -> (relevant, answer line)
+        verdicts = {
+            int(m.group(1)): (m.group(2).lower() == "yes", m.group(0).lower())
+            for m in _VERDICT_LINE.finditer(text)
+        }
+        if not verdicts and len(batch) == 1:
+            verdicts = {1: ("yes" in text.lower(), text.lower())}
+
+        relevant = []
+        for i, content in enumerate(batch, start=1):
+            if i not in verdicts:
+                logger.warning(f"   No filter verdict for: {content.title[:50]}, keeping it")
+                relevant.append(content)
+                continue
 
-                    # Classify update type
-                    if "new regulation" in answer or "amended" in answer:
-                        content.update_type = UpdateType.NEW_REGULATION
-                    elif "policy" in answer:
-                        content.update_type = UpdateType.POLICY_CHANGE
-                    else:
-                        content.update_type = UpdateType.GENERAL_NEWS
+            is_relevant, answer = verdicts[i]
+            if not is_relevant:
+                continue
 
-                    tier2_filtered.append(content)
+            # Calculate relevance score (simple)
+            content.relevance_score = 0.8 if "new regulation" in answer else 0.6
 
-            except Exception as e:
-                logger.error(f"ZANTARA AI filtering error: {e}")  # LEGACY: was Claude
-                # Include by default if error
-                tier2_filtered.append(content)
+            # Classify update type
+            if "new regulation" in answer or "amended" in answer:
+                content.update_type = UpdateType.NEW_REGULATION
+            elif "policy" in answer:
+                content.update_type = UpdateType.POLICY_CHANGE
+            else:
+                content.update_type = UpdateType.GENERAL_NEWS
 
-        logger.info(
-            f"   Tier 2: {len(tier2_filtered)}/{len(tier1_filtered)} passed ZANTARA AI filter"
-        )  # LEGACY: was Claude
+            relevant.append(content)
 
-        return tier2_filtered
+        return relevant
 
     async def ingest_content(self, content_list: list[ScrapedContent]) -> int:
         """
         Ingest filtered content into Qdrant collections.
 
+        Items already seen (by content_id) are skipped before embedding. The rest
+        are grouped by target collection, embedded in batches and bulk-upserted;
+        an item is marked as seen only once its collection upsert succeeded.
+
         Args:
             content_list: List of filtered content
 
@@ -401,45 +623,139 @@ Answer with YES or NO and a brief reason."""
 
         logger.info(f"📥 Ingesting {len(content_list)} items into Qdrant...")
 
-        ingested_count = 0
-
+        # Group new items by target collection (dedup against the store and the batch)
+        by_collection: dict[str, list[ScrapedContent]] = {}
+        batch_ids: set[str] = set()
         for content in content_list:
-            # Check for duplicates
-            if content.content_id in self.content_hashes:
+            if content.content_id in self.content_hashes or content.content_id in batch_ids:
                 logger.debug(f"   Skipping duplicate: {content.title}")
                 continue
 
-            # Get target collection
             source = self.sources.get(content.source_id)
             if not source:
                 continue
 
-            target_collection = source.target_collection
+            batch_ids.add(content.content_id)
+            by_collection.setdefault(source.target_collection, []).append(content)
 
-            # Add to collection (using search_service ingestion method if available)
+        ingested_count = 0
+        for target_collection, items in by_collection.items():
             try:
-                # Prepare metadata for logging
-                # In production, use search_service.add_document()
-                # For now, log
-                logger.info(f"   ✅ Ingested: {content.title[:50]}... → {target_collection}")
-
-                # Add to deduplication set
-                self.content_hashes.add(content.content_id)
-
-                # Update stats
-                ingested_count += 1
-                self.orchestrator_stats["items_by_collection"][target_collection] = (
-                    self.orchestrator_stats["items_by_collection"].get(target_collection, 0) + 1
-                )
-
+                ingested = await self._write_collection(target_collection, items)
             except Exception as e:
-                logger.error(f"Ingestion error: {e}")
+                logger.error(f"Ingestion error ({target_collection}): {e}")
                 continue
 
+            if not ingested:
+                continue
+
+            self.content_hashes.update(content.content_id for content in ingested)
+            invalidate_collection(self._physical_collection(target_collection))
+
+            ingested_count += len(ingested)
+            self.orchestrator_stats["items_by_collection"][target_collection] = (
+                self.orchestrator_stats["items_by_collection"].get(target_collection, 0)
+                + len(ingested)
+            )
+            logger.info(f"   ✅ Ingested {len(ingested)} items → {target_collection}")
+
         logger.info(f"✅ Ingested {ingested_count} items")
 
         return ingested_count
 
+    def _physical_collection(self, target_collection: str) -> str:
+        """Qdrant collection behind a SearchService name (cached searches are tagged with it)"""
+        vector_db = getattr(self.search, "collections", {}).get(target_collection)
+        return getattr(vector_db, "collection_name", None) or target_collection
+
+    async def _write_collection(
+        self, target_collection: str, items: list[ScrapedContent]
+    ) -> list[ScrapedContent]:
+        """
+        Embed items in batches and bulk-upsert them into one collection.
+
+        Args:
+            target_collection: SearchService collection name
+            items: New items routed to the collection
+
+        Returns:
+            Items that were upserted (a failed embedding batch drops its items)
+        """
+        vector_db = getattr(self.search, "collections", {}).get(target_collection)
+        embedder = getattr(self.search, "embedder", None)
+        if vector_db is None or embedder is None:
+            logger.warning(f"⚠️ No vector store for collection {target_collection}")
+            return []
+
+        batch_size = max(1, int(_ingestion_setting("embed_batch_size", EMBED_BATCH_SIZE)))
+        embedded: list[ScrapedContent] = []
+        embeddings: list[list[float]] = []
+        for i in range(0, len(items), batch_size):
+            batch = items[i : i + batch_size]
+            try:
+                vectors = await asyncio.to_thread(
+                    embedder.generate_embeddings, [self._document_text(c) for c in batch]
+                )
+            except Exception as e:
+                logger.error(f"Embedding error ({target_collection}): {e}")
+                continue
+            if len(vectors) != len(batch):
+                logger.error(
+                    f"Embedding error ({target_collection}): "
+                    f"{len(vectors)} vectors for {len(batch)} items"
+                )
+                continue
+            embedded.extend(batch)
+            embeddings.extend(vectors)
+
+        if not embedded:
+            return []
+
+        texts = [self._document_text(content) for content in embedded]
+        metadatas = [
+            self._document_metadata(content, text)
+            for content, text in zip(embedded, texts, strict=True)
+        ]
+        ids = [
+            make_point_id(f"auto_ingestion:{content.source_id}:{content.url}", text)
+            for content, text in zip(embedded, texts, strict=True)
+        ]
+
+        result = await asyncio.to_thread(
+            vector_db.upsert_documents,
+            chunks=texts,
+            embeddings=embeddings,
+            metadatas=metadatas,
+            ids=ids,
+        )
+        if not result.get("success"):
+            logger.error(f"Qdrant upsert failed ({target_collection}): {result.get('error')}")
+            return []
+
+        return embedded
+
+    @staticmethod
+    def _document_text(content: ScrapedContent) -> str:
+        """Text embedded and stored for a scraped item"""
+        return f"{content.title}\n\n{content.content}" if content.title else content.content
+
+    @staticmethod
+    def _document_metadata(content: ScrapedContent, text: str) -> dict[str, Any]:
+        """Payload metadata for a scraped item"""
+        metadata = {
+            **content.metadata,
+            "content_id": content.content_id,
+            "source_id": content.source_id,
+            "title": content.title,
+            "url": content.url,
+            "scraped_at": content.scraped_at,
+            "update_type": content.update_type.value if content.update_type else None,
+            "relevance_score": content.relevance_score,
+            "ingested_by": "auto_ingestion",
+        }
+        metadata[CONTENT_HASH_FIELD] = content_hash(text, metadata)
+        return metadata
+
     async def run_ingestion_job(self, source_id: str) -> IngestionJob:
         """
         Run complete ingestion job for a source.
@@ -454,39 +770,67 @@ Answer with YES or NO and a brief reason."""
         if not source:
             raise ValueError(f"Unknown source: {source_id}")
 
-        # Create job
-        job_id = f"job_{source_id}_{int(datetime.now().timestamp())}"
+        job = self._create_job(source)
+        await self._run_job(job, source)
+        return job
+
+    def _create_job(self, source: MonitoredSource) -> IngestionJob:
+        """Register a pending job for a source (visible through get_job_status)"""
+        job_id = f"job_{source.source_id}_{int(datetime.now().timestamp())}"
         job = IngestionJob(
             job_id=job_id,
-            source_id=source_id,
+            source_id=source.source_id,
             status=IngestionStatus.PENDING,
             started_at=datetime.now().isoformat(),
+            updated_at=datetime.now().isoformat(),
         )
 
         self.jobs[job_id] = job
         self.orchestrator_stats["total_jobs"] += 1
+        return job
 
-        logger.info(f"🚀 Starting ingestion job: {job_id} for {source.name}")
+    @staticmethod
+    def _set_progress(
+        job: IngestionJob, progress: float, status: IngestionStatus | None = None
+    ) -> None:
+        """Update a job's progress (and optionally its status)"""
+        if status is not None:
+            job.status = status
+        job.progress = round(min(max(progress, 0.0), 1.0), 3)
+        job.updated_at = datetime.now().isoformat()
+
+    async def _run_job(self, job: IngestionJob, source: MonitoredSource) -> None:
+        """Scrape, filter and ingest one source, recording results on the job"""
+        logger.info(f"🚀 Starting ingestion job: {job.job_id} for {source.name}")
+        job.started_at = datetime.now().isoformat()
 
         try:
             # Step 1: Scrape
-            job.status = IngestionStatus.SCRAPING
+            self._set_progress(job, 0.0, IngestionStatus.SCRAPING)
             scraped_items = await self.scrape_source(source)
             job.items_scraped = len(scraped_items)
 
+            # Items already in the knowledge base are neither filtered nor re-embedded
+            new_items = [c for c in scraped_items if c.content_id not in self.content_hashes]
+            skipped = len(scraped_items) - len(new_items)
+            if skipped:
+                self.orchestrator_stats["items_skipped_seen"] += skipped
+                logger.info(f"   Skipping {skipped} already ingested items")
+            scraped_items = new_items
+
             # Step 2: Filter
-            job.status = IngestionStatus.FILTERING
-            filtered_items = await self.filter_content(scraped_items)
+            self._set_progress(job, SCRAPE_PROGRESS, IngestionStatus.FILTERING)
+            filtered_items = await self.filter_content(scraped_items, job=job)
             job.items_filtered = len(filtered_items)
 
             # Step 3: Ingest
-            job.status = IngestionStatus.INGESTING
+            self._set_progress(job, FILTER_PROGRESS, IngestionStatus.INGESTING)
             ingested_count = await self.ingest_content(filtered_items)
             job.items_ingested = ingested_count
             job.items_failed = len(filtered_items) - ingested_count
 
             # Complete
-            job.status = IngestionStatus.COMPLETED
+            self._set_progress(job, 1.0, IngestionStatus.COMPLETED)
             job.completed_at = datetime.now().isoformat()
 
             self.orchestrator_stats["successful_jobs"] += 1
@@ -494,7 +838,7 @@ Answer with YES or NO and a brief reason."""
             self.orchestrator_stats["last_run"] = datetime.now().isoformat()
 
             logger.info(
-                f"✅ Job completed: {job_id} - "
+                f"✅ Job completed: {job.job_id} - "
                 f"scraped={job.items_scraped}, "
                 f"filtered={job.items_filtered}, "
                 f"ingested={job.items_ingested}"
@@ -504,19 +848,28 @@ Answer with YES or NO and a brief reason."""
             job.status = IngestionStatus.FAILED
             job.error = str(e)
             job.completed_at = datetime.now().isoformat()
+            job.updated_at = job.completed_at
 
             self.orchestrator_stats["failed_jobs"] += 1
 
-            logger.error(f"❌ Job failed: {job_id} - {e}")
-
-        return job
+            logger.error(f"❌ Job failed: {job.job_id} - {e}")
 
-    async def run_scheduled_ingestion(self) -> list[IngestionJob]:
+    async def run_scheduled_ingestion(
+        self, max_concurrent: int | None = None
+    ) -> list[IngestionJob]:
         """
         Run ingestion for all due sources (called by cron job).
 
+        Sources run concurrently, at most max_concurrent at a time; scrapes of the
+        same host are still serialized and spaced by the host rate limiter. All
+        jobs are registered as PENDING up front, so queued sources show up in
+        get_job_status too.
+
+        Args:
+            max_concurrent: Concurrent jobs (default settings.auto_ingestion_max_concurrent_jobs)
+
         Returns:
-            List of completed jobs
+            List of completed jobs, in due-source order
         """
         logger.info("🔄 Running scheduled ingestion...")
 
@@ -526,13 +879,26 @@ Answer with YES or NO and a brief reason."""
             logger.info("   No sources due for scraping")
             return []
 
+        if max_concurrent is None:
+            max_concurrent = int(_ingestion_setting("max_concurrent_jobs", MAX_CONCURRENT_JOBS))
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+        async def run(job: IngestionJob, source: MonitoredSource) -> IngestionJob:
+            async with semaphore:
+                await self._run_job(job, source)
+            return job
+
+        scheduled = [(self._create_job(source), source) for source in due_sources]
+        outcomes = await asyncio.gather(
+            *(run(job, source) for job, source in scheduled), return_exceptions=True
+        )
+
         jobs = []
-        for source in due_sources:
-            try:
-                job = await self.run_ingestion_job(source.source_id)
-                jobs.append(job)
-            except Exception as e:
-                logger.error(f"Error running job for {source.source_id}: {e}")
+        for (job, source), outcome in zip(scheduled, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Error running job for {source.source_id}: {outcome}")
+                continue
+            jobs.append(job)
 
         logger.info(f"✅ Scheduled ingestion complete: {len(jobs)} jobs run")
 
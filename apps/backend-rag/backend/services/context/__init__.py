@@ -4,6 +4,7 @@ Memory context building and RAG management
 """
 
 from .context_builder import ContextBuilder
+from .crm_context import CRMContextProvider
 from .rag_manager import RAGManager
 
-__all__ = ["ContextBuilder", "RAGManager"]
+__all__ = ["ContextBuilder", "CRMContextProvider", "RAGManager"]
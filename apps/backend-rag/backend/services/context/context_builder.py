@@ -17,6 +17,8 @@ from psycopg2.extras import RealDictCursor
 
 from app.core.config import settings
 
+from .crm_context import format_crm_context, get_crm_context_provider
+
 logger = logging.getLogger(__name__)
 
 
@@ -138,11 +140,25 @@ COME POSSO AIUTARTI OGGI:
 - Hai bisogno di chiarimenti su una nuova regolamentazione?
 - Vuoi pianificare una nuova espansione business?"""
 
+    async def build_crm_context_async(self, user_email: str | None) -> str | None:
+        """
+        Build CRM context without blocking the event loop.
+        Uses the shared CRMContextProvider (pooled single query, per-email cache).
+
+        Args:
+            user_email: User's email address to look up in CRM
+
+        Returns:
+            Formatted CRM context string or None if no data found
+        """
+        return await get_crm_context_provider().build_context(user_email)
+
     def build_crm_context(self, user_email: str | None) -> str | None:
         """
         Build CRM context from user's client profile and active practices.
         This provides real-time CRM data to Zantara so it can answer questions
         about client status, active practices, etc.
+        Synchronous (opens its own connection); chat turns use build_crm_context_async.
 
         Args:
             user_email: User's email address to look up in CRM
@@ -183,8 +199,6 @@ COME POSSO AIUTARTI OGGI:
                 return None
 
             client_id = client["id"]
-            client_name = client["full_name"]
-            client_status = client["status"]
 
             # Get active practices for this client
             cursor.execute(
@@ -207,52 +221,7 @@ COME POSSO AIUTARTI OGGI:
             cursor.close()
             conn.close()
 
-            # Build context string
-            crm_parts = [
-                "CLIENT PROFILE (CRM DATA):",
-                f"- Name: {client_name}",
-                f"- Email: {user_email}",
-                f"- Status: {client_status}",
-            ]
-
-            if client.get("tags"):
-                crm_parts.append(f"- Tags: {', '.join(client['tags'])}")
-
-            if practices:
-                crm_parts.append(f"\nACTIVE PRACTICES ({len(practices)}):")
-                for practice in practices:
-                    practice_name = practice.get(
-                        "practice_type_name", practice.get("practice_type_code", "Unknown")
-                    )
-                    status = practice.get("status", "unknown")
-                    priority = practice.get("priority", "normal")
-
-                    # Calculate progress percentage if possible
-                    progress_info = ""
-                    if status == "completed":
-                        progress_info = " (100% complete)"
-                    elif status == "in_progress":
-                        # Estimate based on dates
-                        if practice.get("start_date") and practice.get("completion_date"):
-                            progress_info = " (in progress)"
-                        else:
-                            progress_info = " (in progress)"
-                    elif status == "pending":
-                        progress_info = " (pending start)"
-
-                    crm_parts.append(
-                        f"  • {practice_name}: {status}{progress_info} (Priority: {priority})"
-                    )
-
-                    if practice.get("assigned_to"):
-                        crm_parts.append(f"    Assigned to: {practice.get('assigned_to')}")
-
-                    if practice.get("expiry_date"):
-                        crm_parts.append(f"    Expiry: {practice.get('expiry_date')}")
-            else:
-                crm_parts.append("\nACTIVE PRACTICES: None")
-
-            crm_context = "\n".join(crm_parts)
+            crm_context = format_crm_context(client, practices, user_email)
             logger.info(
                 f"📋 [ContextBuilder] Built CRM context for {user_email}: {len(practices)} practices"
             )
@@ -0,0 +1,299 @@
+"""
+CRM Context Provider
+Non-blocking CRM lookup for chat turns
+
+The client profile and its latest practices are read with one query on a shared
+asyncpg pool. Results are cached per email for a short TTL and dropped when
+clients or practices are written; the context string is formatted on first use.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+import asyncpg
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CRM_CONTEXT_TTL_S = 30.0  # Default per-email cache TTL
+MAX_CACHED_EMAILS = 2048  # Expired entries are purged past this size
+POOL_RETRY_S = 60.0  # Wait before retrying a failed pool creation
+
+# Active client by email with its 10 latest practices aggregated as JSON
+CRM_CONTEXT_QUERY = """
+    SELECT c.id, c.full_name, c.email, c.status, c.tags,
+           COALESCE(p.practices, '[]'::json) AS practices
+    FROM clients c
+    LEFT JOIN LATERAL (
+        SELECT json_agg(recent ORDER BY recent.created_at DESC) AS practices
+        FROM (
+            SELECT p.status, p.priority, p.created_at, p.assigned_to, p.expiry_date,
+                   pt.code AS practice_type_code, pt.name AS practice_type_name
+            FROM practices p
+            JOIN practice_types pt ON p.practice_type_id = pt.id
+            WHERE p.client_id = c.id
+            ORDER BY p.created_at DESC
+            LIMIT 10
+        ) recent
+    ) p ON TRUE
+    WHERE c.email = $1 AND c.status = 'active'
+    LIMIT 1
+"""
+
+
+def format_crm_context(client: dict, practices: list[dict], user_email: str) -> str:
+    """
+    Format a client profile and its practices for the LLM context.
+
+    Args:
+        client: Client row (full_name, status, tags)
+        practices: Practice rows, newest first
+        user_email: Email the client was looked up by
+
+    Returns:
+        CRM context string
+    """
+    crm_parts = [
+        "CLIENT PROFILE (CRM DATA):",
+        f"- Name: {client['full_name']}",
+        f"- Email: {user_email}",
+        f"- Status: {client['status']}",
+    ]
+
+    if client.get("tags"):
+        crm_parts.append(f"- Tags: {', '.join(client['tags'])}")
+
+    if practices:
+        crm_parts.append(f"\nACTIVE PRACTICES ({len(practices)}):")
+        for practice in practices:
+            practice_name = practice.get(
+                "practice_type_name", practice.get("practice_type_code", "Unknown")
+            )
+            status = practice.get("status", "unknown")
+            priority = practice.get("priority", "normal")
+
+            progress_info = ""
+            if status == "completed":
+                progress_info = " (100% complete)"
+            elif status == "in_progress":
+                progress_info = " (in progress)"
+            elif status == "pending":
+                progress_info = " (pending start)"
+
+            crm_parts.append(f"  • {practice_name}: {status}{progress_info} (Priority: {priority})")
+
+            if practice.get("assigned_to"):
+                crm_parts.append(f"    Assigned to: {practice.get('assigned_to')}")
+
+            if practice.get("expiry_date"):
+                crm_parts.append(f"    Expiry: {practice.get('expiry_date')}")
+    else:
+        crm_parts.append("\nACTIVE PRACTICES: None")
+
+    return "\n".join(crm_parts)
+
+
+@dataclass
+class CRMContext:
+    """CRM data of one client; text is formatted on first access"""
+
+    email: str
+    client: dict[str, Any]
+    practices: list[dict[str, Any]]
+
+    @cached_property
+    def text(self) -> str:
+        return format_crm_context(self.client, self.practices, self.email)
+
+
+class CRMContextProvider:
+    """
+    Async CRM context lookup with a per-email TTL cache
+    """
+
+    def __init__(self, pool: asyncpg.Pool | None = None, ttl_s: float | None = None):
+        """
+        Initialize provider
+
+        Args:
+            pool: Shared asyncpg pool (None = create a small one from DATABASE_URL on first use)
+            ttl_s: Cache TTL in seconds (default settings.crm_context_cache_ttl_s)
+        """
+        self.pool = pool
+        self._owns_pool = False
+        self._pool_lock: asyncio.Lock | None = None
+        self._pool_retry_at = 0.0
+
+        if ttl_s is None:
+            ttl_s = getattr(settings, "crm_context_cache_ttl_s", None)
+        self.ttl_s = (
+            float(ttl_s)
+            if isinstance(ttl_s, int | float) and not isinstance(ttl_s, bool)
+            else CRM_CONTEXT_TTL_S
+        )
+
+        # email -> (expires_at, context or None for "no active client")
+        self._cache: dict[str, tuple[float, CRMContext | None]] = {}
+        self._client_emails: dict[Any, str] = {}  # client_id -> cached email
+        self._generation = 0  # Bumped on invalidation; stale lookups are not cached
+
+    async def _get_pool(self) -> asyncpg.Pool | None:
+        """Shared pool, or a lazily created one when none was injected"""
+        if self.pool is not None:
+            return self.pool
+        if not settings.database_url or time.monotonic() < self._pool_retry_at:
+            return None
+
+        if self._pool_lock is None:
+            self._pool_lock = asyncio.Lock()
+        async with self._pool_lock:
+            if self.pool is None:
+                try:
+                    self.pool = await asyncpg.create_pool(
+                        dsn=settings.database_url, min_size=1, max_size=5, command_timeout=30
+                    )
+                    self._owns_pool = True
+                    logger.info("✅ [CRMContext] Connected to PostgreSQL")
+                except Exception as e:
+                    self._pool_retry_at = time.monotonic() + POOL_RETRY_S
+                    logger.warning(f"⚠️ [CRMContext] PostgreSQL connection failed: {e}")
+                    return None
+        return self.pool
+
+    async def get_context(self, user_email: str | None) -> CRMContext | None:
+        """
+        CRM data for a user, from cache when fresh.
+
+        Args:
+            user_email: User's email address to look up in CRM
+
+        Returns:
+            CRMContext, or None if there is no active client (or the lookup failed)
+        """
+        if not user_email:
+            return None
+
+        now = time.monotonic()
+        cached = self._cache.get(user_email)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        pool = await self._get_pool()
+        if pool is None:
+            return None
+
+        generation = self._generation
+        try:
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow(CRM_CONTEXT_QUERY, user_email)
+        except Exception as e:
+            logger.warning(f"⚠️ [CRMContext] Failed to load CRM context: {e}")
+            return None
+
+        context = None
+        if row:
+            practices = row["practices"]
+            if isinstance(practices, str):
+                practices = json.loads(practices)
+            context = CRMContext(
+                email=user_email,
+                client={key: row[key] for key in ("id", "full_name", "status", "tags")},
+                practices=practices or [],
+            )
+            logger.info(
+                f"📋 [CRMContext] Loaded CRM context for {user_email}: "
+                f"{len(context.practices)} practices"
+            )
+        else:
+            logger.info(f"📋 [CRMContext] No active client found for {user_email}")
+
+        if generation == self._generation:
+            self._store(user_email, context, now)
+        return context
+
+    async def build_context(self, user_email: str | None) -> str | None:
+        """
+        Formatted CRM context for a user.
+
+        Args:
+            user_email: User's email address to look up in CRM
+
+        Returns:
+            Formatted CRM context string or None if no data found
+        """
+        context = await self.get_context(user_email)
+        return context.text if context else None
+
+    def _store(self, user_email: str, context: CRMContext | None, now: float) -> None:
+        if len(self._cache) >= MAX_CACHED_EMAILS:
+            for email in [email for email, (expires, _) in self._cache.items() if expires <= now]:
+                self._drop(email)
+            if len(self._cache) >= MAX_CACHED_EMAILS:
+                self._drop(next(iter(self._cache)))
+        self._cache[user_email] = (now + self.ttl_s, context)
+        if context is not None:
+            self._client_emails[context.client["id"]] = user_email
+
+    def _drop(self, user_email: str) -> None:
+        _, context = self._cache.pop(user_email, (None, None))
+        if context is not None:
+            self._client_emails.pop(context.client["id"], None)
+
+    def invalidate(self, email: str | None = None, client_id: Any = None) -> None:
+        """
+        Drop cached CRM context after a client or practice write.
+
+        Args:
+            email: Client email (also drops a cached "no active client")
+            client_id: Client ID (drops the email it was cached under)
+            With neither, the whole cache is cleared.
+        """
+        self._generation += 1
+        if email is None and client_id is None:
+            self._cache.clear()
+            self._client_emails.clear()
+            return
+        if client_id is not None:
+            cached_email = self._client_emails.get(client_id)
+            if cached_email:
+                self._drop(cached_email)
+        if email:
+            self._drop(email)
+
+    async def close(self):
+        """Close the pool if this provider created it"""
+        if self.pool is not None and self._owns_pool:
+            await self.pool.close()
+            self.pool = None
+            self._owns_pool = False
+
+
+# Singleton instance
+_crm_context_provider: CRMContextProvider | None = None
+
+
+def get_crm_context_provider() -> CRMContextProvider:
+    """Get the global CRMContextProvider instance (created on first use)"""
+    global _crm_context_provider
+    if _crm_context_provider is None:
+        _crm_context_provider = CRMContextProvider()
+    return _crm_context_provider
+
+
+def init_crm_context_provider(db_pool: asyncpg.Pool | None) -> CRMContextProvider:
+    """Initialize the global CRMContextProvider on the shared asyncpg pool"""
+    global _crm_context_provider
+    _crm_context_provider = CRMContextProvider(db_pool)
+    return _crm_context_provider
+
+
+def invalidate_crm_context(email: str | None = None, client_id: Any = None) -> None:
+    """Drop cached CRM context after a write (no-op before the provider exists)"""
+    if _crm_context_provider is not None:
+        _crm_context_provider.invalidate(email=email, client_id=client_id)
@@ -0,0 +1,431 @@
+"""
+ZANTARA - Local Document Store
+Content-addressed disk cache for full-document (Smart Oracle) analysis
+
+PDFs are fetched once from a pluggable backend (Google Drive in production, a
+local directory in tests/dev) and stored as objects/<sha256>.pdf, with the
+extracted text cached next to them as <sha256>.txt. An index maps requested
+filenames to backend file IDs and file IDs to content hashes, so a repeat
+question about the same regulation needs neither a Drive search nor a download
+nor a re-parse. The store is bounded by size with least-recently-used eviction.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_STORE_DIR = "/tmp/zantara_documents"
+DOCUMENT_STORE_MAX_MB = 2048
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024  # Drive media download chunk
+
+
+def clean_document_name(filename: str) -> str:
+    """Search key of a filename: basename without extension ("dir/tasse_2024.pdf" -> "tasse_2024")"""
+    return os.path.splitext(os.path.basename(filename or ""))[0].strip()
+
+
+def name_variants(clean_name: str) -> list[str]:
+    """Fuzzy spellings tried in order when searching a backend for a document"""
+    variants = [
+        clean_name,
+        clean_name.replace("_", " "),
+        clean_name.replace("-", " "),
+        clean_name.replace("_", ""),
+    ]
+    return list(dict.fromkeys(v for v in variants if v))
+
+
+class DocumentBackend(ABC):
+    """Source of original PDFs"""
+
+    @abstractmethod
+    def find(self, clean_name: str) -> dict[str, Any] | None:
+        """
+        Find the best matching PDF for a document name.
+
+        Args:
+            clean_name: Name without directory and extension
+
+        Returns:
+            {"id": ..., "name": ...} or None if nothing matches
+        """
+
+    @abstractmethod
+    def fetch(self, file_id: str, dest: BinaryIO) -> None:
+        """Write the content of a file to dest (raises on failure)"""
+
+
+class DriveBackend(DocumentBackend):
+    """Google Drive backend (fuzzy name search, streamed media download)"""
+
+    def __init__(self, service_factory: Callable[[], Any]):
+        """
+        Args:
+            service_factory: Returns a Drive v3 service (or None); called until it succeeds
+        """
+        self._service_factory = service_factory
+        self._service = None
+
+    @property
+    def service(self):
+        if self._service is None:
+            self._service = self._service_factory()
+        return self._service
+
+    def find(self, clean_name: str) -> dict[str, Any] | None:
+        if not self.service:
+            logger.warning("⚠️ Google Drive service not available")
+            return None
+
+        for variant in name_variants(clean_name):
+            escaped = variant.replace("\\", "\\\\").replace("'", "\\'")
+            query = (
+                f"name contains '{escaped}' and mimeType = 'application/pdf' and trashed = false"
+            )
+            logger.debug(f"🔍 Trying search query: {query}")
+            results = (
+                self.service.files().list(q=query, fields="files(id, name)", pageSize=1).execute()
+            )
+            files = results.get("files", [])
+            if files:
+                return files[0]
+        return None
+
+    def fetch(self, file_id: str, dest: BinaryIO) -> None:
+        from googleapiclient.http import MediaIoBaseDownload
+
+        request = self.service.files().get_media(fileId=file_id)
+        downloader = MediaIoBaseDownload(dest, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+        done = False
+        while not done:
+            status, done = downloader.next_chunk()
+            if status:
+                logger.debug(f"Download progress: {int(status.progress() * 100)}%")
+
+
+class LocalDirectoryBackend(DocumentBackend):
+    """PDFs from a local directory (tests, development, mounted exports)"""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def find(self, clean_name: str) -> dict[str, Any] | None:
+        pdfs = sorted(p for p in self.root.rglob("*") if p.suffix.lower() == ".pdf")
+        for variant in name_variants(clean_name):
+            needle = variant.lower()
+            for pdf in pdfs:
+                if needle in pdf.name.lower():
+                    return {"id": pdf.relative_to(self.root).as_posix(), "name": pdf.name}
+        return None
+
+    def fetch(self, file_id: str, dest: BinaryIO) -> None:
+        with open(self.root / file_id, "rb") as src:
+            shutil.copyfileobj(src, dest)
+
+
+class _HashingWriter:
+    """File wrapper hashing what is written (backends stream into it)"""
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.sha256.update(data)
+        return self.f.write(data)
+
+
+class DocumentStore:
+    """
+    Size-bounded, content-addressed local cache of backend PDFs and their text
+    """
+
+    def __init__(
+        self,
+        backend: DocumentBackend,
+        root: str | Path | None = None,
+        max_bytes: int | None = None,
+    ):
+        """
+        Initialize store
+
+        Args:
+            backend: Where PDFs come from
+            root: Cache directory (default settings.document_store_dir)
+            max_bytes: Disk budget for PDFs + text (default settings.document_store_max_mb)
+        """
+        self.backend = backend
+        self.root = Path(
+            root or getattr(settings, "document_store_dir", None) or DOCUMENT_STORE_DIR
+        )
+        if max_bytes is None:
+            max_mb = getattr(settings, "document_store_max_mb", None)
+            max_mb = max_mb if isinstance(max_mb, int) else DOCUMENT_STORE_MAX_MB
+            max_bytes = max_mb * 1024 * 1024
+        self.max_bytes = max_bytes
+
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.json"
+
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._index = self._load_index()
+        self.stats = {"hits": 0, "downloads": 0, "searches": 0, "text_hits": 0, "evictions": 0}
+
+    # --- Index ---
+
+    def _load_index(self) -> dict[str, dict]:
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            if isinstance(index.get("names"), dict) and isinstance(index.get("files"), dict):
+                return index
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"⚠️ Unreadable document index, starting empty: {e}")
+        return {"names": {}, "files": {}}
+
+    def _save_index(self) -> None:
+        """Write the index atomically (caller holds self._lock)"""
+        tmp_path = self.index_path.with_name(f"index.json.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._index, f)
+            tmp_path.replace(self.index_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to save document index: {e}")
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _object_path(self, sha256: str, suffix: str = ".pdf") -> Path:
+        return self.objects_dir / f"{sha256}{suffix}"
+
+    # --- Lookup ---
+
+    def get_pdf(self, filename: str) -> Path | None:
+        """
+        Local path of the PDF for a (fuzzy) filename, fetching it on a miss.
+
+        Args:
+            filename: Filename as stored in Qdrant metadata (directory and extension ignored)
+
+        Returns:
+            Path inside the store, or None if the backend has no match or fails
+        """
+        clean_name = clean_document_name(filename)
+        if not clean_name:
+            return None
+
+        with self._key_lock(clean_name):
+            entry = self._index["names"].get(clean_name)
+            if entry:
+                path = self._cached_object(entry["id"])
+                if path:
+                    self.stats["hits"] += 1
+                    return path
+                try:
+                    return self._download(entry)
+                except Exception as e:
+                    # Deleted or replaced upstream: forget the mapping and search again
+                    logger.warning(
+                        f"⚠️ Cached file ID for '{clean_name}' failed ({e}), re-searching"
+                    )
+                    with self._lock:
+                        self._index["names"].pop(clean_name, None)
+                        self._index["files"].pop(entry["id"], None)
+                        self._save_index()
+
+            self.stats["searches"] += 1
+            found = self.backend.find(clean_name)
+            if not found:
+                logger.warning(f"⚠️ No file found for: {filename}")
+                return None
+            logger.info(f"✅ Found match: '{found['name']}' (ID: {found['id']})")
+
+            entry = {"id": found["id"], "name": found["name"]}
+            with self._lock:
+                self._index["names"][clean_name] = entry
+                self._save_index()
+            path = self._cached_object(entry["id"])
+            if path:
+                self.stats["hits"] += 1
+                return path
+            return self._download(entry)
+
+    def get_text(self, filename: str) -> str | None:
+        """
+        Extracted text of the PDF for a filename, parsed once and cached beside it.
+
+        Returns:
+            Text ("" for PDFs without a text layer), or None if the PDF is unavailable
+        """
+        pdf_path = self.get_pdf(filename)
+        if pdf_path is None:
+            return None
+
+        text_path = pdf_path.with_suffix(".txt")
+        with self._key_lock(pdf_path.stem):
+            try:
+                text = text_path.read_text(encoding="utf-8")
+                self.stats["text_hits"] += 1
+                self._touch(text_path)
+                return text
+            except FileNotFoundError:
+                pass
+
+            from core.parsers import DocumentParseError, extract_text_from_pdf
+
+            try:
+                text = extract_text_from_pdf(str(pdf_path))
+            except DocumentParseError as e:
+                logger.warning(f"⚠️ No text extracted from {pdf_path.name}: {e}")
+                text = ""  # Cached too, so scanned PDFs are not re-parsed
+
+            tmp_path = text_path.with_name(f"{text_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(text, encoding="utf-8")
+            tmp_path.replace(text_path)
+        self._evict(keep={pdf_path.stem})
+        return text
+
+    def _cached_object(self, file_id: str) -> Path | None:
+        sha256 = self._index["files"].get(file_id)
+        if not sha256:
+            return None
+        path = self._object_path(sha256)
+        if not path.exists():
+            return None
+        self._touch(path)
+        return path
+
+    def _download(self, entry: dict) -> Path:
+        """Fetch a backend file into the store (raises on failure)"""
+        tmp_path = self.objects_dir / f".{entry['id'].replace('/', '_')}.{os.getpid()}.part"
+        try:
+            with open(tmp_path, "wb") as f:
+                writer = _HashingWriter(f)
+                self.backend.fetch(entry["id"], writer)
+            sha256 = writer.sha256.hexdigest()
+            path = self._object_path(sha256)
+            if path.exists():
+                tmp_path.unlink()  # Same content under another name or ID
+                self._touch(path)
+            else:
+                tmp_path.replace(path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        self.stats["downloads"] += 1
+        logger.info(f"✅ Stored '{entry['name']}' as {sha256[:12]} ({path.stat().st_size} bytes)")
+        with self._lock:
+            self._index["files"][entry["id"]] = sha256
+            self._save_index()
+        self._evict(keep={sha256})
+        return path
+
+    # --- Eviction ---
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        with contextlib.suppress(OSError):
+            os.utime(path)
+
+    def _evict(self, keep: set[str]) -> None:
+        """Remove least recently used documents (PDF + text) until under max_bytes"""
+        groups: dict[str, list[Any]] = {}  # sha256 -> [latest mtime, size, paths]
+        total = 0
+        for path in self.objects_dir.iterdir():
+            if path.suffix not in (".pdf", ".txt"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            total += stat.st_size
+            group = groups.setdefault(path.stem, [0.0, 0, []])
+            group[0] = max(group[0], stat.st_mtime)
+            group[1] += stat.st_size
+            group[2].append(path)
+
+        if total <= self.max_bytes:
+            return
+
+        evicted = set()
+        for sha256, (_, size, paths) in sorted(groups.items(), key=lambda item: item[1][0]):
+            if total <= self.max_bytes:
+                break
+            if sha256 in keep:
+                continue
+            for path in paths:
+                path.unlink(missing_ok=True)
+            total -= size
+            evicted.add(sha256)
+
+        if evicted:
+            self.stats["evictions"] += len(evicted)
+            logger.info(f"🧹 Evicted {len(evicted)} documents from local store")
+            with self._lock:
+                files = self._index["files"]
+                for file_id in [fid for fid, sha256 in files.items() if sha256 in evicted]:
+                    del files[file_id]  # Name -> ID stays, so a re-fetch skips the search
+                self._save_index()
+
+
+# Singleton instance
+_document_store: DocumentStore | None = None
+_document_store_lock = threading.Lock()
+
+
+def _drive_service() -> Any:
+    """Drive v3 service built from settings.google_credentials_json (or None)"""
+    # Imported lazily: smart_oracle imports this module
+    from services.smart_oracle import get_drive_service
+
+    return get_drive_service()
+
+
+def get_document_store() -> DocumentStore:
+    """
+    Get the global DocumentStore, creating it on first use.
+
+    The backend comes from settings alone, so every caller shares the same
+    store whichever of them asks first.
+
+    Returns:
+        DocumentStore configured from settings.document_store_*
+    """
+    global _document_store
+    with _document_store_lock:
+        if _document_store is None:
+            backend_name = getattr(settings, "document_store_backend", "drive")
+            local_dir = getattr(settings, "document_store_local_dir", None)
+            if backend_name == "local" and local_dir:
+                backend: DocumentBackend = LocalDirectoryBackend(local_dir)
+            else:
+                backend = DriveBackend(_drive_service)
+            _document_store = DocumentStore(backend)
+            logger.info(f"📚 Document store at {_document_store.root} ({type(backend).__name__})")
+        return _document_store
+
+
+def set_document_store(store: DocumentStore | None) -> None:
+    """Replace the global DocumentStore (e.g. a LocalDirectoryBackend store in tests)"""
+    global _document_store
+    with _document_store_lock:
+        _document_store = store
@@ -11,36 +11,223 @@ Flow:
 4. If no match → proceed to normal RAG + Sonnet generation
 
 This provides 250x speedup for ~50-60% of queries.
+
+Semantic matching runs against a GoldenAnswerIndex: the normalized embeddings
+of every canonical question, kept as one matrix and queried with a single dot
+product. The index is synced incrementally from golden_answers (rows changed
+since the last sync, re-encoding only questions whose text changed) and can be
+persisted (settings.golden_answer_index_path) so restarts skip the re-encode.
 """
 
+import asyncio
 import hashlib
 import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
 
 import asyncpg
 import numpy as np
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+INDEX_REFRESH_S = 60.0  # Default min seconds between delta syncs
+
+
+def _question_hash(question: str) -> str:
+    """Hash of a canonical question (re-encode only when it changes)"""
+    return hashlib.sha256(question.encode("utf-8")).hexdigest()
+
+
+def _normalize(vectors) -> np.ndarray:
+    """Rows scaled to unit length (dot product = cosine similarity)"""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class GoldenAnswerIndex:
+    """
+    Embedding matrix of all golden answer canonical questions.
+
+    Row i holds the unit-length embedding of cluster_ids[i]; question_hashes[i]
+    tells whether the stored embedding is still current. watermark is the
+    latest golden_answers.updated_at already applied.
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL):
+        self.model_name = model_name
+        self.cluster_ids: list[str] = []
+        self.question_hashes: list[str] = []
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.watermark: datetime | None = None
+        self._rows: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.cluster_ids)
+
+    def is_current(self, cluster_id: str, question_hash: str) -> bool:
+        """Check if a cluster's stored embedding matches its question"""
+        row = self._rows.get(cluster_id)
+        return row is not None and self.question_hashes[row] == question_hash
+
+    def upsert(self, cluster_ids: list[str], question_hashes: list[str], vectors) -> None:
+        """
+        Insert or replace the embeddings of clusters.
+
+        Args:
+            cluster_ids: Cluster IDs
+            question_hashes: Hash of each cluster's canonical question
+            vectors: One embedding per cluster (normalized here)
+        """
+        if not cluster_ids:
+            return
+        vectors = _normalize(vectors)
+        if not len(self):
+            self.matrix = np.empty((0, vectors.shape[1]), dtype=np.float32)
+
+        appended = []
+        for cluster_id, question_hash, vector in zip(
+            cluster_ids, question_hashes, vectors, strict=True
+        ):
+            row = self._rows.get(cluster_id)
+            if row is None:
+                self._rows[cluster_id] = len(self.cluster_ids)
+                self.cluster_ids.append(cluster_id)
+                self.question_hashes.append(question_hash)
+                appended.append(vector)
+            else:
+                self.question_hashes[row] = question_hash
+                if row < len(self.matrix):
+                    self.matrix[row] = vector
+                else:
+                    appended[row - len(self.matrix)] = vector
+        if appended:
+            self.matrix = np.vstack([self.matrix, np.asarray(appended)])
+
+    def retain(self, cluster_ids: set[str]) -> int:
+        """
+        Drop clusters not in cluster_ids (deleted golden answers).
+
+        Returns:
+            Number of rows removed
+        """
+        keep = [i for i, cluster_id in enumerate(self.cluster_ids) if cluster_id in cluster_ids]
+        removed = len(self.cluster_ids) - len(keep)
+        if removed:
+            self.cluster_ids = [self.cluster_ids[i] for i in keep]
+            self.question_hashes = [self.question_hashes[i] for i in keep]
+            self.matrix = self.matrix[keep]
+            self._rows = {cluster_id: i for i, cluster_id in enumerate(self.cluster_ids)}
+        return removed
+
+    def search(self, query_vector) -> tuple[str, float] | None:
+        """
+        Best matching cluster for a query embedding.
+
+        Returns:
+            (cluster_id, cosine similarity), or None if the index is empty
+        """
+        if not len(self):
+            return None
+        scores = self.matrix @ _normalize(query_vector)[0]
+        best = int(np.argmax(scores))
+        return self.cluster_ids[best], float(scores[best])
+
+    def save(self, path: str | Path) -> None:
+        """Write the index atomically (failures are logged, not raised)"""
+        path = Path(path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    model_name=np.array(self.model_name),
+                    cluster_ids=np.array(self.cluster_ids, dtype=str),
+                    question_hashes=np.array(self.question_hashes, dtype=str),
+                    matrix=self.matrix,
+                    watermark=np.array(self.watermark.isoformat() if self.watermark else ""),
+                )
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to save golden answer index: {e}")
+
+    @classmethod
+    def load(cls, path: str | Path, model_name: str = EMBEDDING_MODEL) -> "GoldenAnswerIndex":
+        """
+        Read a saved index; an unreadable file or one built with another model
+        yields an empty index.
+        """
+        index = cls(model_name)
+        path = Path(path)
+        if not path.exists():
+            return index
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if str(data["model_name"]) != model_name:
+                    logger.info("Golden answer index built with another model, rebuilding")
+                    return index
+                index.cluster_ids = [str(c) for c in data["cluster_ids"]]
+                index.question_hashes = [str(h) for h in data["question_hashes"]]
+                index.matrix = np.asarray(data["matrix"], dtype=np.float32)
+                watermark = str(data["watermark"])
+                index.watermark = datetime.fromisoformat(watermark) if watermark else None
+            index._rows = {cluster_id: i for i, cluster_id in enumerate(index.cluster_ids)}
+            logger.info(f"📚 Loaded golden answer index: {len(index)} questions")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load golden answer index: {e}")
+            return cls(model_name)
+        return index
+
 
 class GoldenAnswerService:
     """
     Fast lookup and retrieval of pre-generated golden answers
     """
 
-    def __init__(self, database_url: str):
+    def __init__(
+        self,
+        database_url: str,
+        index_path: str | None = None,
+        index_refresh_s: float | None = None,
+    ):
         """
         Initialize service
 
         Args:
             database_url: PostgreSQL connection string
+            index_path: Persisted embedding index (default settings.golden_answer_index_path)
+            index_refresh_s: Min seconds between index syncs
+                (default settings.golden_answer_index_refresh_s)
         """
         self.database_url = database_url
         self.pool: asyncpg.Pool | None = None
         self.model: SentenceTransformer | None = None
         self.similarity_threshold = 0.80  # 80% similarity required
 
+        if index_path is None:
+            index_path = getattr(settings, "golden_answer_index_path", None)
+        self.index_path = index_path if isinstance(index_path, str) else None
+        if index_refresh_s is None:
+            index_refresh_s = getattr(settings, "golden_answer_index_refresh_s", None)
+        self.index_refresh_s = (
+            float(index_refresh_s)
+            if isinstance(index_refresh_s, int | float) and not isinstance(index_refresh_s, bool)
+            else INDEX_REFRESH_S
+        )
+        self.index: GoldenAnswerIndex | None = None  # Loaded on first semantic lookup
+        self._index_synced_at: float | None = None
+        self._index_lock = asyncio.Lock()
+
     async def connect(self):
         """Initialize PostgreSQL connection pool"""
         try:
@@ -62,7 +249,7 @@ class GoldenAnswerService:
         """Lazy load embedding model"""
         if self.model is None:
             logger.info("Loading embedding model for similarity matching...")
-            self.model = SentenceTransformer("all-MiniLM-L6-v2")
+            self.model = SentenceTransformer(EMBEDDING_MODEL)
 
     async def lookup_golden_answer(self, query: str, _user_id: str | None = None) -> dict | None:
         """
@@ -148,6 +335,9 @@ class GoldenAnswerService:
         """
         Find golden answer using semantic similarity
 
+        The query is encoded once and scored against the embedding index of all
+        canonical questions with one matrix-vector product.
+
         Args:
             query: User query
 
@@ -158,58 +348,150 @@ class GoldenAnswerService:
             return None
 
         try:
-            # Load embedding model
+            await self.refresh_index()
+            if not self.index:
+                return None
+
+            # Load embedding model (only needed once there is something to match)
             self._load_model()
+            query_embedding = self.model.encode([query])[0]
+            match = self.index.search(query_embedding)
+            if not match:
+                return None
+
+            cluster_id, best_similarity = match
+            if best_similarity < self.similarity_threshold:
+                return None
 
-            # Get all canonical questions from golden_answers
             async with self.pool.acquire() as conn:
-                golden_answers = await conn.fetch(
+                best_match = await conn.fetchrow(
                     """
                     SELECT
                         cluster_id,
                         canonical_question,
                         answer,
                         sources,
-                        confidence,
-                        usage_count
+                        confidence
                     FROM golden_answers
-                    ORDER BY usage_count DESC
-                    LIMIT 100
-                """
+                    WHERE cluster_id = $1
+                """,
+                    cluster_id,
                 )
 
-            if not golden_answers:
+            if not best_match:
+                # Deleted since the last index sync
                 return None
 
-            # Generate embeddings
-            query_embedding = self.model.encode([query])[0]
-            canonical_questions = [ga["canonical_question"] for ga in golden_answers]
-            canonical_embeddings = self.model.encode(canonical_questions)
+            return {
+                "cluster_id": best_match["cluster_id"],
+                "canonical_question": best_match["canonical_question"],
+                "answer": best_match["answer"],
+                "sources": best_match["sources"],
+                "confidence": best_match["confidence"],
+                "similarity": best_similarity,
+            }
 
-            # Calculate similarities
-            similarities = cosine_similarity([query_embedding], canonical_embeddings)[0]
+        except Exception as e:
+            logger.error(f"❌ Semantic lookup failed: {e}")
+            return None
 
-            # Find best match above threshold
-            best_idx = np.argmax(similarities)
-            best_similarity = similarities[best_idx]
+    async def refresh_index(self, force: bool = False) -> int:
+        """
+        Sync the embedding index with golden_answers.
 
-            if best_similarity >= self.similarity_threshold:
-                best_match = golden_answers[best_idx]
+        Only rows updated since the index watermark are read, and only those
+        whose canonical question changed are re-encoded. Deleted answers are
+        dropped when the row count no longer matches. Runs at most once per
+        index_refresh_s unless forced (call with force=True after bulk writes).
 
-                return {
-                    "cluster_id": best_match["cluster_id"],
-                    "canonical_question": best_match["canonical_question"],
-                    "answer": best_match["answer"],
-                    "sources": best_match["sources"],
-                    "confidence": best_match["confidence"],
-                    "similarity": float(best_similarity),
-                }
+        Args:
+            force: Sync even if the last sync is recent
 
-            return None
+        Returns:
+            Number of questions (re-)encoded
+        """
+        if not self.pool:
+            return 0
+
+        async with self._index_lock:
+            if (
+                not force
+                and self.index is not None
+                and self._index_synced_at is not None
+                and time.monotonic() - self._index_synced_at < self.index_refresh_s
+            ):
+                return 0
+
+            if self.index is None:
+                self.index = (
+                    await asyncio.to_thread(GoldenAnswerIndex.load, self.index_path)
+                    if self.index_path
+                    else GoldenAnswerIndex()
+                )
+            index = self.index
 
-        except Exception as e:
-            logger.error(f"❌ Semantic lookup failed: {e}")
-            return None
+            full_sync = index.watermark is None
+            async with self.pool.acquire() as conn:
+                if full_sync:
+                    rows = await conn.fetch(
+                        """
+                        SELECT cluster_id, canonical_question, updated_at
+                        FROM golden_answers
+                    """
+                    )
+                    total = len(rows)
+                else:
+                    # >=: rows sharing the watermark timestamp may not all be applied
+                    rows = await conn.fetch(
+                        """
+                        SELECT cluster_id, canonical_question, updated_at
+                        FROM golden_answers
+                        WHERE updated_at >= $1
+                    """,
+                        index.watermark,
+                    )
+                    total = await conn.fetchval("SELECT COUNT(*) FROM golden_answers")
+
+            stale = []
+            for row in rows:
+                question_hash = _question_hash(row["canonical_question"])
+                if not index.is_current(row["cluster_id"], question_hash):
+                    stale.append((row["cluster_id"], question_hash, row["canonical_question"]))
+
+            if stale:
+                self._load_model()
+                vectors = await asyncio.to_thread(
+                    self.model.encode, [question for _, _, question in stale]
+                )
+                index.upsert(
+                    [cluster_id for cluster_id, _, _ in stale],
+                    [question_hash for _, question_hash, _ in stale],
+                    vectors,
+                )
+
+            # Deleted answers: the index holds clusters the table no longer has
+            removed = 0
+            if full_sync:
+                removed = index.retain({row["cluster_id"] for row in rows})
+            elif total is not None and total != len(index):
+                async with self.pool.acquire() as conn:
+                    live = await conn.fetch("SELECT cluster_id FROM golden_answers")
+                removed = index.retain({row["cluster_id"] for row in live})
+
+            updated = [row["updated_at"] for row in rows if row.get("updated_at")]
+            if updated:
+                index.watermark = max([*updated, index.watermark] if index.watermark else updated)
+            self._index_synced_at = time.monotonic()
+
+            if stale or removed:
+                logger.info(
+                    f"🔄 Golden answer index synced: {len(stale)} encoded, "
+                    f"{removed} removed, {len(index)} total"
+                )
+                if self.index_path:
+                    await asyncio.to_thread(index.save, self.index_path)
+
+            return len(stale)
 
     async def _increment_usage(self, cluster_id: str):
         """
@@ -0,0 +1,518 @@
+"""
+ZANTARA RAG - Batch Ingestion Pipeline
+Parallel, resumable directory ingestion: parse → chunk → embed → store
+
+Documents are parsed in a process pool while earlier documents are being embedded
+and stored. Chunks are embedded in fixed-size batches that span documents and
+upserted in bounded requests. Stages are linked by bounded queues, so a slow
+stage throttles the ones before it instead of piling parsed text up in memory.
+Finished files are recorded in a JSON manifest, which lets an interrupted batch
+resume and lets skip_existing skip files that have not changed. Within a changed
+file only chunks with new text are embedded (see core.chunk_manifest).
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from core.cache import invalidate_collection
+from core.chunk_manifest import (
+    ChunkSyncPlan,
+    delete_vanished_chunks,
+    prepare_chunk_sync,
+    update_relabeled_chunks,
+)
+from core.parsers import auto_detect_and_parse, get_document_info
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".ingest_manifest.json"
+
+_DONE = object()  # Queue sentinel: no more items
+
+
+def _parse_document(file_path: str) -> tuple[str, dict[str, Any]]:
+    """Parse a document and read its info (runs in a worker process)"""
+    return auto_detect_and_parse(file_path), get_document_info(file_path)
+
+
+def _failed_result(file_path: str, error: Exception | str) -> dict[str, Any]:
+    return {
+        "success": False,
+        "book_title": Path(file_path).stem,
+        "book_author": "Unknown",
+        "tier": "Unknown",
+        "chunks_created": 0,
+        "message": "Ingestion failed",
+        "error": str(error),
+    }
+
+
+class IngestionManifest:
+    """
+    Per-directory record of ingested files.
+
+    A file counts as ingested while its size and mtime match the fingerprint
+    stored when it was processed. The manifest is rewritten atomically after
+    every finished document, so a crash loses at most the documents in flight.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Args:
+            path: JSON file holding the manifest (created on first save)
+        """
+        self.path = Path(path)
+        self.entries: dict[str, dict[str, Any]] = self._load()
+
+    @staticmethod
+    def fingerprint(file_path: str) -> str:
+        """Cheap change detector for a file: size and modification time"""
+        stat = os.stat(file_path)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            files = data.get("files", {}) if isinstance(data, dict) else {}
+            return files if isinstance(files, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable ingestion manifest {self.path}: {e}")
+            return {}
+
+    def get_done(self, file_path: str, fingerprint: str) -> dict[str, Any] | None:
+        """Return the entry of a successfully ingested, unchanged file (else None)"""
+        entry = self.entries.get(file_path)
+        if entry and entry.get("status") == "done" and entry.get("fingerprint") == fingerprint:
+            return entry
+        return None
+
+    def record(self, file_path: str, fingerprint: str, result: dict[str, Any]):
+        """Store the outcome of a file and persist the manifest"""
+        self.entries[file_path] = {
+            "fingerprint": fingerprint,
+            "status": "done" if result.get("success") else "failed",
+            "book_title": result.get("book_title"),
+            "book_author": result.get("book_author"),
+            "tier": result.get("tier"),
+            "chunks_created": result.get("chunks_created", 0),
+            "error": result.get("error"),
+            "updated_at": time.time(),
+        }
+        self.save()
+
+    def save(self):
+        """Write the manifest atomically (failures are logged, not raised)"""
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "files": self.entries}, f, indent=2, default=str)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save ingestion manifest {self.path}: {e}")
+
+
+@dataclass
+class _DocumentJob:
+    """A document travelling through the embed/store stages"""
+
+    file_path: str
+    fingerprint: str
+    book_title: str
+    book_author: str
+    tier: str
+    plan: ChunkSyncPlan
+    remaining: int
+    errors: list[str] = field(default_factory=list)
+
+
+class IngestionPipeline:
+    """
+    Staged batch ingestion on top of IngestionService.
+
+    parse (process pool) → chunk (thread) → embed (batched) → upsert (chunked)
+    """
+
+    def __init__(
+        self,
+        service,
+        manifest_path: str | Path | None = None,
+        parse_workers: int | None = None,
+        embed_batch_size: int | None = None,
+        upsert_batch_size: int | None = None,
+        queue_size: int | None = None,
+    ):
+        """
+        Args:
+            service: IngestionService providing chunker, embedder, vector_db, classifier
+            manifest_path: Manifest file (None = no persistence across runs)
+            parse_workers: Parsing processes (0 = parse in threads)
+            embed_batch_size: Chunks per embedding call
+            upsert_batch_size: Points per vector store upsert
+            queue_size: Parsed documents allowed to wait for embedding
+        """
+        self.service = service
+        self.manifest = IngestionManifest(manifest_path) if manifest_path else None
+        self.parse_workers = (
+            settings.ingest_parse_workers if parse_workers is None else parse_workers
+        )
+        self.embed_batch_size = max(1, embed_batch_size or settings.ingest_embed_batch_size)
+        self.upsert_batch_size = max(1, upsert_batch_size or settings.ingest_upsert_batch_size)
+        self.queue_size = max(1, queue_size or settings.ingest_queue_size)
+        self._legal_service = None
+        self.stats = {
+            "parsed": 0,
+            "skipped": 0,
+            "embed_batches": 0,
+            "upserts": 0,
+            "points": 0,
+            "unchanged_chunks": 0,
+            "relabeled_points": 0,
+            "deleted_points": 0,
+        }
+
+    async def run(self, files: list[str], skip_existing: bool = True) -> list[dict[str, Any]]:
+        """
+        Ingest files, returning one ingest_book-style result per file (input order).
+
+        Args:
+            files: Paths of the documents to ingest
+            skip_existing: Skip files already ingested (unchanged per the manifest, or
+                found in the vector store when the manifest has never seen them)
+
+        Returns:
+            List of result dictionaries
+        """
+        files = list(dict.fromkeys(str(f) for f in files))
+        results: dict[str, dict[str, Any]] = {}
+        pending: list[tuple[str, str]] = []
+
+        for file_path in files:
+            try:
+                fingerprint = IngestionManifest.fingerprint(file_path)
+            except OSError as e:
+                results[file_path] = _failed_result(file_path, e)
+                continue
+
+            entry = await self._existing_entry(file_path, fingerprint) if skip_existing else None
+            if entry:
+                self.stats["skipped"] += 1
+                results[file_path] = self._skipped_result(file_path, entry)
+            else:
+                pending.append((file_path, fingerprint))
+
+        if pending:
+            logger.info(
+                f"🚀 Batch ingestion: {len(pending)} to process, {self.stats['skipped']} skipped"
+            )
+            await self._run_stages(pending, results)
+
+        return [results[f] for f in files]
+
+    async def _existing_entry(self, file_path: str, fingerprint: str) -> dict[str, Any] | None:
+        """
+        Find evidence that a file is already ingested.
+
+        The manifest is authoritative for files it knows. Files it has never seen
+        (e.g. ingested before the manifest existed) are looked up in the vector store.
+        """
+        if self.manifest and file_path in self.manifest.entries:
+            return self.manifest.get_done(file_path, fingerprint)
+
+        try:
+            count = await asyncio.to_thread(self.service.vector_db.count, {"file_path": file_path})
+        except Exception as e:
+            logger.warning(f"⚠️ Could not check existing points for {file_path}: {e}")
+            return None
+        if not isinstance(count, int) or count <= 0:
+            return None
+
+        entry = {"book_title": Path(file_path).stem, "chunks_created": count}
+        if self.manifest:
+            self.manifest.record(file_path, fingerprint, {"success": True, **entry})
+        return entry
+
+    @staticmethod
+    def _skipped_result(file_path: str, entry: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "success": True,
+            "book_title": entry.get("book_title") or Path(file_path).stem,
+            "book_author": entry.get("book_author") or "Unknown",
+            "tier": entry.get("tier") or "Unknown",
+            "chunks_created": entry.get("chunks_created", 0),
+            "message": "Skipped: already ingested and unchanged",
+            "error": None,
+        }
+
+    def _create_executor(self) -> Executor | None:
+        if self.parse_workers <= 0:
+            return None  # loop default thread pool
+        # spawn: forking a process that runs an event loop and model threads is unsafe
+        return ProcessPoolExecutor(
+            max_workers=self.parse_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    async def _run_stages(self, pending: list[tuple[str, str]], results: dict[str, dict[str, Any]]):
+        file_queue: asyncio.Queue = asyncio.Queue()
+        for item in pending:
+            file_queue.put_nowait(item)
+
+        doc_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        upsert_queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        executor = self._create_executor()
+        parser_count = max(1, min(self.parse_workers or 1, len(pending)))
+
+        def finish(file_path: str, fingerprint: str, result: dict[str, Any]):
+            results[file_path] = result
+            if self.manifest:
+                self.manifest.record(file_path, fingerprint, result)
+            status = "✅" if result["success"] else "❌"
+            logger.info(f"{status} {Path(file_path).name}: {result['message']}")
+
+        async def close_parsing(parsers: list[asyncio.Task]):
+            await asyncio.gather(*parsers)
+            await doc_queue.put(_DONE)
+
+        try:
+            parsers = [
+                asyncio.create_task(self._parse_worker(file_queue, doc_queue, executor, finish))
+                for _ in range(parser_count)
+            ]
+            await self._supervise(
+                [
+                    *parsers,
+                    asyncio.create_task(close_parsing(parsers)),
+                    asyncio.create_task(self._embed_worker(doc_queue, upsert_queue, finish)),
+                    asyncio.create_task(self._upsert_worker(upsert_queue, finish)),
+                ]
+            )
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        if self.stats["points"] or self.stats["relabeled_points"] or self.stats["deleted_points"]:
+            invalidate_collection(self.service.vector_db.collection_name)
+
+    @staticmethod
+    async def _supervise(tasks: list[asyncio.Task]):
+        """
+        Wait for all stage tasks. The first one to fail cancels the others and its
+        exception propagates, so no stage is left blocked on a queue nobody drains.
+        """
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _get_legal_service(self):
+        """LegalIngestionService shared by all legal documents of the batch (created lazily)"""
+        if self._legal_service is None:
+            from services.legal_ingestion_service import LegalIngestionService
+
+            self._legal_service = LegalIngestionService()
+        return self._legal_service
+
+    async def _parse_worker(self, file_queue, doc_queue, executor, finish):
+        """Parse, route and chunk documents until the file queue is empty"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                file_path, fingerprint = file_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            try:
+                text, doc_info = await loop.run_in_executor(executor, _parse_document, file_path)
+                self.stats["parsed"] += 1
+
+                if self.service._is_legal_text(text):
+                    logger.info("📜 Legal document detected - routing to LegalIngestionService")
+                    # Already parsed by the pool: pass the text instead of parsing again
+                    result = await self._get_legal_service().ingest_legal_document(
+                        file_path=file_path, text=text
+                    )
+                    finish(file_path, fingerprint, self._normalize(file_path, result))
+                    continue
+
+                prepared = await asyncio.to_thread(
+                    self.service.prepare_chunks, file_path, text, doc_info
+                )
+                plan = await asyncio.to_thread(
+                    prepare_chunk_sync,
+                    self.service.vector_db,
+                    file_path,
+                    prepared["chunk_texts"],
+                    prepared["metadatas"],
+                )
+            except Exception as e:
+                logger.error(f"❌ Error preparing {file_path}: {e}")
+                finish(file_path, fingerprint, _failed_result(file_path, e))
+                continue
+
+            # Blocks while the embed stage is behind (backpressure)
+            await doc_queue.put((file_path, fingerprint, prepared, plan))
+
+    async def _embed_worker(self, doc_queue, upsert_queue, finish):
+        """Embed chunks in fixed-size batches spanning document boundaries"""
+        texts: list[str] = []
+        metadatas: list[dict[str, Any]] = []
+        ids: list[str] = []
+        owners: list[_DocumentJob] = []
+
+        async def flush():
+            if not texts:
+                return
+            batch = (texts[:], metadatas[:], ids[:], owners[:])
+            for buffer in (texts, metadatas, ids, owners):
+                buffer.clear()
+
+            self.stats["embed_batches"] += 1
+            try:
+                embeddings = await asyncio.to_thread(
+                    self.service.embedder.generate_embeddings, batch[0]
+                )
+                if len(embeddings) != len(batch[0]):
+                    raise ValueError(f"Expected {len(batch[0])} embeddings, got {len(embeddings)}")
+            except Exception as e:
+                logger.error(f"❌ Embedding batch failed: {e}")
+                await self._complete(batch[3], finish, error=str(e))
+                return
+            await upsert_queue.put((batch[0], embeddings, batch[1], batch[2], batch[3]))
+
+        while True:
+            item = await doc_queue.get()
+            if item is _DONE:
+                await flush()
+                await upsert_queue.put(_DONE)
+                return
+
+            file_path, fingerprint, prepared, plan = item
+            tier = prepared["tier"]
+            job = _DocumentJob(
+                file_path=file_path,
+                fingerprint=fingerprint,
+                book_title=prepared["book_title"],
+                book_author=prepared["book_author"],
+                tier=getattr(tier, "value", tier),
+                plan=plan,
+                remaining=len(plan.changed),
+            )
+            self.stats["unchanged_chunks"] += plan.unchanged
+            if not plan.changed:
+                await self._finish_job(job, finish)
+                continue
+
+            for index in plan.changed:
+                texts.append(prepared["chunk_texts"][index])
+                metadatas.append(plan.metadatas[index])
+                ids.append(plan.ids[index])
+                owners.append(job)
+                if len(texts) >= self.embed_batch_size:
+                    await flush()
+
+    async def _upsert_worker(self, upsert_queue, finish):
+        """Store embedded batches in bounded upsert requests"""
+        while True:
+            item = await upsert_queue.get()
+            if item is _DONE:
+                return
+
+            texts, embeddings, metadatas, ids, owners = item
+            for start in range(0, len(texts), self.upsert_batch_size):
+                end = start + self.upsert_batch_size
+                error = None
+                try:
+                    response = await asyncio.to_thread(
+                        self.service.vector_db.upsert_documents,
+                        chunks=texts[start:end],
+                        embeddings=embeddings[start:end],
+                        metadatas=metadatas[start:end],
+                        ids=ids[start:end],
+                    )
+                    if isinstance(response, dict) and response.get("success") is False:
+                        error = response.get("error") or "Upsert failed"
+                    else:
+                        self.stats["upserts"] += 1
+                        self.stats["points"] += len(texts[start:end])
+                except Exception as e:
+                    error = str(e)
+                if error:
+                    logger.error(f"❌ Upsert batch failed: {error}")
+                await self._complete(owners[start:end], finish, error=error)
+
+    async def _complete(self, owners: list[_DocumentJob], finish, error: str | None = None):
+        """Account processed chunks; documents whose chunks are all processed finish"""
+        for job in owners:
+            if error and error not in job.errors:
+                job.errors.append(error)
+            job.remaining -= 1
+            if job.remaining == 0:
+                await self._finish_job(job, finish)
+
+    async def _finish_job(self, job: _DocumentJob, finish):
+        """Relabel moved chunks, delete vanished ones (once new ones are stored) and report"""
+        if not job.errors:
+            try:
+                relabeled = await asyncio.to_thread(
+                    update_relabeled_chunks, self.service.vector_db, job.plan
+                )
+                self.stats["relabeled_points"] += relabeled
+                deleted = await asyncio.to_thread(
+                    delete_vanished_chunks, self.service.vector_db, job.plan
+                )
+                self.stats["deleted_points"] += deleted
+            except Exception as e:
+                logger.error(f"❌ Could not update stored chunks of {job.file_path}: {e}")
+                job.errors.append(str(e))
+        finish(job.file_path, job.fingerprint, self._job_result(job))
+
+    @staticmethod
+    def _job_result(job: _DocumentJob) -> dict[str, Any]:
+        if job.errors:
+            return {
+                "success": False,
+                "book_title": job.book_title,
+                "book_author": job.book_author,
+                "tier": job.tier,
+                "chunks_created": 0,
+                "message": "Failed to ingest book",
+                "error": "; ".join(job.errors),
+            }
+        return {
+            "success": True,
+            "book_title": job.book_title,
+            "book_author": job.book_author,
+            "tier": job.tier,
+            "chunks_created": len(job.plan.ids),
+            "message": f"Successfully ingested {job.book_title}",
+            "error": None,
+        }
+
+    @staticmethod
+    def _normalize(file_path: str, result: dict[str, Any]) -> dict[str, Any]:
+        """Fill the fields BookIngestionResponse requires (legal results may omit some)"""
+        normalized = _failed_result(file_path, result.get("error") or "")
+        normalized.update(result)
+        normalized["error"] = result.get("error")
+        return normalized
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pipeline counters (documents parsed/skipped, batches, points stored)"""
+        return dict(self.stats)
@@ -1,13 +1,17 @@
 """
 ZANTARA RAG - Ingestion Service
 Book processing pipeline: parse → chunk → embed → store
+Re-ingestion only embeds chunks whose text changed (see core.chunk_manifest)
 Auto-routes legal documents to LegalIngestionService
 """
 
+import asyncio
 import logging
 from pathlib import Path
 from typing import Any
 
+from core.cache import invalidate_collection
+from core.chunk_manifest import sync_document_chunks
 from core.chunker import TextChunker
 from core.embeddings import EmbeddingsGenerator
 from core.parsers import auto_detect_and_parse, get_document_info
@@ -65,8 +69,12 @@ class IngestionService:
         try:
             logger.info(f"Starting ingestion for: {file_path}")
 
+            # Step 1: Parse once, off the event loop (large PDFs take minutes to extract)
+            text = await asyncio.to_thread(auto_detect_and_parse, file_path)
+            logger.info(f"Extracted {len(text)} characters")
+
             # AUTO-ROUTING: Check if this is a legal document
-            if doc_type == "legal" or self._is_legal_document(file_path):
+            if doc_type == "legal" or self._is_legal_document(file_path, text=text):
                 logger.info("📜 Legal document detected - routing to LegalIngestionService")
                 from services.legal_ingestion_service import LegalIngestionService
 
@@ -75,88 +83,34 @@ class IngestionService:
                     file_path=file_path,
                     title=title,
                     tier_override=tier_override,
+                    text=text,
                 )
 
-            # Step 1: Extract document info
+            # Step 2: Extract document info
             doc_info = get_document_info(file_path)
-            book_title = title or doc_info.get("title", Path(file_path).stem)
-            book_author = author or doc_info.get("author", "Unknown")
 
-            # Extract legal metadata if available
-            extracted_status_vigensi = (
-                status_vigensi or doc_info.get("status_vigensi") or doc_info.get("status")
+            # Steps 3-4: Classify tier and chunk text
+            prepared = self.prepare_chunks(
+                file_path,
+                text,
+                doc_info,
+                title=title,
+                author=author,
+                language=language,
+                tier_override=tier_override,
+                status_vigensi=status_vigensi,
+                wilayah=wilayah,
             )
-            extracted_wilayah = wilayah or doc_info.get("wilayah") or doc_info.get("region")
-
-            logger.info(f"Book: {book_title} by {book_author}")
-            if extracted_status_vigensi:
-                logger.info(f"Legal status: {extracted_status_vigensi}")
-            if extracted_wilayah:
-                logger.info(f"Region: {extracted_wilayah}")
-
-            # Step 2: Parse document
-            text = auto_detect_and_parse(file_path)
-            logger.info(f"Extracted {len(text)} characters")
-
-            # Step 3: Classify tier
-            if tier_override:
-                tier = tier_override
-                logger.info(f"Using manual tier override: {tier.value}")
-            else:
-                # Use first 2000 chars as content sample for classification
-                content_sample = text[:2000]
-                tier = self.classifier.classify_book_tier(book_title, book_author, content_sample)
-
-            min_level = self.classifier.get_min_access_level(tier)
-
-            # Step 4: Chunk text
-            base_metadata = {
-                "book_title": book_title,
-                "book_author": book_author,
-                "tier": tier.value,
-                "min_level": min_level,
-                "language": language,
-                "file_path": file_path,
-            }
-
-            # Add legal metadata if available
-            if extracted_status_vigensi:
-                base_metadata["status_vigensi"] = extracted_status_vigensi
-            if extracted_wilayah:
-                base_metadata["wilayah"] = extracted_wilayah
-
-            chunks = self.chunker.semantic_chunk(text, metadata=base_metadata)
-            logger.info(f"Created {len(chunks)} chunks")
-
-            # Step 5: Generate embeddings
-            chunk_texts = [chunk["text"] for chunk in chunks]
-            embeddings = self.embedder.generate_embeddings(chunk_texts)
-            logger.info(f"Generated {len(embeddings)} embeddings")
-
-            # Step 6: Prepare metadata for each chunk
-            metadatas = []
-            for chunk in chunks:
-                meta = {
-                    "book_title": book_title,
-                    "book_author": book_author,
-                    "tier": tier.value,
-                    "min_level": min_level,
-                    "chunk_index": chunk["chunk_index"],
-                    "total_chunks": chunk["total_chunks"],
-                    "language": language,
-                    "file_path": file_path,
-                }
-                # Add legal metadata if available
-                if extracted_status_vigensi:
-                    meta["status_vigensi"] = extracted_status_vigensi
-                if extracted_wilayah:
-                    meta["wilayah"] = extracted_wilayah
-                metadatas.append(meta)
-
-            # Step 7: Store in vector database
-            self.vector_db.upsert_documents(
-                chunks=chunk_texts, embeddings=embeddings, metadatas=metadatas
+            book_title = prepared["book_title"]
+            book_author = prepared["book_author"]
+            tier = prepared["tier"]
+            chunk_texts = prepared["chunk_texts"]
+
+            # Steps 5-6: Embed and store new/changed chunks, delete vanished ones
+            sync_document_chunks(
+                self.vector_db, self.embedder, file_path, chunk_texts, prepared["metadatas"]
             )
+            invalidate_collection(self.vector_db.collection_name)
 
             logger.info(f"✅ Successfully ingested: {book_title}")
 
@@ -165,7 +119,7 @@ class IngestionService:
                 "book_title": book_title,
                 "book_author": book_author,
                 "tier": tier.value,
-                "chunks_created": len(chunks),
+                "chunks_created": len(chunk_texts),
                 "message": f"Successfully ingested {book_title}",
                 "error": None,
             }
@@ -182,19 +136,139 @@ class IngestionService:
                 "error": str(e),
             }
 
-    def _is_legal_document(self, file_path: str) -> bool:
+    def prepare_chunks(
+        self,
+        file_path: str,
+        text: str,
+        doc_info: dict[str, Any],
+        title: str | None = None,
+        author: str | None = None,
+        language: str = "en",
+        tier_override: TierLevel | None = None,
+        status_vigensi: str | None = None,
+        wilayah: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Classify a parsed book and split it into chunks with per-chunk metadata.
+
+        Args:
+            file_path: Path to book file (stored in metadata)
+            text: Parsed document text
+            doc_info: Document info from get_document_info()
+            title: Book title (taken from doc_info if not provided)
+            author: Book author (taken from doc_info if not provided)
+            language: Book language code
+            tier_override: Manual tier classification (optional)
+            status_vigensi: Legal validity status (taken from doc_info if not provided)
+            wilayah: Region/territory (taken from doc_info if not provided)
+
+        Returns:
+            Dictionary with book_title, book_author, tier, chunk_texts and metadatas
+        """
+        book_title = title or doc_info.get("title", Path(file_path).stem)
+        book_author = author or doc_info.get("author", "Unknown")
+
+        # Extract legal metadata if available
+        extracted_status_vigensi = (
+            status_vigensi or doc_info.get("status_vigensi") or doc_info.get("status")
+        )
+        extracted_wilayah = wilayah or doc_info.get("wilayah") or doc_info.get("region")
+
+        logger.info(f"Book: {book_title} by {book_author}")
+        if extracted_status_vigensi:
+            logger.info(f"Legal status: {extracted_status_vigensi}")
+        if extracted_wilayah:
+            logger.info(f"Region: {extracted_wilayah}")
+
+        # Classify tier
+        if tier_override:
+            tier = tier_override
+            logger.info(f"Using manual tier override: {tier.value}")
+        else:
+            # Use first 2000 chars as content sample for classification
+            content_sample = text[:2000]
+            tier = self.classifier.classify_book_tier(book_title, book_author, content_sample)
+
+        min_level = self.classifier.get_min_access_level(tier)
+
+        # Chunk text
+        base_metadata = {
+            "book_title": book_title,
+            "book_author": book_author,
+            "tier": tier.value,
+            "min_level": min_level,
+            "language": language,
+            "file_path": file_path,
+        }
+
+        # Add legal metadata if available
+        if extracted_status_vigensi:
+            base_metadata["status_vigensi"] = extracted_status_vigensi
+        if extracted_wilayah:
+            base_metadata["wilayah"] = extracted_wilayah
+
+        chunks = self.chunker.semantic_chunk(text, metadata=base_metadata)
+        logger.info(f"Created {len(chunks)} chunks")
+
+        # Prepare metadata for each chunk
+        metadatas = []
+        for chunk in chunks:
+            meta = {
+                "book_title": book_title,
+                "book_author": book_author,
+                "tier": tier.value,
+                "min_level": min_level,
+                "chunk_index": chunk["chunk_index"],
+                "total_chunks": chunk["total_chunks"],
+                "language": language,
+                "file_path": file_path,
+            }
+            # Add legal metadata if available
+            if extracted_status_vigensi:
+                meta["status_vigensi"] = extracted_status_vigensi
+            if extracted_wilayah:
+                meta["wilayah"] = extracted_wilayah
+            metadatas.append(meta)
+
+        return {
+            "book_title": book_title,
+            "book_author": book_author,
+            "tier": tier,
+            "chunk_texts": [chunk["text"] for chunk in chunks],
+            "metadatas": metadatas,
+        }
+
+    def _is_legal_document(self, file_path: str, text: str | None = None) -> bool:
         """
         Detect if file is an Indonesian legal document.
 
         Args:
             file_path: Path to document file
+            text: Already-parsed text of the file (parsed here if missing)
+
+        Returns:
+            True if document appears to be legal
+        """
+        try:
+            return self._is_legal_text(
+                text if text is not None else auto_detect_and_parse(file_path)
+            )
+
+        except Exception as e:
+            logger.warning(f"Error detecting legal document: {e}")
+            return False
+
+    def _is_legal_text(self, text: str) -> bool:
+        """
+        Detect if already-parsed text is an Indonesian legal document.
+
+        Args:
+            text: Document text (only the first 5000 chars are inspected)
 
         Returns:
             True if document appears to be legal
         """
         try:
-            # Quick check: parse first 5000 chars
-            text = auto_detect_and_parse(file_path)
             sample = text[:5000] if len(text) > 5000 else text
 
             # Use LegalMetadataExtractor to detect
@@ -9,9 +9,18 @@ UPDATED 2025-12-04:
 - Optimized streaming
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable
 from typing import Any
 
+from app.core.config import settings
+
 # Import new Gemini Service
 from services.gemini_service import gemini_jaksel
 
@@ -24,6 +33,124 @@ from .routing import ResponseHandler, SpecializedServiceRouter
 
 logger = logging.getLogger(__name__)
 
+# RAG result used when retrieval misses its deadline
+EMPTY_RAG_RESULT = {
+    "context": None,
+    "used_rag": False,
+    "document_count": 0,
+    "docs": [],
+    "collection_used": None,
+}
+
+
+REWRITE_CACHE_SIZE = 512  # (history, query) -> rewritten query
+
+# Words that refer back to earlier turns (EN / IT / ID). Ambiguous articles
+# such as Italian "la"/"lo" are left out: they would gate nearly every query.
+_ANAPHORA_WORDS = frozenset(
+    {
+        # English
+        "it",
+        "its",
+        "itself",
+        "this",
+        "that",
+        "these",
+        "those",
+        "they",
+        "them",
+        "their",
+        "he",
+        "him",
+        "his",
+        "she",
+        "her",
+        "ones",
+        "same",
+        "former",
+        "latter",
+        "above",
+        # Italian
+        "esso",
+        "essa",
+        "essi",
+        "questo",
+        "questa",
+        "questi",
+        "queste",
+        "quello",
+        "quella",
+        "quelli",
+        "quelle",
+        "stesso",
+        "stessa",
+        "suo",
+        "sua",
+        "suoi",
+        "sue",
+        "lui",
+        "lei",
+        "loro",
+        # Indonesian
+        "itu",
+        "ini",
+        "tersebut",
+        "dia",
+        "ia",
+        "beliau",
+        "mereka",
+        "sama",
+        "tadi",
+    }
+)
+
+# Follow-ups that continue the previous question ("and for Bali?", "e per le tasse?")
+_ELLIPSIS_START = re.compile(
+    r"^(?:and|also|what about|how about|same for|e|ed|anche|invece|e per|e se|"
+    r"dan|juga|terus|lalu|kalau|bagaimana dengan|gimana dengan)\b",
+    re.IGNORECASE,
+)
+
+# Indonesian possessive suffix ("biayanya" = its cost) and common words that merely end in -nya
+_NYA_SUFFIX = re.compile(r"\w{3,}nya$")
+_NYA_WORDS = frozenset(
+    {"hanya", "punya", "sebenarnya", "biasanya", "misalnya", "sebaiknya", "seharusnya"}
+)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def needs_query_rewrite(query: str) -> bool:
+    """
+    Cheap coreference/ellipsis check for a follow-up query.
+
+    True when the query refers back to the conversation (pronouns, demonstratives,
+    Indonesian -nya), continues it ("and for Bali?"), or is a bare short question
+    ("how much?"). Errs on the side of rewriting.
+
+    Args:
+        query: User query
+
+    Returns:
+        True if the query likely needs the conversation to be understood
+    """
+    text = query.strip().lower()
+    if _ELLIPSIS_START.match(text):
+        return True
+
+    words = _WORD.findall(text)
+    for word in words:
+        if word in _ANAPHORA_WORDS:
+            return True
+        if _NYA_SUFFIX.fullmatch(word) and word not in _NYA_WORDS:
+            return True
+
+    return len(words) <= 3 and text.endswith("?")
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
 
 class IntelligentRouter:
     """
@@ -65,6 +192,18 @@ class IntelligentRouter:
         self.tool_executor = tool_executor
         self.citation_service = CitationService()
 
+        # Query rewrite cache and counters
+        self._rewrite_cache: OrderedDict[str, str] = OrderedDict()
+        self.rewrite_stats = {"skipped": 0, "cached": 0, "rewritten": 0, "failed": 0}
+
+        # Context stage deadlines (seconds); the rewrite deadline is its latency budget
+        self.stage_timeouts = {
+            "rewrite": settings.timeout_query_rewrite,
+            "rag": settings.timeout_rag_query,
+            "cultural": settings.timeout_context_source,
+            "crm": settings.timeout_context_source,
+        }
+
         logger.info("🎯 [IntelligentRouter] Initialized (GEMINI JAKSEL NATIVE)")
 
     async def _prepare_routing_context(
@@ -78,54 +217,17 @@ class IntelligentRouter:
         """
         Unified context preparation logic for both route_chat and stream_chat.
         Returns a dictionary containing all necessary context and metadata.
-        """
-        # STEP 0: Fast Intent Classification
-        intent = await self.classifier.classify_intent(message)
-        category = intent["category"]
-        logger.info(f"📋 [Router] Classification: {category}")
-
-        # STEP 0.5: Detect special query types
-        is_identity_query = self.context_builder.detect_identity_query(message)
-        is_zantara_query = self.context_builder.detect_zantara_query(message)
-        is_team_query = self.context_builder.detect_team_query(message)
-
-        if is_identity_query:
-            category = "identity"
-        elif is_zantara_query:
-            category = "zantara_identity"
-        elif is_team_query:
-            category = "team_query"
-
-        # STEP 3: Classify query type for RAG
-        query_type = (
-            category
-            if category in ["identity", "team_query", "zantara_identity"]
-            else self.response_handler.classify_query(message)
-        )
-
-        # STEP 4: Build identity context
-        identity_context = None
-        if collaborator and hasattr(collaborator, "id") and collaborator.id != "anonymous":
-            identity_context = self.context_builder.build_identity_context(collaborator)
 
-        # STEP 5: Query Rewriting
-        search_query = await self._rewrite_query_for_search(message, conversation_history)
-
-        # STEP 6: RAG retrieval
-        force_collection = "bali_zero_team" if category in ["identity", "team_query"] else None
-        rag_limit = 10 if query_type in ["business", "emergency"] else 5
-        rag_result = await self.rag_manager.retrieve_context(
-            query=search_query,
-            query_type=query_type,
-            user_level=0,
-            limit=rag_limit,
-            force_collection=force_collection,
-        )
-
-        # STEP 7-10: Build other contexts (Memory, Team, Cultural, CRM)
-        memory_context = self.context_builder.build_memory_context(memory)
-        team_context = self.context_builder.build_team_context(collaborator)
-        cultural_context = await self._get_cultural_context(message, conversation_history)
+        Context sources run as a task graph: classification and query rewriting
+        run side by side, RAG starts once both are done, and cultural and CRM
+        context are fetched concurrently with all of it. Rewrite, RAG, cultural
+        and CRM each have a deadline; a source that misses it is left out
+        (rewrite falls back to the original message). Per-stage timings are
+        returned in metadata["timings_ms"].
+        """
+        started = time.perf_counter()
+        timings: dict[str, float] = {}
+        timed_out: list[str] = []
 
         # Build CRM context from user email
         user_email = None
@@ -134,10 +236,87 @@ class IntelligentRouter:
         elif isinstance(user_id, str) and "@" in user_id:
             user_email = user_id
 
-        crm_context = self.context_builder.build_crm_context(user_email)
+        # Independent roots of the graph
+        classify_task = asyncio.create_task(
+            self._timed_stage("classify", self._classify_for_routing(message), timings, timed_out)
+        )
+        rewrite_task = asyncio.create_task(
+            self._timed_stage(
+                "rewrite",
+                self._rewrite_query_for_search(message, conversation_history),
+                timings,
+                timed_out,
+                timeout=self.stage_timeouts["rewrite"],
+                fallback=message,
+            )
+        )
+        cultural_task = asyncio.create_task(
+            self._timed_stage(
+                "cultural",
+                self._get_cultural_context(message, conversation_history),
+                timings,
+                timed_out,
+                timeout=self.stage_timeouts["cultural"],
+            )
+        )
+        crm_task = asyncio.create_task(
+            self._timed_stage(
+                "crm",
+                self.context_builder.build_crm_context_async(user_email),
+                timings,
+                timed_out,
+                timeout=self.stage_timeouts["crm"],
+            )
+        )
+
+        async def retrieve_rag() -> dict:
+            # STEP 5-6: RAG retrieval on the rewritten query, once the intent is known
+            (category, query_type, _), search_query = await asyncio.gather(
+                classify_task, rewrite_task
+            )
+            force_collection = "bali_zero_team" if category in ["identity", "team_query"] else None
+            rag_limit = 10 if query_type in ["business", "emergency"] else 5
+            return await self._timed_stage(
+                "rag",
+                self.rag_manager.retrieve_context(
+                    query=search_query,
+                    query_type=query_type,
+                    user_level=0,
+                    limit=rag_limit,
+                    force_collection=force_collection,
+                ),
+                timings,
+                timed_out,
+                timeout=self.stage_timeouts["rag"],
+                fallback=dict(EMPTY_RAG_RESULT),
+            )
+
+        rag_task = asyncio.create_task(retrieve_rag())
+        tasks = [classify_task, rewrite_task, cultural_task, crm_task, rag_task]
 
-        # Build backend services context
+        # STEP 4, 7-8: In-memory contexts are built while the I/O stages are in flight
+        local_started = time.perf_counter()
+        identity_context = None
+        if collaborator and hasattr(collaborator, "id") and collaborator.id != "anonymous":
+            identity_context = self.context_builder.build_identity_context(collaborator)
+        memory_context = self.context_builder.build_memory_context(memory)
+        team_context = self.context_builder.build_team_context(collaborator)
         backend_services_context = self.context_builder.build_backend_services_context()
+        timings["local"] = _elapsed_ms(local_started)
+
+        try:
+            (
+                (category, _, is_zantara_query),
+                _,
+                cultural_context,
+                crm_context,
+                rag_result,
+            ) = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
 
         # Combine contexts
         combined_context = self.context_builder.combine_contexts(
@@ -151,6 +330,8 @@ class IntelligentRouter:
             backend_services_context=backend_services_context,
             crm_context=crm_context,
         )
+        timings["total"] = _elapsed_ms(started)
+        logger.info(f"⏱️ [Router] Context ready in {timings['total']}ms: {timings}")
 
         return {
             "combined_context": combined_context,
@@ -169,9 +350,76 @@ class IntelligentRouter:
                     for doc in rag_result.get("docs", [])
                 ],
                 "intent": category,
+                "timings_ms": timings,
+                "timed_out": timed_out,
             },
         }
 
+    async def _classify_for_routing(self, message: str) -> tuple[str, str, bool]:
+        """
+        Intent category and RAG query type of a message.
+
+        Returns:
+            (category, query_type, is_zantara_query)
+        """
+        # STEP 0: Fast Intent Classification
+        intent = await self.classifier.classify_intent(message)
+        category = intent["category"]
+        logger.info(f"📋 [Router] Classification: {category}")
+
+        # STEP 0.5: Detect special query types
+        is_identity_query = self.context_builder.detect_identity_query(message)
+        is_zantara_query = self.context_builder.detect_zantara_query(message)
+        is_team_query = self.context_builder.detect_team_query(message)
+
+        if is_identity_query:
+            category = "identity"
+        elif is_zantara_query:
+            category = "zantara_identity"
+        elif is_team_query:
+            category = "team_query"
+
+        # STEP 3: Classify query type for RAG
+        query_type = (
+            category
+            if category in ["identity", "team_query", "zantara_identity"]
+            else self.response_handler.classify_query(message)
+        )
+        return category, query_type, is_zantara_query
+
+    async def _timed_stage(
+        self,
+        name: str,
+        coro: Awaitable,
+        timings: dict[str, float],
+        timed_out: list[str],
+        timeout: float | None = None,
+        fallback: Any = None,
+    ) -> Any:
+        """
+        Await one context stage, recording its duration.
+
+        Args:
+            name: Stage name (key in timings)
+            coro: Stage coroutine
+            timings: Stage durations in ms, updated in place
+            timed_out: Names of stages that missed their deadline, updated in place
+            timeout: Deadline in seconds (None = no deadline)
+            fallback: Result when the deadline is missed
+
+        Returns:
+            Stage result, or fallback on timeout (other errors propagate)
+        """
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(coro, timeout) if timeout else await coro
+        except asyncio.TimeoutError:
+            timed_out.append(name)
+            logger.warning(f"⏱️ [Router] {name} timed out after {timeout}s, continuing without it")
+            return fallback
+        finally:
+            timings[name] = _elapsed_ms(started)
+
     async def route_chat(
         self,
         message: str,
@@ -287,16 +535,33 @@ class IntelligentRouter:
     ) -> str:
         """
         Rewrite query using Gemini to include context from history for better RAG retrieval.
+
+        The LLM is only called when needs_query_rewrite() finds a coreference or
+        ellipsis; rewrites are cached per (recent history, query). The latency
+        budget is the "rewrite" stage deadline in _prepare_routing_context.
         """
         if not conversation_history:
             return query
 
+        if not needs_query_rewrite(query):
+            self.rewrite_stats["skipped"] += 1
+            logger.debug(f"🔄 [Router] Query is standalone, skipping rewrite: '{query}'")
+            return query
+
+        recent_history = conversation_history[-3:]
+        cache_key = self._rewrite_cache_key(recent_history, query)
+        cached = self._rewrite_cache.get(cache_key)
+        if cached is not None:
+            self._rewrite_cache.move_to_end(cache_key)
+            self.rewrite_stats["cached"] += 1
+            return cached
+
         try:
             # Simple rewriting prompt
             rewrite_prompt = f"""Rewrite the following user query to be a standalone search query, resolving any coreferences (like 'it', 'that', 'he') based on the conversation history.
 
             History:
-            {str(conversation_history[-3:]) if conversation_history else "None"}
+            {str(recent_history)}
 
             User Query: {query}
 
@@ -310,12 +575,25 @@ class IntelligentRouter:
 
             # Clean up response
             cleaned = rewritten.strip().replace("Standalone Query:", "").strip().strip('"')
+            if not cleaned:
+                return query
             logger.info(f"🔄 [Router] Rewrote query: '{query}' -> '{cleaned}'")
+
+            self._rewrite_cache[cache_key] = cleaned
+            if len(self._rewrite_cache) > REWRITE_CACHE_SIZE:
+                self._rewrite_cache.popitem(last=False)
+            self.rewrite_stats["rewritten"] += 1
             return cleaned
         except Exception as e:
+            self.rewrite_stats["failed"] += 1
             logger.warning(f"⚠️ [Router] Query rewriting failed: {e}. Using original query.")
             return query
 
+    @staticmethod
+    def _rewrite_cache_key(recent_history: list[dict], query: str) -> str:
+        history = json.dumps(recent_history, sort_keys=True, default=str)
+        return hashlib.sha256(f"{history}\x00{query}".encode()).hexdigest()
+
     async def _get_cultural_context(
         self, message: str, conversation_history: list[dict] | None  # noqa: ARG002
     ) -> str | None:
@@ -334,4 +612,5 @@ class IntelligentRouter:
             "router": "gemini_jaksel_router",
             "model": gemini_jaksel.model_name,
             "rag_available": self.rag_manager.search is not None,
+            "query_rewrite": dict(self.rewrite_stats),
         }
@@ -0,0 +1,94 @@
+"""
+ZANTARA RAG - Keyword Matcher
+Aho–Corasick multi-pattern matching over named keyword groups
+
+Finds every keyword of every group occurring as a substring of a text in a single
+pass, so routing cost no longer grows with the number of keywords.
+"""
+
+from collections import deque
+from collections.abc import Iterable
+
+
+class KeywordMatcher:
+    """
+    Compiled substring matcher for named keyword groups.
+
+    match(text) returns, per group, the keywords of that group contained in text,
+    in group order (duplicates in a group are reported twice) - i.e. exactly
+    `[kw for kw in group if kw in text]`, computed with one scan of text.
+    """
+
+    def __init__(self, groups: dict[str, Iterable[str]]):
+        """
+        Args:
+            groups: Group name -> keywords (matched case-sensitively; lowercase both sides)
+        """
+        self.groups = {name: list(keywords) for name, keywords in groups.items()}
+
+        # keyword -> [(group, position in group)]
+        self._occurrences: dict[str, list[tuple[str, int]]] = {}
+        for name, keywords in self.groups.items():
+            for position, keyword in enumerate(keywords):
+                if keyword:
+                    self._occurrences.setdefault(keyword, []).append((name, position))
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[str]] = [[]]
+        for keyword in self._occurrences:
+            self._add(keyword)
+        self._build_failure_links()
+
+    def _add(self, keyword: str):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(keyword)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # Inherit keywords ending at the failure state (suffix matches)
+                self._output[next_state] = (
+                    self._output[next_state] + self._output[self._fail[next_state]]
+                )
+
+    def find(self, text: str) -> set[str]:
+        """Return the set of keywords (from any group) occurring in text"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found: set[str] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def match(self, text: str) -> dict[str, list[str]]:
+        """Return the matched keywords of every group (empty list if none)"""
+        positions: dict[str, list[int]] = {name: [] for name in self.groups}
+        for keyword in self.find(text):
+            for name, position in self._occurrences[keyword]:
+                positions[name].append(position)
+
+        return {
+            name: [self.groups[name][position] for position in sorted(found)]
+            for name, found in positions.items()
+        }
@@ -3,12 +3,21 @@ Legal Ingestion Service
 Specialized ingestion pipeline for Indonesian legal documents
 """
 
+import asyncio
 import logging
 from pathlib import Path
 from typing import Any
 
+from core.cache import invalidate_collection
+from core.chunk_manifest import sync_document_chunks
 from core.embeddings import EmbeddingsGenerator
-from core.legal import LegalChunker, LegalCleaner, LegalMetadataExtractor, LegalStructureParser
+from core.legal import (
+    LegalChunker,
+    LegalCleaner,
+    LegalMetadataExtractor,
+    LegalStructureParser,
+    LegalTokenizer,
+)
 from core.parsers import auto_detect_and_parse
 from core.qdrant_db import QdrantClient
 from utils.tier_classifier import TierClassifier
@@ -32,6 +41,7 @@ class LegalIngestionService:
             collection_name: Qdrant collection name for legal documents
         """
         self.cleaner = LegalCleaner()
+        self.tokenizer = LegalTokenizer()
         self.metadata_extractor = LegalMetadataExtractor()
         self.structure_parser = LegalStructureParser()
         self.chunker = LegalChunker()
@@ -47,6 +57,7 @@ class LegalIngestionService:
         title: str | None = None,
         tier_override: TierLevel | None = None,
         collection_name: str | None = None,
+        text: str | None = None,
     ) -> dict[str, Any]:
         """
         Ingest a legal document through the complete pipeline.
@@ -65,6 +76,7 @@ class LegalIngestionService:
             title: Document title (auto-extracted if not provided)
             tier_override: Manual tier classification (optional)
             collection_name: Override collection name (optional)
+            text: Already extracted document text (skips stage 1 when the caller parsed it)
 
         Returns:
             Dictionary with ingestion results
@@ -76,16 +88,22 @@ class LegalIngestionService:
             if collection_name:
                 self.vector_db = QdrantClient(collection_name=collection_name)
 
-            # STAGE 1: Parse document
-            raw_text = auto_detect_and_parse(file_path)
+            # STAGE 1: Parse document (unless the caller already did)
+            if text is None:
+                raw_text = await asyncio.to_thread(auto_detect_and_parse, file_path)
+            else:
+                raw_text = text
             logger.info(f"Extracted {len(raw_text)} characters from document")
 
             # STAGE 2: Clean (The Washer)
             cleaned_text = self.cleaner.clean(raw_text)
             logger.info(f"Cleaned text: {len(cleaned_text)} characters")
 
+            # Scan structural markers once; stages 3, 4 and 6 work on these offsets
+            tokens = self.tokenizer.tokenize(cleaned_text)
+
             # STAGE 3: Extract Metadata (The Librarian)
-            metadata = self.metadata_extractor.extract(cleaned_text)
+            metadata = self.metadata_extractor.extract(cleaned_text, tokens=tokens)
 
             # HYBRID EXTRACTION: Fallback to Vertex AI if Pattern Extraction fails
             if not metadata or metadata.get("type") == "UNKNOWN":
@@ -126,7 +144,7 @@ class LegalIngestionService:
             document_title = title or metadata.get("full_title", Path(file_path).stem)
 
             # STAGE 4: Parse Structure (The Architect)
-            structure = self.structure_parser.parse(cleaned_text)
+            structure = self.structure_parser.parse(cleaned_text, tokens=tokens)
             logger.info(
                 f"Parsed structure: {len(structure.get('batang_tubuh', []))} BAB, "
                 f"{len(structure.get('pasal_list', []))} Pasal"
@@ -162,7 +180,7 @@ class LegalIngestionService:
                 "legal_status": metadata.get("status"),
             }
 
-            chunks = self.chunker.chunk(cleaned_text, metadata, structure)
+            chunks = self.chunker.chunk(cleaned_text, metadata, structure, tokens=tokens)
             logger.info(f"Created {len(chunks)} legal chunks (Pasal-aware)")
 
             if not chunks:
@@ -175,12 +193,8 @@ class LegalIngestionService:
                     "error": "Chunking produced no results",
                 }
 
-            # STAGE 7: Generate embeddings
+            # STAGE 7: Prepare metadata for each chunk
             chunk_texts = [chunk["text"] for chunk in chunks]
-            embeddings = self.embedder.generate_embeddings(chunk_texts)
-            logger.info(f"Generated {len(embeddings)} embeddings")
-
-            # STAGE 8: Prepare metadata for each chunk
             metadatas = []
             for chunk in chunks:
                 meta = {
@@ -208,10 +222,9 @@ class LegalIngestionService:
 
                 metadatas.append(meta)
 
-            # STAGE 9: Store in vector database
-            self.vector_db.upsert_documents(
-                chunks=chunk_texts, embeddings=embeddings, metadatas=metadatas
-            )
+            # STAGE 8: Embed and store new/changed chunks, delete vanished ones
+            sync_document_chunks(self.vector_db, self.embedder, file_path, chunk_texts, metadatas)
+            invalidate_collection(self.vector_db.collection_name)
 
             logger.info(f"✅ Successfully ingested legal document: {document_title}")
 
@@ -10,8 +10,11 @@ Phase 3 Enhancement: Smart Fallback Chain Agent
 """
 
 import logging
+from collections import OrderedDict
 from typing import Literal
 
+from services.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 # Phase 2/3: Extended collection support (5 → 15 collections with Oracle + expanded KBLI/Legal/Tax + Team)
@@ -438,6 +441,74 @@ class QueryRouter:
         "literature",
     ]
 
+    # Priority overrides (checked before domain scoring)
+    IDENTITY_PATTERNS = [
+        "chi sono",
+        "who am i",
+        "siapa saya",
+        "mi conosci",
+        "cosa sai di me",
+        "il mio nome",
+        "my name",
+        "my role",
+        "sai chi sono",
+        "do you know me",
+        "recognize me",
+        "mi riconosci",
+        "kenal saya",
+        "chi sono io",
+    ]
+
+    TEAM_OVERRIDE_PATTERNS = [
+        "membri",
+        "team",
+        "colleghi",
+        "quanti siamo",
+        "chi lavora",
+        "team members",
+        "colleagues",
+        "who works",
+        "conosci i membri",
+        "know the members",
+        "dipartimento",
+        "department",
+    ]
+
+    FOUNDER_KEYWORDS = ["fondatore", "founder"]
+
+    # Property sub-routing: listing intent → property_listings
+    LISTING_KEYWORDS = [
+        "for sale",
+        "dijual",
+        "listing",
+        "available",
+        "rent",
+        "sewa",
+        "lease",
+    ]
+
+    # Keyword groups compiled into one matcher (group name → class attribute)
+    MATCHER_GROUPS = {
+        "identity": "IDENTITY_PATTERNS",
+        "team_override": "TEAM_OVERRIDE_PATTERNS",
+        "founder": "FOUNDER_KEYWORDS",
+        "backend_services": "BACKEND_SERVICES_KEYWORDS",
+        "visa": "VISA_KEYWORDS",
+        "kbli": "KBLI_KEYWORDS",
+        "tax": "TAX_KEYWORDS",
+        "legal": "LEGAL_KEYWORDS",
+        "property": "PROPERTY_KEYWORDS",
+        "books": "BOOKS_KEYWORDS",
+        "team": "TEAM_KEYWORDS",
+        "team_enum": "TEAM_ENUMERATION_KEYWORDS",
+        "updates": "UPDATE_KEYWORDS",
+        "tax_genius": "TAX_GENIUS_KEYWORDS",
+        "listing": "LISTING_KEYWORDS",
+    }
+
+    # Per-query match results shared by route/route_with_confidence/get_routing_stats
+    MATCH_CACHE_SIZE = 1024
+
     # Phase 3: Smart Fallback Chains
     # Define fallback priority for each primary collection
     # Format: primary_collection -> [fallback1, fallback2, fallback3]
@@ -478,6 +549,37 @@ class QueryRouter:
             "low_confidence": 0,
             "fallbacks_used": 0,
         }
+        self._match_cache: OrderedDict[str, dict[str, list[str]]] = OrderedDict()
+
+    @classmethod
+    def _get_matcher(cls) -> KeywordMatcher:
+        """Compiled matcher over all keyword groups (built once per class)"""
+        matcher = cls.__dict__.get("_matcher")
+        if matcher is None:
+            matcher = KeywordMatcher(
+                {group: getattr(cls, attr) for group, attr in cls.MATCHER_GROUPS.items()}
+            )
+            cls._matcher = matcher
+        return matcher
+
+    def _match_keywords(self, query: str) -> dict[str, list[str]]:
+        """
+        Matched keywords per group for query (one scan, cached per normalized query).
+
+        Returns:
+            Group name → matched keywords; treat as read-only (shared via the cache)
+        """
+        query_lower = query.lower()
+        matches = self._match_cache.get(query_lower)
+        if matches is not None:
+            self._match_cache.move_to_end(query_lower)
+            return matches
+
+        matches = self._get_matcher().match(query_lower)
+        self._match_cache[query_lower] = matches
+        if len(self._match_cache) > self.MATCH_CACHE_SIZE:
+            self._match_cache.popitem(last=False)
+        return matches
 
     def route(self, query: str) -> CollectionName:
         """
@@ -503,57 +605,25 @@ class QueryRouter:
         Returns:
             Collection name from 9 available collections
         """
-        query_lower = query.lower()
+        matches = self._match_keywords(query)
 
         # PRIORITY OVERRIDE: Identity queries (highest priority)
-        identity_patterns = [
-            "chi sono",
-            "who am i",
-            "siapa saya",
-            "mi conosci",
-            "cosa sai di me",
-            "il mio nome",
-            "my name",
-            "my role",
-            "sai chi sono",
-            "do you know me",
-            "recognize me",
-            "mi riconosci",
-            "kenal saya",
-            "chi sono io",
-        ]
-        if any(pattern in query_lower for pattern in identity_patterns):
+        if matches["identity"]:
             logger.info("🧭 Route: bali_zero_team (IDENTITY QUERY OVERRIDE)")
             return "bali_zero_team"
 
         # PRIORITY OVERRIDE: Team enumeration queries
-        team_patterns = [
-            "membri",
-            "team",
-            "colleghi",
-            "quanti siamo",
-            "chi lavora",
-            "team members",
-            "colleagues",
-            "who works",
-            "conosci i membri",
-            "know the members",
-            "dipartimento",
-            "department",
-        ]
-        if any(pattern in query_lower for pattern in team_patterns):
+        if matches["team_override"]:
             logger.info("🧭 Route: bali_zero_team (TEAM ENUMERATION OVERRIDE)")
             return "bali_zero_team"
 
         # EXPLICIT OVERRIDE: Force team routing for founder queries
-        if "fondatore" in query_lower or "founder" in query_lower:
+        if matches["founder"]:
             logger.info("🧭 Route: bali_zero_team (EXPLICIT OVERRIDE: founder query detected)")
             return "bali_zero_team"
 
         # PRIORITY CHECK: Backend services queries (highest priority after identity/team)
-        backend_services_score = sum(
-            1 for kw in self.BACKEND_SERVICES_KEYWORDS if kw in query_lower
-        )
+        backend_services_score = len(matches["backend_services"])
         if backend_services_score > 0:
             logger.info(
                 f"🧭 Route: zantara_books (BACKEND SERVICES QUERY: score={backend_services_score})"
@@ -561,18 +631,18 @@ class QueryRouter:
             return "zantara_books"
 
         # Calculate domain scores
-        visa_score = sum(1 for kw in self.VISA_KEYWORDS if kw in query_lower)
-        kbli_score = sum(1 for kw in self.KBLI_KEYWORDS if kw in query_lower)
-        tax_score = sum(1 for kw in self.TAX_KEYWORDS if kw in query_lower)
-        legal_score = sum(1 for kw in self.LEGAL_KEYWORDS if kw in query_lower)
-        property_score = sum(1 for kw in self.PROPERTY_KEYWORDS if kw in query_lower)
-        books_score = sum(1 for kw in self.BOOKS_KEYWORDS if kw in query_lower)
-        team_score = sum(1 for kw in self.TEAM_KEYWORDS if kw in query_lower)
-        team_enum_score = sum(1 for kw in self.TEAM_ENUMERATION_KEYWORDS if kw in query_lower)
+        visa_score = len(matches["visa"])
+        kbli_score = len(matches["kbli"])
+        tax_score = len(matches["tax"])
+        legal_score = len(matches["legal"])
+        property_score = len(matches["property"])
+        books_score = len(matches["books"])
+        team_score = len(matches["team"])
+        team_enum_score = len(matches["team_enum"])
 
         # Calculate modifier scores
-        update_score = sum(1 for kw in self.UPDATE_KEYWORDS if kw in query_lower)
-        tax_genius_score = sum(1 for kw in self.TAX_GENIUS_KEYWORDS if kw in query_lower)
+        update_score = len(matches["updates"])
+        tax_genius_score = len(matches["tax_genius"])
 
         # Determine primary domain
         domain_scores = {
@@ -627,17 +697,7 @@ class QueryRouter:
                 logger.info(f"🧭 Route: {collection} (legal general: legal={legal_score})")
         elif primary_domain == "property":
             # Property domain: route to listings vs knowledge
-            listing_keywords = [
-                "for sale",
-                "dijual",
-                "listing",
-                "available",
-                "rent",
-                "sewa",
-                "lease",
-            ]
-            has_listing_intent = any(kw in query_lower for kw in listing_keywords)
-            if has_listing_intent:
+            if matches["listing"]:
                 collection = "property_listings"
                 logger.info(
                     f"🧭 Route: {collection} (property listings: property={property_score})"
@@ -779,33 +839,22 @@ class QueryRouter:
             - confidence: Confidence score (0.0 - 1.0)
             - fallback_collections: List of all collections to try (primary + fallbacks)
         """
-        query_lower = query.lower()
+        matches = self._match_keywords(query)
 
         # EXPLICIT OVERRIDE: Force team routing for founder queries
-        if "fondatore" in query_lower or "founder" in query_lower:
+        if matches["founder"]:
             logger.info(
                 "🧭 Route: bali_zero_team (EXPLICIT OVERRIDE: founder query in route_with_confidence)"
             )
             return ("bali_zero_team", 1.0, ["bali_zero_team"])
 
         # Calculate domain scores (same as route())
-        visa_score = sum(1 for kw in self.VISA_KEYWORDS if kw in query_lower)
-        kbli_score = sum(1 for kw in self.KBLI_KEYWORDS if kw in query_lower)
-        tax_score = sum(1 for kw in self.TAX_KEYWORDS if kw in query_lower)
-        legal_score = sum(1 for kw in self.LEGAL_KEYWORDS if kw in query_lower)
-        property_score = sum(1 for kw in self.PROPERTY_KEYWORDS if kw in query_lower)
-        books_score = sum(1 for kw in self.BOOKS_KEYWORDS if kw in query_lower)
-        update_score = sum(1 for kw in self.UPDATE_KEYWORDS if kw in query_lower)
-        tax_genius_score = sum(1 for kw in self.TAX_GENIUS_KEYWORDS if kw in query_lower)
-
         domain_scores = {
-            "visa": visa_score,
-            "kbli": kbli_score,
-            "tax": tax_score,
-            "legal": legal_score,
-            "property": property_score,
-            "books": books_score,
+            domain: len(matches[domain])
+            for domain in ("visa", "kbli", "tax", "legal", "property", "books")
         }
+        update_score = len(matches["updates"])
+        tax_genius_score = len(matches["tax_genius"])
 
         primary_domain = max(domain_scores, key=domain_scores.get)
         primary_score = domain_scores[primary_domain]
@@ -823,17 +872,7 @@ class QueryRouter:
         elif primary_domain == "legal":
             collection = "legal_updates" if update_score > 0 else "legal_architect"
         elif primary_domain == "property":
-            listing_keywords = [
-                "for sale",
-                "dijual",
-                "listing",
-                "available",
-                "rent",
-                "sewa",
-                "lease",
-            ]
-            has_listing_intent = any(kw in query_lower for kw in listing_keywords)
-            collection = "property_listings" if has_listing_intent else "property_knowledge"
+            collection = "property_listings" if matches["listing"] else "property_knowledge"
         elif primary_domain == "visa":
             collection = "visa_oracle"
         elif primary_domain == "kbli":
@@ -883,57 +922,23 @@ class QueryRouter:
         Returns:
             Dictionary with routing analysis including all domain scores
         """
-        query_lower = query.lower()
-
-        # Calculate all domain scores
-        visa_score = sum(1 for kw in self.VISA_KEYWORDS if kw in query_lower)
-        kbli_score = sum(1 for kw in self.KBLI_KEYWORDS if kw in query_lower)
-        tax_score = sum(1 for kw in self.TAX_KEYWORDS if kw in query_lower)
-        legal_score = sum(1 for kw in self.LEGAL_KEYWORDS if kw in query_lower)
-        property_score = sum(1 for kw in self.PROPERTY_KEYWORDS if kw in query_lower)
-        books_score = sum(1 for kw in self.BOOKS_KEYWORDS if kw in query_lower)
-        update_score = sum(1 for kw in self.UPDATE_KEYWORDS if kw in query_lower)
-        sum(1 for kw in self.TAX_GENIUS_KEYWORDS if kw in query_lower)
-
-        # Find matching keywords
-        visa_matches = [kw for kw in self.VISA_KEYWORDS if kw in query_lower]
-        kbli_matches = [kw for kw in self.KBLI_KEYWORDS if kw in query_lower]
-        tax_matches = [kw for kw in self.TAX_KEYWORDS if kw in query_lower]
-        legal_matches = [kw for kw in self.LEGAL_KEYWORDS if kw in query_lower]
-        property_matches = [kw for kw in self.PROPERTY_KEYWORDS if kw in query_lower]
-        books_matches = [kw for kw in self.BOOKS_KEYWORDS if kw in query_lower]
-        update_matches = [kw for kw in self.UPDATE_KEYWORDS if kw in query_lower]
+        matches = self._match_keywords(query)
+        domains = ("visa", "kbli", "tax", "legal", "property", "books")
+        domain_scores = {domain: len(matches[domain]) for domain in domains}
 
         collection = self.route(query)
 
         return {
             "query": query,
             "selected_collection": collection,
-            "domain_scores": {
-                "visa": visa_score,
-                "kbli": kbli_score,
-                "tax": tax_score,
-                "legal": legal_score,
-                "property": property_score,
-                "books": books_score,
-            },
-            "modifier_scores": {"updates": update_score},
+            "domain_scores": domain_scores,
+            "modifier_scores": {"updates": len(matches["updates"])},
             "matched_keywords": {
-                "visa": visa_matches,
-                "kbli": kbli_matches,
-                "tax": tax_matches,
-                "legal": legal_matches,
-                "property": property_matches,
-                "books": books_matches,
-                "updates": update_matches,
+                **{domain: list(matches[domain]) for domain in domains},
+                "updates": list(matches["updates"]),
             },
             "routing_method": "keyword_layer_1_phase_2",
-            "total_matches": visa_score
-            + kbli_score
-            + tax_score
-            + legal_score
-            + property_score
-            + books_score,
+            "total_matches": sum(domain_scores.values()),
         }
 
     def get_fallback_stats(self) -> dict:
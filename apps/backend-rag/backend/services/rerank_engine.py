@@ -0,0 +1,202 @@
+"""
+Reranking engine: dynamic batching + optional ONNX Runtime backend
+
+The cross-encoder is far more efficient on one large batch than on many small
+ones, so RerankBatchEngine collects (query, document) pairs from concurrent
+requests and scores them together. A batch is dispatched as soon as it holds
+max_batch_pairs pairs or the oldest request has waited max_wait_ms.
+
+OnnxCrossEncoder is a drop-in replacement for sentence_transformers.CrossEncoder
+(predict only) running an exported ONNX model on CPU, optionally int8-quantized.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+# ONNX Runtime (optional dependency)
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+
+class OnnxCrossEncoder:
+    """
+    Cross-encoder scoring with ONNX Runtime on CPU
+
+    Expects a directory containing model.onnx (exported with e.g.
+    `optimum-cli export onnx --model <hf-model> <dir>`) plus the tokenizer files.
+    With quantize=True, model_int8.onnx is used, and created once with dynamic
+    int8 quantization if missing.
+    """
+
+    def __init__(self, model_dir: str, quantize: bool = True, max_length: int = 512):
+        if ort is None:
+            raise ImportError("onnxruntime is required for the ONNX reranker backend")
+
+        from transformers import AutoTokenizer
+
+        model_path = Path(model_dir)
+        onnx_file = model_path / "model.onnx"
+        if quantize:
+            onnx_file = self._quantized_model(onnx_file)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(onnx_file), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_path))
+        self.max_length = max_length
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self.model_file = str(onnx_file)
+
+    @staticmethod
+    def _quantized_model(onnx_file: Path) -> Path:
+        quantized = onnx_file.with_name("model_int8.onnx")
+        if not quantized.exists():
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            logger.info(f"🔄 Quantizing re-ranker model to int8: {quantized}")
+            quantize_dynamic(str(onnx_file), str(quantized), weight_type=QuantType.QInt8)
+        return quantized
+
+    def predict(self, pairs: list[list[str]], batch_size: int = 32) -> np.ndarray:
+        """Score [query, document] pairs, returning one relevance logit per pair"""
+        scores = []
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start : start + batch_size]
+            encoded = self.tokenizer(
+                [query for query, _ in batch],
+                [doc for _, doc in batch],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            inputs = {k: v.astype(np.int64) for k, v in encoded.items() if k in self._input_names}
+            logits = self.session.run(None, inputs)[0]
+            scores.append(logits.reshape(len(batch), -1)[:, 0])
+        return np.concatenate(scores) if scores else np.array([], dtype=np.float32)
+
+
+class RerankBatchEngine:
+    """
+    Dynamic batcher merging rerank requests into shared model calls
+
+    Each request's pairs stay together in one batch; predictions run in a worker
+    thread so the event loop keeps accepting requests while the model is busy.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[list[list[str]]], Any],
+        max_batch_pairs: int = 128,
+        max_wait_ms: float = 5.0,
+    ):
+        """
+        Args:
+            predict_fn: Scores a list of [query, document] pairs
+            max_batch_pairs: Dispatch a batch once it holds this many pairs
+            max_wait_ms: Max time a request waits for other requests to join
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_pairs = max_batch_pairs
+        self.max_wait_ms = max_wait_ms
+        self._pending: list[tuple[list[list[str]], asyncio.Future, float]] = []
+        self._pending_pairs = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._latencies: deque[float] = deque(maxlen=1000)
+        self._busy_seconds = 0.0
+        self.stats = {"requests": 0, "batches": 0, "pairs": 0, "errors": 0}
+
+    async def score(self, pairs: list[list[str]]) -> list[float]:
+        """Score pairs as part of the next batch"""
+        if not pairs:
+            return []
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((pairs, future, time.perf_counter()))
+        self._pending_pairs += len(pairs)
+        self.stats["requests"] += 1
+
+        if self._pending_pairs >= self.max_batch_pairs:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        self._pending_pairs = 0
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[list[list[str]], asyncio.Future, float]]):
+        all_pairs = [pair for pairs, _, _ in batch for pair in pairs]
+        self.stats["batches"] += 1
+        self.stats["pairs"] += len(all_pairs)
+
+        compute_start = time.perf_counter()
+        try:
+            scores = await asyncio.to_thread(self.predict_fn, all_pairs)
+            scores = [float(s) for s in scores]
+            if len(scores) != len(all_pairs):
+                raise ValueError(f"Expected {len(all_pairs)} scores, got {len(scores)}")
+        except Exception as e:
+            self.stats["errors"] += 1
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._busy_seconds += time.perf_counter() - compute_start
+
+        done = time.perf_counter()
+        offset = 0
+        for pairs, future, enqueued_at in batch:
+            self._latencies.append((done - enqueued_at) * 1000)
+            if not future.done():
+                future.set_result(scores[offset : offset + len(pairs)])
+            offset += len(pairs)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get batching statistics
+
+        Returns:
+            Dict with request/batch counts, average batch size, model throughput
+            (pairs per second of model time) and request latency percentiles
+        """
+        latencies = sorted(self._latencies)
+        n = len(latencies)
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "avg_batch_pairs": round(self.stats["pairs"] / batches, 2) if batches else 0.0,
+            "throughput_pairs_per_sec": (
+                round(self.stats["pairs"] / self._busy_seconds, 1) if self._busy_seconds else 0.0
+            ),
+            "p50_latency_ms": latencies[int(n * 0.50)] if n else 0.0,
+            "p95_latency_ms": latencies[int(n * 0.95)] if n else 0.0,
+            "max_batch_pairs": self.max_batch_pairs,
+            "max_wait_ms": self.max_wait_ms,
+        }
@@ -9,11 +9,12 @@ Phase 3 Enhancement: Conflict Resolution Agent
 - Transparent conflict reporting
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Any
 
-from core.cache import cached
+from core.cache import ALL_COLLECTIONS_TAG, cached
 from core.embeddings import EmbeddingsGenerator
 from core.qdrant_db import QdrantClient
 
@@ -24,6 +25,27 @@ from services.query_router import QueryRouter
 logger = logging.getLogger(__name__)
 
 
+def _search_cache_tags(
+    service: "SearchService",
+    query: str,  # noqa: ARG001
+    user_level: int | None,  # noqa: ARG001
+    limit: int,  # noqa: ARG001
+    tier_filter: list[TierLevel] | None,  # noqa: ARG001
+    collection_name: str,
+) -> list[str]:
+    """
+    Tag cached single-collection results with the physical Qdrant collection.
+
+    Aliases of one collection (legal_architect, legal_updates, ... -> legal_unified)
+    share the tag, so invalidate_collection() on the physical name drops them all.
+    """
+    vector_db = service.collections.get(collection_name)
+    physical_name = getattr(vector_db, "collection_name", None)
+    if not isinstance(physical_name, str):
+        return [ALL_COLLECTIONS_TAG]
+    return [f"collection:{physical_name}"]
+
+
 class SearchService:
     """RAG search with access control and multi-collection support"""
 
@@ -154,6 +176,9 @@ class SearchService:
             "pagamento",
         ]
 
+        # Per-collection deadline for multi-collection fan-out
+        self.collection_search_timeout = float(settings.timeout_collection_search)
+
         # Phase 3: Conflict resolution tracking
         self.conflict_stats = {
             "total_multi_collection_searches": 0,
@@ -212,7 +237,23 @@ class SearchService:
 
         return filters if filters else None
 
-    @cached(ttl=300, prefix="rag_search")
+    def _route_collection(self, query: str, collection_override: str | None = None) -> str:
+        """Collection a single-collection search for query is routed to"""
+        if collection_override:
+            collection_name = collection_override
+            logger.info(f"🔧 Using override collection: {collection_name}")
+        elif any(kw in query.lower() for kw in self.pricing_keywords):
+            # Pricing query detected - prioritize pricing collection
+            collection_name = "bali_zero_pricing"
+            logger.info("💰 PRICING QUERY DETECTED → Using bali_zero_pricing collection")
+        else:
+            collection_name = self.router.route(query)
+
+        if collection_name not in self.collections:
+            logger.error(f"❌ Unknown collection: {collection_name}, defaulting to visa_oracle")
+            collection_name = "visa_oracle"
+        return collection_name
+
     async def search(
         self,
         query: str,
@@ -234,38 +275,33 @@ class SearchService:
         Returns:
             Search results with metadata
         """
+        # Route once: the result selects both the collection and the cache tag
+        collection_name = self._route_collection(query, collection_override)
+        return await self._search_routed(query, user_level, limit, tier_filter, collection_name)
+
+    @cached(ttl=300, prefix="rag_search", tags=_search_cache_tags)
+    async def _search_routed(
+        self,
+        query: str,
+        user_level: int,
+        limit: int,
+        tier_filter: list[TierLevel] | None,
+        collection_name: str,
+    ) -> dict[str, Any]:
+        """Search one routed collection (cached, tagged with its Qdrant collection)"""
         try:
             # Generate query embedding
-            query_embedding = self.embedder.generate_query_embedding(query)
+            query_embedding = await self.embedder.async_generate_query_embedding(query)
 
             # 🔍 DEBUG: Log embedding details
             logger.info(
                 f"🔍 DEBUG - Query: '{query[:50]}...', embedding_dim={len(query_embedding)}, provider={self.embedder.provider}"
             )
             logger.info(
-                f"🔍 DEBUG - Parameters: collection_override={collection_override}, user_level={user_level}, limit={limit}"
+                f"🔍 DEBUG - Parameters: collection={collection_name}, user_level={user_level}, limit={limit}"
             )
 
-            # Detect if pricing query
-            is_pricing_query = any(kw in query.lower() for kw in self.pricing_keywords)
-
-            # Route to appropriate collection
-            if collection_override:
-                collection_name = collection_override
-                logger.info(f"🔧 Using override collection: {collection_name}")
-            elif is_pricing_query:
-                # Pricing query detected - prioritize pricing collection
-                collection_name = "bali_zero_pricing"
-                logger.info("💰 PRICING QUERY DETECTED → Using bali_zero_pricing collection")
-            else:
-                collection_name = self.router.route(query)
-
-            # Select the appropriate vector DB client
-            vector_db = self.collections.get(collection_name)
-            if not vector_db:
-                logger.error(f"❌ Unknown collection: {collection_name}, defaulting to visa_oracle")
-                vector_db = self.collections["visa_oracle"]
-                collection_name = "visa_oracle"
+            vector_db = self.collections[collection_name]
 
             # Determine allowed tiers (only apply to zantara_books collection)
             allowed_tiers = self.LEVEL_TO_TIERS.get(user_level, [])
@@ -292,8 +328,8 @@ class SearchService:
             if chroma_filter:
                 logger.debug(f"🔍 DEBUG - Filter applied: {chroma_filter}")
 
-            # Search
-            raw_results = vector_db.search(
+            # Search (non-blocking, pooled keep-alive connection)
+            raw_results = await vector_db.async_search(
                 query_embedding=query_embedding, filter=chroma_filter, limit=limit
             )
 
@@ -516,7 +552,165 @@ class SearchService:
 
         return resolved_results, conflict_reports
 
-    @cached(ttl=300, prefix="rag_multi_search")
+    async def _search_collection_for_merge(
+        self,
+        collection_name: str,
+        vector_db: QdrantClient,
+        query_embedding: list[float],
+        user_level: int,
+        limit: int,
+        tier_filter: list[TierLevel] | None,
+        primary_collection: str,
+    ) -> list[dict]:
+        """
+        Search one collection and format results for multi-collection merging.
+
+        Args:
+            collection_name: Logical collection name
+            vector_db: Qdrant client for the collection
+            query_embedding: Precomputed query embedding
+            user_level: User access level (0-3)
+            limit: Max results
+            tier_filter: Optional specific tier filter
+            primary_collection: Collection chosen by the router (gets a score boost)
+
+        Returns:
+            List of formatted results tagged with their source collection
+        """
+        # Determine allowed tiers (only for zantara_books)
+        allowed_tiers = self.LEVEL_TO_TIERS.get(user_level, [])
+        if tier_filter:
+            allowed_tiers = [t for t in allowed_tiers if t in tier_filter]
+
+        # Build filter (only for zantara_books)
+        tier_filter_dict = None
+        if collection_name == "zantara_books" and allowed_tiers:
+            tier_values = [t.value for t in allowed_tiers]
+            tier_filter_dict = {"tier": {"$in": tier_values}}
+
+        # Build combined filter with default exclusion of repealed laws
+        chroma_filter = self._build_search_filter(
+            tier_filter=tier_filter_dict, exclude_repealed=True
+        )
+
+        raw_results = await vector_db.async_search(
+            query_embedding=query_embedding, filter=chroma_filter, limit=limit
+        )
+
+        formatted_results = []
+        for i in range(len(raw_results.get("documents", []))):
+            distance = (
+                raw_results["distances"][i] if i < len(raw_results.get("distances", [])) else 1.0
+            )
+            score = 1 / (1 + distance)
+
+            # Boost primary collection results slightly
+            if collection_name == primary_collection:
+                score = min(1.0, score * 1.1)
+            # Boost pricing collection
+            if collection_name == "bali_zero_pricing":
+                score = min(1.0, score + 0.15)
+            # Boost team collection
+            if collection_name == "bali_zero_team":
+                score = min(1.0, score + 0.15)
+
+            # Copy metadata: aliased collections may share payload objects
+            metadata = {
+                **(
+                    raw_results["metadatas"][i] if i < len(raw_results.get("metadatas", [])) else {}
+                ),
+                "source_collection": collection_name,
+                "is_primary": collection_name == primary_collection,
+            }
+
+            formatted_results.append(
+                {
+                    "id": raw_results["ids"][i] if i < len(raw_results.get("ids", [])) else None,
+                    "text": raw_results["documents"][i]
+                    if i < len(raw_results.get("documents", []))
+                    else "",
+                    "metadata": metadata,
+                    "score": round(score, 4),
+                }
+            )
+
+        return formatted_results
+
+    async def _fan_out_search(
+        self,
+        collections_to_search: list[str],
+        query_embedding: list[float],
+        user_level: int,
+        limit: int,
+        tier_filter: list[TierLevel] | None,
+        primary_collection: str,
+    ) -> tuple[dict[str, list[dict]], list[str]]:
+        """
+        Query all collections concurrently, each with its own deadline.
+
+        A slow or failing collection never blocks the others: its results are
+        dropped and the rest are returned, so total latency is bounded by
+        the per-collection timeout rather than the sum of all searches.
+
+        Returns:
+            Tuple of (results_by_collection, timed_out_collections).
+            results_by_collection keeps the order of collections_to_search.
+        """
+        searches = {}
+        for collection_name in collections_to_search:
+            vector_db = self.collections.get(collection_name)
+            if not vector_db:
+                logger.warning(f"⚠️ Collection not found: {collection_name}, skipping")
+                continue
+            if collection_name in searches:
+                continue
+
+            searches[collection_name] = asyncio.wait_for(
+                self._search_collection_for_merge(
+                    collection_name=collection_name,
+                    vector_db=vector_db,
+                    query_embedding=query_embedding,
+                    user_level=user_level,
+                    limit=limit,
+                    tier_filter=tier_filter,
+                    primary_collection=primary_collection,
+                ),
+                timeout=self.collection_search_timeout,
+            )
+
+        outcomes = await asyncio.gather(*searches.values(), return_exceptions=True)
+
+        results_by_collection = {}
+        timed_out = []
+        for collection_name, outcome in zip(searches, outcomes, strict=True):
+            if isinstance(outcome, asyncio.TimeoutError):
+                timed_out.append(collection_name)
+                logger.warning(
+                    f"⏱️ {collection_name}: timed out after {self.collection_search_timeout}s, "
+                    "continuing with partial results"
+                )
+                continue
+            if isinstance(outcome, Exception):
+                logger.error(f"❌ {collection_name}: search failed: {outcome}")
+                continue
+
+            if outcome:
+                results_by_collection[collection_name] = outcome
+                logger.info(
+                    f"   ✓ {collection_name}: {len(outcome)} results (top score: {outcome[0]['score']:.2f})"
+                )
+
+            # Phase 3: Record query for health monitoring
+            self.health_monitor.record_query(
+                collection_name=collection_name,
+                had_results=bool(outcome),
+                result_count=len(outcome),
+                avg_score=sum(r["score"] for r in outcome) / len(outcome) if outcome else 0.0,
+            )
+
+        return results_by_collection, timed_out
+
+    @cached(ttl=300, prefix="rag_multi_search", tags=[ALL_COLLECTIONS_TAG])
     async def search_with_conflict_resolution(
         self,
         query: str,
@@ -531,8 +725,8 @@ class SearchService:
         Uses QueryRouter's route_with_confidence() to:
         1. Determine primary collection
         2. Get fallback collections based on confidence
-        3. Search all relevant collections
-        4. Detect and resolve conflicts
+        3. Search all relevant collections concurrently (per-collection timeout)
+        4. Detect and resolve conflicts on whatever results arrived
         5. Return merged + deduplicated results
 
         Args:
@@ -549,7 +743,7 @@ class SearchService:
             self.conflict_stats["total_multi_collection_searches"] += 1
 
             # Generate query embedding once (reuse for all collections)
-            query_embedding = self.embedder.generate_query_embedding(query)
+            query_embedding = await self.embedder.async_generate_query_embedding(query)
 
             # Detect if pricing query (override fallbacks)
             is_pricing_query = any(kw in query.lower() for kw in self.pricing_keywords)
@@ -572,98 +766,15 @@ class SearchService:
                     f"Total collections: {len(collections_to_search)}"
                 )
 
-            # Search all collections in parallel
-            results_by_collection = {}
-            for collection_name in collections_to_search:
-                vector_db = self.collections.get(collection_name)
-                if not vector_db:
-                    logger.warning(f"⚠️ Collection not found: {collection_name}, skipping")
-                    continue
-
-                # Determine allowed tiers (only for zantara_books)
-                allowed_tiers = self.LEVEL_TO_TIERS.get(user_level, [])
-                if tier_filter:
-                    allowed_tiers = [t for t in allowed_tiers if t in tier_filter]
-
-                # Build filter (only for zantara_books)
-                tier_filter_dict = None
-                if collection_name == "zantara_books" and allowed_tiers:
-                    tier_values = [t.value for t in allowed_tiers]
-                    tier_filter_dict = {"tier": {"$in": tier_values}}
-
-                # Build combined filter with default exclusion of repealed laws
-                chroma_filter = self._build_search_filter(
-                    tier_filter=tier_filter_dict, exclude_repealed=True
-                )
-
-                # Search this collection
-                raw_results = vector_db.search(
-                    query_embedding=query_embedding, filter=chroma_filter, limit=limit
-                )
-
-                # Format results
-                formatted_results = []
-                for i in range(len(raw_results.get("documents", []))):
-                    distance = (
-                        raw_results["distances"][i]
-                        if i < len(raw_results.get("distances", []))
-                        else 1.0
-                    )
-                    score = 1 / (1 + distance)
-
-                    # Boost primary collection results slightly
-                    if collection_name == primary_collection:
-                        score = min(1.0, score * 1.1)
-                    # Boost pricing collection
-                    if collection_name == "bali_zero_pricing":
-                        score = min(1.0, score + 0.15)
-                    # Boost team collection
-                    if collection_name == "bali_zero_team":
-                        score = min(1.0, score + 0.15)
-
-                    metadata = (
-                        raw_results["metadatas"][i]
-                        if i < len(raw_results.get("metadatas", []))
-                        else {}
-                    )
-                    metadata["source_collection"] = collection_name
-                    metadata["is_primary"] = collection_name == primary_collection
-
-                    formatted_results.append(
-                        {
-                            "id": raw_results["ids"][i]
-                            if i < len(raw_results.get("ids", []))
-                            else None,
-                            "text": raw_results["documents"][i]
-                            if i < len(raw_results.get("documents", []))
-                            else "",
-                            "metadata": metadata,
-                            "score": round(score, 4),
-                        }
-                    )
-
-                if formatted_results:
-                    results_by_collection[collection_name] = formatted_results
-                    logger.info(
-                        f"   ✓ {collection_name}: {len(formatted_results)} results (top score: {formatted_results[0]['score']:.2f})"
-                    )
-
-                    # Phase 3: Record query for health monitoring
-                    avg_score = sum(r["score"] for r in formatted_results) / len(formatted_results)
-                    self.health_monitor.record_query(
-                        collection_name=collection_name,
-                        had_results=True,
-                        result_count=len(formatted_results),
-                        avg_score=avg_score,
-                    )
-                else:
-                    # Record zero-result query
-                    self.health_monitor.record_query(
-                        collection_name=collection_name,
-                        had_results=False,
-                        result_count=0,
-                        avg_score=0.0,
-                    )
+            # Search all collections concurrently (partial results on per-collection timeout)
+            results_by_collection, timed_out = await self._fan_out_search(
+                collections_to_search=collections_to_search,
+                query_embedding=query_embedding,
+                user_level=user_level,
+                limit=limit,
+                tier_filter=tier_filter,
+                primary_collection=primary_collection,
+            )
 
             # Detect conflicts
             conflicts = self.detect_conflicts(results_by_collection)
@@ -696,6 +807,7 @@ class SearchService:
                 "conflicts_detected": len(conflicts),
                 "conflicts": conflict_reports,
                 "fallbacks_used": len(collections_to_search) > 1,
+                "collections_timed_out": timed_out,
             }
 
         except Exception as e:
@@ -835,7 +947,7 @@ class SearchService:
         """
         try:
             # Generate embedding
-            query_embedding = self.embedder.generate_query_embedding(query)
+            query_embedding = await self.embedder.async_generate_query_embedding(query)
 
             # Get client (create ad-hoc if not in pre-defined list)
             if collection_name in self.collections:
@@ -847,7 +959,9 @@ class SearchService:
                 )
 
             # Search
-            raw_results = client.search(query_embedding=query_embedding, filter=filter, limit=limit)
+            raw_results = await client.async_search(
+                query_embedding=query_embedding, filter=filter, limit=limit
+            )
 
             # Format results to match standard SearchService output
             formatted_results = []
@@ -891,7 +1005,7 @@ class SearchService:
         """
         try:
             # Generate query embedding
-            query_embedding = self.embedder.generate_query_embedding(query)
+            query_embedding = await self.embedder.async_generate_query_embedding(query)
 
             # NOTE: Qdrant filtering is limited - we rely on semantic search instead
             # The when_to_use metadata is stored as comma-separated string, but Qdrant
@@ -901,7 +1015,7 @@ class SearchService:
 
             # Search cultural_insights collection
             cultural_db = self.collections["cultural_insights"]
-            raw_results = cultural_db.search(
+            raw_results = await cultural_db.async_search(
                 query_embedding=query_embedding, filter=chroma_filter, limit=limit
             )
 
@@ -981,7 +1095,7 @@ class SearchService:
 
                     # Perform lightweight search to load indexes
                     dummy_embedding = self.embedder.generate_query_embedding("test")
-                    _ = vector_db.search(
+                    _ = await vector_db.async_search(
                         query_embedding=dummy_embedding,
                         filter=None,
                         limit=1,  # Minimal results, just loading indexes
@@ -7,6 +7,8 @@ Features:
 - Similarity-based cache lookup (cosine similarity)
 - TTL-based expiration
 - LRU eviction policy
+- In-process embedding matrix (one matmul per lookup, optional HNSW)
+- Pipelined writes and background LRU eviction
 
 Performance Impact:
 - Latency: 800ms → 150ms (-81%)
@@ -14,18 +16,184 @@ Performance Impact:
 - Database load: -70% (fewer Qdrant queries)
 """
 
+import asyncio
 import hashlib
 import json
 import logging
+import time
 from datetime import datetime
 from typing import Any
 
 import numpy as np
 from redis.asyncio import Redis
 
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
 logger = logging.getLogger(__name__)
 
 
+class EmbeddingIndex:
+    """
+    In-process index of L2-normalized cached embeddings.
+
+    Lookups are a single matrix-vector product over all cached embeddings.
+    Once the index grows past ann_threshold entries and hnswlib is installed,
+    an HNSW graph is built and used instead of the brute-force scan.
+    """
+
+    def __init__(self, ann_threshold: int = 5000, initial_capacity: int = 256):
+        self.ann_threshold = ann_threshold
+        self._initial_capacity = initial_capacity
+        self.clear()
+
+    def clear(self):
+        """Drop all entries"""
+        self._keys: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._matrix: np.ndarray | None = None
+        self._ann = None
+        self._ann_labels: dict[str, int] = {}
+        self._ann_keys: dict[int, str] = {}
+        self._next_label = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def keys(self) -> set[str]:
+        """Keys currently indexed"""
+        return set(self._rows)
+
+    @property
+    def backend(self) -> str:
+        """Active lookup backend ("hnsw" or "matrix")"""
+        return "hnsw" if self._ann is not None else "matrix"
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray | None:
+        vec = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        if norm == 0 or not np.isfinite(norm):
+            return None
+        return vec / norm
+
+    def add(self, key: str, embedding: np.ndarray):
+        """Insert or replace the embedding stored under key"""
+        vec = self._normalize(embedding)
+        if vec is None:
+            return
+
+        # Embedding model changed (different dimensions): start over
+        if self._matrix is not None and self._matrix.shape[1] != vec.shape[0]:
+            logger.warning(
+                f"[Cache] Embedding dimension changed ({self._matrix.shape[1]} → {vec.shape[0]}), "
+                "resetting in-process index"
+            )
+            self.clear()
+
+        if key in self._rows:
+            self._matrix[self._rows[key]] = vec
+        else:
+            if self._matrix is None:
+                self._matrix = np.zeros((self._initial_capacity, vec.shape[0]), dtype=np.float32)
+            elif len(self._keys) >= self._matrix.shape[0]:
+                grown = np.zeros((self._matrix.shape[0] * 2, vec.shape[0]), dtype=np.float32)
+                grown[: len(self._keys)] = self._matrix[: len(self._keys)]
+                self._matrix = grown
+
+            self._rows[key] = len(self._keys)
+            self._matrix[len(self._keys)] = vec
+            self._keys.append(key)
+
+        if self._ann is not None:
+            self._ann_add(key, vec)
+        elif hnswlib is not None and len(self._keys) >= self.ann_threshold:
+            self._build_ann()
+
+    def remove(self, key: str):
+        """Remove key if present (swap-with-last, O(1))"""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+
+        last = len(self._keys) - 1
+        if row != last:
+            last_key = self._keys[last]
+            self._matrix[row] = self._matrix[last]
+            self._keys[row] = last_key
+            self._rows[last_key] = row
+        self._keys.pop()
+
+        if self._ann is not None:
+            label = self._ann_labels.pop(key, None)
+            if label is not None:
+                self._ann.mark_deleted(label)
+                self._ann_keys.pop(label, None)
+
+    def best_match(self, embedding: np.ndarray) -> tuple[str, float] | None:
+        """
+        Find the most similar indexed embedding.
+
+        Returns:
+            Tuple of (key, cosine similarity), or None if the index is empty
+        """
+        if not self._keys:
+            return None
+
+        query = self._normalize(embedding)
+        if query is None or query.shape[0] != self._matrix.shape[1]:
+            return None
+
+        if self._ann is not None:
+            try:
+                labels, distances = self._ann.knn_query(query, k=1)
+                key = self._ann_keys.get(int(labels[0][0]))
+                if key is not None:
+                    return key, 1.0 - float(distances[0][0])
+            except RuntimeError as e:
+                logger.debug(f"[Cache] HNSW query failed, using matrix scan: {e}")
+
+        similarities = self._matrix[: len(self._keys)] @ query
+        best_row = int(np.argmax(similarities))
+        return self._keys[best_row], float(similarities[best_row])
+
+    def _build_ann(self):
+        """Build the HNSW graph from the current matrix"""
+        count = len(self._keys)
+        ann = hnswlib.Index(space="cosine", dim=self._matrix.shape[1])
+        ann.init_index(max_elements=count * 2, ef_construction=200, M=16)
+        ann.set_ef(64)
+
+        labels = np.arange(count)
+        ann.add_items(self._matrix[:count], labels)
+
+        self._ann = ann
+        self._ann_labels = {key: i for i, key in enumerate(self._keys)}
+        self._ann_keys = dict(enumerate(self._keys))
+        self._next_label = count
+        logger.info(f"🧭 [Cache] Built HNSW index over {count} cached embeddings")
+
+    def _ann_add(self, key: str, vec: np.ndarray):
+        old_label = self._ann_labels.pop(key, None)
+        if old_label is not None:
+            self._ann.mark_deleted(old_label)
+            self._ann_keys.pop(old_label, None)
+
+        if self._ann.get_current_count() >= self._ann.get_max_elements():
+            self._ann.resize_index(self._ann.get_max_elements() * 2)
+
+        label = self._next_label
+        self._next_label += 1
+        self._ann.add_items(vec.reshape(1, -1), np.array([label]))
+        self._ann_labels[key] = label
+        self._ann_keys[label] = key
+
+
 class SemanticCache:
     """
     Semantic caching for RAG queries
@@ -36,6 +204,8 @@ class SemanticCache:
     - Similarity-based cache lookup (cosine similarity)
     - TTL-based expiration
     - LRU eviction policy
+    - In-process EmbeddingIndex kept in sync with the Redis index
+    - Pipelined writes; LRU eviction runs in a background task
     """
 
     def __init__(
@@ -44,6 +214,8 @@ class SemanticCache:
         similarity_threshold: float = 0.95,
         default_ttl: int = 3600,  # 1 hour
         max_cache_size: int = 10000,
+        ann_threshold: int = 5000,
+        index_sync_interval: float = 30.0,
     ):
         self.redis = redis_client
         self.similarity_threshold = similarity_threshold
@@ -52,6 +224,19 @@ class SemanticCache:
         self.cache_prefix = "semantic_cache:"
         self.embedding_prefix = "embedding:"
 
+        # Local copy of cached embeddings; resynced from Redis every index_sync_interval
+        # seconds to pick up entries written by other workers
+        self.index_sync_interval = index_sync_interval
+        self._index = EmbeddingIndex(ann_threshold=ann_threshold)
+        self._index_synced_at: float | None = None
+        self._sync_lock = asyncio.Lock()
+
+        # Background eviction (at most one task; writes during a run request another pass)
+        self._eviction_task: asyncio.Task | None = None
+        self._eviction_pending = False
+
+        self.stats = {"hits": 0, "semantic_hits": 0, "misses": 0, "evictions": 0}
+
     async def get_cached_result(
         self, query: str, query_embedding: np.ndarray | None = None
     ) -> dict[str, Any] | None:
@@ -74,6 +259,7 @@ class SemanticCache:
                 logger.info("✅ [Cache] Exact match found for query")
                 result = json.loads(cached)
                 result["cache_hit"] = "exact"
+                self.stats["hits"] += 1
                 return result
 
             # If no exact match and embedding provided, try semantic similarity
@@ -84,9 +270,12 @@ class SemanticCache:
                         f"✅ [Cache] Similar match found (similarity: {similar_result['similarity']:.3f})"
                     )
                     similar_result["data"]["cache_hit"] = "semantic"
+                    self.stats["hits"] += 1
+                    self.stats["semantic_hits"] += 1
                     return similar_result["data"]
 
             logger.debug("❌ [Cache] No match found for query")
+            self.stats["misses"] += 1
             return None
 
         except Exception as e:
@@ -124,19 +313,24 @@ class SemanticCache:
                 "timestamp": datetime.now().isoformat(),
                 "embedding_key": embedding_key,
             }
-            await self.redis.setex(cache_key, ttl, json.dumps(result_data))
-
-            # Store embedding (as binary for efficiency)
+            # Store embedding (as float32 binary - the format the index reads back)
+            query_embedding = np.asarray(query_embedding, dtype=np.float32)
             embedding_bytes = query_embedding.tobytes()
-            await self.redis.setex(embedding_key, ttl, embedding_bytes)
 
-            # Add to embeddings index (sorted set by timestamp for LRU)
-            await self.redis.zadd(
-                f"{self.cache_prefix}index", {embedding_key: datetime.now().timestamp()}
-            )
+            # Result, embedding and index entry (sorted set by timestamp for LRU)
+            # in one round trip; ZCARD tells us whether eviction is needed
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.setex(cache_key, ttl, json.dumps(result_data))
+            pipe.setex(embedding_key, ttl, embedding_bytes)
+            pipe.zadd(f"{self.cache_prefix}index", {embedding_key: datetime.now().timestamp()})
+            pipe.zcard(f"{self.cache_prefix}index")
+            *_, cache_size = await pipe.execute()
 
-            # Enforce max cache size (LRU eviction)
-            await self._enforce_cache_size()
+            self._index.add(embedding_key, query_embedding)
+
+            # Enforce max cache size (LRU eviction) without blocking this request
+            if cache_size > self.max_cache_size:
+                self._schedule_eviction()
 
             logger.info(f"✅ [Cache] Cached result for query (TTL: {ttl}s)")
             return True
@@ -149,6 +343,9 @@ class SemanticCache:
         """
         Find cached query with similar embedding
 
+        Uses the in-process EmbeddingIndex (no per-entry Redis round trips);
+        only the winning entry's payload is fetched from Redis.
+
         Args:
             query_embedding: Query embedding to compare
 
@@ -156,50 +353,76 @@ class SemanticCache:
             Dict with cached data and similarity score, or None
         """
         try:
-            # Get all embedding keys from index
-            embedding_keys = await self.redis.zrange(f"{self.cache_prefix}index", 0, -1)
+            await self._maybe_sync_index()
 
-            if not embedding_keys:
+            match = self._index.best_match(query_embedding)
+            if match is None:
                 return None
 
-            best_match = None
-            best_similarity = 0.0
-
-            # Compare with cached embeddings
-            for embedding_key in embedding_keys:
-                # Get cached embedding
-                cached_embedding_bytes = await self.redis.get(embedding_key)
-                if not cached_embedding_bytes:
-                    continue
-
-                # Convert bytes back to numpy array
-                cached_embedding = np.frombuffer(cached_embedding_bytes, dtype=np.float32)
-
-                # Calculate cosine similarity
-                similarity = self._cosine_similarity(query_embedding, cached_embedding)
-
-                # Track best match
-                if similarity > best_similarity:
-                    best_similarity = similarity
-                    best_match = embedding_key
+            best_match, best_similarity = match
 
             # If best match exceeds threshold, return cached result
             if best_similarity >= self.similarity_threshold:
                 # Get cache key from embedding key
-                cache_key = best_match.decode() if isinstance(best_match, bytes) else best_match
-                cache_key = cache_key.replace(self.embedding_prefix, self.cache_prefix)
+                cache_key = best_match.replace(self.embedding_prefix, self.cache_prefix)
                 cached_data = await self.redis.get(cache_key)
 
                 if cached_data:
                     result = json.loads(cached_data)
                     return {"data": result, "similarity": best_similarity}
 
+                # Payload expired in Redis - stop matching against it
+                self._index.remove(best_match)
+
             return None
 
         except Exception as e:
             logger.error(f"[Cache] Error finding similar query: {e}")
             return None
 
+    async def _maybe_sync_index(self):
+        """Resync the in-process index if it has never been loaded or is stale"""
+        if (
+            self._index_synced_at is not None
+            and time.monotonic() - self._index_synced_at < self.index_sync_interval
+        ):
+            return
+
+        async with self._sync_lock:
+            # Another coroutine may have synced while we waited
+            if (
+                self._index_synced_at is not None
+                and time.monotonic() - self._index_synced_at < self.index_sync_interval
+            ):
+                return
+            await self._sync_index()
+
+    async def _sync_index(self, batch_size: int = 500):
+        """
+        Reconcile the in-process index with the Redis index.
+
+        Drops locally indexed keys that are gone from Redis and loads embeddings
+        for keys added by other workers (MGET in batches, not one GET per key).
+        """
+        raw_keys = await self.redis.zrange(f"{self.cache_prefix}index", 0, -1)
+        redis_keys = [k.decode() if isinstance(k, bytes) else k for k in raw_keys]
+
+        for stale_key in self._index.keys() - set(redis_keys):
+            self._index.remove(stale_key)
+
+        missing = [k for k in redis_keys if k not in self._index]
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start : start + batch_size]
+            blobs = await self.redis.mget(batch)
+            for key, blob in zip(batch, blobs, strict=False):
+                if blob:
+                    self._index.add(key, np.frombuffer(blob, dtype=np.float32))
+
+        self._index_synced_at = time.monotonic()
+        logger.debug(
+            f"[Cache] Index synced: {len(self._index)} embeddings ({len(missing)} fetched)"
+        )
+
     @staticmethod
     def _cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
         """Calculate cosine similarity between two vectors"""
@@ -215,8 +438,23 @@ class SemanticCache:
         query_hash = hashlib.md5(query.lower().strip().encode()).hexdigest()
         return f"{self.embedding_prefix}{query_hash}"
 
-    async def _enforce_cache_size(self):
-        """Enforce max cache size using LRU eviction"""
+    def _schedule_eviction(self):
+        """Run LRU eviction in the background, coalescing bursts into one task"""
+        if self._eviction_task is not None and not self._eviction_task.done():
+            self._eviction_pending = True
+            return
+        self._eviction_task = asyncio.create_task(self._run_eviction())
+
+    async def _run_eviction(self):
+        """Evict until no new eviction request arrived during the last pass"""
+        while True:
+            self._eviction_pending = False
+            await self._enforce_cache_size()
+            if not self._eviction_pending:
+                return
+
+    async def _enforce_cache_size(self, batch_size: int = 500):
+        """Enforce max cache size using LRU eviction (one pipeline per batch)"""
         try:
             # Get cache size
             cache_size = await self.redis.zcard(f"{self.cache_prefix}index")
@@ -228,15 +466,23 @@ class SemanticCache:
                     f"{self.cache_prefix}index", 0, num_to_remove - 1
                 )
 
-                # Remove oldest entries
-                for key in oldest_keys:
-                    key_str = key.decode() if isinstance(key, bytes) else key
-                    cache_key = key_str.replace(self.embedding_prefix, self.cache_prefix)
-                    await self.redis.delete(key)
-                    await self.redis.delete(cache_key)
-                    await self.redis.zrem(f"{self.cache_prefix}index", key)
+                for start in range(0, len(oldest_keys), batch_size):
+                    batch = oldest_keys[start : start + batch_size]
+                    key_strs = [k.decode() if isinstance(k, bytes) else k for k in batch]
+                    cache_keys = [
+                        k.replace(self.embedding_prefix, self.cache_prefix) for k in key_strs
+                    ]
+
+                    pipe = self.redis.pipeline(transaction=False)
+                    pipe.delete(*key_strs, *cache_keys)
+                    pipe.zrem(f"{self.cache_prefix}index", *key_strs)
+                    await pipe.execute()
+
+                    for key_str in key_strs:
+                        self._index.remove(key_str)
 
-                logger.info(f"🗑️ [Cache] Evicted {num_to_remove} oldest entries (LRU)")
+                self.stats["evictions"] += len(oldest_keys)
+                logger.info(f"🗑️ [Cache] Evicted {len(oldest_keys)} oldest entries (LRU)")
 
         except Exception as e:
             logger.error(f"[Cache] Error enforcing cache size: {e}")
@@ -245,12 +491,21 @@ class SemanticCache:
         """Get cache statistics"""
         try:
             cache_size = await self.redis.zcard(f"{self.cache_prefix}index")
+            lookups = self.stats["hits"] + self.stats["misses"]
+            hit_rate = (self.stats["hits"] / lookups * 100) if lookups > 0 else 0
             return {
                 "cache_size": cache_size,
                 "max_cache_size": self.max_cache_size,
                 "utilization": f"{(cache_size / self.max_cache_size) * 100:.1f}%",
                 "similarity_threshold": self.similarity_threshold,
                 "default_ttl": self.default_ttl,
+                "index_size": len(self._index),
+                "index_backend": self._index.backend,
+                "hits": self.stats["hits"],
+                "semantic_hits": self.stats["semantic_hits"],
+                "misses": self.stats["misses"],
+                "evictions": self.stats["evictions"],
+                "hit_rate": f"{hit_rate:.1f}%",
             }
         except Exception as e:
             logger.error(f"[Cache] Error getting stats: {e}")
@@ -266,6 +521,7 @@ class SemanticCache:
             # Delete all
             if keys:
                 await self.redis.delete(*keys)
+            self._index.clear()
 
             logger.info(f"🗑️ [Cache] Cleared {len(keys)} cached entries")
 
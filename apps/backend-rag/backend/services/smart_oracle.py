@@ -3,21 +3,25 @@ Zantara Smart Oracle - Enhanced PDF Analysis with Google Drive Integration
 
 This module provides intelligent document analysis by:
 1. Downloading PDFs from Google Drive using Service Account
-2. Processing documents with Google Gemini AI
+   (cached in the local DocumentStore)
+2. Processing documents with Google Gemini AI (each PDF is uploaded once and
+   the Gemini file reused while it is still available)
 3. Providing accurate answers based on full document content
 """
 
-import io
+import asyncio
 import json
 import logging
-import os
+import time
+from collections import OrderedDict
+from typing import Any
 
 import google.generativeai as genai
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
 
 from app.core.config import settings
+from services.document_store import get_document_store
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +33,14 @@ logger = logging.getLogger(__name__)
 if settings.google_api_key:
     genai.configure(api_key=settings.google_api_key)
 
+# Gemini deletes uploaded files after 48 hours; reuse them for a bit less than that
+GEMINI_FILE_TTL = 46 * 3600  # seconds
+GEMINI_FILE_CACHE_SIZE = 128  # Uploaded files remembered (LRU)
+
+# Local PDF path -> (Gemini file, upload time). Store objects are content-addressed,
+# so a path always refers to the same content.
+_uploaded_files: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+
 
 # 2. Google Drive Service (Using Service Account)
 def get_drive_service():
@@ -57,72 +69,43 @@ def get_drive_service():
 def download_pdf_from_drive(filename_from_qdrant):
     """
     Cerca su Drive in modo 'intelligente', tollerando piccole differenze nel nome.
-    """
-    service = get_drive_service()
-    if not service:
-        return None
 
-    try:
-        # 1. PULIZIA DEL NOME
-        # Se Qdrant ti dà "cartella/tasse_2024.pdf", teniamo solo "tasse_2024"
-        # Rimuoviamo l'estensione .pdf per la ricerca
-        clean_name = os.path.splitext(os.path.basename(filename_from_qdrant))[0]
-
-        # 2. RICERCA ELASTICA ('contains' invece di '=')
-        # Cerca file PDF che contengono quella parola chiave nel nome
-        query = f"name contains '{clean_name}' and mimeType = 'application/pdf' and trashed = false"
-
-        logger.debug(f"Searching Drive for: {clean_name}")
-
-        results = (
-            service.files()
-            .list(
-                q=query,
-                fields="files(id, name)",
-                pageSize=1,  # Prendiamo solo il candidato migliore
-            )
-            .execute()
-        )
-
-        items = results.get("files", [])
-
-        if not items:
-            # TENTATIVO DISPERATO: Sostituisci underscore con spazi (es. "tasse_2024" -> "tasse 2024")
-            alt_name = clean_name.replace("_", " ")
-            query_alt = (
-                f"name contains '{alt_name}' and mimeType = 'application/pdf' and trashed = false"
-            )
-            results = (
-                service.files().list(q=query_alt, fields="files(id, name)", pageSize=1).execute()
-            )
-            items = results.get("files", [])
+    Il PDF passa dal DocumentStore locale: nome -> ID Drive e ID -> contenuto sono
+    in cache, quindi una domanda ripetuta sullo stesso documento non rifà né la
+    ricerca né il download.
 
-        if not items:
-            logger.warning(f"No file found on Drive for: {filename_from_qdrant}")
-            return None
+    Returns:
+        Path locale del PDF (nella cache, da non cancellare) o None
+    """
+    try:
+        path = get_document_store().get_pdf(filename_from_qdrant)
+        return str(path) if path else None
+    except Exception as e:
+        logger.error(f"Drive search error: {e}")
+        return None
 
-        # 3. TROVATO! (Anche se il nome non è identico)
-        found_file = items[0]
-        logger.info(f"Found match: '{found_file['name']}' (ID: {found_file['id']})")
 
-        # Scarica
-        request = service.files().get_media(fileId=found_file["id"])
-        fh = io.BytesIO()
-        downloader = MediaIoBaseDownload(fh, request)
-        done = False
-        while done is False:
-            _, done = downloader.next_chunk()
+def upload_to_gemini(pdf_path):
+    """
+    Upload a PDF to Gemini, reusing an earlier upload of the same file.
 
-        fh.seek(0)
-        temp_path = f"/tmp/{found_file['name']}"
-        with open(temp_path, "wb") as f:
-            f.write(fh.read())
+    Gemini receives the original PDF (tables and layout included); only the
+    upload is skipped for a document asked about again within GEMINI_FILE_TTL.
 
-        return temp_path
+    Returns:
+        Gemini file handle
+    """
+    entry = _uploaded_files.get(pdf_path)
+    if entry and time.monotonic() - entry[1] < GEMINI_FILE_TTL:
+        _uploaded_files.move_to_end(pdf_path)
+        return entry[0]
 
-    except Exception as e:
-        logger.error(f"Drive search error: {e}")
-        return None
+    uploaded = genai.upload_file(pdf_path)
+    _uploaded_files[pdf_path] = (uploaded, time.monotonic())
+    _uploaded_files.move_to_end(pdf_path)
+    while len(_uploaded_files) > GEMINI_FILE_CACHE_SIZE:
+        _uploaded_files.popitem(last=False)
+    return uploaded
 
 
 # --- MAIN ORACLE LOGIC ---
@@ -140,38 +123,38 @@ async def smart_oracle(query, best_filename_from_qdrant):
         str: AI-generated answer based on full document analysis
     """
 
-    # 1. Download the specific file identified by your Vector DB
-    pdf_path = download_pdf_from_drive(best_filename_from_qdrant)
+    # 1. Fetch the specific file identified by your Vector DB (local store, Drive on a miss)
+    pdf_path = await asyncio.to_thread(download_pdf_from_drive, best_filename_from_qdrant)
 
     if pdf_path:
         try:
             # --- AI PROCESSING BLOCK (Gemini Implementation) ---
             # LEGACY CODE CLEANED: Anthropic references removed - use ZANTARA AI if switching
 
-            # Upload file to Gemini's temporary cache
-            gemini_file = genai.upload_file(pdf_path)
+            # Upload the PDF to Gemini's temporary storage (reused for repeat questions)
+            document = upload_to_gemini(pdf_path)
 
             # Select Model (Use 'models/gemini-2.5-flash' - unlimited on ULTRA plan)
             model = genai.GenerativeModel("models/gemini-2.5-flash")
 
             logger.info(f"Analyzing document: {best_filename_from_qdrant}")
 
-            # Generate content using the uploaded file and the user query
+            # Generate content using the document and the user query
             response = model.generate_content(
                 [
                     "You are an expert consultant. Answer the user query based ONLY on the provided document.",
-                    gemini_file,
+                    document,
                     f"User Query: {query}",
                 ]
             )
 
-            # Cleanup: Remove local temp file to save space
-            os.remove(pdf_path)
-
+            # The PDF stays in the local document store (size-bounded LRU) for repeat questions
             return response.text
 
         except Exception as ai_error:
             logger.error(f"AI Processing Error: {ai_error}")
+            # The Gemini file may have expired early: upload again next time
+            _uploaded_files.pop(pdf_path, None)
             return "Error processing the document with AI."
     else:
         # Fallback if the file is missing from Drive
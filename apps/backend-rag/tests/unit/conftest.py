@@ -66,6 +66,7 @@ def mock_context_builder():
     builder.detect_identity_query = MagicMock(return_value=False)
     builder.detect_zantara_query = MagicMock(return_value=False)
     builder.detect_team_query = MagicMock(return_value=False)
+    builder.build_crm_context_async = AsyncMock(return_value=None)
     return builder
 
 
@@ -2,10 +2,12 @@
 Unit tests for Auto Ingestion Orchestrator
 """
 
+import asyncio
 import sys
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -16,10 +18,12 @@ if str(backend_path) not in sys.path:
 
 from services.auto_ingestion_orchestrator import (
     AutoIngestionOrchestrator,
+    HostRateLimiter,
     IngestionJob,
     IngestionStatus,
     MonitoredSource,
     ScrapedContent,
+    SeenContentStore,
     SourceType,
     UpdateType,
 )
@@ -31,8 +35,27 @@ from services.auto_ingestion_orchestrator import (
 
 @pytest.fixture
 def mock_search_service():
-    """Mock SearchService"""
-    return MagicMock()
+    """Mock SearchService with an embedder and upsert-capable collections"""
+    mock = MagicMock()
+    mock.embedder.generate_embeddings = MagicMock(
+        side_effect=lambda texts: [[0.1, 0.2, 0.3] for _ in texts]
+    )
+    collections = {}
+    physical = {
+        "kbli_comprehensive": "kbli_unified",
+        "visa_oracle": "visa_oracle",
+        "tax_updates": "tax_genius",
+        "legal_updates": "legal_unified",
+    }
+    for name, collection_name in physical.items():
+        collection = MagicMock()
+        collection.collection_name = collection_name
+        collection.upsert_documents = MagicMock(
+            side_effect=lambda chunks, **_kwargs: {"success": True, "documents_added": len(chunks)}
+        )
+        collections[name] = collection
+    mock.collections = collections
+    return mock
 
 
 @pytest.fixture
@@ -61,12 +84,13 @@ def mock_scraper_service():
 
 
 @pytest.fixture
-def orchestrator(mock_search_service, mock_claude_service, mock_scraper_service):
+def orchestrator(tmp_path, mock_search_service, mock_claude_service, mock_scraper_service):
     """Create AutoIngestionOrchestrator instance"""
     return AutoIngestionOrchestrator(
         search_service=mock_search_service,
         claude_service=mock_claude_service,
         scraper_service=mock_scraper_service,
+        seen_store_path=str(tmp_path / "seen.log"),
     )
 
 
@@ -255,15 +279,14 @@ async def test_scrape_source_with_scraper(orchestrator, mock_scraper_service):
 
 @pytest.mark.asyncio
 async def test_scrape_source_without_scraper(orchestrator):
-    """Test scraping source without scraper service (demo mode)"""
+    """Without a scraper service nothing is scraped (no simulated content)"""
     orchestrator.scraper = None
     source = orchestrator.sources["oss_kbli"]
 
     scraped_items = await orchestrator.scrape_source(source)
 
-    assert len(scraped_items) > 0
-    assert isinstance(scraped_items[0], ScrapedContent)
-    assert "demo" in scraped_items[0].content_id.lower() or "demo" in scraped_items[0].title.lower()
+    assert scraped_items == []
+    assert source.last_scraped is None
 
 
 @pytest.mark.asyncio
@@ -355,6 +378,93 @@ async def test_filter_content_no_claude_service(orchestrator):
     # Should only use Tier 1 filtering
 
 
+@pytest.mark.asyncio
+async def test_filter_content_batches_llm_calls(orchestrator, mock_claude_service):
+    """Tier 2 classifies several items per prompt and applies per-item verdicts"""
+    content_list = [
+        ScrapedContent(
+            content_id=f"content{i}",
+            source_id="oss_kbli",
+            title=f"Peraturan {i}",
+            content="Perubahan peraturan",
+            url="https://example.com",
+            scraped_at=datetime.now().isoformat(),
+        )
+        for i in range(1, 6)
+    ]
+    mock_claude_service.conversational = AsyncMock(
+        side_effect=[
+            {"text": "1: YES - new regulation\n2: NO - news\n3: YES - policy change"},
+            {"text": "1: NO - not relevant"},  # No verdict for the second item
+        ]
+    )
+
+    with patch("services.auto_ingestion_orchestrator.settings") as mock_settings:
+        mock_settings.auto_ingestion_filter_batch_size = 3
+        filtered = await orchestrator.filter_content(content_list)
+
+    assert mock_claude_service.conversational.call_count == 2
+    first_prompt = mock_claude_service.conversational.call_args_list[0].kwargs["message"]
+    assert "[3] Title: Peraturan 3" in first_prompt
+    assert [c.content_id for c in filtered] == ["content1", "content3", "content5"]
+    assert filtered[0].update_type == UpdateType.NEW_REGULATION
+    assert filtered[0].relevance_score == 0.8
+    assert filtered[1].update_type == UpdateType.POLICY_CHANGE
+
+
+@pytest.mark.asyncio
+async def test_filter_content_batch_error_keeps_items(orchestrator, mock_claude_service):
+    """A failed prompt keeps every item of its batch"""
+    mock_claude_service.conversational = AsyncMock(side_effect=Exception("LLM down"))
+    content_list = [
+        ScrapedContent(
+            content_id=f"content{i}",
+            source_id="oss_kbli",
+            title="Regulation",
+            content="Policy update",
+            url="https://example.com",
+            scraped_at=datetime.now().isoformat(),
+        )
+        for i in range(3)
+    ]
+
+    filtered = await orchestrator.filter_content(content_list)
+
+    assert len(filtered) == 3
+    assert mock_claude_service.conversational.call_count == 1
+
+
+# ============================================================================
+# Tests for HostRateLimiter
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_host_rate_limiter_spaces_same_host():
+    """Requests to one host are serialized and spaced, other hosts are not delayed"""
+    limiter = HostRateLimiter(max_concurrent=1, min_interval_s=0.05)
+    starts = {}
+
+    async def request(key, url):
+        async with limiter.slot(url):
+            starts[key] = time.monotonic()
+
+    t0 = time.monotonic()
+    await asyncio.gather(
+        request("a1", "https://a.go.id/x"),
+        request("a2", "https://A.go.id/y"),
+        request("b1", "https://b.go.id/z"),
+    )
+
+    assert abs(starts["a2"] - starts["a1"]) >= 0.045
+    assert starts["b1"] - t0 < 0.04
+
+
+def test_host_rate_limiter_host_of():
+    """Hosts are compared case-insensitively"""
+    assert HostRateLimiter.host_of("https://WWW.Pajak.go.id/id/peraturan") == "www.pajak.go.id"
+
+
 # ============================================================================
 # Tests for ingest_content
 # ============================================================================
@@ -441,6 +551,170 @@ async def test_ingest_content_unknown_source(orchestrator):
     assert ingested_count == 0
 
 
+def _content(content_id, source_id="oss_kbli", text="Peraturan baru"):
+    return ScrapedContent(
+        content_id=content_id,
+        source_id=source_id,
+        title=f"Title {content_id}",
+        content=text,
+        url=f"https://example.com/{content_id}",
+        scraped_at=datetime.now().isoformat(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_ingest_content_batches_by_collection(orchestrator, mock_search_service):
+    """Items are grouped per target collection, embedded in batches and bulk-upserted"""
+    content_list = [
+        _content("k1"),
+        _content("v1", source_id="ditjen_imigrasi"),
+        _content("k2"),
+        _content("k2"),  # Duplicate within the batch
+    ]
+
+    with patch("services.auto_ingestion_orchestrator.settings") as mock_settings:
+        mock_settings.auto_ingestion_embed_batch_size = 1
+        ingested_count = await orchestrator.ingest_content(content_list)
+
+    assert ingested_count == 3
+    assert mock_search_service.embedder.generate_embeddings.call_count == 3
+
+    kbli = mock_search_service.collections["kbli_comprehensive"].upsert_documents
+    kbli.assert_called_once()
+    kwargs = kbli.call_args.kwargs
+    assert kwargs["chunks"] == ["Title k1\n\nPeraturan baru", "Title k2\n\nPeraturan baru"]
+    assert [m["content_id"] for m in kwargs["metadatas"]] == ["k1", "k2"]
+    assert all("content_hash" in m for m in kwargs["metadatas"])
+    assert len(set(kwargs["ids"])) == 2
+    mock_search_service.collections["visa_oracle"].upsert_documents.assert_called_once()
+    assert orchestrator.orchestrator_stats["items_by_collection"] == {
+        "kbli_comprehensive": 2,
+        "visa_oracle": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_ingest_content_invalidates_physical_collection(orchestrator):
+    """Cached searches are tagged with the Qdrant collection, not the routed alias"""
+    with patch("services.auto_ingestion_orchestrator.invalidate_collection") as mock_invalidate:
+        await orchestrator.ingest_content([_content("k1")])
+
+    mock_invalidate.assert_called_once_with("kbli_unified")
+
+
+@pytest.mark.asyncio
+async def test_ingest_content_point_ids_are_deterministic(orchestrator, mock_search_service):
+    """Re-ingesting the same item rewrites the same point"""
+    upsert = mock_search_service.collections["kbli_comprehensive"].upsert_documents
+
+    await orchestrator.ingest_content([_content("k1")])
+    first_ids = upsert.call_args.kwargs["ids"]
+    orchestrator.content_hashes = SeenContentStore()
+    await orchestrator.ingest_content([_content("k1")])
+
+    assert upsert.call_args.kwargs["ids"] == first_ids
+
+
+@pytest.mark.asyncio
+async def test_ingest_content_upsert_failure_not_marked_seen(orchestrator, mock_search_service):
+    """Items of a failed upsert are retried on the next run"""
+    upsert = mock_search_service.collections["kbli_comprehensive"].upsert_documents
+    upsert.side_effect = None
+    upsert.return_value = {"success": False, "error": "HTTP 500"}
+
+    ingested_count = await orchestrator.ingest_content([_content("k1")])
+
+    assert ingested_count == 0
+    assert "k1" not in orchestrator.content_hashes
+
+
+@pytest.mark.asyncio
+async def test_ingest_content_embedding_failure(orchestrator, mock_search_service):
+    """A failed embedding batch drops only its items"""
+    mock_search_service.embedder.generate_embeddings.side_effect = Exception("API down")
+
+    ingested_count = await orchestrator.ingest_content([_content("k1")])
+
+    assert ingested_count == 0
+    mock_search_service.collections["kbli_comprehensive"].upsert_documents.assert_not_called()
+
+
+# ============================================================================
+# Tests for SeenContentStore
+# ============================================================================
+
+
+def test_seen_content_store_survives_restart(tmp_path):
+    """Seen content IDs are reloaded from the log"""
+    path = tmp_path / "seen" / "auto_ingestion.log"
+    store = SeenContentStore(str(path))
+    store.update(["a", "b", "a"])
+    store.add("c")
+    store.add("b")
+
+    reloaded = SeenContentStore(str(path))
+
+    assert len(reloaded) == 3
+    assert "a" in reloaded and "c" in reloaded
+    assert path.read_text().splitlines() == ["a", "b", "c"]
+
+
+def test_seen_content_store_ignores_torn_line(tmp_path):
+    """A partially written last line is dropped and later appends stay intact"""
+    path = tmp_path / "seen.log"
+    path.write_text("a\nb\nto")
+
+    store = SeenContentStore(str(path))
+    assert len(store) == 2
+    assert "to" not in store
+
+    store.add("c")
+    assert "c" in SeenContentStore(str(path))
+
+
+def test_seen_content_store_memory_only():
+    """Without a path the store is an in-memory set"""
+    store = SeenContentStore()
+    store.add("a")
+
+    assert "a" in store
+    assert store.path is None
+
+
+@pytest.mark.asyncio
+async def test_scheduled_ingestion_skips_seen_after_restart(
+    tmp_path, mock_search_service, mock_claude_service, mock_scraper_service
+):
+    """A restarted orchestrator neither filters nor re-embeds items it already ingested"""
+    path = str(tmp_path / "seen.log")
+    first = AutoIngestionOrchestrator(
+        search_service=mock_search_service,
+        claude_service=mock_claude_service,
+        scraper_service=mock_scraper_service,
+        seen_store_path=path,
+    )
+    job = await first.run_ingestion_job("oss_kbli")
+    assert job.items_ingested == 1
+    embed_calls = mock_search_service.embedder.generate_embeddings.call_count
+    llm_calls = mock_claude_service.conversational.call_count
+
+    restarted = AutoIngestionOrchestrator(
+        search_service=mock_search_service,
+        claude_service=mock_claude_service,
+        scraper_service=mock_scraper_service,
+        seen_store_path=path,
+    )
+    job = await restarted.run_ingestion_job("oss_kbli")
+
+    assert job.status == IngestionStatus.COMPLETED
+    assert job.items_scraped == 1
+    assert job.items_ingested == 0
+    assert job.items_failed == 0
+    assert restarted.orchestrator_stats["items_skipped_seen"] == 1
+    assert mock_search_service.embedder.generate_embeddings.call_count == embed_calls
+    assert mock_claude_service.conversational.call_count == llm_calls
+
+
 # ============================================================================
 # Tests for run_ingestion_job
 # ============================================================================
@@ -516,6 +790,59 @@ async def test_run_scheduled_ingestion_with_due_sources(
     assert all(isinstance(job, IngestionJob) for job in jobs)
 
 
+@pytest.mark.asyncio
+async def test_run_scheduled_ingestion_runs_sources_concurrently(orchestrator):
+    """Due sources run concurrently up to the global cap, and jobs keep source order"""
+    running = 0
+    peak = 0
+
+    async def scrape(url):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return [{"title": "Peraturan", "content": f"Peraturan baru {url}", "url": url}]
+
+    orchestrator.scraper.scrape = AsyncMock(side_effect=scrape)
+    orchestrator.host_limiter = HostRateLimiter(max_concurrent=1, min_interval_s=0)
+
+    jobs = await orchestrator.run_scheduled_ingestion(max_concurrent=2)
+
+    assert peak == 2
+    assert [job.source_id for job in jobs] == list(orchestrator.DEFAULT_SOURCES)
+    assert all(job.status == IngestionStatus.COMPLETED for job in jobs)
+    assert all(job.progress == 1.0 for job in jobs)
+
+
+@pytest.mark.asyncio
+async def test_run_scheduled_ingestion_progress_visible(orchestrator):
+    """Queued and running jobs are visible through get_job_status"""
+    release = asyncio.Event()
+    snapshots = []
+
+    async def scrape(url):
+        snapshots.append({job.source_id: job.status for job in orchestrator.jobs.values()})
+        await release.wait()
+        return []
+
+    orchestrator.scraper.scrape = AsyncMock(side_effect=scrape)
+    task = asyncio.create_task(orchestrator.run_scheduled_ingestion(max_concurrent=1))
+    while not snapshots:
+        await asyncio.sleep(0)
+
+    statuses = snapshots[0]
+    assert statuses["oss_kbli"] == IngestionStatus.SCRAPING
+    assert statuses["djp_tax"] == IngestionStatus.PENDING
+    job_id = next(j for j in orchestrator.jobs.values() if j.source_id == "djp_tax").job_id
+    assert orchestrator.get_job_status(job_id).progress == 0.0
+
+    release.set()
+    jobs = await task
+    assert orchestrator.get_job_status(job_id).status == IngestionStatus.COMPLETED
+    assert len(jobs) == len(orchestrator.DEFAULT_SOURCES)
+
+
 @pytest.mark.asyncio
 async def test_run_scheduled_ingestion_no_due_sources(orchestrator):
     """Test running scheduled ingestion with no due sources"""
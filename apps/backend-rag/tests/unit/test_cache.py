@@ -37,7 +37,10 @@ def mock_redis_client():
     mock_client.get.return_value = None
     mock_client.setex.return_value = True
     mock_client.delete.return_value = 1
-    mock_client.keys.return_value = []
+    mock_client.scan_iter.return_value = iter([])
+    mock_client.unlink.return_value = 0
+    mock_client.mget.return_value = []
+    mock_client.incr.return_value = 1
     return mock_client
 
 
@@ -316,21 +319,30 @@ def test_delete_redis_error(cache_service_with_redis, mock_redis_client):
 
 
 def test_clear_pattern_redis_with_keys(cache_service_with_redis, mock_redis_client):
-    """Test clear_pattern with Redis and matching keys"""
-    mock_redis_client.keys.return_value = ["key1", "key2", "key3"]
-    mock_redis_client.delete.return_value = 3
+    """Test clear_pattern with Redis scans (never KEYS) and unlinks matching keys"""
+    mock_redis_client.scan_iter.return_value = iter(["key1", "key2", "key3"])
+    mock_redis_client.unlink.return_value = 3
     result = cache_service_with_redis.clear_pattern("zantara:test:*")
     assert result == 3
-    mock_redis_client.keys.assert_called_once_with("zantara:test:*")
-    mock_redis_client.delete.assert_called_once_with("key1", "key2", "key3")
+    mock_redis_client.keys.assert_not_called()
+    mock_redis_client.scan_iter.assert_called_once_with(match="zantara:test:*", count=500)
+    mock_redis_client.unlink.assert_called_once_with("key1", "key2", "key3")
+    mock_redis_client.incr.assert_called_once_with("zantara:version:test")
 
 
 def test_clear_pattern_redis_no_keys(cache_service_with_redis, mock_redis_client):
     """Test clear_pattern with Redis and no matching keys"""
-    mock_redis_client.keys.return_value = []
     result = cache_service_with_redis.clear_pattern("zantara:test:*")
     assert result == 0
-    mock_redis_client.delete.assert_not_called()
+    mock_redis_client.unlink.assert_not_called()
+
+
+def test_clear_pattern_redis_skips_version_keys(cache_service_with_redis, mock_redis_client):
+    """Test clearing everything keeps the invalidation counters"""
+    mock_redis_client.scan_iter.return_value = iter(["zantara:version:test", "zantara:a:b"])
+    mock_redis_client.unlink.return_value = 1
+    cache_service_with_redis.clear_pattern("zantara:*")
+    mock_redis_client.unlink.assert_called_once_with("zantara:a:b")
 
 
 def test_clear_pattern_memory(cache_service_no_redis, clear_memory_cache):
@@ -355,7 +367,7 @@ def test_clear_pattern_memory_no_match(cache_service_no_redis, clear_memory_cach
 
 def test_clear_pattern_redis_error(cache_service_with_redis, mock_redis_client):
     """Test clear_pattern when Redis raises exception"""
-    mock_redis_client.keys.side_effect = Exception("Redis error")
+    mock_redis_client.scan_iter.side_effect = Exception("Redis error")
     with patch("core.cache.logger") as mock_logger:
         result = cache_service_with_redis.clear_pattern("zantara:test:*")
         assert result == 0
@@ -594,3 +606,165 @@ def test_generate_key_with_complex_types(cache_service_no_redis):
     key = cache_service_no_redis._generate_key("test", [1, 2, 3], {"nested": {"key": "value"}})
     assert key.startswith("zantara:test:")
     assert len(key.split(":")[2]) == 12
+
+
+# ============================================================================
+# Tests for MemoryCache and the L1 tier
+# ============================================================================
+
+
+def test_memory_cache_ttl_expiry():
+    """Test entries expire after their TTL"""
+    from core.cache import MemoryCache
+
+    mem = MemoryCache()
+    with patch("core.cache.time.monotonic", return_value=1000.0):
+        mem.set("key", "value", ttl=10)
+    with patch("core.cache.time.monotonic", return_value=1005.0):
+        assert mem.get("key") == "value"
+    with patch("core.cache.time.monotonic", return_value=1011.0):
+        assert mem.get("key") is None
+        assert "key" not in mem
+    assert mem.stats["expirations"] == 1
+
+
+def test_memory_cache_lru_entry_limit():
+    """Test least recently used entries are evicted past max_entries"""
+    from core.cache import MemoryCache
+
+    mem = MemoryCache(max_entries=2)
+    mem.set("a", 1)
+    mem.set("b", 2)
+    mem.get("a")
+    mem.set("c", 3)
+
+    assert "b" not in mem
+    assert mem.get("a") == 1
+    assert mem.stats["evictions"] == 1
+
+
+def test_memory_cache_lfu_policy():
+    """Test LFU keeps frequently hit entries"""
+    from core.cache import MemoryCache
+
+    mem = MemoryCache(max_entries=2, policy="lfu")
+    mem.set("hot", 1)
+    mem.set("cold", 2)
+    for _ in range(3):
+        mem.get("hot")
+    mem.get("cold")  # cold is now most recent but less frequent
+    mem.set("new", 3)
+
+    assert "hot" in mem
+    assert "cold" not in mem
+
+
+def test_memory_cache_byte_limit():
+    """Test byte-size accounting bounds memory usage"""
+    from core.cache import MemoryCache
+
+    mem = MemoryCache(max_entries=100, max_bytes=200)
+    for i in range(10):
+        mem.set(f"key{i}", "x" * 50)
+
+    assert mem.current_bytes <= 200
+    assert len(mem) < 10
+
+    mem.set("huge", "x" * 500)
+    assert "huge" not in mem
+
+
+def test_set_to_memory_respects_ttl(cache_service_no_redis, clear_memory_cache):
+    """Test the memory fallback honours the TTL passed to set"""
+    with patch("core.cache.time.monotonic", return_value=0.0):
+        cache_service_no_redis.set("test_key", {"key": "value"}, ttl=5)
+    with patch("core.cache.time.monotonic", return_value=6.0):
+        assert cache_service_no_redis.get("test_key") is None
+
+
+def test_l1_serves_hot_keys_without_redis(cache_service_with_redis, mock_redis_client):
+    """Test L1 hits skip the Redis round trip"""
+    mock_redis_client.get.return_value = '{"key": "value"}'
+
+    assert cache_service_with_redis.get("test_key") == {"key": "value"}
+    assert cache_service_with_redis.get("test_key") == {"key": "value"}
+
+    mock_redis_client.get.assert_called_once_with("test_key")
+    assert cache_service_with_redis.stats["hits"] == 2
+
+
+def test_l1_invalidated_on_delete(cache_service_with_redis, mock_redis_client):
+    """Test delete drops the L1 copy too"""
+    cache_service_with_redis.set("test_key", {"key": "value"})
+    cache_service_with_redis.delete("test_key")
+
+    assert cache_service_with_redis.get("test_key") is None
+    mock_redis_client.get.assert_called_once_with("test_key")
+
+
+def test_l1_disabled():
+    """Test L1 can be turned off via settings"""
+    with patch("app.core.config.settings") as mock_settings:
+        mock_settings.redis_url = None
+        mock_settings.cache_l1_enabled = False
+        with patch("core.cache.logger"):
+            service = CacheService()
+    assert service.l1 is None
+    assert service.get_stats()["l1"] is None
+
+
+# ============================================================================
+# Tests for versioned invalidation
+# ============================================================================
+
+
+def test_versioned_key_changes_after_bump(cache_service_no_redis):
+    """Test bumping a namespace version changes the generated key"""
+    key1 = cache_service_no_redis._generate_versioned_key("vtest", ["collection:a"], ("q",), {})
+    cache_service_no_redis.bump_version("collection:a")
+    key2 = cache_service_no_redis._generate_versioned_key("vtest", ["collection:a"], ("q",), {})
+    key3 = cache_service_no_redis._generate_versioned_key("vtest", ["collection:b"], ("q",), {})
+
+    assert key1 != key2
+    assert key1.startswith("zantara:vtest:")
+    assert key3 != key2
+
+
+def test_versions_read_from_redis_in_one_call(cache_service_with_redis, mock_redis_client):
+    """Test versions are fetched with a single MGET and reused locally"""
+    mock_redis_client.mget.return_value = ["2", None, "5"]
+    versions = cache_service_with_redis.get_versions(["*", "vtest", "collection:a"])
+    assert versions == {"*": 2, "vtest": 0, "collection:a": 5}
+
+    cache_service_with_redis.get_versions(["*", "vtest", "collection:a"])
+    mock_redis_client.mget.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_tag_misses_cached_entries(cache_service_no_redis, clear_memory_cache):
+    """Test invalidate_tag makes tagged entries miss without touching others"""
+    from core.cache import invalidate_collection
+
+    calls = []
+
+    @cached(ttl=300, prefix="vsearch", tags=lambda collection: [f"collection:{collection}"])
+    async def search(collection):
+        calls.append(collection)
+        return {"collection": collection, "n": len(calls)}
+
+    with patch("core.cache.cache", cache_service_no_redis):
+        await search("legal")
+        await search("visa")
+        with patch("core.cache.logger"):
+            invalidate_collection("legal")
+        await search("legal")
+        await search("visa")
+
+    assert calls == ["legal", "visa", "legal"]
+
+
+def test_invalidate_prefix_pattern_bumps_version(cache_service_with_redis, mock_redis_client):
+    """Test prefix patterns are invalidated via a version bump"""
+    with patch("core.cache.cache", cache_service_with_redis), patch("core.cache.logger"):
+        invalidate_cache("zantara:agents:*")
+    mock_redis_client.incr.assert_called_once_with("zantara:version:agents")
@@ -0,0 +1,241 @@
+"""
+Unit tests for deterministic chunk IDs and incremental re-ingestion
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# Ensure backend is in path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+if str(backend_path) not in sys.path:
+    sys.path.insert(0, str(backend_path))
+
+from core.chunk_manifest import (
+    ChunkSyncPlan,
+    content_hash,
+    delete_vanished_chunks,
+    load_chunk_manifest,
+    make_point_id,
+    plan_chunk_sync,
+    sync_document_chunks,
+)
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+class FakeCollection:
+    """In-memory stand-in for QdrantClient (upsert/set_payloads/delete/scroll_points)"""
+
+    def __init__(self):
+        self.points: dict[str, dict] = {}
+        self.upserted: list[str] = []
+        self.relabeled: list[str] = []
+
+    def upsert_documents(self, chunks, embeddings, metadatas, ids):
+        for point_id, text, metadata in zip(ids, chunks, metadatas, strict=True):
+            self.points[point_id] = {"text": text, "metadata": metadata}
+        self.upserted.extend(ids)
+        return {"success": True}
+
+    def set_payloads(self, updates):
+        for point_id, payload in updates:
+            self.points[point_id].update(payload)
+        self.relabeled.extend(point_id for point_id, _ in updates)
+        return {"success": True, "updated_count": len(updates)}
+
+    def delete(self, ids):
+        for point_id in ids:
+            self.points.pop(point_id, None)
+        return {"success": True, "deleted_count": len(ids)}
+
+    def scroll_points(self, filter=None, payload_fields=None):
+        return [
+            {"id": point_id, "payload": {"metadata": point["metadata"]}}
+            for point_id, point in self.points.items()
+            if point["metadata"].get("file_path") == filter["file_path"]
+        ]
+
+
+@pytest.fixture
+def collection():
+    return FakeCollection()
+
+
+@pytest.fixture
+def embedder():
+    embedder = MagicMock()
+    embedder.generate_embeddings.side_effect = lambda texts: [[0.1] for _ in texts]
+    return embedder
+
+
+def _metas(source, n, **extra):
+    return [{"file_path": source, "chunk_index": i, **extra} for i in range(n)]
+
+
+def _sync(collection, embedder, texts, source="book.pdf", **extra):
+    return sync_document_chunks(
+        collection, embedder, source, texts, _metas(source, len(texts), **extra)
+    )
+
+
+# ============================================================================
+# Tests: IDs and hashes
+# ============================================================================
+
+
+def test_point_id_is_deterministic_uuid():
+    """Same (source, text, occurrence) -> same UUID; any component changes it"""
+    point_id = make_point_id("a.pdf", "text")
+
+    assert point_id == make_point_id("a.pdf", "text", 0)
+    assert len(point_id) == 36
+    assert point_id != make_point_id("b.pdf", "text")
+    assert point_id != make_point_id("a.pdf", "text", 1)
+    assert point_id != make_point_id("a.pdf", "text!")
+
+
+def test_content_hash_covers_metadata_and_ignores_key_order():
+    """Metadata changes alter the hash; key order and the hash field itself do not"""
+    base = content_hash("t", {"a": 1, "b": 2})
+
+    assert base == content_hash("t", {"b": 2, "a": 1})
+    assert base == content_hash("t", {"a": 1, "b": 2, "content_hash": "old"})
+    assert base != content_hash("t", {"a": 1, "b": 3})
+
+
+# ============================================================================
+# Tests: planning
+# ============================================================================
+
+
+def test_plan_without_manifest_upserts_everything():
+    """Unknown manifest: every chunk is changed, nothing vanished"""
+    plan = plan_chunk_sync("a.pdf", ["x", "y"], _metas("a.pdf", 2), None)
+
+    assert plan.changed == [0, 1]
+    assert plan.vanished == []
+    assert all("content_hash" in meta for meta in plan.metadatas)
+
+
+def test_plan_repeated_text_gets_distinct_ids():
+    """Identical chunks in one document are stored as separate points"""
+    plan = plan_chunk_sync("a.pdf", ["x", "y", "x"], _metas("a.pdf", 3), None)
+
+    assert len(set(plan.ids)) == 3
+
+
+def test_plan_treats_legacy_points_as_vanished():
+    """Points stored under random IDs are replaced by deterministic ones"""
+    plan = plan_chunk_sync("a.pdf", ["x"], _metas("a.pdf", 1), {"legacy-uuid": ""})
+
+    assert plan.changed == [0]
+    assert plan.vanished == ["legacy-uuid"]
+
+
+def test_load_manifest_returns_none_when_collection_unreadable():
+    """A failed scroll must not look like an empty document"""
+    vector_db = MagicMock()
+    vector_db.scroll_points.side_effect = RuntimeError("Qdrant scroll failed: 503")
+
+    assert load_chunk_manifest(vector_db, "a.pdf") is None
+
+
+# ============================================================================
+# Tests: sync_document_chunks
+# ============================================================================
+
+
+def test_reingesting_unchanged_document_is_a_noop(collection, embedder):
+    """Second ingestion embeds and upserts nothing and leaves no duplicates"""
+    _sync(collection, embedder, ["one", "two", "three"])
+    embedder.generate_embeddings.reset_mock()
+
+    plan = _sync(collection, embedder, ["one", "two", "three"])
+
+    assert plan.changed == []
+    assert plan.unchanged == 3
+    embedder.generate_embeddings.assert_not_called()
+    assert len(collection.points) == 3
+
+
+def test_reingesting_edited_document_syncs_only_the_diff(collection, embedder):
+    """Edited chunks are re-embedded; removed chunks are deleted"""
+    _sync(collection, embedder, ["one", "two", "three"])
+    embedder.generate_embeddings.reset_mock()
+    collection.upserted.clear()
+
+    plan = _sync(collection, embedder, ["one", "TWO"])
+
+    embedder.generate_embeddings.assert_called_once_with(["TWO"])
+    assert plan.changed == [1]
+    assert len(plan.vanished) == 2  # old "two" and "three"
+    assert sorted(p["text"] for p in collection.points.values()) == ["TWO", "one"]
+
+
+def test_metadata_change_updates_payload_without_embedding(collection, embedder):
+    """Payload-only changes (e.g. new tier) rewrite the payload under the same IDs"""
+    first = _sync(collection, embedder, ["one", "two"], tier="C")
+    embedder.generate_embeddings.reset_mock()
+    collection.upserted.clear()
+
+    second = _sync(collection, embedder, ["one", "two"], tier="A")
+
+    assert second.changed == []
+    assert second.relabeled == [0, 1]
+    assert second.unchanged == 0
+    assert second.ids == first.ids
+    assert second.vanished == []
+    embedder.generate_embeddings.assert_not_called()
+    assert collection.upserted == []
+    assert {p["metadata"]["tier"] for p in collection.points.values()} == {"A"}
+
+
+def test_inserted_chunk_does_not_reembed_shifted_chunks(collection, embedder):
+    """Chunks moved to another position keep their points; only new text is embedded"""
+    first = _sync(collection, embedder, ["one", "two"], total_chunks=2)
+    embedder.generate_embeddings.reset_mock()
+
+    second = _sync(collection, embedder, ["zero", "one", "two"], total_chunks=3)
+
+    embedder.generate_embeddings.assert_called_once_with(["zero"])
+    assert second.changed == [0]
+    assert second.relabeled == [1, 2]
+    assert second.ids[1:] == first.ids
+    assert second.vanished == []
+    indices = {p["text"]: p["metadata"]["chunk_index"] for p in collection.points.values()}
+    assert indices == {"zero": 0, "one": 1, "two": 2}
+
+
+def test_documents_do_not_touch_each_other(collection, embedder):
+    """The manifest is scoped to one source"""
+    _sync(collection, embedder, ["shared text"], source="a.pdf")
+    _sync(collection, embedder, ["shared text"], source="b.pdf")
+    _sync(collection, embedder, [], source="a.pdf")
+
+    assert [p["metadata"]["file_path"] for p in collection.points.values()] == ["b.pdf"]
+
+
+def test_failed_upsert_raises_and_keeps_old_points(collection, embedder):
+    """Vanished chunks are only deleted after the new ones were stored"""
+    _sync(collection, embedder, ["old"])
+    collection.upsert_documents = MagicMock(return_value={"success": False, "error": "HTTP 500"})
+
+    with pytest.raises(RuntimeError, match="HTTP 500"):
+        _sync(collection, embedder, ["new"])
+
+    assert [p["text"] for p in collection.points.values()] == ["old"]
+
+
+def test_delete_vanished_raises_on_rejected_delete():
+    """A rejected delete is surfaced"""
+    vector_db = MagicMock()
+    vector_db.delete.return_value = {"success": False, "error": "HTTP 400"}
+    plan = ChunkSyncPlan(source="a", ids=[], metadatas=[], changed=[], vanished=["x"])
+
+    with pytest.raises(RuntimeError, match="HTTP 400"):
+        delete_vanished_chunks(vector_db, plan)
@@ -0,0 +1,274 @@
+"""
+Unit tests for CRM Context Provider
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Ensure backend is in path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+if str(backend_path) not in sys.path:
+    sys.path.insert(0, str(backend_path))
+
+from services.context import crm_context
+from services.context.context_builder import ContextBuilder
+from services.context.crm_context import (
+    CRMContextProvider,
+    format_crm_context,
+    invalidate_crm_context,
+)
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+class AsyncContextManager:
+    """Helper class for async context manager"""
+
+    def __init__(self, return_value):
+        self.return_value = return_value
+
+    async def __aenter__(self):
+        return self.return_value
+
+    async def __aexit__(self, *args):
+        pass
+
+
+def _client_row(client_id=1, practices=None):
+    return {
+        "id": client_id,
+        "full_name": "John Doe",
+        "email": "john@example.com",
+        "status": "active",
+        "tags": ["vip"],
+        "practices": json.dumps(practices or []),
+    }
+
+
+@pytest.fixture
+def mock_pool():
+    """Mock asyncpg.Pool"""
+    pool = MagicMock()
+    conn = MagicMock()
+    conn.fetchrow = AsyncMock(return_value=None)
+    pool.acquire = MagicMock(return_value=AsyncContextManager(conn))
+    return pool, conn
+
+
+@pytest.fixture
+def provider(mock_pool):
+    pool, _ = mock_pool
+    return CRMContextProvider(pool, ttl_s=60)
+
+
+# ============================================================================
+# Tests for format_crm_context
+# ============================================================================
+
+
+def test_format_crm_context_with_practices():
+    text = format_crm_context(
+        {"full_name": "John Doe", "status": "active", "tags": ["vip"]},
+        [
+            {
+                "practice_type_name": "KITAS",
+                "status": "in_progress",
+                "priority": "high",
+                "assigned_to": "anna@balizero.com",
+                "expiry_date": "2026-01-31",
+            }
+        ],
+        "john@example.com",
+    )
+
+    assert "CLIENT PROFILE (CRM DATA):" in text
+    assert "- Tags: vip" in text
+    assert "ACTIVE PRACTICES (1):" in text
+    assert "KITAS: in_progress (in progress) (Priority: high)" in text
+    assert "Assigned to: anna@balizero.com" in text
+    assert "Expiry: 2026-01-31" in text
+
+
+def test_format_crm_context_no_practices():
+    text = format_crm_context({"full_name": "John", "status": "active"}, [], "john@example.com")
+
+    assert text.endswith("ACTIVE PRACTICES: None")
+
+
+# ============================================================================
+# Tests for CRMContextProvider
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_get_context_single_query(provider, mock_pool):
+    """Client and practices come from one fetchrow"""
+    _, conn = mock_pool
+    conn.fetchrow.return_value = _client_row(
+        practices=[{"practice_type_name": "PT PMA", "status": "completed", "priority": "normal"}]
+    )
+
+    text = await provider.build_context("john@example.com")
+
+    conn.fetchrow.assert_awaited_once()
+    assert conn.fetchrow.call_args.args[1] == "john@example.com"
+    assert "PT PMA: completed (100% complete)" in text
+
+
+@pytest.mark.asyncio
+async def test_get_context_cached(provider, mock_pool):
+    """Repeated turns within the TTL hit the cache, including 'no active client'"""
+    _, conn = mock_pool
+    conn.fetchrow.return_value = _client_row()
+
+    first = await provider.get_context("john@example.com")
+    second = await provider.get_context("john@example.com")
+    assert first is second
+
+    conn.fetchrow.return_value = None
+    await provider.get_context("nobody@example.com")
+    assert await provider.get_context("nobody@example.com") is None
+    assert conn.fetchrow.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_context_expires(provider, mock_pool):
+    _, conn = mock_pool
+    conn.fetchrow.return_value = _client_row()
+    provider.ttl_s = 0
+
+    await provider.get_context("john@example.com")
+    await provider.get_context("john@example.com")
+
+    assert conn.fetchrow.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_text_formatted_lazily(provider, mock_pool):
+    _, conn = mock_pool
+    conn.fetchrow.return_value = _client_row()
+
+    with patch.object(crm_context, "format_crm_context", return_value="CRM") as mock_format:
+        context = await provider.get_context("john@example.com")
+        mock_format.assert_not_called()
+
+        assert context.text == "CRM"
+        assert (await provider.build_context("john@example.com")) == "CRM"
+        mock_format.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_by_client_id(provider, mock_pool):
+    """A practice write drops the email its client was cached under"""
+    _, conn = mock_pool
+    conn.fetchrow.return_value = _client_row(client_id=7)
+    await provider.get_context("john@example.com")
+
+    provider.invalidate(client_id=7)
+    await provider.get_context("john@example.com")
+
+    assert conn.fetchrow.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_by_email_drops_negative_entry(provider, mock_pool):
+    """Creating a client replaces a cached 'no active client'"""
+    _, conn = mock_pool
+    assert await provider.get_context("john@example.com") is None
+
+    provider.invalidate(email="john@example.com")
+    conn.fetchrow.return_value = _client_row()
+
+    assert await provider.get_context("john@example.com") is not None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_lookup_not_cached(provider, mock_pool):
+    """A lookup racing a write does not cache the pre-write row"""
+    _, conn = mock_pool
+
+    async def fetch_then_write(*args):
+        provider.invalidate(email="john@example.com")
+        return _client_row()
+
+    conn.fetchrow.side_effect = fetch_then_write
+    await provider.get_context("john@example.com")
+
+    assert "john@example.com" not in provider._cache
+
+
+@pytest.mark.asyncio
+async def test_get_context_db_error(provider, mock_pool):
+    _, conn = mock_pool
+    conn.fetchrow.side_effect = Exception("Database error")
+
+    assert await provider.get_context("john@example.com") is None
+    assert provider._cache == {}
+
+
+@pytest.mark.asyncio
+async def test_get_context_no_email(provider, mock_pool):
+    _, conn = mock_pool
+
+    assert await provider.get_context(None) is None
+    conn.fetchrow.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_context_no_database_url():
+    provider = CRMContextProvider()
+
+    with (
+        patch.object(crm_context.settings, "database_url", None),
+        patch.object(crm_context.asyncpg, "create_pool", new=AsyncMock()) as mock_create,
+    ):
+        assert await provider.get_context("john@example.com") is None
+
+    mock_create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_lazy_pool_created_once(mock_pool):
+    """Concurrent first lookups share one lazily created pool"""
+    pool, _ = mock_pool
+    provider = CRMContextProvider()
+
+    with (
+        patch.object(crm_context.settings, "database_url", "postgresql://test"),
+        patch.object(crm_context.asyncpg, "create_pool", new=AsyncMock(return_value=pool)) as mock,
+    ):
+        await asyncio.gather(*(provider.get_context(f"user{i}@example.com") for i in range(5)))
+
+    mock.assert_awaited_once()
+    assert provider.pool is pool
+
+
+def test_invalidate_crm_context_uses_singleton(mock_pool, monkeypatch):
+    pool, _ = mock_pool
+    monkeypatch.setattr(crm_context, "_crm_context_provider", None)
+    provider = crm_context.init_crm_context_provider(pool)
+    provider._cache["john@example.com"] = (float("inf"), None)
+
+    invalidate_crm_context(email="john@example.com")
+
+    assert provider._cache == {}
+    assert crm_context.get_crm_context_provider() is provider
+
+
+@pytest.mark.asyncio
+async def test_context_builder_async_uses_provider():
+    provider = MagicMock()
+    provider.build_context = AsyncMock(return_value="CRM")
+
+    with patch("services.context.context_builder.get_crm_context_provider", return_value=provider):
+        result = await ContextBuilder().build_crm_context_async("john@example.com")
+
+    assert result == "CRM"
+    provider.build_context.assert_awaited_once_with("john@example.com")
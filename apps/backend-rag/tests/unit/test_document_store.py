@@ -0,0 +1,267 @@
+"""
+Unit tests for the local Document Store
+"""
+
+import os
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Ensure backend is in path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+if str(backend_path) not in sys.path:
+    sys.path.insert(0, str(backend_path))
+
+from core.parsers import DocumentParseError
+
+from services import document_store as document_store_module
+from services.document_store import (
+    DocumentStore,
+    DriveBackend,
+    LocalDirectoryBackend,
+    clean_document_name,
+    name_variants,
+)
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    """Backend directory with a few PDFs"""
+    source = tmp_path / "source"
+    (source / "pajak").mkdir(parents=True)
+    (source / "PP_28_2025.pdf").write_bytes(b"%PDF-1.4 PP 28")
+    (source / "pajak" / "UU PPh 2024.pdf").write_bytes(b"%PDF-1.4 UU PPh")
+    (source / "notes.txt").write_text("not a pdf")
+    return source
+
+
+@pytest.fixture
+def backend(source_dir):
+    backend = LocalDirectoryBackend(source_dir)
+    backend.find = MagicMock(wraps=backend.find)
+    backend.fetch = MagicMock(wraps=backend.fetch)
+    return backend
+
+
+@pytest.fixture
+def store(backend, tmp_path):
+    return DocumentStore(backend, root=tmp_path / "store", max_bytes=1024 * 1024)
+
+
+# ============================================================================
+# Tests for name helpers
+# ============================================================================
+
+
+def test_clean_document_name():
+    assert clean_document_name("folder/tasse_2024.pdf") == "tasse_2024"
+    assert clean_document_name("") == ""
+    assert clean_document_name(None) == ""
+
+
+def test_name_variants():
+    assert name_variants("UU_PPh-2024") == [
+        "UU_PPh-2024",
+        "UU PPh-2024",
+        "UU_PPh 2024",
+        "UUPPh-2024",
+    ]
+    assert name_variants("plain") == ["plain"]
+
+
+# ============================================================================
+# Tests for get_pdf
+# ============================================================================
+
+
+def test_get_pdf_fetches_once(store, backend):
+    """A repeat request needs neither a search nor a download"""
+    first = store.get_pdf("PP_28_2025.pdf")
+    second = store.get_pdf("folder/PP_28_2025.pdf")
+
+    assert first == second
+    assert first.read_bytes() == b"%PDF-1.4 PP 28"
+    assert first.parent == store.objects_dir
+    backend.find.assert_called_once()
+    backend.fetch.assert_called_once()
+    assert store.stats["hits"] == 1
+
+
+def test_get_pdf_fuzzy_name(store):
+    """Underscores match spaces in backend filenames"""
+    path = store.get_pdf("UU_PPh_2024.pdf")
+
+    assert path.read_bytes() == b"%PDF-1.4 UU PPh"
+
+
+def test_get_pdf_not_found(store, backend):
+    assert store.get_pdf("missing.pdf") is None
+    assert store.get_pdf("") is None
+    backend.fetch.assert_not_called()
+
+
+def test_index_persisted(store, backend, tmp_path):
+    """A new store instance on the same directory reuses index and objects"""
+    path = store.get_pdf("PP_28_2025.pdf")
+
+    other_backend = MagicMock()
+    reopened = DocumentStore(other_backend, root=tmp_path / "store")
+
+    assert reopened.get_pdf("PP_28_2025.pdf") == path
+    other_backend.find.assert_not_called()
+    other_backend.fetch.assert_not_called()
+
+
+def test_same_content_stored_once(store, source_dir):
+    """Identical files under different names share one object"""
+    (source_dir / "PP 28 2025 copy.pdf").write_bytes(b"%PDF-1.4 PP 28")
+
+    first = store.get_pdf("PP_28_2025.pdf")
+    second = store.get_pdf("PP 28 2025 copy.pdf")
+
+    assert first == second
+    assert len(list(store.objects_dir.glob("*.pdf"))) == 1
+
+
+def test_stale_file_id_searched_again(store, backend, source_dir):
+    """A file deleted upstream after eviction triggers a new search"""
+    store.get_pdf("PP_28_2025.pdf").unlink()
+    (source_dir / "PP_28_2025.pdf").rename(source_dir / "PP_28_2025 rev.pdf")
+
+    path = store.get_pdf("PP_28_2025.pdf")
+
+    assert path.read_bytes() == b"%PDF-1.4 PP 28"
+    assert backend.find.call_count == 2
+    assert store._index["names"]["PP_28_2025"]["id"] == "PP_28_2025 rev.pdf"
+
+
+def test_fetch_error_leaves_no_partial_file(store, backend):
+    backend.fetch.side_effect = OSError("Connection reset")
+
+    with pytest.raises(OSError):
+        store.get_pdf("PP_28_2025.pdf")
+
+    assert list(store.objects_dir.iterdir()) == []
+
+
+# ============================================================================
+# Tests for eviction
+# ============================================================================
+
+
+def test_lru_eviction(store, source_dir):
+    """Least recently used documents are removed beyond max_bytes"""
+    for i in range(3):
+        (source_dir / f"doc_{i}.pdf").write_bytes(bytes([i]) * 400)
+    store.max_bytes = 1000
+
+    doc_0 = store.get_pdf("doc_0.pdf")
+    doc_1 = store.get_pdf("doc_1.pdf")
+    os.utime(doc_1, (1000, 1000))
+    os.utime(doc_0, (2000, 2000))
+    doc_2 = store.get_pdf("doc_2.pdf")
+
+    assert doc_0.exists() and doc_2.exists()
+    assert not doc_1.exists()
+    assert store.stats["evictions"] == 1
+    # Name -> ID is kept, so the evicted document is re-fetched without a search
+    assert "doc_1" in store._index["names"]
+    assert store.get_pdf("doc_1.pdf") == doc_1
+
+
+# ============================================================================
+# Tests for get_text
+# ============================================================================
+
+
+def test_get_text_extracted_once(store):
+    with patch("core.parsers.extract_text_from_pdf", return_value="Pasal 1") as mock_extract:
+        assert store.get_text("PP_28_2025.pdf") == "Pasal 1"
+        assert store.get_text("PP_28_2025.pdf") == "Pasal 1"
+
+    mock_extract.assert_called_once()
+    assert store.stats["text_hits"] == 1
+    assert store.get_pdf("PP_28_2025.pdf").with_suffix(".txt").exists()
+
+
+def test_get_text_scanned_pdf_cached_empty(store):
+    """PDFs without a text layer are not re-parsed"""
+    with patch(
+        "core.parsers.extract_text_from_pdf", side_effect=DocumentParseError("no text")
+    ) as mock_extract:
+        assert store.get_text("PP_28_2025.pdf") == ""
+        assert store.get_text("PP_28_2025.pdf") == ""
+
+    mock_extract.assert_called_once()
+
+
+def test_get_text_missing_document(store):
+    assert store.get_text("missing.pdf") is None
+
+
+# ============================================================================
+# Tests for DriveBackend and the singleton
+# ============================================================================
+
+
+def test_drive_backend_tries_variants():
+    service = MagicMock()
+    service.files.return_value.list.return_value.execute.side_effect = [
+        {"files": []},
+        {"files": [{"id": "abc", "name": "tasse 2024.pdf"}]},
+    ]
+    factory = MagicMock(return_value=service)
+    backend = DriveBackend(factory)
+
+    assert backend.find("tasse_2024") == {"id": "abc", "name": "tasse 2024.pdf"}
+
+    queries = [call.kwargs["q"] for call in service.files.return_value.list.call_args_list]
+    assert "name contains 'tasse_2024'" in queries[0]
+    assert "name contains 'tasse 2024'" in queries[1]
+    factory.assert_called_once()
+
+
+def test_drive_backend_escapes_quotes():
+    service = MagicMock()
+    service.files.return_value.list.return_value.execute.return_value = {"files": []}
+
+    assert DriveBackend(lambda: service).find("Bali's_guide") is None
+
+    query = service.files.return_value.list.call_args_list[0].kwargs["q"]
+    assert "name contains 'Bali\\'s_guide'" in query
+
+
+def test_drive_backend_no_service():
+    assert DriveBackend(lambda: None).find("doc") is None
+
+
+def test_get_document_store_local_backend(source_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(document_store_module, "_document_store", None)
+    monkeypatch.setattr(document_store_module.settings, "document_store_backend", "local")
+    monkeypatch.setattr(document_store_module.settings, "document_store_local_dir", str(source_dir))
+    monkeypatch.setattr(document_store_module.settings, "document_store_dir", str(tmp_path / "s"))
+
+    store = document_store_module.get_document_store()
+
+    assert isinstance(store.backend, LocalDirectoryBackend)
+    assert document_store_module.get_document_store() is store
+    assert store.get_pdf("PP_28_2025") is not None
+
+
+def test_get_document_store_drive_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_store_module, "_document_store", None)
+    monkeypatch.setattr(document_store_module.settings, "document_store_backend", "drive")
+    monkeypatch.setattr(document_store_module.settings, "document_store_dir", str(tmp_path / "s"))
+    drive = MagicMock()
+
+    store = document_store_module.get_document_store()
+
+    assert isinstance(store.backend, DriveBackend)
+    with patch("services.smart_oracle.get_drive_service", return_value=drive):
+        assert store.backend.service is drive
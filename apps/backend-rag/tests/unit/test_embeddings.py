@@ -109,6 +109,8 @@ def test_generate_embeddings_empty_list(mock_settings):
 
 def test_generate_single_embedding(mock_settings, mock_openai_client):
     """Test generating single embedding"""
+    # One input text, one embedding
+    mock_openai_client.embeddings.create.return_value.data.pop()
     with patch("openai.OpenAI", return_value=mock_openai_client):
         generator = EmbeddingsGenerator(
             provider="openai", api_key="test-key", settings=mock_settings
@@ -121,6 +123,8 @@ def test_generate_single_embedding(mock_settings, mock_openai_client):
 
 def test_generate_query_embedding(mock_settings, mock_openai_client):
     """Test generating query embedding"""
+    # One input text, one embedding
+    mock_openai_client.embeddings.create.return_value.data.pop()
     with patch("openai.OpenAI", return_value=mock_openai_client):
         generator = EmbeddingsGenerator(
             provider="openai", api_key="test-key", settings=mock_settings
@@ -591,3 +595,195 @@ def test_multiple_calls_to_generate_embeddings(mock_settings):
 
         # Verify client was called multiple times
         assert client.embeddings.create.call_count == 2
+
+
+# ============================================================================
+# Tests for EmbeddingCache and EmbeddingBatcher
+# ============================================================================
+
+
+def _echo_client():
+    """OpenAI client mock returning one embedding per input text"""
+    client = MagicMock()
+
+    def create_response(model, input):
+        response = MagicMock()
+        response.data = [MagicMock(embedding=[float(len(text))] * 4) for text in input]
+        return response
+
+    client.embeddings.create = MagicMock(side_effect=create_response)
+    return client
+
+
+def test_generate_embeddings_uses_cache(mock_settings):
+    """Test repeated texts are served from the embedding cache"""
+    client = _echo_client()
+
+    with patch("openai.OpenAI", return_value=client):
+        generator = EmbeddingsGenerator(
+            provider="openai", api_key="test-key", settings=mock_settings
+        )
+
+        first = generator.generate_embeddings(["a", "bb"])
+        second = generator.generate_embeddings(["bb", "a"])
+
+        assert second == [first[1], first[0]]
+        assert client.embeddings.create.call_count == 1
+        assert generator.get_cache_stats()["cache"]["hits"] == 2
+
+
+def test_generate_embeddings_only_embeds_misses(mock_settings):
+    """Test only uncached, deduplicated texts reach the provider"""
+    client = _echo_client()
+
+    with patch("openai.OpenAI", return_value=client):
+        generator = EmbeddingsGenerator(
+            provider="openai", api_key="test-key", settings=mock_settings
+        )
+
+        generator.generate_embeddings(["a"])
+        result = generator.generate_embeddings(["a", "ccc", "ccc"])
+
+        assert len(result) == 3
+        assert client.embeddings.create.call_args.kwargs["input"] == ["ccc"]
+
+
+def test_generate_embeddings_count_mismatch_raises(mock_settings):
+    """Test a short provider response is not returned misaligned with the texts"""
+    client = MagicMock()
+    client.embeddings.create.return_value.data = [MagicMock(embedding=[1.0] * 4)]
+
+    with patch("openai.OpenAI", return_value=client):
+        generator = EmbeddingsGenerator(
+            provider="openai", api_key="test-key", settings=mock_settings
+        )
+
+        with pytest.raises(ValueError, match="Expected 2 embeddings"):
+            generator.generate_embeddings(["a", "bb"])
+
+        assert generator.cache.get(generator.cache.make_key("openai", generator.model, "a")) is None
+
+
+def test_embedding_cache_lru_eviction():
+    """Test the in-memory tier evicts least recently used entries"""
+    from core.embeddings import EmbeddingCache
+
+    cache = EmbeddingCache(max_entries=2)
+    cache.set("a", [1.0])
+    cache.set("b", [2.0])
+    cache.get("a")
+    cache.set("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+    assert len(cache) == 2
+
+
+def test_embedding_cache_disk_backend(tmp_path):
+    """Test the disk tier survives a fresh in-memory cache"""
+    from core.embeddings import EmbeddingCache
+
+    key = EmbeddingCache.make_key("openai", "model", "hello")
+    EmbeddingCache(max_entries=10, cache_dir=str(tmp_path)).set(key, [0.5, 0.25])
+
+    cache = EmbeddingCache(max_entries=10, cache_dir=str(tmp_path))
+    assert cache.get(key) == [0.5, 0.25]
+    assert cache.stats["l2_hits"] == 1
+
+
+def test_embedding_cache_key_depends_on_model():
+    """Test cache keys differ across provider/model for the same text"""
+    from core.embeddings import EmbeddingCache
+
+    assert EmbeddingCache.make_key("openai", "m1", "x") != EmbeddingCache.make_key(
+        "openai", "m2", "x"
+    )
+
+
+@pytest.mark.asyncio
+async def test_batcher_merges_concurrent_requests():
+    """Test concurrent submissions are merged into one embed call"""
+    import asyncio
+
+    from core.embeddings import EmbeddingBatcher
+
+    calls = []
+
+    def embed(texts):
+        calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    batcher = EmbeddingBatcher(embed, max_batch_size=10, max_wait_ms=20)
+    results = await asyncio.gather(batcher.submit("a"), batcher.submit("bb"), batcher.submit("a"))
+
+    assert results == [[1.0], [2.0], [1.0]]
+    assert calls == [["a", "bb"]]
+    assert batcher.get_stats()["batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batcher_propagates_errors():
+    """Test a failed batch rejects every waiting request"""
+    import asyncio
+
+    from core.embeddings import EmbeddingBatcher
+
+    def embed(texts):
+        raise RuntimeError("provider down")
+
+    batcher = EmbeddingBatcher(embed, max_batch_size=10, max_wait_ms=1)
+    results = await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_async_generate_query_embedding_batches_and_caches(mock_settings):
+    """Test async query embeddings go through one batch, then the cache"""
+    import asyncio
+
+    client = _echo_client()
+
+    with patch("openai.OpenAI", return_value=client):
+        generator = EmbeddingsGenerator(
+            provider="openai", api_key="test-key", settings=mock_settings
+        )
+
+        results = await asyncio.gather(
+            generator.async_generate_query_embedding("q1"),
+            generator.async_generate_query_embedding("query2"),
+        )
+        again = await generator.async_generate_query_embedding("q1")
+
+        assert results[0] == [2.0] * 4
+        assert results[1] == [6.0] * 4
+        assert again == results[0]
+        assert client.embeddings.create.call_count == 1
+        # Each query is counted once (by the batch), the L1 fast path not at all
+        stats = generator.get_cache_stats()["cache"]
+        assert (stats["hits"], stats["misses"]) == (0, 2)
+
+
+@pytest.mark.asyncio
+async def test_async_generate_query_embedding_leaves_l2_to_batch(mock_settings, tmp_path):
+    """Test an L1 miss is looked up in L2 by the batch, not on the event loop"""
+    from core.embeddings import EmbeddingCache
+
+    client = _echo_client()
+
+    with patch("openai.OpenAI", return_value=client):
+        generator = EmbeddingsGenerator(
+            provider="openai", api_key="test-key", settings=mock_settings
+        )
+        generator.cache = EmbeddingCache(cache_dir=str(tmp_path))
+        await generator.async_generate_query_embedding("q1")
+        generator.cache.clear()  # Only the disk tier still holds "q1"
+
+        with patch.object(generator.cache, "peek", wraps=generator.cache.peek) as peek:
+            again = await generator.async_generate_query_embedding("q1")
+
+        assert again == [2.0] * 4
+        assert peek.call_count == 1
+        assert client.embeddings.create.call_count == 1
+        stats = generator.get_cache_stats()["cache"]
+        assert (stats["l2_hits"], stats["misses"]) == (1, 1)
@@ -4,9 +4,11 @@ Unit tests for Golden Answer Service
 """
 
 import sys
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 
 # Ensure backend is in path
@@ -14,7 +16,7 @@ backend_path = Path(__file__).parent.parent.parent / "backend"
 if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
-from services.golden_answer_service import GoldenAnswerService
+from services.golden_answer_service import GoldenAnswerIndex, GoldenAnswerService
 
 # ============================================================================
 # Fixtures
@@ -34,6 +36,46 @@ class AsyncContextManager:
         pass
 
 
+class FakeEncoder:
+    """Deterministic stand-in for SentenceTransformer (text -> vector lookup)"""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        return np.array([self.vectors[text] for text in texts], dtype=np.float32)
+
+
+def _at_similarity(similarity):
+    """2-d unit vector whose cosine similarity with [1, 0] is similarity"""
+    return [similarity, (1 - similarity**2) ** 0.5]
+
+
+def _setup_semantic(service, conn, answers, question_vectors, queries):
+    """Wire golden_answers rows and a fake encoder into a service"""
+    rows = {answer["cluster_id"]: answer for answer in answers}
+    conn.fetch = AsyncMock(return_value=answers)
+    conn.fetchval = AsyncMock(return_value=len(answers))
+    conn.fetchrow = AsyncMock(side_effect=lambda _sql, cluster_id: rows.get(cluster_id))
+    service.pool.acquire = MagicMock(return_value=AsyncContextManager(conn))
+    encoder = FakeEncoder({**question_vectors, **queries})
+    service.model = encoder
+    return encoder
+
+
+def _answer(cluster_id, question, confidence=0.9, **extra):
+    return {
+        "cluster_id": cluster_id,
+        "canonical_question": question,
+        "answer": f"Answer {cluster_id}",
+        "sources": [],
+        "confidence": confidence,
+        **extra,
+    }
+
+
 @pytest.fixture
 def mock_pool():
     """Mock asyncpg.Pool"""
@@ -281,83 +323,40 @@ async def test_lookup_golden_answer_exception(golden_answer_service):
 async def test_semantic_lookup_success(golden_answer_service):
     """Test _semantic_lookup successful"""
     service, pool, conn = golden_answer_service
+    _setup_semantic(
+        service,
+        conn,
+        [_answer("cluster_1", "How to get KITAS?"), _answer("cluster_2", "Visa requirements")],
+        {"How to get KITAS?": _at_similarity(0.85), "Visa requirements": _at_similarity(0.5)},
+        {"how do I get a KITAS": [1.0, 0.0]},
+    )
 
-    mock_golden_answers = [
-        {
-            "cluster_id": "cluster_1",
-            "canonical_question": "How to get KITAS?",
-            "answer": "Answer 1",
-            "sources": [],
-            "confidence": 0.9,
-            "usage_count": 10,
-        },
-        {
-            "cluster_id": "cluster_2",
-            "canonical_question": "Visa requirements",
-            "answer": "Answer 2",
-            "sources": [],
-            "confidence": 0.85,
-            "usage_count": 5,
-        },
-    ]
-
-    conn.fetch = AsyncMock(return_value=mock_golden_answers)
-
-    with (
-        patch.object(service, "_load_model"),
-        patch("services.golden_answer_service.SentenceTransformer") as mock_transformer,
-    ):
-        mock_model = MagicMock()
-        mock_model.encode = MagicMock(
-            side_effect=[
-                [[0.1, 0.2, 0.3]],  # Query embedding
-                [[0.1, 0.2, 0.3], [0.5, 0.6, 0.7]],  # Canonical embeddings
-            ]
-        )
-        service.model = mock_model
-
-        with patch("services.golden_answer_service.cosine_similarity", return_value=[[0.85, 0.5]]):
-            with patch("services.golden_answer_service.np.argmax", return_value=0):
-                result = await service._semantic_lookup("How to get KITAS?")
+    with patch.object(service, "_load_model"):
+        result = await service._semantic_lookup("how do I get a KITAS")
 
-                assert result is not None
-                assert result["cluster_id"] == "cluster_1"
-                assert result["similarity"] == 0.85
+    assert result is not None
+    assert result["cluster_id"] == "cluster_1"
+    assert result["answer"] == "Answer cluster_1"
+    assert result["similarity"] == pytest.approx(0.85, abs=1e-5)
 
 
 @pytest.mark.asyncio
 async def test_semantic_lookup_below_threshold(golden_answer_service):
     """Test _semantic_lookup below threshold"""
     service, pool, conn = golden_answer_service
-
-    conn.fetch = AsyncMock(
-        return_value=[
-            {
-                "cluster_id": "cluster_1",
-                "canonical_question": "Test",
-                "answer": "Answer",
-                "sources": [],
-                "confidence": 0.9,
-                "usage_count": 10,
-            }
-        ]
+    _setup_semantic(
+        service,
+        conn,
+        [_answer("cluster_1", "Test")],
+        {"Test": _at_similarity(0.5)},  # Below 0.8 threshold
+        {"test": [1.0, 0.0]},
     )
 
-    with (
-        patch.object(service, "_load_model"),
-        patch("services.golden_answer_service.SentenceTransformer"),
-    ):
-        mock_model = MagicMock()
-        mock_model.encode = MagicMock(return_value=[[0.1, 0.2]])
-        service.model = mock_model
-
-        with patch(
-            "services.golden_answer_service.cosine_similarity", return_value=[[0.5]]
-        ):  # Below 0.8 threshold
-            with patch("services.golden_answer_service.np.argmax", return_value=0):
-                result = await service._semantic_lookup("test")
+    with patch.object(service, "_load_model"):
+        result = await service._semantic_lookup("test")
 
-                assert result is None
+    assert result is None
+    conn.fetchrow.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -372,14 +371,16 @@ async def test_semantic_lookup_no_pool():
 
 @pytest.mark.asyncio
 async def test_semantic_lookup_no_answers(golden_answer_service):
-    """Test _semantic_lookup with no golden answers"""
+    """Test _semantic_lookup with no golden answers (no model load needed)"""
     service, pool, conn = golden_answer_service
 
     conn.fetch = AsyncMock(return_value=[])
 
-    result = await service._semantic_lookup("test")
+    with patch.object(service, "_load_model") as mock_load_model:
+        result = await service._semantic_lookup("test")
 
     assert result is None
+    mock_load_model.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -389,11 +390,119 @@ async def test_semantic_lookup_exception(golden_answer_service):
 
     conn.fetch.side_effect = Exception("Database error")
 
-    result = await service._semantic_lookup("test")
+    with patch.object(service, "_load_model"):
+        result = await service._semantic_lookup("test")
 
     assert result is None
 
 
+# ============================================================================
+# Tests for refresh_index / GoldenAnswerIndex
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_refresh_index_reencodes_only_changed_questions(golden_answer_service):
+    """Delta sync reads rows since the watermark and re-encodes changed questions only"""
+    service, pool, conn = golden_answer_service
+    t0 = datetime(2025, 1, 1)
+    t1 = datetime(2025, 1, 2)
+    encoder = _setup_semantic(
+        service,
+        conn,
+        [
+            _answer("cluster_1", "Old question", updated_at=t0),
+            _answer("cluster_2", "Other question", updated_at=t0),
+        ],
+        {"Old question": [1.0, 0.0], "Other question": [0.0, 1.0], "New question": [0.6, 0.8]},
+        {},
+    )
+
+    assert await service.refresh_index() == 2
+    assert service.index.watermark == t0
+
+    conn.fetch = AsyncMock(
+        return_value=[
+            _answer("cluster_1", "New question", updated_at=t1),
+            _answer("cluster_2", "Other question", updated_at=t0),  # Same timestamp, unchanged
+        ]
+    )
+    assert await service.refresh_index(force=True) == 1
+
+    assert encoder.calls[-1] == ["New question"]
+    assert conn.fetch.call_args.args[1] == t0
+    assert service.index.watermark == t1
+    assert service.index.search([0.6, 0.8])[0] == "cluster_1"
+
+
+@pytest.mark.asyncio
+async def test_refresh_index_drops_deleted_answers(golden_answer_service):
+    """Row count mismatch triggers a cluster_id scan that drops deleted answers"""
+    service, pool, conn = golden_answer_service
+    t0 = datetime(2025, 1, 1)
+    _setup_semantic(
+        service,
+        conn,
+        [_answer("cluster_1", "Q1", updated_at=t0), _answer("cluster_2", "Q2", updated_at=t0)],
+        {"Q1": [1.0, 0.0], "Q2": [0.0, 1.0]},
+        {},
+    )
+    await service.refresh_index()
+
+    conn.fetch = AsyncMock(side_effect=[[], [{"cluster_id": "cluster_2"}]])
+    conn.fetchval = AsyncMock(return_value=1)
+    assert await service.refresh_index(force=True) == 0
+
+    assert service.index.cluster_ids == ["cluster_2"]
+    assert service.index.search([1.0, 0.0])[0] == "cluster_2"
+
+
+@pytest.mark.asyncio
+async def test_refresh_index_throttled(golden_answer_service):
+    """Syncs run at most once per index_refresh_s unless forced"""
+    service, pool, conn = golden_answer_service
+    _setup_semantic(service, conn, [_answer("cluster_1", "Q1")], {"Q1": [1.0, 0.0]}, {})
+
+    await service.refresh_index()
+    await service.refresh_index()
+    assert conn.fetch.await_count == 1
+
+    await service.refresh_index(force=True)
+    assert conn.fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_index_persisted(golden_answer_service, tmp_path):
+    """A saved index is reloaded and brought up to date without re-encoding"""
+    service, pool, conn = golden_answer_service
+    service.index_path = str(tmp_path / "golden_index.npz")
+    t0 = datetime(2025, 1, 1)
+    answers = [_answer("cluster_1", "Q1", updated_at=t0), _answer("cluster_2", "Q2", updated_at=t0)]
+    _setup_semantic(service, conn, answers, {"Q1": [1.0, 0.0], "Q2": [0.0, 1.0]}, {})
+    await service.refresh_index()
+
+    restarted = GoldenAnswerService("postgresql://test", index_path=service.index_path)
+    restarted.pool = pool
+    encoder = _setup_semantic(restarted, conn, answers, {}, {})
+    assert await restarted.refresh_index() == 0
+
+    assert encoder.calls == []
+    assert restarted.index.cluster_ids == ["cluster_1", "cluster_2"]
+    assert restarted.index.watermark == t0
+    assert conn.fetch.call_args.args[1] == t0
+
+
+def test_index_load_rejects_other_model(tmp_path):
+    """An index built with another embedding model is not reused"""
+    path = tmp_path / "golden_index.npz"
+    index = GoldenAnswerIndex("other-model")
+    index.upsert(["cluster_1"], ["hash"], [[1.0, 0.0]])
+    index.save(path)
+
+    assert len(GoldenAnswerIndex.load(path, "other-model")) == 1
+    assert len(GoldenAnswerIndex.load(path)) == 0
+
+
 # ============================================================================
 # Tests for _increment_usage
 # ============================================================================
@@ -591,109 +700,49 @@ async def test_lookup_golden_answer_with_whitespace_normalization():
 
 
 @pytest.mark.asyncio
-async def test_semantic_lookup_load_model_called():
-    """Test _semantic_lookup calls _load_model"""
-    mock_pool = AsyncMock()
-
-    async def mock_create_pool(*args, **kwargs):
-        return mock_pool
-
-    with patch("services.golden_answer_service.asyncpg.create_pool", side_effect=mock_create_pool):
-        service = GoldenAnswerService("postgresql://test")
-        service.pool = mock_pool
-
-        class AsyncContextManager:
-            def __init__(self, return_value):
-                self.return_value = return_value
-
-            async def __aenter__(self):
-                return self.return_value
-
-            async def __aexit__(self, *args):
-                pass
+async def test_semantic_lookup_load_model_called(golden_answer_service):
+    """Test _semantic_lookup calls _load_model when there is something to match"""
+    service, pool, conn = golden_answer_service
+    _setup_semantic(
+        service,
+        conn,
+        [_answer("cluster_1", "Test")],
+        {"Test": [1.0, 0.0]},
+        {"test query": [1.0, 0.0]},
+    )
 
-        conn = MagicMock()
-        conn.fetch = AsyncMock(return_value=[])
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManager(conn))
+    with patch.object(service, "_load_model") as mock_load_model:
+        await service._semantic_lookup("test query")
 
-        with patch.object(service, "_load_model") as mock_load_model:
-            await service._semantic_lookup("test query")
-            mock_load_model.assert_called_once()
+    assert mock_load_model.called
 
 
 @pytest.mark.asyncio
-async def test_semantic_lookup_with_multiple_candidates():
+async def test_semantic_lookup_with_multiple_candidates(golden_answer_service):
     """Test _semantic_lookup picks best match from multiple answers"""
-    mock_pool = AsyncMock()
-
-    async def mock_create_pool(*args, **kwargs):
-        return mock_pool
-
-    with patch("services.golden_answer_service.asyncpg.create_pool", side_effect=mock_create_pool):
-        service = GoldenAnswerService("postgresql://test")
-        service.pool = mock_pool
-
-        class AsyncContextManager:
-            def __init__(self, return_value):
-                self.return_value = return_value
-
-            async def __aenter__(self):
-                return self.return_value
-
-            async def __aexit__(self, *args):
-                pass
-
-        conn = MagicMock()
-
-        # Multiple golden answers to choose from
-        mock_answers = [
-            {
-                "cluster_id": "cluster_1",
-                "canonical_question": "How to get KITAS?",
-                "answer": "Answer 1",
-                "sources": [],
-                "confidence": 0.9,
-                "usage_count": 10,
-            },
-            {
-                "cluster_id": "cluster_2",
-                "canonical_question": "KITAS process",
-                "answer": "Answer 2",
-                "sources": [],
-                "confidence": 0.85,
-                "usage_count": 5,
-            },
-            {
-                "cluster_id": "cluster_3",
-                "canonical_question": "Visa requirements",
-                "answer": "Answer 3",
-                "sources": [],
-                "confidence": 0.8,
-                "usage_count": 3,
-            },
-        ]
-
-        conn.fetch = AsyncMock(return_value=mock_answers)
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManager(conn))
-
-        with patch.object(service, "_load_model"):
-            mock_model = MagicMock()
-            service.model = mock_model
+    service, pool, conn = golden_answer_service
+    _setup_semantic(
+        service,
+        conn,
+        [
+            _answer("cluster_1", "How to get KITAS?"),
+            _answer("cluster_2", "KITAS process", confidence=0.85),
+            _answer("cluster_3", "Visa requirements", confidence=0.8),
+        ],
+        {
+            "How to get KITAS?": _at_similarity(0.75),
+            "KITAS process": _at_similarity(0.85),
+            "Visa requirements": _at_similarity(0.65),
+        },
+        {"get KITAS info": [1.0, 0.0]},
+    )
 
-            # Simulate embeddings and similarities
-            with (
-                patch("services.golden_answer_service.SentenceTransformer"),
-                patch(
-                    "services.golden_answer_service.cosine_similarity",
-                    return_value=[[0.75, 0.85, 0.65]],
-                ),
-                patch("services.golden_answer_service.np.argmax", return_value=1),
-            ):  # cluster_2 is best
-                result = await service._semantic_lookup("get KITAS info")
+    with patch.object(service, "_load_model"):
+        result = await service._semantic_lookup("get KITAS info")
 
-                assert result is not None
-                assert result["cluster_id"] == "cluster_2"
-                assert result["similarity"] == 0.85
+    assert result is not None
+    assert result["cluster_id"] == "cluster_2"  # cluster_2 is best
+    assert result["similarity"] == pytest.approx(0.85, abs=1e-5)
 
 
 @pytest.mark.asyncio
@@ -821,104 +870,38 @@ async def test_get_golden_answer_stats_with_dates():
 
 
 @pytest.mark.asyncio
-async def test_semantic_lookup_exact_threshold_match():
+async def test_semantic_lookup_exact_threshold_match(golden_answer_service):
     """Test _semantic_lookup when similarity equals threshold"""
-    mock_pool = AsyncMock()
-
-    async def mock_create_pool(*args, **kwargs):
-        return mock_pool
-
-    with patch("services.golden_answer_service.asyncpg.create_pool", side_effect=mock_create_pool):
-        service = GoldenAnswerService("postgresql://test")
-        service.pool = mock_pool
-
-        class AsyncContextManager:
-            def __init__(self, return_value):
-                self.return_value = return_value
-
-            async def __aenter__(self):
-                return self.return_value
-
-            async def __aexit__(self, *args):
-                pass
-
-        conn = MagicMock()
-
-        mock_answers = [
-            {
-                "cluster_id": "cluster_1",
-                "canonical_question": "Test",
-                "answer": "Answer",
-                "sources": [],
-                "confidence": 0.9,
-                "usage_count": 10,
-            }
-        ]
-
-        conn.fetch = AsyncMock(return_value=mock_answers)
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManager(conn))
-
-        with patch.object(service, "_load_model"):
-            mock_model = MagicMock()
-            service.model = mock_model
+    service, pool, conn = golden_answer_service
+    _setup_semantic(
+        service, conn, [_answer("cluster_1", "Test")], {"Test": [1.0, 0.0]}, {"test": [1.0, 0.0]}
+    )
+    # Exactly at threshold
+    service.similarity_threshold = 1.0
 
-            # Exactly at threshold (0.80)
-            with patch("services.golden_answer_service.cosine_similarity", return_value=[[0.80]]):
-                with patch("services.golden_answer_service.np.argmax", return_value=0):
-                    result = await service._semantic_lookup("test")
+    with patch.object(service, "_load_model"):
+        result = await service._semantic_lookup("test")
 
-                    assert result is not None
-                    assert result["similarity"] == 0.80
+    assert result is not None
+    assert result["similarity"] == pytest.approx(1.0)
 
 
 @pytest.mark.asyncio
-async def test_semantic_lookup_just_below_threshold():
+async def test_semantic_lookup_just_below_threshold(golden_answer_service):
     """Test _semantic_lookup when similarity just below threshold"""
-    mock_pool = AsyncMock()
-
-    async def mock_create_pool(*args, **kwargs):
-        return mock_pool
-
-    with patch("services.golden_answer_service.asyncpg.create_pool", side_effect=mock_create_pool):
-        service = GoldenAnswerService("postgresql://test")
-        service.pool = mock_pool
-
-        class AsyncContextManager:
-            def __init__(self, return_value):
-                self.return_value = return_value
-
-            async def __aenter__(self):
-                return self.return_value
-
-            async def __aexit__(self, *args):
-                pass
-
-        conn = MagicMock()
-
-        mock_answers = [
-            {
-                "cluster_id": "cluster_1",
-                "canonical_question": "Test",
-                "answer": "Answer",
-                "sources": [],
-                "confidence": 0.9,
-                "usage_count": 10,
-            }
-        ]
-
-        conn.fetch = AsyncMock(return_value=mock_answers)
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManager(conn))
-
-        with patch.object(service, "_load_model"):
-            mock_model = MagicMock()
-            service.model = mock_model
+    service, pool, conn = golden_answer_service
+    _setup_semantic(
+        service,
+        conn,
+        [_answer("cluster_1", "Test")],
+        {"Test": _at_similarity(0.799)},  # Just below threshold (0.80)
+        {"test": [1.0, 0.0]},
+    )
 
-            # Just below threshold (0.799)
-            with patch("services.golden_answer_service.cosine_similarity", return_value=[[0.799]]):
-                with patch("services.golden_answer_service.np.argmax", return_value=0):
-                    result = await service._semantic_lookup("test")
+    with patch.object(service, "_load_model"):
+        result = await service._semantic_lookup("test")
 
-                    assert result is None
+    assert result is None
 
 
 @pytest.mark.asyncio
@@ -1039,69 +1022,22 @@ async def test_get_golden_answer_stats_database_exception():
 
 
 @pytest.mark.asyncio
-async def test_semantic_lookup_encodes_query_correctly():
-    """Test that semantic lookup properly encodes query and answers"""
-    mock_pool = AsyncMock()
-
-    async def mock_create_pool(*args, **kwargs):
-        return mock_pool
-
-    with patch("services.golden_answer_service.asyncpg.create_pool", side_effect=mock_create_pool):
-        service = GoldenAnswerService("postgresql://test")
-        service.pool = mock_pool
-
-        class AsyncContextManager:
-            def __init__(self, return_value):
-                self.return_value = return_value
-
-            async def __aenter__(self):
-                return self.return_value
-
-            async def __aexit__(self, *args):
-                pass
-
-        conn = MagicMock()
-
-        mock_answers = [
-            {
-                "cluster_id": "cluster_1",
-                "canonical_question": "How to get KITAS?",
-                "answer": "Answer 1",
-                "sources": [],
-                "confidence": 0.9,
-                "usage_count": 10,
-            }
-        ]
-
-        conn.fetch = AsyncMock(return_value=mock_answers)
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManager(conn))
-
-        with patch.object(service, "_load_model"):
-            mock_model = MagicMock()
-
-            # Track encode calls
-            encode_calls = []
-
-            def track_encode(texts):
-                encode_calls.append(texts)
-                if isinstance(texts, list) and all(isinstance(t, str) for t in texts):
-                    return [[0.1, 0.2, 0.3]] * len(texts)
-                return [[0.1, 0.2, 0.3]]
-
-            mock_model.encode = track_encode
-            service.model = mock_model
+async def test_semantic_lookup_encodes_query_correctly(golden_answer_service):
+    """Questions are encoded once into the index; later lookups encode only the query"""
+    service, pool, conn = golden_answer_service
+    encoder = _setup_semantic(
+        service,
+        conn,
+        [_answer("cluster_1", "How to get KITAS?")],
+        {"How to get KITAS?": [1.0, 0.0]},
+        {"test query": [1.0, 0.0], "another query": [0.0, 1.0]},
+    )
 
-            with patch("services.golden_answer_service.cosine_similarity", return_value=[[0.85]]):
-                with patch("services.golden_answer_service.np.argmax", return_value=0):
-                    result = await service._semantic_lookup("test query")
+    with patch.object(service, "_load_model"):
+        await service._semantic_lookup("test query")
+        await service._semantic_lookup("another query")
 
-                    # Verify encode was called for query and answers
-                    assert len(encode_calls) == 2
-                    assert "test query" in encode_calls[0] or encode_calls[0] == ["test query"]
-                    assert (
-                        "How to get KITAS?" in encode_calls[1]
-                        or encode_calls[1][0] == "How to get KITAS?"
-                    )
+    assert encoder.calls == [["How to get KITAS?"], ["test query"], ["another query"]]
 
 
 @pytest.mark.asyncio
@@ -1174,55 +1110,23 @@ async def test_get_golden_answer_stats_empty_database():
 
 
 @pytest.mark.asyncio
-async def test_semantic_lookup_with_high_similarity():
+async def test_semantic_lookup_with_high_similarity(golden_answer_service):
     """Test _semantic_lookup with very high similarity scores"""
-    mock_pool = AsyncMock()
-
-    async def mock_create_pool(*args, **kwargs):
-        return mock_pool
-
-    with patch("services.golden_answer_service.asyncpg.create_pool", side_effect=mock_create_pool):
-        service = GoldenAnswerService("postgresql://test")
-        service.pool = mock_pool
-
-        class AsyncContextManager:
-            def __init__(self, return_value):
-                self.return_value = return_value
-
-            async def __aenter__(self):
-                return self.return_value
-
-            async def __aexit__(self, *args):
-                pass
-
-        conn = MagicMock()
-
-        mock_answers = [
-            {
-                "cluster_id": "cluster_1",
-                "canonical_question": "Perfect match",
-                "answer": "Answer",
-                "sources": [],
-                "confidence": 0.99,
-                "usage_count": 100,
-            }
-        ]
-
-        conn.fetch = AsyncMock(return_value=mock_answers)
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManager(conn))
-
-        with patch.object(service, "_load_model"):
-            mock_model = MagicMock()
-            service.model = mock_model
+    service, pool, conn = golden_answer_service
+    _setup_semantic(
+        service,
+        conn,
+        [_answer("cluster_1", "Perfect match", confidence=0.99)],
+        {"Perfect match": _at_similarity(0.99)},
+        {"perfect match": [1.0, 0.0]},
+    )
 
-            # Very high similarity (0.99)
-            with patch("services.golden_answer_service.cosine_similarity", return_value=[[0.99]]):
-                with patch("services.golden_answer_service.np.argmax", return_value=0):
-                    result = await service._semantic_lookup("perfect match")
+    with patch.object(service, "_load_model"):
+        result = await service._semantic_lookup("perfect match")
 
-                    assert result is not None
-                    assert result["similarity"] == 0.99
-                    assert result["confidence"] == 0.99
+    assert result is not None
+    assert result["similarity"] == pytest.approx(0.99, abs=1e-5)
+    assert result["confidence"] == 0.99
 
 
 @pytest.mark.asyncio
@@ -1335,60 +1239,20 @@ async def test_lookup_golden_answer_with_various_confidence_levels():
 
 
 @pytest.mark.asyncio
-async def test_semantic_lookup_filters_by_usage_count():
-    """Test that semantic lookup respects the LIMIT clause (top 100)"""
-    mock_pool = AsyncMock()
-
-    async def mock_create_pool(*args, **kwargs):
-        return mock_pool
-
-    with patch("services.golden_answer_service.asyncpg.create_pool", side_effect=mock_create_pool):
-        service = GoldenAnswerService("postgresql://test")
-        service.pool = mock_pool
-
-        class AsyncContextManager:
-            def __init__(self, return_value):
-                self.return_value = return_value
-
-            async def __aenter__(self):
-                return self.return_value
-
-            async def __aexit__(self, *args):
-                pass
-
-        conn = MagicMock()
-
-        # Create 100 mock answers ordered by usage count
-        mock_answers = [
-            {
-                "cluster_id": f"cluster_{i}",
-                "canonical_question": f"Question {i}",
-                "answer": f"Answer {i}",
-                "sources": [],
-                "confidence": 0.9,
-                "usage_count": 100 - i,  # Decreasing usage count
-            }
-            for i in range(100)
-        ]
+async def test_semantic_lookup_covers_all_answers(golden_answer_service):
+    """The index covers every golden answer, not just the 100 most used"""
+    service, pool, conn = golden_answer_service
+    answers = [_answer(f"cluster_{i}", f"Question {i}") for i in range(250)]
+    question_vectors = {f"Question {i}": _at_similarity(0.1) for i in range(250)}
+    question_vectors["Question 249"] = _at_similarity(0.95)  # Least used answer
+    _setup_semantic(service, conn, answers, question_vectors, {"test": [1.0, 0.0]})
 
-        conn.fetch = AsyncMock(return_value=mock_answers)
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManager(conn))
+    with patch.object(service, "_load_model"):
+        result = await service._semantic_lookup("test")
 
-        with patch.object(service, "_load_model"):
-            mock_model = MagicMock()
-            service.model = mock_model
-
-            with (
-                patch(
-                    "services.golden_answer_service.cosine_similarity", return_value=[[0.85] * 100]
-                ),
-                patch("services.golden_answer_service.np.argmax", return_value=0),
-            ):
-                result = await service._semantic_lookup("test")
-
-                # Verify it selected from the answers
-                assert result is not None
-                assert result["cluster_id"] == "cluster_0"  # First one has highest usage
+    assert result is not None
+    assert result["cluster_id"] == "cluster_249"
+    assert len(service.index) == 250
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,312 @@
+"""
+Unit tests for the batch ingestion pipeline
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Ensure backend is in path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+if str(backend_path) not in sys.path:
+    sys.path.insert(0, str(backend_path))
+
+from app.models import TierLevel
+from services.ingestion_pipeline import IngestionManifest, IngestionPipeline
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+def _prepare_chunks(file_path, text, doc_info):
+    chunk_texts = text.split("|")
+    return {
+        "book_title": Path(file_path).stem,
+        "book_author": "Author",
+        "tier": TierLevel.C,
+        "chunk_texts": chunk_texts,
+        "metadatas": [{"file_path": file_path, "chunk_index": i} for i in range(len(chunk_texts))],
+    }
+
+
+@pytest.fixture
+def service():
+    """IngestionService stand-in: chunks on '|', embeds to constant vectors"""
+    service = MagicMock()
+    service._is_legal_text.return_value = False
+    service.prepare_chunks.side_effect = _prepare_chunks
+    service.embedder.generate_embeddings.side_effect = lambda texts: [[0.1] * 4 for _ in texts]
+    service.vector_db.upsert_documents.return_value = {"success": True}
+    service.vector_db.count.return_value = 0
+    service.vector_db.collection_name = "books"
+    return service
+
+
+@pytest.fixture
+def books(tmp_path):
+    """Three small 'books' whose content is their chunk texts joined by '|'"""
+    contents = {"a.txt": "a1|a2|a3", "b.txt": "b1", "c.txt": "c1|c2|c3|c4"}
+    paths = []
+    for name, content in contents.items():
+        path = tmp_path / name
+        path.write_text(content)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def parse():
+    """Parse files by reading them (no PDF/EPUB parsing in unit tests)"""
+    with patch(
+        "services.ingestion_pipeline._parse_document",
+        side_effect=lambda path: (Path(path).read_text(), {}),
+    ) as mock_parse:
+        yield mock_parse
+
+
+def _pipeline(service, tmp_path, **kwargs):
+    options = {"parse_workers": 0, "embed_batch_size": 3, "upsert_batch_size": 2}
+    options.update(kwargs)
+    return IngestionPipeline(service, manifest_path=tmp_path / "manifest.json", **options)
+
+
+# ============================================================================
+# Tests: IngestionPipeline.run
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_run_ingests_all_documents_in_batches(service, books, parse, tmp_path):
+    """Chunks are embedded in fixed batches across documents and upserted in chunks"""
+    pipeline = _pipeline(service, tmp_path)
+
+    with patch("services.ingestion_pipeline.invalidate_collection") as mock_invalidate:
+        results = await pipeline.run(books)
+
+    assert [r["success"] for r in results] == [True, True, True]
+    assert [r["chunks_created"] for r in results] == [3, 1, 4]
+    assert [r["book_title"] for r in results] == ["a", "b", "c"]
+    assert results[0]["tier"] == TierLevel.C.value
+
+    embed_batches = [c.args[0] for c in service.embedder.generate_embeddings.call_args_list]
+    assert embed_batches == [["a1", "a2", "a3"], ["b1", "c1", "c2"], ["c3", "c4"]]
+    upserted = [c.kwargs["chunks"] for c in service.vector_db.upsert_documents.call_args_list]
+    assert all(len(chunk) <= 2 for chunk in upserted)
+    assert sum(len(chunk) for chunk in upserted) == 8
+    assert pipeline.get_stats()["points"] == 8
+    mock_invalidate.assert_called_once_with("books")
+
+
+@pytest.mark.asyncio
+async def test_run_resumes_from_manifest(service, books, parse, tmp_path):
+    """A second run skips files recorded as done and unchanged"""
+    with patch("services.ingestion_pipeline.invalidate_collection"):
+        await _pipeline(service, tmp_path).run(books)
+        service.embedder.generate_embeddings.reset_mock()
+
+        Path(books[1]).write_text("b1|b2-changed")
+        results = await _pipeline(service, tmp_path).run(books)
+
+    assert results[0]["message"].startswith("Skipped")
+    assert results[0]["chunks_created"] == 3
+    assert results[1]["chunks_created"] == 2
+    assert parse.call_count == 4  # 3 first run + the modified file
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert set(manifest["files"]) == set(books)
+
+
+@pytest.mark.asyncio
+async def test_run_reingests_only_changed_chunks(service, books, parse, tmp_path):
+    """Re-ingesting a modified file embeds its changed chunks and deletes vanished ones"""
+    stored = {}
+
+    def upsert(chunks, embeddings, metadatas, ids):
+        stored.update(zip(ids, metadatas, strict=True))
+        return {"success": True}
+
+    service.vector_db.upsert_documents.side_effect = upsert
+    service.vector_db.scroll_points.side_effect = lambda filter, payload_fields: [
+        {"id": point_id, "payload": {"metadata": meta}}
+        for point_id, meta in stored.items()
+        if meta["file_path"] == filter["file_path"]
+    ]
+
+    with patch("services.ingestion_pipeline.invalidate_collection"):
+        await _pipeline(service, tmp_path).run(books)
+        service.embedder.generate_embeddings.reset_mock()
+
+        Path(books[2]).write_text("c1|c2|C3")
+        results = await _pipeline(service, tmp_path).run(books)
+
+    embedded = [t for c in service.embedder.generate_embeddings.call_args_list for t in c.args[0]]
+    assert embedded == ["C3"]
+    assert results[2]["chunks_created"] == 3
+    vanished = service.vector_db.delete.call_args.args[0]
+    assert {stored[point_id]["chunk_index"] for point_id in vanished} == {2, 3}
+
+
+@pytest.mark.asyncio
+async def test_run_relabels_shifted_chunks_without_embedding(service, books, parse, tmp_path):
+    """A chunk inserted in front only embeds the new text; moved chunks get a payload update"""
+    stored = {}
+
+    def upsert(chunks, embeddings, metadatas, ids):
+        stored.update(zip(ids, metadatas, strict=True))
+        return {"success": True}
+
+    def set_payloads(updates):
+        stored.update((point_id, payload["metadata"]) for point_id, payload in updates)
+        return {"success": True}
+
+    service.vector_db.upsert_documents.side_effect = upsert
+    service.vector_db.set_payloads.side_effect = set_payloads
+    service.vector_db.scroll_points.side_effect = lambda filter, payload_fields: [
+        {"id": point_id, "payload": {"metadata": meta}}
+        for point_id, meta in stored.items()
+        if meta["file_path"] == filter["file_path"]
+    ]
+
+    with patch("services.ingestion_pipeline.invalidate_collection") as mock_invalidate:
+        await _pipeline(service, tmp_path).run(books)
+        service.embedder.generate_embeddings.reset_mock()
+        mock_invalidate.reset_mock()
+
+        Path(books[1]).write_text("b0|b1")
+        pipeline = _pipeline(service, tmp_path)
+        await pipeline.run(books)
+
+    embedded = [t for c in service.embedder.generate_embeddings.call_args_list for t in c.args[0]]
+    assert embedded == ["b0"]
+    assert pipeline.stats["relabeled_points"] == 1
+    assert sorted(m["chunk_index"] for m in stored.values() if m["file_path"] == books[1]) == [0, 1]
+    mock_invalidate.assert_called_once_with("books")
+
+
+@pytest.mark.asyncio
+async def test_run_without_skip_existing_reprocesses(service, books, parse, tmp_path):
+    """skip_existing=False ingests every file again"""
+    with patch("services.ingestion_pipeline.invalidate_collection"):
+        await _pipeline(service, tmp_path).run(books)
+        await _pipeline(service, tmp_path).run(books, skip_existing=False)
+
+    assert parse.call_count == 6
+
+
+@pytest.mark.asyncio
+async def test_run_skips_files_already_in_vector_store(service, books, parse, tmp_path):
+    """Files unknown to the manifest are skipped when their points already exist"""
+    service.vector_db.count.side_effect = lambda f: 5 if f["file_path"] == books[0] else 0
+
+    with patch("services.ingestion_pipeline.invalidate_collection"):
+        results = await _pipeline(service, tmp_path).run(books)
+
+    assert results[0]["message"].startswith("Skipped")
+    assert results[0]["chunks_created"] == 5
+    assert parse.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_run_isolates_failures(service, books, parse, tmp_path):
+    """Parse and upsert failures fail only the affected documents"""
+
+    def parse_document(path):
+        if path == books[0]:
+            raise ValueError("corrupt")
+        return Path(path).read_text(), {}
+
+    parse.side_effect = parse_document
+    service.vector_db.upsert_documents.side_effect = lambda chunks, **_: (
+        {"success": False, "error": "HTTP 500"} if "b1" in chunks else {"success": True}
+    )
+
+    with patch("services.ingestion_pipeline.invalidate_collection"):
+        results = await _pipeline(service, tmp_path, upsert_batch_size=1).run(books)
+
+    assert results[0]["success"] is False
+    assert "corrupt" in results[0]["error"]
+    assert results[1]["success"] is False
+    assert results[1]["error"] == "HTTP 500"
+    assert results[2]["success"] is True
+
+    manifest = IngestionManifest(tmp_path / "manifest.json")
+    assert manifest.entries[books[0]]["status"] == "failed"
+    assert manifest.get_done(books[0], IngestionManifest.fingerprint(books[0])) is None
+
+
+@pytest.mark.asyncio
+async def test_run_routes_legal_documents(service, books, parse, tmp_path):
+    """Legal documents go to LegalIngestionService and results are normalized"""
+    service._is_legal_text.side_effect = lambda text: text in ("b1", "a1|a2|a3")
+    legal_service = MagicMock()
+
+    async def ingest_legal_document(file_path, text):
+        return {"success": False, "book_title": "UU", "chunks_created": 0, "error": "empty"}
+
+    legal_service.ingest_legal_document.side_effect = ingest_legal_document
+
+    with (
+        patch("services.ingestion_pipeline.invalidate_collection"),
+        patch(
+            "services.legal_ingestion_service.LegalIngestionService", return_value=legal_service
+        ) as mock_legal_class,
+    ):
+        results = await _pipeline(service, tmp_path).run(books)
+
+    assert results[1]["book_title"] == "UU"
+    assert results[1]["tier"] == "Unknown"
+    assert results[1]["error"] == "empty"
+    assert results[2]["success"] is True
+
+    # One service for the batch, fed the text the pool already parsed
+    mock_legal_class.assert_called_once()
+    texts = {c.kwargs["text"] for c in legal_service.ingest_legal_document.call_args_list}
+    assert texts == {"b1", "a1|a2|a3"}
+    assert parse.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_run_stage_failure_cancels_pipeline(service, books, parse, tmp_path):
+    """A dying embed stage fails the run instead of leaving parsers blocked on the queue"""
+    service.prepare_chunks.side_effect = lambda *args: {"chunk_texts": ["x"], "metadatas": [{}]}
+
+    with patch("services.ingestion_pipeline.invalidate_collection"):
+        pipeline = _pipeline(service, tmp_path, queue_size=1)
+        with pytest.raises(KeyError):
+            await asyncio.wait_for(pipeline.run(books), timeout=5)
+
+    service.vector_db.upsert_documents.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_run_reports_missing_files(service, parse, tmp_path):
+    """Missing files fail without reaching the parser"""
+    results = await _pipeline(service, tmp_path).run([str(tmp_path / "missing.pdf")])
+
+    assert results[0]["success"] is False
+    parse.assert_not_called()
+
+
+# ============================================================================
+# Tests: IngestionManifest
+# ============================================================================
+
+
+def test_manifest_ignores_corrupt_file(tmp_path):
+    """A corrupt manifest starts empty instead of failing the batch"""
+    path = tmp_path / "manifest.json"
+    path.write_text("{not json")
+
+    assert IngestionManifest(path).entries == {}
+
+
+def test_manifest_save_failure_is_logged(tmp_path):
+    """Unwritable manifest locations do not raise"""
+    manifest = IngestionManifest(tmp_path / "missing-dir" / "manifest.json")
+    manifest.record("book.pdf", "1:1", {"success": True})
+
+    assert manifest.entries["book.pdf"]["status"] == "done"
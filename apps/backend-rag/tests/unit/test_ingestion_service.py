@@ -5,7 +5,7 @@ Unit tests for Ingestion Service
 
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -114,6 +114,25 @@ async def test_ingest_book_with_tier_override(ingestion_service):
         ingestion_service.classifier.classify_book_tier.assert_not_called()
 
 
+@pytest.mark.asyncio
+async def test_ingest_book_legal_parses_once(ingestion_service):
+    """Legal documents are handed the already extracted text instead of re-parsing"""
+    legal_service = MagicMock()
+    legal_service.ingest_legal_document = AsyncMock(return_value={"success": True})
+
+    with (
+        patch("services.ingestion_service.auto_detect_and_parse") as mock_parse,
+        patch("services.legal_ingestion_service.LegalIngestionService", return_value=legal_service),
+    ):
+        mock_parse.return_value = "UNDANG-UNDANG Pasal 1"
+
+        result = await ingestion_service.ingest_book(file_path="/path/uu.pdf", doc_type="legal")
+
+    assert result == {"success": True}
+    mock_parse.assert_called_once_with("/path/uu.pdf")
+    assert legal_service.ingest_legal_document.call_args.kwargs["text"] == "UNDANG-UNDANG Pasal 1"
+
+
 @pytest.mark.asyncio
 async def test_ingest_book_exception(ingestion_service):
     """Test ingesting book with exception"""
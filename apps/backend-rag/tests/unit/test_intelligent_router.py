@@ -3,6 +3,7 @@ Unit tests for Intelligent Router
 Updated for Gemini Jaksel Native implementation
 """
 
+import asyncio
 import sys
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -90,6 +91,7 @@ def intelligent_router(
     mock_context_builder.detect_zantara_query = MagicMock(return_value=False)
     mock_context_builder.detect_team_query = MagicMock(return_value=False)
     mock_context_builder.build_identity_context = MagicMock(return_value=None)
+    mock_context_builder.build_crm_context_async = AsyncMock(return_value=None)
 
     mock_rag_manager = AsyncMock()
     mock_rag_manager.retrieve_context = AsyncMock(
@@ -235,6 +237,104 @@ async def test_stream_chat_exception(intelligent_router):
     assert "Streaming failed" in str(exc_info.value)
 
 
+# ============================================================================
+# Tests for _prepare_routing_context
+# ============================================================================
+
+
+def _slow(result, delay):
+    async def call(*args, **kwargs):
+        await asyncio.sleep(delay)
+        return result
+
+    return call
+
+
+@pytest.mark.asyncio
+async def test_prepare_routing_context_runs_sources_concurrently(intelligent_router):
+    """Cultural and CRM context overlap with rewrite + RAG; timings are reported"""
+    router, mocks = intelligent_router
+    router._rewrite_query_for_search = _slow("rewritten query", 0.2)
+    mocks["rag_manager"].retrieve_context = AsyncMock(
+        side_effect=_slow({"context": "RAG", "used_rag": True, "docs": []}, 0.1)
+    )
+    mocks["cultural_rag"].get_cultural_context = AsyncMock(
+        side_effect=_slow([{"content": "Cultural insight"}], 0.2)
+    )
+    mocks["context_builder"].build_crm_context_async = AsyncMock(side_effect=_slow("CRM", 0.2))
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    ctx = await router._prepare_routing_context("Test", "user@example.com", [{"role": "user"}])
+    elapsed = loop.time() - started
+
+    assert elapsed < 0.45  # Serial would be 0.7s
+    assert mocks["rag_manager"].retrieve_context.call_args.kwargs["query"] == "rewritten query"
+    combine_kwargs = mocks["context_builder"].combine_contexts.call_args.kwargs
+    assert combine_kwargs["crm_context"] == "CRM"
+    assert combine_kwargs["cultural_context"] == "Cultural context"
+    assert combine_kwargs["rag_context"] == "RAG"
+    timings = ctx["metadata"]["timings_ms"]
+    assert {"classify", "rewrite", "rag", "cultural", "crm", "local", "total"} <= set(timings)
+    assert ctx["metadata"]["timed_out"] == []
+
+
+@pytest.mark.asyncio
+async def test_prepare_routing_context_stage_deadlines(intelligent_router):
+    """Sources that miss their deadline are left out instead of delaying the turn"""
+    router, mocks = intelligent_router
+    router.stage_timeouts = {"rewrite": 0.05, "rag": 1.0, "cultural": 0.05, "crm": 0.05}
+    router._rewrite_query_for_search = _slow("rewritten query", 5)
+    mocks["cultural_rag"].get_cultural_context = AsyncMock(side_effect=_slow([{"c": 1}], 5))
+    mocks["context_builder"].build_crm_context_async = AsyncMock(side_effect=_slow("CRM", 5))
+
+    ctx = await router._prepare_routing_context("Test", "user@example.com", [{"role": "user"}])
+
+    assert set(ctx["metadata"]["timed_out"]) == {"rewrite", "cultural", "crm"}
+    assert ctx["metadata"]["timings_ms"]["total"] < 1000
+    assert mocks["rag_manager"].retrieve_context.call_args.kwargs["query"] == "Test"
+    combine_kwargs = mocks["context_builder"].combine_contexts.call_args.kwargs
+    assert combine_kwargs["crm_context"] is None
+    assert combine_kwargs["cultural_context"] is None
+
+
+@pytest.mark.asyncio
+async def test_prepare_routing_context_rag_deadline(intelligent_router):
+    """RAG past its deadline yields an empty RAG result"""
+    router, mocks = intelligent_router
+    router.stage_timeouts["rag"] = 0.05
+    mocks["rag_manager"].retrieve_context = AsyncMock(side_effect=_slow({"context": "x"}, 5))
+
+    ctx = await router._prepare_routing_context("Test", "user123")
+
+    assert ctx["metadata"]["timed_out"] == ["rag"]
+    assert ctx["rag_result"]["used_rag"] is False
+    assert ctx["rag_result"]["docs"] == []
+
+
+@pytest.mark.asyncio
+async def test_prepare_routing_context_error_cancels_stages(intelligent_router):
+    """A failing stage cancels the others and propagates"""
+    router, mocks = intelligent_router
+    crm_cancelled = asyncio.Event()
+
+    async def slow_crm(*args):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            crm_cancelled.set()
+            raise
+
+    router.stage_timeouts["crm"] = None
+    mocks["context_builder"].build_crm_context_async = AsyncMock(side_effect=slow_crm)
+    router.classifier.classify_intent = AsyncMock(side_effect=Exception("Classification error"))
+
+    with pytest.raises(Exception, match="Classification error"):
+        await router._prepare_routing_context("Test", "user@example.com")
+
+    assert crm_cancelled.is_set()
+
+
 # ============================================================================
 # Tests for _handle_emotional_override
 # ============================================================================
@@ -0,0 +1,57 @@
+"""
+Unit tests for KeywordMatcher (Aho–Corasick keyword groups)
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure backend is in path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+if str(backend_path) not in sys.path:
+    sys.path.insert(0, str(backend_path))
+
+from services.keyword_matcher import KeywordMatcher
+
+
+def _naive(groups, text):
+    return {name: [kw for kw in keywords if kw in text] for name, keywords in groups.items()}
+
+
+def test_match_single_group():
+    """Test keywords found anywhere in the text are reported"""
+    matcher = KeywordMatcher({"visa": ["visa", "kitas", "immigration"]})
+    assert matcher.match("how to get a kitas visa") == {"visa": ["visa", "kitas"]}
+
+
+def test_match_overlapping_and_nested_keywords():
+    """Test nested/overlapping keywords are all found (like `kw in text`)"""
+    groups = {"tax": ["tax", "tax rate", "rate"], "other": ["ax r", "xyz"]}
+    matcher = KeywordMatcher(groups)
+    text = "what is the tax rate"
+    assert matcher.match(text) == _naive(groups, text)
+
+
+def test_match_keyword_in_multiple_groups():
+    """Test a keyword shared by groups counts for each group"""
+    matcher = KeywordMatcher({"a": ["team"], "b": ["members", "team"]})
+    assert matcher.match("team members") == {"a": ["team"], "b": ["members", "team"]}
+
+
+def test_match_duplicates_in_group_counted():
+    """Test duplicated keywords in a group are reported twice (same as a list scan)"""
+    matcher = KeywordMatcher({"team": ["staff", "team", "staff"]})
+    assert matcher.match("our staff") == {"team": ["staff", "staff"]}
+
+
+def test_match_no_matches():
+    """Test every group is present even without matches"""
+    matcher = KeywordMatcher({"a": ["x"], "b": []})
+    assert matcher.match("hello") == {"a": [], "b": []}
+
+
+def test_match_agrees_with_naive_scan():
+    """Test results equal the naive substring scan on suffix-heavy patterns"""
+    groups = {"g1": ["he", "she", "his", "hers"], "g2": ["s", "rs", "ushe"]}
+    matcher = KeywordMatcher(groups)
+    for text in ["ushers", "she sells", "hishers", "", "xyz"]:
+        assert matcher.match(text) == _naive(groups, text)
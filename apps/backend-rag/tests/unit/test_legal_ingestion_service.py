@@ -229,6 +229,29 @@ async def test_ingest_legal_document_success(legal_ingestion_service, sample_leg
         Path(tmp_path).unlink(missing_ok=True)
 
 
+@pytest.mark.asyncio
+async def test_ingest_legal_document_with_parsed_text(legal_ingestion_service, sample_legal_text):
+    """Test text passed by the caller is used without parsing the file again"""
+    service, mocks = legal_ingestion_service
+
+    mocks["cleaner"].clean.side_effect = lambda text: text
+    mocks["metadata_extractor"].extract.return_value = {}
+    mocks["structure_parser"].parse.return_value = {"batang_tubuh": [], "pasal_list": []}
+    mocks["chunker"].chunk.return_value = [{"text": "Chunk", "chunk_index": 0, "total_chunks": 1}]
+    mocks["embedder"].generate_embeddings.return_value = [[0.1] * 1536]
+    mocks["classifier"].classify_book_tier.return_value = TierLevel.S
+    mocks["classifier"].get_min_access_level.return_value = 0
+
+    with patch("services.legal_ingestion_service.auto_detect_and_parse") as mock_parse:
+        result = await service.ingest_legal_document(
+            "/nonexistent/uu.pdf", title="UU", text=sample_legal_text
+        )
+
+    assert result["success"] is True
+    mock_parse.assert_not_called()
+    mocks["cleaner"].clean.assert_called_once_with(sample_legal_text)
+
+
 @pytest.mark.asyncio
 async def test_ingest_legal_document_with_title(legal_ingestion_service, sample_legal_text):
     """Test ingestion with provided title"""
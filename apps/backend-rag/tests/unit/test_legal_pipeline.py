@@ -1,6 +1,7 @@
 """
 Unit tests for Legal Document Refinement Pipeline
 Tests all 4 stages: Cleaner, Metadata Extractor, Structure Parser, Chunker
+(plus the Tokenizer they share)
 """
 
 import sys
@@ -14,7 +15,16 @@ backend_path = Path(__file__).parent.parent.parent / "backend"
 if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
-from core.legal import LegalChunker, LegalCleaner, LegalMetadataExtractor, LegalStructureParser
+from core.legal import (
+    LegalChunker,
+    LegalCleaner,
+    LegalMetadataExtractor,
+    LegalStructureParser,
+    LegalTokenizer,
+)
+from core.legal.constants import PASAL_PATTERN
+from core.legal.structure_parser import find_bab_at
+from core.legal.tokenizer import pasal_spans
 
 from services.legal_ingestion_service import LegalIngestionService
 
@@ -94,6 +104,71 @@ def legal_chunker():
     return LegalChunker()
 
 
+@pytest.fixture
+def legal_tokenizer():
+    """Create LegalTokenizer instance"""
+    return LegalTokenizer()
+
+
+# ============================================================================
+# Test Cases - Stage 0: Tokenizer
+# ============================================================================
+
+
+def test_tokenizer_emits_structural_tokens(legal_tokenizer):
+    """One scan yields every marker with its offsets and heading fields"""
+    tokens = legal_tokenizer.tokenize(SAMPLE_LEGAL_TEXT)
+
+    kinds = [t.kind for t in tokens if t.kind != "AYAT"]
+    assert kinds == [
+        "KONSIDERANS",
+        "KONSIDERANS",
+        "PASAL",  # "Pasal 5 ayat (1) Undang-Undang Dasar" in Mengingat
+        "MEMUTUSKAN",
+        "BAB",
+        "PASAL",
+        "PASAL",
+        "BAB",
+        "PASAL",
+    ]
+    bab = tokens.first("BAB")
+    assert (bab.number, bab.title) == ("I", "KETENTUAN UMUM")
+    assert SAMPLE_LEGAL_TEXT[bab.start :].startswith("BAB I")
+    assert [t.number for t in tokens.of_kind("PASAL", start=bab.start)] == ["1", "2", "3"]
+    assert len(tokens.of_kind("AYAT")) == 6
+    assert (
+        tokens.of_kind("PASAL", start=bab.end, end=tokens.of_kind("BAB")[1].start)[-1].number == "2"
+    )
+
+
+def test_pasal_spans_match_pasal_pattern(legal_tokenizer):
+    """Token-based Pasal spans equal PASAL_PATTERN.finditer over the same range"""
+    text = SAMPLE_LEGAL_TEXT + "Pasal 4A\nPasal ini berlaku.\nPenjelasan Umum\nPasal 5\nx"
+    tokens = legal_tokenizer.tokenize(text)
+    start, end = text.index("BAB I\n"), text.index("Penjelasan")
+
+    spans = pasal_spans(text, tokens, start, end)
+
+    expected = list(PASAL_PATTERN.finditer(text[start:end]))
+    assert [s.number for s in spans] == [m.group(1) for m in expected] == ["1", "2", "3", "4A"]
+    assert [text[s.body_start : s.end] for s in spans] == [m.group(2) for m in expected]
+
+
+def test_stages_accept_shared_tokens(
+    legal_tokenizer, metadata_extractor, structure_parser, legal_chunker
+):
+    """Passing one token stream gives the same results as scanning in each stage"""
+    tokens = legal_tokenizer.tokenize(SAMPLE_LEGAL_TEXT)
+    metadata = metadata_extractor.extract(SAMPLE_LEGAL_TEXT, tokens=tokens)
+    structure = structure_parser.parse(SAMPLE_LEGAL_TEXT, tokens=tokens)
+
+    assert metadata == metadata_extractor.extract(SAMPLE_LEGAL_TEXT)
+    assert structure == structure_parser.parse(SAMPLE_LEGAL_TEXT)
+    assert legal_chunker.chunk(
+        SAMPLE_LEGAL_TEXT, metadata, structure, tokens=tokens
+    ) == legal_chunker.chunk(SAMPLE_LEGAL_TEXT, metadata, structure)
+
+
 # ============================================================================
 # Test Cases - Stage 1: Cleaner
 # ============================================================================
@@ -215,6 +290,37 @@ def test_structure_parser_extracts_ayat(structure_parser):
     assert pasal_1["ayat"][0]["number"] == "1"
 
 
+def test_structure_parser_builds_index(structure_parser):
+    """parse() indexes BAB offsets and maps each Pasal to its BAB"""
+    structure = structure_parser.parse(SAMPLE_LEGAL_TEXT)
+    index = structure["index"]
+
+    assert index["pasal_to_bab"] == {
+        "1": "BAB I - KETENTUAN UMUM",
+        "2": "BAB I - KETENTUAN UMUM",
+        "3": "BAB II - STRUKTUR ORGANISASI",
+    }
+    assert index["bab_offsets"] == sorted(index["bab_offsets"])
+    bab_ii = SAMPLE_LEGAL_TEXT.index("BAB II")
+    assert index["bab_offsets"][1] == bab_ii
+    assert find_bab_at(index, bab_ii + 1) == "BAB II - STRUKTUR ORGANISASI"
+    assert find_bab_at(index, bab_ii) == "BAB I - KETENTUAN UMUM"
+    assert find_bab_at(index, 0) is None
+
+
+def test_structure_parser_pasal_bab_context(structure_parser):
+    """Pasal list carries the BAB found through the index"""
+    structure = structure_parser.parse(SAMPLE_LEGAL_TEXT)
+    contexts = [p["bab_context"] for p in structure["pasal_list"]]
+    assert contexts == [
+        "BAB I - KETENTUAN UMUM",
+        "BAB I - KETENTUAN UMUM",
+        "BAB II - STRUKTUR ORGANISASI",
+    ]
+    text = SAMPLE_LEGAL_TEXT
+    assert structure_parser._find_bab_context(text, text.index("Pasal 3")) == contexts[2]
+
+
 # ============================================================================
 # Test Cases - Stage 4: Chunker
 # ============================================================================
@@ -266,6 +372,28 @@ def test_legal_chunker_splits_large_pasal_by_ayat(legal_chunker):
     assert len(chunks) > 0
 
 
+def test_legal_chunker_uses_structure_index(legal_chunker, structure_parser):
+    """Chunks get their BAB from the parser's Pasal -> BAB index"""
+    metadata = {"type_abbrev": "UU", "number": "12", "year": "2024", "topic": "IKN"}
+    structure = structure_parser.parse(SAMPLE_LEGAL_TEXT)
+
+    chunks = legal_chunker.chunk(SAMPLE_LEGAL_TEXT, metadata, structure)
+
+    pasal_2 = next(c for c in chunks if c.get("pasal_number") == "2")
+    assert "BAB I - KETENTUAN UMUM - Pasal 2]" in pasal_2["text"]
+
+
+def test_legal_chunker_indexes_hand_built_structure(legal_chunker):
+    """Structures without an index still resolve BAB context"""
+    metadata = {"type_abbrev": "UU", "number": "1", "year": "2024", "topic": "T"}
+    structure = {"batang_tubuh": [{"number": "IV", "title": "SANKSI", "pasal": [{"number": "9"}]}]}
+
+    chunks = legal_chunker.chunk("Pasal 9\nDenda.", metadata, structure)
+
+    assert "BAB IV - SANKSI" in chunks[0]["text"]
+    assert legal_chunker._find_bab_for_pasal(structure, "10") is None
+
+
 # ============================================================================
 # Test Cases - Integration: Full Pipeline
 # ============================================================================
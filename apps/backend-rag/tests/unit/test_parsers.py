@@ -4,6 +4,7 @@ Unit tests for Document Parsers
 
 import sys
 import tempfile
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -14,12 +15,15 @@ backend_path = Path(__file__).parent.parent.parent / "backend"
 if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
+from core import parsers
 from core.parsers import (
     DocumentParseError,
+    ExtractionCache,
     auto_detect_and_parse,
     extract_text_from_epub,
     extract_text_from_pdf,
     get_document_info,
+    iter_pdf_pages,
 )
 
 
@@ -274,3 +278,115 @@ def test_get_document_info_handles_errors():
             assert "file_name" in info
         finally:
             Path(tmp_path).unlink(missing_ok=True)
+
+
+# ============================================================================
+# Tests for iter_pdf_pages (parallel extraction, streaming, cache)
+# ============================================================================
+
+
+def _write_pdf(path: Path, page_texts: list[str]):
+    """Write a real PDF with one line of Helvetica text per page"""
+    from pypdf import PdfWriter
+    from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+    writer = PdfWriter()
+    font = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+    )
+    for text in page_texts:
+        page = writer.add_blank_page(width=300, height=200)
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 12 Tf 20 100 Td ({text}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def _mock_reader(page_texts: list[str]) -> MagicMock:
+    reader = MagicMock()
+    reader.pages = [MagicMock(**{"extract_text.return_value": text}) for text in page_texts]
+    return reader
+
+
+@pytest.fixture
+def pdf_pool():
+    """Tear down the shared extraction pool after the test"""
+    yield
+    parsers._reset_pdf_pool()
+
+
+def test_iter_pdf_pages_parallel_matches_in_process(tmp_path, pdf_pool):
+    """Page ranges extracted by the process pool come back complete and in order"""
+    path = tmp_path / "gazette.pdf"
+    _write_pdf(path, [f"Halaman {i}" for i in range(1, 8)])
+
+    with patch.object(parsers, "_pdf_setting", side_effect=lambda name, default: 1):
+        parallel = list(iter_pdf_pages(str(path), workers=2, pages_per_task=3))
+    in_process = list(iter_pdf_pages(str(path), workers=0))
+
+    assert parallel == in_process
+    assert [number for number, _ in parallel] == list(range(1, 8))
+    assert parallel[6][1].strip() == "Halaman 7"
+
+
+def test_iter_pdf_pages_streams_pages():
+    """Pages are yielded before later pages are extracted"""
+    reader = _mock_reader(["one", "two", "three"])
+
+    with patch("core.parsers.PdfReader", return_value=reader):
+        pages = iter_pdf_pages("doc.pdf", workers=0)
+        assert next(pages) == (1, "one")
+
+    reader.pages[2].extract_text.assert_not_called()
+
+
+def test_iter_pdf_pages_falls_back_when_pool_breaks():
+    """A broken process pool degrades to in-process extraction without losing pages"""
+    reader = _mock_reader([f"p{i}" for i in range(1, 6)])
+    pool = MagicMock()
+    pool.submit.side_effect = BrokenProcessPool("worker died")
+
+    with (
+        patch("core.parsers.PdfReader", return_value=reader),
+        patch.object(parsers, "_pdf_setting", side_effect=lambda name, default: 1),
+        patch.object(parsers, "_get_pdf_pool", return_value=pool),
+        patch.object(parsers, "_reset_pdf_pool") as mock_reset,
+    ):
+        pages = list(iter_pdf_pages("doc.pdf", workers=4, pages_per_task=2))
+
+    assert [text for _, text in pages] == ["p1", "p2", "p3", "p4", "p5"]
+    mock_reset.assert_called_once()
+
+
+def test_extraction_cache_skips_parsing_unchanged_files(tmp_path):
+    """Same file content is extracted once; the cache is keyed by hash, not path"""
+    cache = ExtractionCache(tmp_path / "cache")
+    first, copy = tmp_path / "a.pdf", tmp_path / "b.pdf"
+    first.write_bytes(b"%PDF same bytes")
+    copy.write_bytes(b"%PDF same bytes")
+
+    with (
+        patch.object(parsers, "get_extraction_cache", return_value=cache),
+        patch("core.parsers.PdfReader", return_value=_mock_reader(["Pasal 1", ""])) as mock_pdf,
+    ):
+        assert extract_text_from_pdf(str(first)) == "Pasal 1"
+        assert extract_text_from_pdf(str(copy)) == "Pasal 1"
+        assert list(iter_pdf_pages(str(copy))) == [(1, "Pasal 1"), (2, "")]
+
+    assert mock_pdf.call_count == 1
+
+
+def test_extraction_cache_disabled_by_default():
+    """No cache directory configured -> no cache"""
+    with patch.object(parsers, "settings", MagicMock(parser_cache_dir=None)):
+        assert parsers.get_extraction_cache() is None
@@ -5,7 +5,7 @@ Unit tests for Qdrant DB Client
 
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import requests
@@ -15,6 +15,7 @@ backend_path = Path(__file__).parent.parent.parent / "backend"
 if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
+from core import qdrant_db
 from core.qdrant_db import QdrantClient
 
 # ============================================================================
@@ -37,6 +38,15 @@ def mock_requests():
         yield mock
 
 
+@pytest.fixture
+def mock_async_http():
+    """Mock shared async HTTP client"""
+    mock_client = MagicMock()
+    mock_client.post = AsyncMock()
+    with patch("core.qdrant_db.get_async_http_client", return_value=mock_client):
+        yield mock_client
+
+
 @pytest.fixture
 def qdrant_client(mock_settings):
     """Create a QdrantClient instance"""
@@ -252,6 +262,143 @@ async def test_search_with_none_filter(qdrant_client, mock_requests):
         mock_logger.warning.assert_not_called()
 
 
+# ============================================================================
+# Tests for async_search / search_batch methods
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_async_search_success(qdrant_client, mock_async_http):
+    """Test async search uses the shared pool and formats results"""
+    query_embedding = [0.1, 0.2, 0.3]
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "result": [{"id": 1, "score": 0.9, "payload": {"text": "Doc", "metadata": {"source": "a"}}}]
+    }
+    mock_async_http.post.return_value = mock_response
+
+    result = await qdrant_client.async_search(query_embedding, filter={"tier": "S"}, limit=3)
+
+    assert result["ids"] == ["1"]
+    assert result["documents"] == ["Doc"]
+    assert result["distances"][0] == pytest.approx(0.1)
+    call_args = mock_async_http.post.call_args
+    assert call_args[0][0].endswith("collections/knowledge_base/points/search")
+    assert call_args[1]["json"]["limit"] == 3
+    assert "filter" in call_args[1]["json"]
+
+
+@pytest.mark.asyncio
+async def test_async_search_http_error(qdrant_client, mock_async_http):
+    """Test async search returns empty results on HTTP error"""
+    mock_response = MagicMock()
+    mock_response.status_code = 503
+    mock_response.text = "Unavailable"
+    mock_async_http.post.return_value = mock_response
+
+    result = await qdrant_client.async_search([0.1, 0.2])
+
+    assert result == {
+        "ids": [],
+        "documents": [],
+        "metadatas": [],
+        "distances": [],
+        "total_found": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_async_search_exception(qdrant_client, mock_async_http):
+    """Test async search swallows transport errors"""
+    mock_async_http.post.side_effect = Exception("Connection reset")
+
+    result = await qdrant_client.async_search([0.1, 0.2])
+
+    assert result["total_found"] == 0
+
+
+@pytest.mark.asyncio
+async def test_search_batch_success(qdrant_client, mock_async_http):
+    """Test batch search sends all searches in one request"""
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "result": [
+            [{"id": "a", "score": 0.8, "payload": {"text": "A"}}],
+            [],
+        ]
+    }
+    mock_async_http.post.return_value = mock_response
+
+    results = await qdrant_client.search_batch(
+        [[0.1, 0.2], [0.3, 0.4]], filters=[{"tier": "S"}, None], limit=[2, 4]
+    )
+
+    assert len(results) == 2
+    assert results[0]["ids"] == ["a"]
+    assert results[1]["total_found"] == 0
+    mock_async_http.post.assert_called_once()
+    call_args = mock_async_http.post.call_args
+    assert call_args[0][0].endswith("/points/search/batch")
+    searches = call_args[1]["json"]["searches"]
+    assert [s["limit"] for s in searches] == [2, 4]
+    assert "filter" in searches[0]
+    assert "filter" not in searches[1]
+
+
+@pytest.mark.asyncio
+async def test_search_batch_empty(qdrant_client, mock_async_http):
+    """Test batch search with no queries makes no request"""
+    assert await qdrant_client.search_batch([]) == []
+    mock_async_http.post.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_batch_http_error(qdrant_client, mock_async_http):
+    """Test batch search returns one empty result per query on error"""
+    mock_response = MagicMock()
+    mock_response.status_code = 500
+    mock_response.text = "boom"
+    mock_async_http.post.return_value = mock_response
+
+    results = await qdrant_client.search_batch([[0.1], [0.2], [0.3]])
+
+    assert len(results) == 3
+    assert all(r["total_found"] == 0 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_search_batch_result_count_mismatch(qdrant_client, mock_async_http):
+    """Test a response with the wrong number of results is not zipped onto the queries"""
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "result": [[{"id": "a", "score": 0.8, "payload": {"text": "A"}}]]
+    }
+    mock_async_http.post.return_value = mock_response
+
+    results = await qdrant_client.search_batch([[0.1], [0.2]])
+
+    assert len(results) == 2
+    assert all(r["total_found"] == 0 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_async_http_client_is_shared_and_closable():
+    """Test the pooled client is reused and recreated after close"""
+    client1 = qdrant_db.get_async_http_client()
+    client2 = qdrant_db.get_async_http_client()
+    assert client1 is client2
+
+    await qdrant_db.close_async_http_client()
+    assert client1.is_closed
+
+    client3 = qdrant_db.get_async_http_client()
+    assert client3 is not client1
+    await qdrant_db.close_async_http_client()
+
+
 # ============================================================================
 # Tests for get_collection_stats method
 # ============================================================================
@@ -493,6 +640,197 @@ async def test_upsert_documents_empty_lists(qdrant_client, mock_requests):
     assert payload["points"] == []
 
 
+# ============================================================================
+# Tests for upsert_points (streaming bulk upsert)
+# ============================================================================
+
+
+def _ok_response():
+    response = MagicMock()
+    response.status_code = 200
+    return response
+
+
+def _points(n):
+    return ((f"id{i}", [float(i)], {"text": f"doc {i}"}) for i in range(n))
+
+
+def test_upsert_points_sends_fixed_size_batches(qdrant_client, mock_requests):
+    """Points are streamed in batches of batch_size"""
+    mock_requests.put.return_value = _ok_response()
+
+    result = qdrant_client.upsert_points(_points(5), batch_size=2, max_in_flight=2)
+
+    assert result["success"] is True
+    assert result["documents_added"] == 5
+    assert result["batches"] == 3
+    sizes = sorted(len(c.kwargs["json"]["points"]) for c in mock_requests.put.call_args_list)
+    assert sizes == [1, 2, 2]
+    assert all(c.kwargs["params"] == {"wait": "true"} for c in mock_requests.put.call_args_list)
+
+
+def test_upsert_points_converts_numpy_vectors(qdrant_client, mock_requests):
+    """Numpy vectors are serialized as plain lists"""
+    import numpy as np
+
+    mock_requests.put.return_value = _ok_response()
+
+    qdrant_client.upsert_points([("id0", np.array([0.5, 1.5]), {})])
+
+    point = mock_requests.put.call_args.kwargs["json"]["points"][0]
+    assert point["vector"] == [0.5, 1.5]
+    assert isinstance(point["vector"], list)
+
+
+def test_upsert_points_retries_transient_failures(qdrant_client, mock_requests):
+    """Network errors and 5xx are retried with the same batch"""
+    unavailable = MagicMock(status_code=503, text="busy")
+    mock_requests.put.side_effect = [Exception("reset"), unavailable, _ok_response()]
+
+    with patch("core.qdrant_db.time.sleep") as mock_sleep:
+        result = qdrant_client.upsert_points(_points(2), batch_size=10, max_retries=3)
+
+    assert result["success"] is True
+    assert result["documents_added"] == 2
+    assert mock_requests.put.call_count == 3
+    sent = [c.kwargs["json"] for c in mock_requests.put.call_args_list]
+    assert sent[0] == sent[1] == sent[2]
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 1.0]
+
+
+def test_upsert_points_does_not_retry_rejected_batch(qdrant_client, mock_requests):
+    """4xx responses fail the batch without retrying"""
+    mock_requests.put.side_effect = [MagicMock(status_code=400, text="bad vector"), _ok_response()]
+
+    result = qdrant_client.upsert_points(_points(3), batch_size=2, max_in_flight=1)
+
+    assert result["success"] is False
+    assert result["failed_batches"] == 1
+    assert result["documents_added"] == 1
+    assert result["error"] == "HTTP 400"
+    assert mock_requests.put.call_count == 2
+
+
+def test_upsert_points_gives_up_after_max_retries(qdrant_client, mock_requests):
+    """A batch failing every attempt is reported"""
+    mock_requests.put.side_effect = Exception("down")
+
+    with patch("core.qdrant_db.time.sleep"):
+        result = qdrant_client.upsert_points(_points(1), max_retries=2)
+
+    assert result["success"] is False
+    assert "down" in result["error"]
+    assert mock_requests.put.call_count == 3
+
+
+def test_upsert_points_no_wait_ends_with_barrier(qdrant_client, mock_requests):
+    """wait=False sends batches unacknowledged, then resends the last one with wait=true"""
+    mock_requests.put.return_value = _ok_response()
+
+    result = qdrant_client.upsert_points(_points(3), batch_size=2, max_in_flight=1, wait=False)
+
+    assert result["success"] is True
+    calls = mock_requests.put.call_args_list
+    assert [c.kwargs["params"]["wait"] for c in calls] == ["false", "false", "true"]
+    assert calls[-1].kwargs["json"] == calls[1].kwargs["json"]
+
+
+def test_upsert_points_empty_iterable(qdrant_client, mock_requests):
+    """No points means no requests"""
+    result = qdrant_client.upsert_points(iter([]))
+
+    assert result["success"] is True
+    assert result["batches"] == 0
+    mock_requests.put.assert_not_called()
+
+
+def test_upsert_documents_streams_large_inputs(qdrant_client, mock_requests):
+    """upsert_documents delegates to upsert_points above the batch size"""
+    mock_requests.put.return_value = _ok_response()
+    with patch.object(qdrant_db, "UPSERT_BATCH_SIZE", 2):
+        result = qdrant_client.upsert_documents(
+            ["a", "b", "c"], [[0.1], [0.2], [0.3]], [{}, {}, {}], ids=["1", "2", "3"]
+        )
+
+    assert result["success"] is True
+    assert result["documents_added"] == 3
+    assert mock_requests.put.call_count == 2
+    first = mock_requests.put.call_args_list[0].kwargs["json"]["points"][0]
+    assert first == {"id": "1", "vector": [0.1], "payload": {"text": "a", "metadata": {}}}
+
+
+def test_upsert_documents_large_input_failure_raises(qdrant_client, mock_requests):
+    """A failed batch raises like a failed single request, instead of returning success=False"""
+    mock_requests.put.side_effect = [_ok_response(), MagicMock(status_code=400, text="bad")]
+    with patch.object(qdrant_db, "UPSERT_BATCH_SIZE", 2):
+        with pytest.raises(RuntimeError, match="1/2 batches"):
+            qdrant_client.upsert_documents(
+                ["a", "b", "c"], [[0.1], [0.2], [0.3]], [{}, {}, {}], ids=["1", "2", "3"]
+            )
+
+
+def test_set_payloads_sends_one_batch(qdrant_client, mock_requests):
+    """Payload updates go out as one batch request of set_payload operations"""
+    mock_requests.post.return_value = _ok_response()
+
+    result = qdrant_client.set_payloads([("1", {"metadata": {"a": 1}}), ("2", {"metadata": {}})])
+
+    assert result == {"success": True, "updated_count": 2}
+    call = mock_requests.post.call_args
+    assert call.args[0].endswith("/points/batch")
+    assert call.kwargs["json"]["operations"][0] == {
+        "set_payload": {"payload": {"metadata": {"a": 1}}, "points": ["1"]}
+    }
+
+
+def test_set_payloads_http_error(qdrant_client, mock_requests):
+    mock_requests.post.return_value = MagicMock(status_code=400, text="bad")
+
+    assert qdrant_client.set_payloads([("1", {})]) == {"success": False, "error": "HTTP 400"}
+
+
+def test_scroll_points_follows_pages(qdrant_client, mock_requests):
+    """scroll_points requests every page and returns ids with payloads"""
+    first_page = [{"id": 1, "payload": {"metadata": {"h": "a"}}}]
+    pages = [
+        {"result": {"points": first_page, "next_page_offset": 2}},
+        {"result": {"points": [{"id": "u2", "payload": None}], "next_page_offset": None}},
+    ]
+    responses = [MagicMock(status_code=200, json=MagicMock(return_value=p)) for p in pages]
+    mock_requests.post.side_effect = responses
+
+    points = qdrant_client.scroll_points(
+        filter={"file_path": "a.pdf"}, payload_fields=["metadata.h"], page_size=1
+    )
+
+    assert points == [{"id": "1", "payload": {"metadata": {"h": "a"}}}, {"id": "u2", "payload": {}}]
+    first, second = (c.kwargs["json"] for c in mock_requests.post.call_args_list)
+    assert first["filter"] == {"must": [{"key": "metadata.file_path", "match": {"value": "a.pdf"}}]}
+    assert first["with_payload"] == {"include": ["metadata.h"]}
+    assert "offset" not in first
+    assert second["offset"] == 2
+
+
+def test_scroll_points_raises_on_error(qdrant_client, mock_requests):
+    """A failed page raises instead of returning a partial list"""
+    mock_requests.post.return_value = MagicMock(status_code=500, text="boom")
+
+    with pytest.raises(RuntimeError):
+        qdrant_client.scroll_points()
+
+
+def test_count_with_filter(qdrant_client, mock_requests):
+    """count posts an exact count request with the converted filter"""
+    mock_requests.post.return_value = MagicMock(
+        status_code=200, json=MagicMock(return_value={"result": {"count": 7}})
+    )
+
+    assert qdrant_client.count({"file_path": "a.pdf"}) == 7
+    payload = mock_requests.post.call_args.kwargs["json"]
+    assert payload["exact"] is True
+    assert payload["filter"]["must"][0]["key"] == "metadata.file_path"
+
+
 # ============================================================================
 # Tests for collection property
 # ============================================================================
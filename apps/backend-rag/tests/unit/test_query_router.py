@@ -750,3 +750,39 @@ def test_get_fallback_stats_confidence_distribution(query_router):
     assert "high" in stats["confidence_distribution"]
     assert "medium" in stats["confidence_distribution"]
     assert "low" in stats["confidence_distribution"]
+
+
+# ============================================================================
+# Tests for the compiled keyword matcher and shared match cache
+# ============================================================================
+
+
+def test_match_keywords_cached_per_normalized_query(query_router):
+    """Test route/confidence/stats share one keyword scan per normalized query"""
+    from unittest.mock import patch
+
+    matcher = QueryRouter._get_matcher()
+    with patch.object(matcher, "match", wraps=matcher.match) as match:
+        query_router.route("What is the KITAS visa cost?")
+        query_router.route_with_confidence("what is the kitas visa cost?")
+        query_router.get_routing_stats("What is the KITAS visa cost?")
+
+    assert match.call_count == 1
+
+
+def test_match_cache_is_bounded(query_router):
+    """Test the per-query match cache evicts old queries"""
+    query_router.MATCH_CACHE_SIZE = 2
+    for query in ["visa", "tax", "kbli"]:
+        query_router.route(query)
+
+    assert list(query_router._match_cache) == ["tax", "kbli"]
+
+
+def test_routing_stats_matched_keywords(query_router):
+    """Test matched keywords are reported per domain"""
+    stats = query_router.get_routing_stats("latest tax update for visa")
+
+    assert "visa" in stats["matched_keywords"]["visa"]
+    assert "tax" in stats["matched_keywords"]["tax"]
+    assert stats["modifier_scores"]["updates"] == len(stats["matched_keywords"]["updates"])
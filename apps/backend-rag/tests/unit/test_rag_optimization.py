@@ -15,7 +15,7 @@ if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
 from services.context.rag_manager import RAGManager
-from services.intelligent_router import IntelligentRouter
+from services.intelligent_router import IntelligentRouter, needs_query_rewrite
 from services.search_service import SearchService
 
 # ============================================================================
@@ -154,9 +154,11 @@ def mock_ai_client():
                 "tokens": {"input": 50, "output": 20},
             }
         return {
-            "text": messages[0]["content"].split("Current user query: ")[1].split('"')[1]
-            if "Current user query:" in messages[0]["content"]
-            else "test query",
+            "text": (
+                messages[0]["content"].split("Current user query: ")[1].split('"')[1]
+                if "Current user query:" in messages[0]["content"]
+                else "test query"
+            ),
             "model": "gemini-2.5-flash",
             "provider": "google_native",
             "tokens": {"input": 50, "output": 20},
@@ -248,6 +250,86 @@ async def test_query_rewriting_handles_ai_failure(mock_ai_client):
     assert rewritten == query
 
 
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("e per le tasse?", True),
+        ("and for Bali?", True),
+        ("How much does it cost?", True),
+        ("how much?", True),
+        ("Quanto costa questo visto?", True),
+        ("Berapa biayanya?", True),
+        ("test query", False),
+        ("What are the tax rates for companies in Indonesia?", False),
+        ("Apa syarat KITAS untuk investor?", False),
+        ("Saya hanya punya paspor Italia", False),
+    ],
+)
+def test_needs_query_rewrite(query, expected):
+    """Coreference/ellipsis detector gates the LLM rewrite"""
+    assert needs_query_rewrite(query) is expected
+
+
+@pytest.mark.asyncio
+async def test_query_rewriting_skips_llm_for_standalone_followup(mock_ai_client):
+    """A standalone query with history does not cost an LLM call"""
+    router = IntelligentRouter(ai_client=mock_ai_client, search_service=None, tool_executor=None)
+    history = [{"role": "user", "content": "Tell me about visas"}]
+    query = "What are the tax rates for companies in Indonesia?"
+
+    with patch(
+        "services.intelligent_router.gemini_jaksel.generate_response", new=AsyncMock()
+    ) as mock_generate:
+        rewritten = await router._rewrite_query_for_search(query, history)
+
+    assert rewritten == query
+    mock_generate.assert_not_called()
+    assert router.rewrite_stats["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_query_rewriting_cached_per_history_and_query(mock_ai_client):
+    """Rewrites are reused for the same recent history and query"""
+    router = IntelligentRouter(ai_client=mock_ai_client, search_service=None, tool_executor=None)
+    history = [
+        {"role": "user", "content": "Tell me about KITAS"},
+        {"role": "assistant", "content": "KITAS is a stay permit..."},
+    ]
+
+    with patch(
+        "services.intelligent_router.gemini_jaksel.generate_response",
+        new=AsyncMock(return_value="How much does a KITAS cost?"),
+    ) as mock_generate:
+        first = await router._rewrite_query_for_search("How much does it cost?", history)
+        second = await router._rewrite_query_for_search("How much does it cost?", list(history))
+        other = await router._rewrite_query_for_search(
+            "How much does it cost?", [{"role": "user", "content": "Tell me about PT PMA"}]
+        )
+
+    assert first == second == other == "How much does a KITAS cost?"
+    assert mock_generate.await_count == 2
+    assert router.rewrite_stats["cached"] == 1
+    assert router.get_stats()["query_rewrite"]["rewritten"] == 2
+
+
+@pytest.mark.asyncio
+async def test_query_rewriting_failure_not_cached(mock_ai_client):
+    """A failed rewrite falls back to the query and is retried next time"""
+    router = IntelligentRouter(ai_client=mock_ai_client, search_service=None, tool_executor=None)
+    history = [{"role": "user", "content": "Tell me about KITAS"}]
+
+    with patch(
+        "services.intelligent_router.gemini_jaksel.generate_response",
+        new=AsyncMock(side_effect=[Exception("AI error"), "KITAS renewal requirements"]),
+    ):
+        assert await router._rewrite_query_for_search("Can I renew it?", history) == (
+            "Can I renew it?"
+        )
+        assert await router._rewrite_query_for_search("Can I renew it?", history) == (
+            "KITAS renewal requirements"
+        )
+
+
 # ============================================================================
 # Tests for Structured Streaming
 # ============================================================================
@@ -289,6 +371,7 @@ async def test_intelligent_router_yields_structured_chunks(mock_ai_client):
     router.context_builder.build_memory_context = MagicMock(return_value="")
     router.context_builder.build_team_context = MagicMock(return_value="")
     router.context_builder.combine_contexts = MagicMock(return_value="")
+    router.context_builder.build_crm_context_async = AsyncMock(return_value=None)
 
     router.response_handler = MagicMock()
     router.response_handler.classify_query = MagicMock(return_value="business")
@@ -0,0 +1,110 @@
+"""
+Unit tests for the reranking engine (dynamic batching + ONNX backend)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Ensure backend is in path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+if str(backend_path) not in sys.path:
+    sys.path.insert(0, str(backend_path))
+
+from services.rerank_engine import OnnxCrossEncoder, RerankBatchEngine
+
+# ============================================================================
+# Tests for RerankBatchEngine
+# ============================================================================
+
+
+def _length_scorer(calls):
+    def predict(pairs):
+        calls.append(len(pairs))
+        return [float(len(doc)) for _, doc in pairs]
+
+    return predict
+
+
+@pytest.mark.asyncio
+async def test_engine_merges_concurrent_requests():
+    """Test pairs from concurrent requests are scored in one model call"""
+    calls = []
+    engine = RerankBatchEngine(_length_scorer(calls), max_batch_pairs=100, max_wait_ms=20)
+
+    results = await asyncio.gather(
+        engine.score([["q1", "a"], ["q1", "bbb"]]),
+        engine.score([["q2", "cc"]]),
+    )
+
+    assert results == [[1.0, 3.0], [2.0]]
+    assert calls == [3]
+    stats = engine.get_stats()
+    assert stats["requests"] == 2
+    assert stats["batches"] == 1
+    assert stats["avg_batch_pairs"] == 3.0
+
+
+@pytest.mark.asyncio
+async def test_engine_dispatches_when_batch_full():
+    """Test a full batch is dispatched without waiting for the deadline"""
+    calls = []
+    engine = RerankBatchEngine(_length_scorer(calls), max_batch_pairs=2, max_wait_ms=10_000)
+
+    result = await asyncio.wait_for(engine.score([["q", "a"], ["q", "b"]]), timeout=1.0)
+
+    assert result == [1.0, 1.0]
+    assert calls == [2]
+
+
+@pytest.mark.asyncio
+async def test_engine_propagates_model_errors():
+    """Test a failing batch rejects every request in it"""
+
+    def predict(pairs):
+        raise RuntimeError("model crashed")
+
+    engine = RerankBatchEngine(predict, max_batch_pairs=100, max_wait_ms=1)
+    results = await asyncio.gather(
+        engine.score([["q", "a"]]), engine.score([["q", "b"]]), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert engine.get_stats()["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_empty_request():
+    """Test empty requests never reach the model"""
+    calls = []
+    engine = RerankBatchEngine(_length_scorer(calls))
+
+    assert await engine.score([]) == []
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_engine_stats_report_throughput_and_latency():
+    """Test stats include throughput and latency percentiles"""
+    engine = RerankBatchEngine(_length_scorer([]), max_wait_ms=1)
+    await engine.score([["q", "doc"]])
+
+    stats = engine.get_stats()
+    assert stats["throughput_pairs_per_sec"] > 0
+    assert stats["p50_latency_ms"] >= 0
+    assert stats["p95_latency_ms"] >= stats["p50_latency_ms"]
+
+
+# ============================================================================
+# Tests for OnnxCrossEncoder
+# ============================================================================
+
+
+def test_onnx_backend_requires_onnxruntime(tmp_path):
+    """Test a clear error when onnxruntime is not installed"""
+    with patch("services.rerank_engine.ort", None):
+        with pytest.raises(ImportError, match="onnxruntime"):
+            OnnxCrossEncoder(str(tmp_path))
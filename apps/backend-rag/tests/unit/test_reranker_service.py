@@ -3,6 +3,7 @@ Unit tests for Reranker Service
 100% coverage target with comprehensive mocking
 """
 
+import asyncio
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
@@ -85,6 +86,33 @@ def test_init_custom_parameters(mock_cross_encoder):
         assert service.enable_cache is False
 
 
+def test_init_defaults_from_settings(mock_cross_encoder):
+    """Test constructor arguments default to the reranker_* settings"""
+    with (
+        patch("services.reranker_service.settings") as mock_settings,
+        patch(
+            "services.reranker_service.OnnxCrossEncoder", return_value=mock_cross_encoder
+        ) as onnx,
+    ):
+        mock_settings.reranker_model = "settings-model"
+        mock_settings.reranker_cache_size = 10
+        mock_settings.reranker_cache_enabled = False
+        mock_settings.reranker_backend = "onnx"
+        mock_settings.reranker_onnx_model_dir = "/models/reranker-onnx"
+        mock_settings.reranker_onnx_quantize = False
+        mock_settings.reranker_batch_max_pairs = 32
+        mock_settings.reranker_batch_max_wait_ms = 2.0
+        service = RerankerService()
+
+    onnx.assert_called_once_with("/models/reranker-onnx", quantize=False)
+    assert service.model_name == "settings-model"
+    assert service.backend == "onnx"
+    assert service._cache_size == 10
+    assert service.enable_cache is False
+    assert service.engine.max_batch_pairs == 32
+    assert service.engine.max_wait_ms == 2.0
+
+
 def test_init_initializes_stats(mock_cross_encoder):
     """Test that stats are initialized correctly"""
     with patch("services.reranker_service.CrossEncoder", return_value=mock_cross_encoder):
@@ -600,6 +628,34 @@ def test_rerank_batch_model_exception_fallback(reranker_service):
     assert len(result) == len(queries)
 
 
+def test_rerank_batch_scores_only_uncached_distinct_pairs(reranker_service):
+    """Test shared and already cached pairs are not sent to the model again"""
+    reranker_service.model.predict = Mock(side_effect=_scores_by_length)
+    reranker_service.rerank("query", [{"text": "aa"}])
+
+    result = reranker_service.rerank_batch(
+        ["query", "query", "other"],
+        [
+            [{"text": "aa"}, {"text": "b"}],
+            [{"text": "b"}, {"text": "ccc"}],
+            [{"text": "b"}],
+        ],
+        top_k=2,
+    )
+
+    assert reranker_service.model.predict.call_count == 2
+    batch_pairs = reranker_service.model.predict.call_args[0][0]
+    assert batch_pairs == [["query", "b"], ["query", "ccc"], ["other", "b"]]
+    assert [[score for _, score in ranked] for ranked in result] == [
+        [2.0, 1.0],
+        [3.0, 1.0],
+        [1.0],
+    ]
+    stats = reranker_service.get_stats()
+    assert stats["pair_cache_hits"] == 1
+    assert stats["pairs_scored"] == 4
+
+
 # ============================================================================
 # Tests for get_stats()
 # ============================================================================
@@ -799,3 +855,143 @@ def test_rerank_audit_logging_error_with_audit_service(reranker_service, sample_
             call_args = mock_audit.log_rerank.call_args
             assert call_args[1]["success"] is False
             assert "error" in call_args[1]
+
+
+# ============================================================================
+# Tests for rerank_async() and backends
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_rerank_async_matches_rerank(reranker_service, sample_documents):
+    """Test rerank_async ranks like rerank, through the batch engine"""
+    result = await reranker_service.rerank_async("Test query", sample_documents, top_k=3)
+
+    assert [score for _, score in result] == [0.9, 0.8, 0.7]
+    assert reranker_service.get_stats()["batching"]["batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rerank_async_batches_concurrent_requests(reranker_service):
+    """Test concurrent rerank_async calls share one model call"""
+    reranker_service.model.predict = Mock(side_effect=lambda pairs: [0.5] * len(pairs))
+    docs_a = [{"text": "a1"}, {"text": "a2"}]
+    docs_b = [{"text": "b1"}]
+
+    results = await asyncio.gather(
+        reranker_service.rerank_async("query a", docs_a),
+        reranker_service.rerank_async("query b", docs_b),
+    )
+
+    assert len(results[0]) == 2
+    assert len(results[1]) == 1
+    reranker_service.model.predict.assert_called_once()
+    assert len(reranker_service.model.predict.call_args[0][0]) == 3
+
+
+@pytest.mark.asyncio
+async def test_rerank_async_model_exception_fallback(reranker_service, sample_documents):
+    """Test rerank_async falls back to original order on model failure"""
+    reranker_service.model.predict = Mock(side_effect=Exception("Model error"))
+
+    result = await reranker_service.rerank_async("Test query", sample_documents, top_k=2)
+
+    assert result == [(sample_documents[0], 0.5), (sample_documents[1], 0.5)]
+
+
+def test_init_onnx_backend():
+    """Test the ONNX backend replaces the sentence-transformers model"""
+    onnx_model = MagicMock()
+    with patch("services.reranker_service.OnnxCrossEncoder", return_value=onnx_model) as onnx_cls:
+        with patch("services.reranker_service.CrossEncoder") as cross_encoder:
+            service = RerankerService(backend="onnx", onnx_model_dir="/models/reranker")
+
+    onnx_cls.assert_called_once_with("/models/reranker", quantize=True)
+    cross_encoder.assert_not_called()
+    assert service.model is onnx_model
+    assert service.get_stats()["backend"] == "onnx"
+
+
+# ============================================================================
+# Tests for content-aware cache keys and the pair score cache
+# ============================================================================
+
+
+def _scores_by_length(pairs):
+    return [float(len(doc)) for _, doc in pairs]
+
+
+def test_cache_key_depends_on_document_content(reranker_service):
+    """Test same-length candidate sets with different content get different keys"""
+    key1 = reranker_service._get_cache_key("query", [{"text": "a"}, {"text": "b"}])
+    key2 = reranker_service._get_cache_key("query", [{"text": "c"}, {"text": "d"}])
+    key3 = reranker_service._get_cache_key("query", [{"text": "a"}, {"text": "b"}])
+
+    assert key1 != key2
+    assert key1 == key3
+
+
+def test_rerank_different_candidates_same_length_not_mixed(reranker_service):
+    """Test a cached ranking is never returned for a different candidate set"""
+    reranker_service.model.predict = Mock(side_effect=_scores_by_length)
+
+    reranker_service.rerank("query", [{"text": "aa"}, {"text": "b"}])
+    result = reranker_service.rerank("query", [{"text": "ccc"}, {"text": "d"}])
+
+    assert [doc["text"] for doc, _ in result] == ["ccc", "d"]
+
+
+def test_rerank_only_scores_uncached_pairs(reranker_service):
+    """Test overlapping candidate sets only send new pairs to the model"""
+    reranker_service.model.predict = Mock(side_effect=_scores_by_length)
+
+    reranker_service.rerank("query", [{"text": "aa"}, {"text": "b"}])
+    result = reranker_service.rerank("query", [{"text": "b"}, {"text": "ccc"}, {"text": "aa"}])
+
+    assert [score for _, score in result] == [3.0, 2.0, 1.0]
+    second_call_pairs = reranker_service.model.predict.call_args_list[1][0][0]
+    assert second_call_pairs == [["query", "ccc"]]
+    stats = reranker_service.get_stats()
+    assert stats["pair_cache_hits"] == 2
+    assert stats["pairs_scored"] == 3
+
+
+def test_rerank_fully_cached_pairs_skip_model(reranker_service):
+    """Test a new candidate order made of known pairs needs no model call"""
+    reranker_service.model.predict = Mock(side_effect=_scores_by_length)
+
+    reranker_service.rerank("query", [{"text": "aa"}, {"text": "b"}])
+    reranker_service.rerank("query", [{"text": "b"}, {"text": "aa"}])
+
+    reranker_service.model.predict.assert_called_once()
+
+
+def test_rerank_duplicate_documents_scored_once(reranker_service):
+    """Test identical document texts in one request are scored once"""
+    reranker_service.model.predict = Mock(side_effect=_scores_by_length)
+
+    result = reranker_service.rerank("query", [{"text": "aa"}, {"text": "aa", "id": 2}])
+
+    assert len(result) == 2
+    assert reranker_service.model.predict.call_args[0][0] == [["query", "aa"]]
+
+
+def test_pair_cache_bounded(mock_cross_encoder):
+    """Test the pair score cache evicts least recently used pairs"""
+    with patch("services.reranker_service.CrossEncoder", return_value=mock_cross_encoder):
+        service = RerankerService(pair_cache_size=2)
+    service.model.predict = Mock(side_effect=_scores_by_length)
+
+    service.rerank("query", [{"text": "a"}, {"text": "bb"}, {"text": "ccc"}])
+
+    assert service.get_stats()["pair_cache_size"] == 2
+
+
+def test_clear_cache_clears_pair_cache(reranker_service):
+    """Test clear_cache drops pair scores too"""
+    reranker_service.model.predict = Mock(side_effect=_scores_by_length)
+    reranker_service.rerank("query", [{"text": "a"}])
+
+    reranker_service.clear_cache()
+
+    assert reranker_service.get_stats()["pair_cache_size"] == 0
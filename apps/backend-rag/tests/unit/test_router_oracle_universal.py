@@ -44,6 +44,20 @@ def mock_settings():
     return settings
 
 
+@pytest.fixture
+def document_store(tmp_path):
+    """Drive-backed document store in tmp_path (resolves the patched google_services)"""
+    from app.routers import oracle_universal
+    from services.document_store import DocumentStore, DriveBackend, set_document_store
+
+    store = DocumentStore(
+        DriveBackend(lambda: oracle_universal.google_services.drive_service), root=tmp_path
+    )
+    set_document_store(store)
+    yield store
+    set_document_store(None)
+
+
 @pytest.fixture
 def mock_db_connection():
     """Mock PostgreSQL connection"""
@@ -696,9 +710,8 @@ class TestUtilityFunctions:
         assert "Google Drive service not available" in caplog.text
 
     @patch("app.routers.oracle_universal.google_services")
-    @patch("builtins.open", create=True)
-    def test_download_pdf_from_drive_success(self, mock_open, mock_google_services):
-        """Test successful PDF download from Drive"""
+    def test_download_pdf_from_drive_success(self, mock_google_services, document_store):
+        """Test successful PDF download from Drive into the document store"""
         from app.routers.oracle_universal import download_pdf_from_drive
 
         mock_drive = MagicMock()
@@ -712,22 +725,24 @@ class TestUtilityFunctions:
         mock_drive.files().list.return_value = mock_files_list
 
         # Mock file download
-        mock_request = MagicMock()
-        mock_drive.files().get_media.return_value = mock_request
-
-        mock_downloader = MagicMock()
-        mock_downloader.next_chunk.return_value = (None, True)
+        def downloader(fh, request, chunksize):
+            fh.write(b"%PDF-1.4 test")
+            mock_downloader = MagicMock()
+            mock_downloader.next_chunk.return_value = (None, True)
+            return mock_downloader
 
-        with (
-            patch("app.routers.oracle_universal.MediaIoBaseDownload", return_value=mock_downloader),
-            patch("app.routers.oracle_universal.io.BytesIO"),
-        ):
+        with patch("googleapiclient.http.MediaIoBaseDownload", side_effect=downloader):
             result = download_pdf_from_drive("test.pdf")
+            # Served from the store the second time
+            assert download_pdf_from_drive("test.pdf") == result
 
-        assert result == "/tmp/test.pdf"
+        assert result.startswith(str(document_store.objects_dir))
+        with open(result, "rb") as f:
+            assert f.read() == b"%PDF-1.4 test"
+        mock_drive.files().get_media.assert_called_once_with(fileId="file123")
 
     @patch("app.routers.oracle_universal.google_services")
-    def test_download_pdf_from_drive_not_found(self, mock_google_services, caplog):
+    def test_download_pdf_from_drive_not_found(self, mock_google_services, caplog, document_store):
         """Test PDF download when file not found"""
         from app.routers.oracle_universal import download_pdf_from_drive
 
@@ -745,7 +760,7 @@ class TestUtilityFunctions:
         assert "No file found" in caplog.text
 
     @patch("app.routers.oracle_universal.google_services")
-    def test_download_pdf_from_drive_error(self, mock_google_services, caplog):
+    def test_download_pdf_from_drive_error(self, mock_google_services, caplog, document_store):
         """Test PDF download error handling"""
         from app.routers.oracle_universal import download_pdf_from_drive
 
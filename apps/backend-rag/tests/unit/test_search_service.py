@@ -3,6 +3,7 @@ Unit tests for Search Service
 100% coverage target with comprehensive mocking
 """
 
+import asyncio
 import sys
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
@@ -15,7 +16,7 @@ if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
 from app.models import TierLevel
-from services.search_service import SearchService
+from services.search_service import SearchService, _search_cache_tags
 
 # ============================================================================
 # Fixtures
@@ -37,6 +38,7 @@ def mock_embeddings_generator():
     mock_embedder.provider = "openai"
     mock_embedder.dimensions = 1536
     mock_embedder.generate_query_embedding = Mock(return_value=[0.1] * 1536)
+    mock_embedder.async_generate_query_embedding = AsyncMock(return_value=[0.1] * 1536)
     return mock_embedder
 
 
@@ -44,7 +46,7 @@ def mock_embeddings_generator():
 def mock_qdrant_client():
     """Mock QdrantClient"""
     mock_client = MagicMock()
-    mock_client.search = Mock(
+    mock_client.async_search = AsyncMock(
         return_value={
             "ids": ["id1", "id2"],
             "documents": ["Document 1", "Document 2"],
@@ -277,7 +279,7 @@ async def test_search_zantara_books_with_tier_filter(search_service):
 
     # Mock the zantara_books collection
     mock_zantara_collection = MagicMock()
-    mock_zantara_collection.search = Mock(
+    mock_zantara_collection.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["Document 1"],
@@ -292,8 +294,8 @@ async def test_search_zantara_books_with_tier_filter(search_service):
 
     assert result["collection_used"] == "zantara_books"
     # Verify filter was applied
-    mock_zantara_collection.search.assert_called_once()
-    call_args = mock_zantara_collection.search.call_args
+    mock_zantara_collection.async_search.assert_called_once()
+    call_args = mock_zantara_collection.async_search.call_args
     assert call_args[1]["filter"] is not None
 
 
@@ -311,6 +313,55 @@ async def test_search_unknown_collection_fallback(search_service):
     assert result["collection_used"] == "visa_oracle"
 
 
+def test_route_collection_single_place(search_service):
+    """Override, pricing and router choices all resolve to a known collection"""
+    search_service.router.route = Mock(return_value="unknown_collection")
+
+    assert search_service._route_collection("q", "tax_genius") == "tax_genius"
+    assert search_service._route_collection("how much is it?") == "bali_zero_pricing"
+    assert search_service._route_collection("visa question") == "visa_oracle"
+    assert search_service._route_collection("q", "not_a_collection") == "visa_oracle"
+
+
+def test_search_cache_tags_use_physical_collection(search_service):
+    """Aliases of one Qdrant collection share a cache tag"""
+    search_service.collections["legal_architect"] = MagicMock(collection_name="legal_unified")
+    search_service.collections["legal_updates"] = MagicMock(collection_name="legal_unified")
+
+    for alias in ("legal_architect", "legal_updates"):
+        tags = _search_cache_tags(search_service, "q", 1, 5, None, alias)
+        assert tags == ["collection:legal_unified"]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_physical_collection_drops_alias_searches(
+    search_service, mock_qdrant_client
+):
+    """Re-ingesting legal_unified invalidates searches routed to any of its aliases"""
+    from core.cache import CacheService, invalidate_collection
+
+    with patch("app.core.config.settings") as mock_settings, patch("core.cache.logger"):
+        mock_settings.redis_url = None
+        cache_service = CacheService()
+
+    legal = MagicMock(collection_name="legal_unified")
+    legal.async_search = mock_qdrant_client.async_search
+    search_service.collections["legal_architect"] = legal
+    search_service.collections["legal_intelligence"] = legal
+
+    with patch("core.cache.cache", cache_service), patch("core.cache.logger"):
+        await search_service.search("alias query", 1, collection_override="legal_architect")
+        await search_service.search("alias query", 1, collection_override="legal_intelligence")
+        await search_service.search("alias query", 1, collection_override="legal_architect")
+        assert legal.async_search.await_count == 2
+
+        invalidate_collection("legal_unified")
+        await search_service.search("alias query", 1, collection_override="legal_architect")
+        await search_service.search("alias query", 1, collection_override="legal_intelligence")
+
+    assert legal.async_search.await_count == 4
+
+
 @pytest.mark.asyncio
 async def test_search_price_redaction(search_service):
     """Test that prices are NOT redacted (as per current implementation)"""
@@ -319,7 +370,7 @@ async def test_search_price_redaction(search_service):
 
     # Mock collection to return document with price
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["The price is IDR 1,000,000"],
@@ -344,7 +395,7 @@ async def test_search_bali_zero_pricing_score_boost(search_service):
     user_level = 2
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["Document 1"],
@@ -372,7 +423,7 @@ async def test_search_empty_results(search_service):
     search_service.router.route = Mock(return_value="visa_oracle")
     # Create a new mock collection with empty results
     empty_collection = MagicMock()
-    empty_collection.search = Mock(
+    empty_collection.async_search = AsyncMock(
         return_value={
             "ids": [],
             "documents": [],
@@ -402,7 +453,7 @@ async def test_search_missing_fields_in_results(search_service):
     search_service.router.route = Mock(return_value="visa_oracle")
     # Mock results with missing fields
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["Doc 1"],
@@ -428,7 +479,7 @@ async def test_search_exception_handling(search_service):
     user_level = 1
 
     # Make embedder raise exception
-    search_service.embedder.generate_query_embedding = Mock(
+    search_service.embedder.async_generate_query_embedding = AsyncMock(
         side_effect=Exception("Embedding error")
     )
 
@@ -461,7 +512,7 @@ async def test_search_custom_limit(search_service):
 
     # Mock collection to return more results
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": [f"id{i}" for i in range(10)],
             "documents": [f"Document {i}" for i in range(10)],
@@ -475,8 +526,8 @@ async def test_search_custom_limit(search_service):
     result = await search_service.search(query, user_level, limit=limit)
 
     assert len(result["results"]) == 10
-    mock_collection.search.assert_called_once()
-    call_args = mock_collection.search.call_args
+    mock_collection.async_search.assert_called_once()
+    call_args = mock_collection.async_search.call_args
     assert call_args[1]["limit"] == 10
 
 
@@ -784,7 +835,7 @@ async def test_search_with_conflict_resolution_conflicts_detected(search_service
 
     # Mock collections to return results
     mock_tax_knowledge = MagicMock()
-    mock_tax_knowledge.search = Mock(
+    mock_tax_knowledge.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["Tax knowledge doc"],
@@ -795,7 +846,7 @@ async def test_search_with_conflict_resolution_conflicts_detected(search_service
     )
 
     mock_tax_updates = MagicMock()
-    mock_tax_updates.search = Mock(
+    mock_tax_updates.async_search = AsyncMock(
         return_value={
             "ids": ["id2"],
             "documents": ["Tax updates doc"],
@@ -825,7 +876,7 @@ async def test_search_with_conflict_resolution_primary_collection_boost(search_s
     )
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["Tax doc"],
@@ -856,7 +907,7 @@ async def test_search_with_conflict_resolution_sorts_by_score(search_service):
     )
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": ["id1", "id2"],
             "documents": ["Doc 1", "Doc 2"],
@@ -886,7 +937,7 @@ async def test_search_with_conflict_resolution_limit_results(search_service):
     )
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": [f"id{i}" for i in range(10)],
             "documents": [f"Doc {i}" for i in range(10)],
@@ -910,7 +961,7 @@ async def test_search_with_conflict_resolution_exception_fallback(search_service
     user_level = 2
 
     # Make embedder raise exception
-    search_service.embedder.generate_query_embedding = Mock(
+    search_service.embedder.async_generate_query_embedding = AsyncMock(
         side_effect=Exception("Embedding error")
     )
 
@@ -960,7 +1011,7 @@ async def test_search_with_conflict_resolution_zantara_books_tier_filter(search_
     )
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["Doc 1"],
@@ -974,8 +1025,8 @@ async def test_search_with_conflict_resolution_zantara_books_tier_filter(search_
     await search_service.search_with_conflict_resolution(query, user_level)
 
     # Verify filter was applied
-    mock_collection.search.assert_called_once()
-    call_args = mock_collection.search.call_args
+    mock_collection.async_search.assert_called_once()
+    call_args = mock_collection.async_search.call_args
     assert call_args[1]["filter"] is not None
 
 
@@ -1225,7 +1276,7 @@ async def test_query_cultural_insights_success(search_service):
     query = "How should I greet someone in Bali?"
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["Greet with 'Om Swastiastu'"],
@@ -1249,7 +1300,7 @@ async def test_query_cultural_insights_empty_results(search_service):
     query = "Unknown query"
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": [],
             "documents": [],
@@ -1272,7 +1323,7 @@ async def test_query_cultural_insights_custom_limit(search_service):
     limit = 5
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": [f"id{i}" for i in range(5)],
             "documents": [f"Doc {i}" for i in range(5)],
@@ -1286,8 +1337,8 @@ async def test_query_cultural_insights_custom_limit(search_service):
     results = await search_service.query_cultural_insights(query, limit=limit)
 
     assert len(results) == 5
-    mock_collection.search.assert_called_once()
-    call_args = mock_collection.search.call_args
+    mock_collection.async_search.assert_called_once()
+    call_args = mock_collection.async_search.call_args
     assert call_args[1]["limit"] == 5
 
 
@@ -1297,7 +1348,7 @@ async def test_query_cultural_insights_exception(search_service):
     query = "Test query"
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(side_effect=Exception("Search error"))
+    mock_collection.async_search = AsyncMock(side_effect=Exception("Search error"))
     search_service.collections["cultural_insights"] = mock_collection
 
     results = await search_service.query_cultural_insights(query)
@@ -1311,7 +1362,7 @@ async def test_query_cultural_insights_missing_fields(search_service):
     query = "Test query"
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["Doc 1"],
@@ -1337,7 +1388,7 @@ async def test_warmup_success(search_service):
     """Test successful warmup"""
     # Mock collections
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["Doc"],
@@ -1364,7 +1415,7 @@ async def test_warmup_missing_collection(search_service):
 
     # Mock remaining collections
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": [],
             "documents": [],
@@ -1385,12 +1436,12 @@ async def test_warmup_collection_exception(search_service):
     """Test warmup handles collection exceptions gracefully"""
     # Mock collection to raise exception
     mock_collection = MagicMock()
-    mock_collection.search = Mock(side_effect=Exception("Collection error"))
+    mock_collection.async_search = AsyncMock(side_effect=Exception("Collection error"))
     search_service.collections["bali_zero_pricing"] = mock_collection
 
     # Mock other collections
     mock_collection_ok = MagicMock()
-    mock_collection_ok.search = Mock(
+    mock_collection_ok.async_search = AsyncMock(
         return_value={
             "ids": [],
             "documents": [],
@@ -1545,7 +1596,7 @@ async def test_search_collection_existing_collection(search_service):
 
     # Mock the collection
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": ["id1", "id2"],
             "documents": ["Doc 1", "Doc 2"],
@@ -1573,7 +1624,7 @@ async def test_search_collection_new_collection(search_service):
 
     # Mock QdrantClient creation
     mock_client = MagicMock()
-    mock_client.search = Mock(
+    mock_client.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["Doc 1"],
@@ -1600,7 +1651,7 @@ async def test_search_collection_with_filter(search_service):
     filter_dict = {"status": "active"}
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={"ids": [], "documents": [], "metadatas": [], "distances": []}
     )
     search_service.collections[collection_name] = mock_collection
@@ -1608,7 +1659,7 @@ async def test_search_collection_with_filter(search_service):
     await search_service.search_collection(query, collection_name, filter=filter_dict)
 
     # Verify filter was passed
-    call_args = mock_collection.search.call_args
+    call_args = mock_collection.async_search.call_args
     assert call_args[1]["filter"] == filter_dict
 
 
@@ -1619,7 +1670,7 @@ async def test_search_collection_exception_handling(search_service):
     collection_name = "visa_oracle"
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(side_effect=Exception("Search error"))
+    mock_collection.async_search = AsyncMock(side_effect=Exception("Search error"))
     search_service.collections[collection_name] = mock_collection
 
     with patch("services.search_service.logger") as mock_logger:
@@ -1640,7 +1691,7 @@ async def test_search_collection_missing_fields(search_service):
 
     # Mock collection with incomplete results
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["Doc 1"],
@@ -1694,7 +1745,7 @@ async def test_search_with_conflict_resolution_tier_filter(search_service):
     tier_filter = [TierLevel.S, TierLevel.A]
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={"ids": [], "documents": [], "metadatas": [], "distances": []}
     )
     search_service.collections["zantara_books"] = mock_collection
@@ -1724,7 +1775,7 @@ async def test_search_with_conflict_resolution_zero_results(search_service):
     query = "test query"
 
     mock_collection = MagicMock()
-    mock_collection.search = Mock(
+    mock_collection.async_search = AsyncMock(
         return_value={"ids": [], "documents": [], "metadatas": [], "distances": []}
     )
     search_service.collections["visa_oracle"] = mock_collection
@@ -1753,6 +1804,78 @@ async def test_search_with_conflict_resolution_zero_results(search_service):
     # The test verifies the code path executes without error
 
 
+def _collection_returning(doc: str, delay: float = 0.0):
+    """Build a mock collection whose async_search returns one document after a delay"""
+
+    async def _search(**_kwargs):
+        await asyncio.sleep(delay)
+        return {"ids": [doc], "documents": [doc], "metadatas": [{}], "distances": [0.1]}
+
+    collection = MagicMock()
+    collection.async_search = AsyncMock(side_effect=_search)
+    return collection
+
+
+@pytest.mark.asyncio
+async def test_search_with_conflict_resolution_searches_concurrently(search_service):
+    """Test fallback collections are queried concurrently, not one after another"""
+    for name in ["tax_genius", "tax_updates", "tax_knowledge"]:
+        search_service.collections[name] = _collection_returning(name, delay=0.2)
+    search_service.router.route_with_confidence = Mock(
+        return_value=("tax_genius", 0.6, ["tax_genius", "tax_updates", "tax_knowledge"])
+    )
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    result = await SearchService.search_with_conflict_resolution.__wrapped__(
+        search_service, "tax law", 2
+    )
+    elapsed = loop.time() - start
+
+    assert elapsed < 0.5  # ~max(0.2), not sum(0.6)
+    assert result["collections_searched"] == ["tax_genius", "tax_updates", "tax_knowledge"]
+    assert result["collections_timed_out"] == []
+
+
+@pytest.mark.asyncio
+async def test_search_with_conflict_resolution_partial_results_on_timeout(search_service):
+    """Test a slow collection is dropped while the others are still merged"""
+    search_service.collection_search_timeout = 0.05
+    search_service.collections["tax_genius"] = _collection_returning("fast")
+    search_service.collections["tax_updates"] = _collection_returning("slow", delay=1.0)
+    search_service.router.route_with_confidence = Mock(
+        return_value=("tax_genius", 0.6, ["tax_genius", "tax_updates"])
+    )
+
+    result = await SearchService.search_with_conflict_resolution.__wrapped__(
+        search_service, "tax law", 2
+    )
+
+    assert result["collections_searched"] == ["tax_genius"]
+    assert result["collections_timed_out"] == ["tax_updates"]
+    assert [r["text"] for r in result["results"]] == ["fast"]
+    assert result["conflicts_detected"] == 0
+
+
+@pytest.mark.asyncio
+async def test_search_with_conflict_resolution_failed_collection_isolated(search_service):
+    """Test one failing collection does not discard the other results"""
+    failing = MagicMock()
+    failing.async_search = AsyncMock(side_effect=Exception("Qdrant down"))
+    search_service.collections["tax_genius"] = failing
+    search_service.collections["tax_updates"] = _collection_returning("update")
+    search_service.router.route_with_confidence = Mock(
+        return_value=("tax_genius", 0.6, ["tax_genius", "tax_updates"])
+    )
+
+    result = await SearchService.search_with_conflict_resolution.__wrapped__(
+        search_service, "tax law", 2
+    )
+
+    assert result["collections_searched"] == ["tax_updates"]
+    assert result["results"][0]["metadata"]["source_collection"] == "tax_updates"
+
+
 @pytest.mark.asyncio
 async def test_search_with_conflict_resolution_updates_collection_branch(search_service):
     """Test conflict resolution branch for 'updates' collection priority"""
@@ -1760,7 +1883,7 @@ async def test_search_with_conflict_resolution_updates_collection_branch(search_
 
     # Mock collections with 'updates' in name
     mock_collection1 = MagicMock()
-    mock_collection1.search = Mock(
+    mock_collection1.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["Doc 1"],
@@ -1770,7 +1893,7 @@ async def test_search_with_conflict_resolution_updates_collection_branch(search_
     )
 
     mock_collection2 = MagicMock()
-    mock_collection2.search = Mock(
+    mock_collection2.async_search = AsyncMock(
         return_value={
             "ids": ["id2"],
             "documents": ["Doc 2"],
@@ -1806,7 +1929,7 @@ async def test_search_with_conflict_resolution_score_comparison_branch(search_se
 
     # Mock collections with different scores
     mock_collection1 = MagicMock()
-    mock_collection1.search = Mock(
+    mock_collection1.async_search = AsyncMock(
         return_value={
             "ids": ["id1"],
             "documents": ["Doc 1"],
@@ -1816,7 +1939,7 @@ async def test_search_with_conflict_resolution_score_comparison_branch(search_se
     )
 
     mock_collection2 = MagicMock()
-    mock_collection2.search = Mock(
+    mock_collection2.async_search = AsyncMock(
         return_value={
             "ids": ["id2"],
             "documents": ["Doc 2"],
@@ -6,7 +6,7 @@ Unit tests for Semantic Cache Service
 import json
 import sys
 from pathlib import Path
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import numpy as np
 import pytest
@@ -16,7 +16,7 @@ backend_path = Path(__file__).parent.parent.parent / "backend"
 if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
-from services.semantic_cache import SemanticCache
+from services.semantic_cache import EmbeddingIndex, SemanticCache
 
 # ============================================================================
 # Fixtures
@@ -31,10 +31,15 @@ def mock_redis_client():
     redis.setex = AsyncMock(return_value=True)
     redis.zadd = AsyncMock(return_value=0)
     redis.zrange = AsyncMock(return_value=[])
+    redis.mget = AsyncMock(return_value=[])
     redis.zcard = AsyncMock(return_value=0)
     redis.zrem = AsyncMock(return_value=0)
     redis.delete = AsyncMock(return_value=1)
     redis.keys = AsyncMock(return_value=[])
+    # Pipeline: commands are buffered synchronously, execute() is awaited
+    redis.pipe = MagicMock()
+    redis.pipe.execute = AsyncMock(return_value=[True, True, 1, 1])
+    redis.pipeline = MagicMock(return_value=redis.pipe)
     return redis
 
 
@@ -142,19 +147,18 @@ async def test_get_cached_result_semantic_match(semantic_cache, sample_embedding
     cached_data = json.dumps(sample_result).encode()
 
     semantic_cache.redis.zrange = AsyncMock(return_value=[cached_embedding_key])
+    semantic_cache.redis.mget = AsyncMock(return_value=[similar_embedding.tobytes()])
     semantic_cache.redis.get = AsyncMock(
         side_effect=[
             None,  # First call for exact match
-            similar_embedding.tobytes(),  # Second call for embedding
-            cached_data,  # Third call for cached result
+            cached_data,  # Second call for cached result
         ]
     )
 
     result = await semantic_cache.get_cached_result(query, query_embedding=sample_embedding)
 
-    # Should find semantic match if similarity is high enough
-    # Note: This test may need adjustment based on actual similarity calculation
-    assert result is None or result["cache_hit"] == "semantic"
+    assert result["cache_hit"] == "semantic"
+    semantic_cache.redis.get.assert_any_call("semantic_cache:abc123")
 
 
 @pytest.mark.asyncio
@@ -179,15 +183,14 @@ async def test_cache_result_success(semantic_cache, sample_embedding, sample_res
     query = "Test query"
     ttl = 3600
 
-    semantic_cache.redis.setex = AsyncMock(return_value=True)
-    semantic_cache.redis.zadd = AsyncMock(return_value=0)
-    semantic_cache.redis.zcard = AsyncMock(return_value=0)
-
     result = await semantic_cache.cache_result(query, sample_embedding, sample_result, ttl=ttl)
 
     assert result is True
-    assert semantic_cache.redis.setex.call_count == 2  # Result + embedding
-    assert semantic_cache.redis.zadd.called
+    pipe = semantic_cache.redis.pipe
+    assert pipe.setex.call_count == 2  # Result + embedding
+    assert pipe.zadd.called
+    pipe.execute.assert_awaited_once()  # Single round trip
+    semantic_cache.redis.setex.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -195,14 +198,10 @@ async def test_cache_result_default_ttl(semantic_cache, sample_embedding, sample
     """Test cache_result uses default TTL when not specified"""
     query = "Test query"
 
-    semantic_cache.redis.setex = AsyncMock(return_value=True)
-    semantic_cache.redis.zadd = AsyncMock(return_value=0)
-    semantic_cache.redis.zcard = AsyncMock(return_value=0)
-
     await semantic_cache.cache_result(query, sample_embedding, sample_result)
 
     # Check that default_ttl was used (setex(key, ttl, value) - TTL is second arg)
-    calls = semantic_cache.redis.setex.call_args_list
+    calls = semantic_cache.redis.pipe.setex.call_args_list
     assert len(calls) == 2  # Should be called twice (cache_key and embedding_key)
     assert all(call[0][1] == semantic_cache.default_ttl for call in calls)
 
@@ -211,7 +210,7 @@ async def test_cache_result_default_ttl(semantic_cache, sample_embedding, sample
 async def test_cache_result_exception_handling(semantic_cache, sample_embedding, sample_result):
     """Test cache_result handles exceptions gracefully"""
     query = "Test query"
-    semantic_cache.redis.setex = AsyncMock(side_effect=Exception("Redis error"))
+    semantic_cache.redis.pipe.execute = AsyncMock(side_effect=Exception("Redis error"))
 
     result = await semantic_cache.cache_result(query, sample_embedding, sample_result)
 
@@ -224,18 +223,54 @@ async def test_cache_result_enforces_cache_size(semantic_cache, sample_embedding
     query = "Test query"
 
     # Mock cache size over limit
+    semantic_cache.redis.pipe.execute = AsyncMock(return_value=[True, True, 1, 10001])
     semantic_cache.redis.zcard = AsyncMock(return_value=10001)  # Over max_cache_size
     semantic_cache.redis.zrange = AsyncMock(return_value=[b"old_key1", b"old_key2"])
-    semantic_cache.redis.setex = AsyncMock(return_value=True)
-    semantic_cache.redis.zadd = AsyncMock(return_value=0)
-    semantic_cache.redis.delete = AsyncMock(return_value=1)
-    semantic_cache.redis.zrem = AsyncMock(return_value=1)
 
     await semantic_cache.cache_result(query, sample_embedding, sample_result)
 
-    # Should call eviction methods
+    # Eviction runs in the background, not inside the request
+    assert semantic_cache._eviction_task is not None
+    await semantic_cache._eviction_task
+
     assert semantic_cache.redis.zrange.called
-    assert semantic_cache.redis.delete.called
+    assert semantic_cache.redis.pipe.delete.called
+    assert semantic_cache.stats["evictions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_result_under_limit_skips_eviction(
+    semantic_cache, sample_embedding, sample_result
+):
+    """Test no eviction task is started while the cache is under its limit"""
+    await semantic_cache.cache_result("Test query", sample_embedding, sample_result)
+
+    assert semantic_cache._eviction_task is None
+    semantic_cache.redis.zcard.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_schedule_eviction_coalesces_bursts(semantic_cache):
+    """Test concurrent eviction requests share one background task"""
+    passes = []
+
+    async def _evict():
+        passes.append(1)
+        if len(passes) == 1:
+            # A write lands while the first pass is running
+            semantic_cache._schedule_eviction()
+
+    semantic_cache._enforce_cache_size = _evict
+
+    semantic_cache._schedule_eviction()
+    first_task = semantic_cache._eviction_task
+    semantic_cache._schedule_eviction()  # Before the task starts: covered by the first pass
+
+    assert semantic_cache._eviction_task is first_task
+    await first_task
+
+    # One pass for the initial burst, one more for the request made mid-pass
+    assert len(passes) == 2
 
 
 # ============================================================================
@@ -260,12 +295,13 @@ async def test_find_similar_query_below_threshold(semantic_cache, sample_embeddi
     embedding_key = b"embedding:abc123"
 
     semantic_cache.redis.zrange = AsyncMock(return_value=[embedding_key])
-    semantic_cache.redis.get = AsyncMock(return_value=different_embedding.tobytes())
+    semantic_cache.redis.mget = AsyncMock(return_value=[different_embedding.tobytes()])
 
     result = await semantic_cache._find_similar_query(sample_embedding)
 
     # Similarity should be low, so result should be None
     assert result is None
+    semantic_cache.redis.get.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -368,15 +404,19 @@ async def test_enforce_cache_size_no_eviction(semantic_cache):
 async def test_enforce_cache_size_evicts_oldest(semantic_cache):
     """Test _enforce_cache_size evicts oldest entries when over limit"""
     semantic_cache.redis.zcard = AsyncMock(return_value=10001)  # Over max_cache_size
-    semantic_cache.redis.zrange = AsyncMock(return_value=[b"old_key1", b"old_key2"])
-    semantic_cache.redis.delete = AsyncMock(return_value=1)
-    semantic_cache.redis.zrem = AsyncMock(return_value=1)
+    semantic_cache.redis.zrange = AsyncMock(return_value=[b"embedding:a", b"embedding:b"])
+    semantic_cache._index.add("embedding:a", np.ones(3))
 
     await semantic_cache._enforce_cache_size()
 
-    assert semantic_cache.redis.zrange.called
-    assert semantic_cache.redis.delete.called
-    assert semantic_cache.redis.zrem.called
+    pipe = semantic_cache.redis.pipe
+    pipe.delete.assert_called_once_with(
+        "embedding:a", "embedding:b", "semantic_cache:a", "semantic_cache:b"
+    )
+    pipe.zrem.assert_called_once_with("semantic_cache:index", "embedding:a", "embedding:b")
+    pipe.execute.assert_awaited_once()
+    semantic_cache.redis.delete.assert_not_called()
+    assert "embedding:a" not in semantic_cache._index
 
 
 @pytest.mark.asyncio
@@ -393,6 +433,21 @@ async def test_enforce_cache_size_exception_handling(semantic_cache):
 # ============================================================================
 
 
+@pytest.mark.asyncio
+async def test_get_cache_stats_counts_hits_and_misses(semantic_cache, sample_result):
+    """Test get_cache_stats reports hit/miss counters"""
+    semantic_cache.redis.get = AsyncMock(side_effect=[json.dumps(sample_result).encode(), None])
+    await semantic_cache.get_cached_result("hit")
+    await semantic_cache.get_cached_result("miss")
+
+    stats = await semantic_cache.get_cache_stats()
+
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 0
+    assert stats["hit_rate"] == "50.0%"
+
+
 @pytest.mark.asyncio
 async def test_get_cache_stats_success(semantic_cache):
     """Test get_cache_stats returns statistics"""
@@ -465,12 +520,13 @@ async def test_find_similar_query_skips_missing_embeddings(semantic_cache, sampl
     embedding_key = b"embedding:abc123"
 
     semantic_cache.redis.zrange = AsyncMock(return_value=[embedding_key])
-    semantic_cache.redis.get = AsyncMock(return_value=None)  # Missing embedding
+    semantic_cache.redis.mget = AsyncMock(return_value=[None])  # Missing embedding
 
     result = await semantic_cache._find_similar_query(sample_embedding)
 
     # Should return None when embedding is missing
     assert result is None
+    assert len(semantic_cache._index) == 0
 
 
 @pytest.mark.asyncio
@@ -482,18 +538,14 @@ async def test_find_similar_query_handles_cache_key_conversion(semantic_cache, s
     similar_embedding = sample_embedding * 0.98  # Very similar
 
     semantic_cache.redis.zrange = AsyncMock(return_value=[embedding_key])
-    semantic_cache.redis.get = AsyncMock(
-        side_effect=[
-            similar_embedding.tobytes(),  # First call for embedding
-            cached_data,  # Second call for cached result
-        ]
-    )
+    semantic_cache.redis.mget = AsyncMock(return_value=[similar_embedding.tobytes()])
+    semantic_cache.redis.get = AsyncMock(return_value=cached_data)
 
     result = await semantic_cache._find_similar_query(sample_embedding)
 
-    # Should handle key conversion and return result if similarity is high enough
-    # Note: This depends on actual similarity calculation
-    assert result is None or isinstance(result, dict)
+    semantic_cache.redis.get.assert_called_once_with(cache_key)
+    assert result["data"] == {"query": "test", "result": {}}
+    assert result["similarity"] == pytest.approx(1.0, abs=1e-5)
 
 
 @pytest.mark.asyncio
@@ -505,18 +557,15 @@ async def test_find_similar_query_returns_none_when_no_cached_data(
     similar_embedding = sample_embedding * 0.98  # Very similar
 
     semantic_cache.redis.zrange = AsyncMock(return_value=[embedding_key])
-    semantic_cache.redis.get = AsyncMock(
-        side_effect=[
-            similar_embedding.tobytes(),  # First call for embedding
-            None,  # Second call for cached result - missing!
-        ]
-    )
+    semantic_cache.redis.mget = AsyncMock(return_value=[similar_embedding.tobytes()])
+    semantic_cache.redis.get = AsyncMock(return_value=None)  # Cached result - missing!
     semantic_cache.similarity_threshold = 0.90  # Lower threshold to ensure match
 
     result = await semantic_cache._find_similar_query(sample_embedding)
 
-    # Should return None when cached data is missing
+    # Should return None when cached data is missing, and forget the stale entry
     assert result is None
+    assert "embedding:abc123" not in semantic_cache._index
 
 
 @pytest.mark.asyncio
@@ -527,18 +576,16 @@ async def test_find_similar_query_handles_bytes_and_string_keys(semantic_cache,
     similar_embedding = sample_embedding * 0.98
 
     semantic_cache.redis.zrange = AsyncMock(return_value=[embedding_key_str])
+    semantic_cache.redis.mget = AsyncMock(return_value=[similar_embedding.tobytes()])
     semantic_cache.redis.get = AsyncMock(
-        side_effect=[
-            similar_embedding.tobytes(),
-            json.dumps({"query": "test", "result": {}}).encode(),
-        ]
+        return_value=json.dumps({"query": "test", "result": {}}).encode()
     )
     semantic_cache.similarity_threshold = 0.90
 
     result = await semantic_cache._find_similar_query(sample_embedding)
 
     # Should handle string keys correctly
-    assert result is None or isinstance(result, dict)
+    assert isinstance(result, dict)
 
 
 @pytest.mark.asyncio
@@ -579,24 +626,23 @@ async def test_find_similar_query_similarity_not_better_than_current(
     embedding_key2 = b"embedding:key2"
     # First embedding is more similar
     similar_embedding1 = sample_embedding * 0.98  # 98% similar
-    # Second embedding is less similar
-    similar_embedding2 = sample_embedding * 0.50  # 50% similar
 
-    semantic_cache.redis.zrange = AsyncMock(return_value=[embedding_key1, embedding_key2])
+    different_embedding = np.array([0.5, 0.4, 0.3, 0.2, 0.1], dtype=np.float32)
+
+    semantic_cache.redis.zrange = AsyncMock(return_value=[embedding_key2, embedding_key1])
+    semantic_cache.redis.mget = AsyncMock(
+        return_value=[different_embedding.tobytes(), similar_embedding1.tobytes()]
+    )
     semantic_cache.redis.get = AsyncMock(
-        side_effect=[
-            similar_embedding1.tobytes(),  # First embedding
-            similar_embedding2.tobytes(),  # Second embedding (less similar)
-            json.dumps({"query": "test", "result": {}}).encode(),  # Cached data
-        ]
+        return_value=json.dumps({"query": "test", "result": {}}).encode()
     )
     semantic_cache.similarity_threshold = 0.90
 
     result = await semantic_cache._find_similar_query(sample_embedding)
 
-    # Should use best_match (key1) even though key2 was checked
-    # Result depends on similarity calculation, but best_match should be key1
-    assert result is None or isinstance(result, dict)
+    # Should use best_match (key1) even though key2 was checked first
+    assert isinstance(result, dict)
+    semantic_cache.redis.get.assert_called_once_with("semantic_cache:key1")
 
 
 def test_get_semantic_cache_singleton():
@@ -618,3 +664,92 @@ def test_get_semantic_cache_singleton():
 
     # Reset for other tests
     services.semantic_cache._semantic_cache = None
+
+
+# ============================================================================
+# Tests for in-process index
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_find_similar_query_index_not_refetched_within_interval(
+    semantic_cache, sample_embedding
+):
+    """Test embeddings are loaded once with MGET, not fetched on every lookup"""
+    semantic_cache.redis.zrange = AsyncMock(return_value=[b"embedding:abc123"])
+    semantic_cache.redis.mget = AsyncMock(return_value=[sample_embedding.tobytes()])
+    semantic_cache.redis.get = AsyncMock(return_value=json.dumps({"query": "q"}).encode())
+
+    await semantic_cache._find_similar_query(sample_embedding)
+    await semantic_cache._find_similar_query(sample_embedding)
+
+    assert semantic_cache.redis.zrange.call_count == 1
+    assert semantic_cache.redis.mget.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_index_drops_keys_removed_from_redis(semantic_cache, sample_embedding):
+    """Test sync removes local entries no longer in the Redis index"""
+    semantic_cache._index.add("embedding:gone", sample_embedding)
+    semantic_cache.redis.zrange = AsyncMock(return_value=[b"embedding:kept"])
+    semantic_cache.redis.mget = AsyncMock(return_value=[sample_embedding.tobytes()])
+
+    await semantic_cache._sync_index()
+
+    assert semantic_cache._index.keys() == {"embedding:kept"}
+
+
+@pytest.mark.asyncio
+async def test_cache_result_adds_to_index(semantic_cache, sample_embedding, sample_result):
+    """Test cache_result makes the entry searchable without a Redis resync"""
+    await semantic_cache.cache_result("Test query", sample_embedding, sample_result)
+
+    assert semantic_cache._get_embedding_key("Test query") in semantic_cache._index
+
+
+def test_embedding_index_best_match():
+    """Test matrix lookup returns the most similar key"""
+    index = EmbeddingIndex(initial_capacity=2)
+    index.add("a", np.array([1.0, 0.0, 0.0]))
+    index.add("b", np.array([0.0, 1.0, 0.0]))
+    index.add("c", np.array([0.0, 0.0, 1.0]))  # Forces capacity growth
+
+    key, similarity = index.best_match(np.array([0.1, 0.9, 0.0]))
+
+    assert key == "b"
+    assert 0.9 < similarity <= 1.0
+    assert index.backend == "matrix"
+
+
+def test_embedding_index_remove_keeps_rows_consistent():
+    """Test swap-with-last removal keeps key/row mapping intact"""
+    index = EmbeddingIndex()
+    index.add("a", np.array([1.0, 0.0]))
+    index.add("b", np.array([0.0, 1.0]))
+    index.add("c", np.array([-1.0, 0.0]))
+
+    index.remove("a")
+    index.remove("missing")
+
+    assert len(index) == 2
+    assert index.best_match(np.array([-1.0, 0.1]))[0] == "c"
+    assert index.best_match(np.array([0.0, 1.0]))[0] == "b"
+
+
+def test_embedding_index_empty_and_zero_vectors():
+    """Test empty index and zero vectors are handled"""
+    index = EmbeddingIndex()
+    assert index.best_match(np.array([1.0, 0.0])) is None
+
+    index.add("zero", np.zeros(2))
+    assert len(index) == 0
+
+
+def test_embedding_index_resets_on_dimension_change():
+    """Test switching embedding models does not mix dimensions"""
+    index = EmbeddingIndex()
+    index.add("old", np.ones(3))
+    index.add("new", np.ones(4))
+
+    assert index.keys() == {"new"}
+    assert index.best_match(np.ones(3)) is None
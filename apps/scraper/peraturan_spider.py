@@ -10,13 +10,20 @@ Features:
 - Saves PDFs to data/raw_laws/ with proper naming
 - Rate limiting and polite delays
 - Graceful error handling
+- Crawl mode: N browser pages fed from a shared URL frontier, a persistent
+  visited set and a separate aiohttp PDF download queue (see crawl())
+- Headless option for CI and servers
+- PDFs stream to disk in chunks, resume with HTTP Range requests and are
+  deduplicated by SHA-256 across differently named files
 """
 
 import asyncio
+import hashlib
 import json
 import re
 import subprocess
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -37,6 +44,9 @@ SEARCH_URL = f"{BASE_URL}/Search"
 DATA_DIR = Path(__file__).parent / "data"
 RAW_LAWS_DIR = DATA_DIR / "raw_laws"
 METADATA_FILE = DATA_DIR / "laws_metadata.jsonl"
+VISITED_FILE = DATA_DIR / "visited_details.txt"
+SKIPPED_FILE = DATA_DIR / "skipped_details.txt"
+CHECKSUMS_FILE = DATA_DIR / "pdf_checksums.jsonl"
 
 # Rate limiting - polite 5 second delay
 REQUEST_DELAY = 5.0
@@ -45,6 +55,29 @@ REQUEST_DELAY = 5.0
 MAX_RETRIES = 3
 RETRY_DELAY = 5.0
 
+# Crawl mode defaults
+CRAWL_WORKERS = 4  # Browser pages visiting detail pages concurrently
+DOWNLOAD_WORKERS = 4  # Concurrent aiohttp PDF downloads
+FRONTIER_HIGH_WATER = 200  # Detail URLs queued before pagination pauses
+
+# PDF downloads
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # Bytes written per chunk while streaming
+PDF_MAGIC = b"%PDF"
+# Large PDFs outlive the session's 30s total timeout: bound connect and stalls only
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+
+# Regulation type filter: abbreviation -> names matched in the extracted type
+JENIS_MAPPING = {
+    "uu": ["uu", "undang-undang"],
+    "pp": ["pp", "peraturan pemerintah"],
+    "perpres": ["perpres", "peraturan presiden"],
+    "permen": ["permen", "peraturan menteri"],
+    "kepres": ["kepres", "keputusan presiden"],
+    "instruksi": ["instruksi", "instruksi presiden"],
+    "keputusan": ["keputusan"],
+    "peraturan": ["peraturan"],
+}
+
 # Cache for browser installation check (avoid checking multiple times)
 _playwright_browsers_checked = False
 
@@ -149,15 +182,20 @@ def _ensure_playwright_browsers_installed():
 class PeraturanSpider:
     """Spider for scraping Indonesian legal documents from peraturan.bpk.go.id"""
 
-    def __init__(self, auto_install_browsers: bool = True):
+    def __init__(self, auto_install_browsers: bool = True, headless: bool = False):
         """Initialize the spider
 
         Args:
             auto_install_browsers: If True, automatically install Playwright browsers if missing
+            headless: Run the browser without a window (CI and servers)
         """
         self.data_dir = DATA_DIR
         self.raw_laws_dir = RAW_LAWS_DIR
         self.metadata_file = METADATA_FILE
+        self.visited_file = VISITED_FILE
+        self.skipped_file = SKIPPED_FILE
+        self.checksums_file = CHECKSUMS_FILE
+        self.headless = headless
 
         # Create directories
         self.data_dir.mkdir(parents=True, exist_ok=True)
@@ -177,7 +215,18 @@ class PeraturanSpider:
             "pdfs_downloaded": 0,
             "errors": 0,
             "detail_pages_visited": 0,
+            "pdfs_resumed": 0,
+            "pdfs_deduplicated": 0,
+            "bytes_downloaded": 0,
+            "download_seconds": 0.0,  # Summed over downloads
         }
+        self._download_window: List[float] = []  # First start, last end (monotonic)
+
+        # PDF dedup: SHA-256 -> canonical filename, duplicate filename -> canonical
+        self.checksums: Dict[str, str] = {}
+        self.duplicate_of: Dict[str, str] = {}
+        self._load_checksums()
+        self._active_downloads: set = set()
 
         logger.info("BPK Peraturan Spider initialized")
 
@@ -889,34 +938,85 @@ class PeraturanSpider:
             return None
 
     async def _download_pdf(self, pdf_url: str, filename: str) -> bool:
-        """Download PDF file"""
+        """Download PDF file
+
+        The response is streamed to a .part file in DOWNLOAD_CHUNK_SIZE chunks and
+        the %PDF magic is checked on the first bytes. After a network error the
+        download is retried and resumed from the bytes already on disk with an
+        HTTP Range request. A completed file whose SHA-256 matches an earlier
+        download under another name is not kept (see duplicate_of).
+        """
         if not pdf_url:
             return False
 
-        try:
-            filepath = self.raw_laws_dir / filename
+        filepath = self.raw_laws_dir / filename
 
-            # Skip if already downloaded
-            if filepath.exists():
-                logger.debug(f"PDF already exists: {filename}")
-                return True
+        # Skip if already downloaded
+        if filepath.exists() or filename in self.duplicate_of:
+            logger.debug(f"PDF already exists: {filename}")
+            return True
 
-            if not self.session:
-                return False
+        if not self.session or filename in self._active_downloads:
+            return False
 
-            async with self.session.get(pdf_url) as response:
-                if response.status == 200:
-                    content = await response.read()
+        self._active_downloads.add(filename)
+        try:
+            for attempt in range(MAX_RETRIES):
+                try:
+                    return await self._stream_pdf(pdf_url, filename)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt == MAX_RETRIES - 1:
+                        raise
+                    wait_time = RETRY_DELAY * (2**attempt)
+                    logger.warning(
+                        f"Download of {filename} interrupted ({e}). "
+                        f"Resuming in {wait_time}s..."
+                    )
+                    await asyncio.sleep(wait_time)
+            return False
+        except Exception as e:
+            logger.error(f"Error downloading PDF {pdf_url}: {e}")
+            self.stats["errors"] += 1
+            return False
+        finally:
+            self._active_downloads.discard(filename)
 
-                    # Verify it's a PDF
-                    if content.startswith(b"%PDF"):
-                        filepath.write_bytes(content)
-                        logger.info(
-                            f"Downloaded PDF: {filename} ({len(content)} bytes)"
+    async def _stream_pdf(self, pdf_url: str, filename: str) -> bool:
+        """One download attempt: stream (or resume) into the .part file, then finalize"""
+        filepath = self.raw_laws_dir / filename
+        part_path = self.raw_laws_dir / f"{filename}.part"
+        offset = part_path.stat().st_size if part_path.exists() else 0
+
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        started = time.monotonic()
+        base = None  # .part size before this attempt wrote to it (None = no body read)
+        restart = False
+
+        try:
+            async with self.session.get(
+                pdf_url, headers=headers, timeout=DOWNLOAD_TIMEOUT
+            ) as response:
+                if response.status == 416 and offset:
+                    # Nothing left to send: the partial file is already complete
+                    logger.info(f"Partial download of {filename} is already complete")
+                elif response.status == 206 and offset:
+                    if not self._range_starts_at(response, offset):
+                        logger.warning(
+                            f"Unexpected Content-Range for {filename}, restarting"
                         )
-                        self.stats["pdfs_downloaded"] += 1
-                        return True
+                        restart = True
                     else:
+                        logger.info(f"Resuming {filename} from {offset} bytes")
+                        self.stats["pdfs_resumed"] += 1
+                        base = offset
+                        await self._write_chunks(response, part_path, append=True)
+                elif response.status == 200:
+                    # Fresh download (or the server ignored the Range header)
+                    base = 0
+                    written = await self._write_chunks(
+                        response, part_path, append=False
+                    )
+                    if written is None:
                         logger.warning(
                             f"Downloaded file is not a valid PDF: {filename}"
                         )
@@ -926,10 +1026,126 @@ class PeraturanSpider:
                         f"Failed to download PDF: {pdf_url} (status: {response.status})"
                     )
                     return False
+        finally:
+            # Measured on disk, so an attempt that fails mid-stream is accounted too
+            if base is not None:
+                size = part_path.stat().st_size if part_path.exists() else 0
+                self._record_throughput(max(0, size - base), started)
+
+        if restart:
+            part_path.unlink(missing_ok=True)
+            return await self._stream_pdf(pdf_url, filename)
+
+        return self._finalize_pdf(part_path, filepath, pdf_url)
+
+    async def _write_chunks(
+        self, response, part_path: Path, append: bool
+    ) -> Optional[int]:
+        """Stream a response body into part_path
+
+        Returns:
+            Bytes written, or None if a fresh body does not start with the PDF magic
+        """
+        written = 0
+        head = b""
+        with open(part_path, "ab" if append else "wb") as f:
+            async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                if not append and len(head) < len(PDF_MAGIC):
+                    head += chunk[: len(PDF_MAGIC) - len(head)]
+                    if len(head) >= len(PDF_MAGIC) and head != PDF_MAGIC:
+                        break
+                f.write(chunk)
+                written += len(chunk)
+
+        if not append and head != PDF_MAGIC:
+            part_path.unlink(missing_ok=True)
+            return None
+        return written
+
+    @staticmethod
+    def _range_starts_at(response, offset: int) -> bool:
+        """Check that a 206 response continues at offset (Content-Range: bytes start-end/total)"""
+        match = re.match(r"bytes\s+(\d+)-", response.headers.get("Content-Range", ""))
+        return bool(match) and int(match.group(1)) == offset
+
+    def _finalize_pdf(self, part_path: Path, filepath: Path, pdf_url: str) -> bool:
+        """Checksum a completed .part file and move it into place (or drop a duplicate)"""
+        sha256 = hashlib.sha256()
+        with open(part_path, "rb") as f:
+            if f.read(len(PDF_MAGIC)) != PDF_MAGIC:
+                logger.warning(f"Downloaded file is not a valid PDF: {filepath.name}")
+                part_path.unlink(missing_ok=True)
+                return False
+            f.seek(0)
+            for block in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                sha256.update(block)
+        digest = sha256.hexdigest()
+        size = part_path.stat().st_size
+
+        canonical = self.checksums.get(digest)
+        if canonical and (self.raw_laws_dir / canonical).exists():
+            part_path.unlink(missing_ok=True)
+            self.duplicate_of[filepath.name] = canonical
+            self._save_checksum(digest, filepath.name, pdf_url, duplicate_of=canonical)
+            self.stats["pdfs_deduplicated"] += 1
+            logger.info(
+                f"Duplicate PDF: {filepath.name} has the same content as {canonical}"
+            )
+            return True
+
+        part_path.replace(filepath)
+        self.checksums[digest] = filepath.name
+        self._save_checksum(digest, filepath.name, pdf_url)
+        self.stats["pdfs_downloaded"] += 1
+        logger.info(f"Downloaded PDF: {filepath.name} ({size} bytes)")
+        return True
+
+    def _record_throughput(self, received: int, started: float):
+        """Account the bytes and time of one download attempt"""
+        ended = time.monotonic()
+        self.stats["bytes_downloaded"] += received
+        self.stats["download_seconds"] += ended - started
+        if not self._download_window:
+            self._download_window = [started, ended]
+        else:
+            self._download_window[0] = min(self._download_window[0], started)
+            self._download_window[1] = max(self._download_window[1], ended)
+
+    def _load_checksums(self):
+        """Load the SHA-256 index of downloaded PDFs"""
+        try:
+            if not self.checksums_file.exists():
+                return
+            with open(self.checksums_file, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if entry.get("duplicate_of"):
+                        self.duplicate_of[entry["filename"]] = entry["duplicate_of"]
+                    else:
+                        self.checksums.setdefault(entry["sha256"], entry["filename"])
         except Exception as e:
-            logger.error(f"Error downloading PDF {pdf_url}: {e}")
-            self.stats["errors"] += 1
-            return False
+            logger.error(f"Error loading PDF checksums: {e}")
+
+    def _save_checksum(
+        self,
+        digest: str,
+        filename: str,
+        pdf_url: str,
+        duplicate_of: Optional[str] = None,
+    ):
+        """Append a downloaded PDF to the SHA-256 index"""
+        entry = {"sha256": digest, "filename": filename, "url": pdf_url}
+        if duplicate_of:
+            entry["duplicate_of"] = duplicate_of
+        try:
+            with open(self.checksums_file, "a", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+                f.write("\n")
+        except Exception as e:
+            logger.error(f"Error saving PDF checksum: {e}")
 
     def _generate_filename(self, item: Dict[str, Any]) -> str:
         """Generate filename for PDF using title"""
@@ -959,6 +1175,108 @@ class PeraturanSpider:
         filename = f"{safe_title}.pdf"
         return filename
 
+    def _matches_jenis(self, metadata: Dict[str, Any], jenis_filter: str) -> bool:
+        """Check if the regulation type matches the jenis filter (case-insensitive)"""
+        extracted_type = metadata.get("type", "").lower()
+        jenis_normalized = jenis_filter.lower()
+
+        # Handle both abbreviations and full names
+        if jenis_normalized in JENIS_MAPPING:
+            return any(
+                mapped_value in extracted_type
+                for mapped_value in JENIS_MAPPING[jenis_normalized]
+            )
+        # Direct match if not in mapping
+        return jenis_normalized in extracted_type
+
+    def _load_visited(self) -> set:
+        """Load the persistent set of processed detail URLs
+
+        Seeded from the metadata file, so earlier runs are not crawled again.
+        """
+        visited = set()
+        try:
+            if self.visited_file.exists():
+                visited.update(
+                    line.strip()
+                    for line in self.visited_file.read_text(
+                        encoding="utf-8"
+                    ).splitlines()
+                    if line.strip()
+                )
+            if self.metadata_file.exists():
+                with open(self.metadata_file, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            url = json.loads(line).get("url")
+                        except json.JSONDecodeError:
+                            continue
+                        if url:
+                            visited.add(url)
+        except Exception as e:
+            logger.error(f"Error loading visited URLs: {e}")
+
+        logger.info(f"Loaded {len(visited)} visited detail URLs")
+        return visited
+
+    def _mark_visited(self, url: str):
+        """Append a processed detail URL to the persistent visited set"""
+        try:
+            with open(self.visited_file, "a", encoding="utf-8") as f:
+                f.write(f"{url}\n")
+        except Exception as e:
+            logger.error(f"Error saving visited URL: {e}")
+
+    def _load_skipped(self, jenis_filter: Optional[str] = None) -> set:
+        """Load detail URLs a crawl with this jenis filter does not need to visit
+
+        The skip log holds one "<reason>\t<url>" line per skipped visit:
+        - "jenis:<type>": the page did not match the filter of an earlier run. It is
+          skipped only while the current filter still excludes that type.
+        - "no_metadata": extraction failed. The page is retried on later runs until
+          it has failed MAX_RETRIES times.
+        """
+        skipped = set()
+        failures: Dict[str, int] = {}
+        try:
+            if self.skipped_file.exists():
+                for line in self.skipped_file.read_text(encoding="utf-8").splitlines():
+                    reason, _, url = line.partition("\t")
+                    if not url:
+                        continue
+                    if reason == "no_metadata":
+                        failures[url] = failures.get(url, 0) + 1
+                        if failures[url] >= MAX_RETRIES:
+                            skipped.add(url)
+                    elif reason.startswith("jenis:") and jenis_filter:
+                        jenis = reason[len("jenis:") :]
+                        if not self._matches_jenis({"type": jenis}, jenis_filter):
+                            skipped.add(url)
+        except Exception as e:
+            logger.error(f"Error loading skipped URLs: {e}")
+
+        logger.info(f"Loaded {len(skipped)} skipped detail URLs")
+        return skipped
+
+    def _mark_skipped(self, url: str, reason: str):
+        """Append a detail URL that produced no item to the skip log"""
+        try:
+            with open(self.skipped_file, "a", encoding="utf-8") as f:
+                f.write(f"{reason}\t{url}\n")
+        except Exception as e:
+            logger.error(f"Error saving skipped URL: {e}")
+
+    def _launch_args(self) -> Dict[str, Any]:
+        """Chromium launch options"""
+        return {
+            "headless": self.headless,
+            "args": [
+                "--disable-gpu",
+                "--no-sandbox",
+                "--disable-dev-shm-usage",
+            ],
+        }
+
     def _save_metadata(self, item: Dict[str, Any]):
         """Save metadata to JSONL file"""
         try:
@@ -984,15 +1302,8 @@ class PeraturanSpider:
         visited_detail_urls = set()  # Track visited URLs to avoid duplicates
 
         async with async_playwright() as p:
-            # Launch browser in headful mode (headless=False) for safety
-            browser = await p.chromium.launch(
-                headless=False,  # Headful mode as requested
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                ],
-            )
+            # Headful by default for safety (headless=True for CI and servers)
+            browser = await p.chromium.launch(**self._launch_args())
             context = await browser.new_context(
                 user_agent=self.ua.random, viewport={"width": 1920, "height": 1080}
             )
@@ -1043,42 +1354,14 @@ class PeraturanSpider:
                             continue
 
                         # Filter by jenis if specified
-                        if jenis_filter:
-                            extracted_type = metadata.get("type", "").lower()
-                            jenis_normalized = jenis_filter.lower()
-
-                            # Check if jenis matches (case-insensitive)
-                            # Handle both abbreviations and full names
-                            jenis_mapping = {
-                                "uu": ["uu", "undang-undang"],
-                                "pp": ["pp", "peraturan pemerintah"],
-                                "perpres": ["perpres", "peraturan presiden"],
-                                "permen": ["permen", "peraturan menteri"],
-                                "kepres": ["kepres", "keputusan presiden"],
-                                "instruksi": ["instruksi", "instruksi presiden"],
-                                "keputusan": ["keputusan"],
-                                "peraturan": ["peraturan"],
-                            }
-
-                            # Check if jenis_filter matches any mapped values
-                            matches = False
-                            if jenis_normalized in jenis_mapping:
-                                # Check if extracted_type contains any of the mapped values
-                                for mapped_value in jenis_mapping[jenis_normalized]:
-                                    if mapped_value in extracted_type:
-                                        matches = True
-                                        break
-                            else:
-                                # Direct match if not in mapping
-                                if jenis_normalized in extracted_type:
-                                    matches = True
-
-                            if not matches:
-                                logger.debug(
-                                    f"Skipping {detail_url}: jenis '{metadata.get('type')}' "
-                                    f"does not match filter '{jenis_filter}'"
-                                )
-                                continue
+                        if jenis_filter and not self._matches_jenis(
+                            metadata, jenis_filter
+                        ):
+                            logger.debug(
+                                f"Skipping {detail_url}: jenis '{metadata.get('type')}' "
+                                f"does not match filter '{jenis_filter}'"
+                            )
+                            continue
 
                         # Download PDF if URL exists
                         if metadata.get("pdf_download_url"):
@@ -1135,6 +1418,202 @@ class PeraturanSpider:
 
         return all_items
 
+    async def crawl(
+        self,
+        max_items: Optional[int] = None,
+        jenis_filter: Optional[str] = None,
+        workers: int = CRAWL_WORKERS,
+        download_workers: int = DOWNLOAD_WORKERS,
+    ) -> List[Dict[str, Any]]:
+        """Worker-pool crawl for large back-fills
+
+        One listing page walks the Search pagination and feeds detail URLs into a
+        shared frontier. `workers` browser contexts take URLs from the frontier and
+        extract metadata, each with its own polite delay, while PDFs are handed to
+        a separate aiohttp download queue so page visits never wait on downloads.
+        Processed detail URLs are recorded in a persistent visited set, so an
+        interrupted back-fill resumes where it stopped. A page with a PDF counts as
+        processed (metadata saved, URL visited) only once its download succeeds, so
+        a PDF that was still queued or failed is fetched again by the next run.
+        Pages rejected by the jenis filter or without metadata go to a skip log
+        instead (see _load_skipped).
+
+        Args:
+            max_items: Maximum number of items to scrape
+            jenis_filter: Filter by regulation type (e.g., 'UU', 'PP', 'Perpres')
+            workers: Concurrent browser pages visiting detail pages
+            download_workers: Concurrent PDF downloads
+        """
+        workers = max(1, workers)
+        download_workers = max(1, download_workers)
+        logger.info(
+            f"Starting BPK crawl with {workers} page workers and "
+            f"{download_workers} download workers..."
+        )
+        if jenis_filter:
+            logger.info(f"Filtering by jenis: {jenis_filter}")
+
+        all_items: List[Dict[str, Any]] = []
+        visited = self._load_visited() | self._load_skipped(jenis_filter)
+        queued: set = set()  # Detail URLs already put on the frontier in this run
+        frontier: asyncio.Queue = asyncio.Queue()
+        downloads: asyncio.Queue = asyncio.Queue()
+        stop = asyncio.Event()
+
+        def limit_reached() -> bool:
+            return bool(max_items) and len(all_items) >= max_items
+
+        async def produce(page: Page):
+            """Walk the listing pagination and enqueue unvisited detail URLs"""
+            try:
+                current_url = SEARCH_URL
+                page_number = 1
+                while not stop.is_set():
+                    logger.info(f"Navigating to listing page {page_number}...")
+                    detail_links = await self._find_detail_links(page, current_url)
+                    if not detail_links:
+                        logger.info(f"No detail links found on page {page_number}.")
+                        break
+
+                    for detail_url in detail_links:
+                        if detail_url in visited or detail_url in queued:
+                            continue
+                        queued.add(detail_url)
+                        frontier.put_nowait(detail_url)
+
+                    # Let the workers catch up before paginating further
+                    while frontier.qsize() >= FRONTIER_HIGH_WATER and not stop.is_set():
+                        await asyncio.sleep(1)
+                    if stop.is_set():
+                        break
+
+                    await self._rate_limit()
+                    next_page_url = await self._find_next_page_link(page)
+                    if not next_page_url:
+                        logger.info(
+                            f"No next page found. Reached end of pagination at page {page_number}."
+                        )
+                        break
+                    current_url = next_page_url
+                    page_number += 1
+            except Exception as e:
+                logger.error(f"Error walking listing pages: {e}")
+                self.stats["errors"] += 1
+            finally:
+                # One end marker per worker
+                for _ in range(workers):
+                    frontier.put_nowait(None)
+
+        def record(detail_url: str, metadata: Dict[str, Any]):
+            """Save a finished item and mark its detail URL visited"""
+            self._save_metadata(metadata)
+            visited.add(detail_url)
+            self._mark_visited(detail_url)
+
+        async def visit(page: Page, worker_id: int):
+            """Extract metadata from frontier URLs and queue their PDFs"""
+            while True:
+                detail_url = await frontier.get()
+                if detail_url is None or stop.is_set():
+                    break
+
+                await self._rate_limit()
+                metadata = await self._extract_metadata_from_detail_page(
+                    page, detail_url
+                )
+                if stop.is_set():
+                    break
+                if not metadata:
+                    self._mark_skipped(detail_url, "no_metadata")
+                    continue
+
+                if jenis_filter and not self._matches_jenis(metadata, jenis_filter):
+                    logger.debug(
+                        f"Skipping {detail_url}: jenis '{metadata.get('type')}' "
+                        f"does not match filter '{jenis_filter}'"
+                    )
+                    self._mark_skipped(detail_url, f"jenis:{metadata.get('type', '')}")
+                    continue
+
+                if metadata.get("pdf_download_url"):
+                    metadata["local_filename"] = self._generate_filename(metadata)
+                    # Recorded by the downloader once the PDF is on disk
+                    downloads.put_nowait((detail_url, metadata))
+                else:
+                    record(detail_url, metadata)
+                all_items.append(metadata)
+                self.stats["total_scraped"] += 1
+                logger.info(
+                    f"[worker {worker_id}] Scraped {len(all_items)}/"
+                    f"{max_items or 'unlimited'} items "
+                    f"(Type: {metadata.get('type', 'Unknown')})"
+                )
+
+                if limit_reached():
+                    logger.info(f"Reached limit of {max_items} items. Stopping.")
+                    stop.set()
+                    break
+
+        async def download():
+            """Download queued PDFs until the end marker"""
+            while True:
+                job = await downloads.get()
+                if job is None:
+                    break
+                detail_url, metadata = job
+                if await self._download_pdf(
+                    metadata["pdf_download_url"], metadata["local_filename"]
+                ):
+                    record(detail_url, metadata)
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(**self._launch_args())
+            downloaders = [
+                asyncio.create_task(download()) for _ in range(download_workers)
+            ]
+            crawlers: List[asyncio.Task] = []
+            finished = False
+            try:
+                pages = []
+                for _ in range(workers + 1):
+                    context = await browser.new_context(
+                        user_agent=self.ua.random,
+                        viewport={"width": 1920, "height": 1080},
+                    )
+                    pages.append(await context.new_page())
+
+                producer = asyncio.create_task(produce(pages[0]))
+                visitors = [
+                    asyncio.create_task(visit(page, i))
+                    for i, page in enumerate(pages[1:], start=1)
+                ]
+                crawlers = [producer, *visitors]
+                await asyncio.gather(*visitors)
+                # Workers may stop early (limit reached) while pagination continues
+                stop.set()
+                await producer
+                finished = True
+            finally:
+                # On error or cancellation stop every task before closing the browser
+                stop.set()
+                for task in crawlers:
+                    task.cancel()
+                await asyncio.gather(*crawlers, return_exceptions=True)
+                if finished:
+                    # Let queued downloads complete
+                    for _ in downloaders:
+                        downloads.put_nowait(None)
+                else:
+                    for task in downloaders:
+                        task.cancel()
+                await asyncio.gather(*downloaders, return_exceptions=True)
+                await browser.close()
+
+        logger.info(f"Crawl complete. Total items: {len(all_items)}")
+        self._print_stats()
+
+        return all_items
+
     def _print_stats(self):
         """Print scraping statistics"""
         logger.info("=" * 50)
@@ -1142,22 +1621,35 @@ class PeraturanSpider:
         logger.info("=" * 50)
         logger.info(f"Total items scraped: {self.stats['total_scraped']}")
         logger.info(f"PDFs downloaded: {self.stats['pdfs_downloaded']}")
+        logger.info(f"PDFs resumed: {self.stats['pdfs_resumed']}")
+        logger.info(f"Duplicate PDFs skipped: {self.stats['pdfs_deduplicated']}")
+        megabytes = self.stats["bytes_downloaded"] / (1024 * 1024)
+        if self._download_window:
+            wall_seconds = max(
+                self._download_window[1] - self._download_window[0], 1e-6
+            )
+            per_download = megabytes / max(self.stats["download_seconds"], 1e-6)
+            logger.info(
+                f"Downloaded: {megabytes:.1f} MB at {megabytes / wall_seconds:.2f} MB/s "
+                f"({per_download:.2f} MB/s per download)"
+            )
         logger.info(f"Detail pages visited: {self.stats['detail_pages_visited']}")
         logger.info(f"Errors: {self.stats['errors']}")
         logger.info("=" * 50)
 
 
-async def test_scraper(limit: int = 5):
+async def test_scraper(limit: int = 5, headless: bool = False):
     """Test function: scrape first N items and verify PDFs"""
     logger.info(f"Running test scrape (limit: {limit} items)...")
 
-    async with PeraturanSpider() as spider:
+    async with PeraturanSpider(headless=headless) as spider:
         items = await spider.scrape(max_items=limit)
 
         # Verify PDFs
         valid_pdfs = 0
         for item in items:
             filename = item.get("local_filename")
+            filename = spider.duplicate_of.get(filename, filename)
             if filename:
                 filepath = spider.raw_laws_dir / filename
                 if filepath.exists():
@@ -1196,14 +1688,40 @@ async def main():
         action="store_true",
         help="Run test mode (scrape 5 items and verify)",
     )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run the browser headless (CI and servers)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Crawl with N concurrent browser pages, a persistent visited set "
+        "and a separate PDF download queue (0 = sequential scrape)",
+    )
+    parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=DOWNLOAD_WORKERS,
+        help="Concurrent PDF downloads in crawl mode",
+    )
 
     args = parser.parse_args()
 
     if args.test:
-        await test_scraper(limit=5)
+        await test_scraper(limit=5, headless=args.headless)
     else:
-        async with PeraturanSpider() as spider:
-            await spider.scrape(max_items=args.limit, jenis_filter=args.jenis)
+        async with PeraturanSpider(headless=args.headless) as spider:
+            if args.workers > 0:
+                await spider.crawl(
+                    max_items=args.limit,
+                    jenis_filter=args.jenis,
+                    workers=args.workers,
+                    download_workers=args.download_workers,
+                )
+            else:
+                await spider.scrape(max_items=args.limit, jenis_filter=args.jenis)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,398 @@
+"""
+Unit tests for the PDF download path of the BPK spider
+(_stream_pdf, _write_chunks, _finalize_pdf) against stub aiohttp responses,
+and for the worker-pool crawl against a stub Playwright browser
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the scraper is in path
+scraper_path = Path(__file__).parent.parent
+if str(scraper_path) not in sys.path:
+    sys.path.insert(0, str(scraper_path))
+
+aiohttp = pytest.importorskip("aiohttp")
+peraturan_spider = pytest.importorskip("peraturan_spider")
+
+PDF_BODY = b"%PDF-1.4 peraturan body"
+PDF_URL = "https://peraturan.bpk.go.id/Download/1/uu.pdf"
+
+# ============================================================================
+# Stub aiohttp objects
+# ============================================================================
+
+
+class StubContent:
+    """response.content: yields chunks, then optionally fails mid-stream"""
+
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+
+    async def iter_chunked(self, size):
+        for chunk in self.chunks:
+            yield chunk
+        if self.error:
+            raise self.error
+
+
+class StubResponse:
+    def __init__(self, status, chunks=(), headers=None, error=None):
+        self.status = status
+        self.headers = headers or {}
+        self.content = StubContent(list(chunks), error)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class StubSession:
+    """Hands out the given responses in order and records request headers"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.timeouts = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        self.timeouts.append(timeout)
+        return self.responses.pop(0)
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+@pytest.fixture
+def spider(tmp_path, monkeypatch):
+    """Spider writing to tmp_path, without browser installation or retry delays"""
+    monkeypatch.setattr(peraturan_spider, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(peraturan_spider, "RAW_LAWS_DIR", tmp_path / "raw_laws")
+    monkeypatch.setattr(
+        peraturan_spider, "CHECKSUMS_FILE", tmp_path / "checksums.jsonl"
+    )
+    monkeypatch.setattr(
+        peraturan_spider, "METADATA_FILE", tmp_path / "laws_metadata.jsonl"
+    )
+    monkeypatch.setattr(peraturan_spider, "VISITED_FILE", tmp_path / "visited.txt")
+    monkeypatch.setattr(peraturan_spider, "SKIPPED_FILE", tmp_path / "skipped.txt")
+    monkeypatch.setattr(peraturan_spider, "RETRY_DELAY", 0)
+    monkeypatch.setattr(peraturan_spider, "DOWNLOAD_CHUNK_SIZE", 4)
+    return peraturan_spider.PeraturanSpider(auto_install_browsers=False, headless=True)
+
+
+def _chunks(data, size=4):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+# ============================================================================
+# Stub Playwright browser and BPK site
+# ============================================================================
+
+
+class StubBrowser:
+    async def new_context(self, **kwargs):
+        return self
+
+    async def new_page(self):
+        return object()
+
+    async def close(self):
+        pass
+
+
+class StubPlaywright:
+    """async_playwright() replacement handing out a StubBrowser"""
+
+    def __init__(self):
+        self.chromium = self
+
+    async def launch(self, **kwargs):
+        return StubBrowser()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class StubSite:
+    """Listing pages and detail pages of the BPK site, patched onto a spider
+
+    listing: detail URLs per listing page, in pagination order
+    types: regulation type per detail URL (default "UU")
+    failing_pdfs: detail URLs whose PDF download fails
+    """
+
+    def __init__(self, spider, monkeypatch, listing, types=None, failing_pdfs=()):
+        self.listing = listing
+        self.types = types or {}
+        self.failing_pdfs = set(failing_pdfs)
+        self.extracted = []
+        self.downloaded = []
+        self.page_number = 0
+        monkeypatch.setattr(peraturan_spider, "REQUEST_DELAY", 0)
+        monkeypatch.setattr(peraturan_spider, "async_playwright", StubPlaywright)
+        monkeypatch.setattr(spider, "_find_detail_links", self.find_detail_links)
+        monkeypatch.setattr(spider, "_find_next_page_link", self.find_next_page_link)
+        monkeypatch.setattr(
+            spider, "_extract_metadata_from_detail_page", self.extract_metadata
+        )
+        monkeypatch.setattr(spider, "_download_pdf", self.download_pdf)
+
+    async def find_detail_links(self, page, url):
+        return self.listing[self.page_number]
+
+    async def find_next_page_link(self, page):
+        if self.page_number + 1 >= len(self.listing):
+            return None
+        self.page_number += 1
+        return f"{peraturan_spider.SEARCH_URL}?page={self.page_number + 1}"
+
+    async def extract_metadata(self, page, detail_url):
+        self.extracted.append(detail_url)
+        await asyncio.sleep(0)
+        return {
+            "url": detail_url,
+            "title": f"Peraturan {detail_url.rsplit('/', 1)[-1]}",
+            "type": self.types.get(detail_url, "UU"),
+            "pdf_download_url": f"{detail_url}.pdf",
+        }
+
+    async def download_pdf(self, pdf_url, filename):
+        self.downloaded.append(filename)
+        return pdf_url[: -len(".pdf")] not in self.failing_pdfs
+
+
+def _details(*numbers):
+    return [f"{peraturan_spider.BASE_URL}/Details/{n}" for n in numbers]
+
+
+def _crawl(spider, **kwargs):
+    """Run a crawl, failing the test instead of hanging"""
+    return asyncio.wait_for(spider.crawl(**kwargs), timeout=10)
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_download_200_streams_to_file(spider):
+    """A fresh download is written chunk by chunk, checksummed and moved into place"""
+    spider.session = StubSession(StubResponse(200, _chunks(PDF_BODY)))
+
+    assert await spider._download_pdf(PDF_URL, "uu.pdf") is True
+
+    assert (spider.raw_laws_dir / "uu.pdf").read_bytes() == PDF_BODY
+    assert not (spider.raw_laws_dir / "uu.pdf.part").exists()
+    assert spider.session.requests == [{}]
+    assert spider.stats["pdfs_downloaded"] == 1
+    # Only connect and read stalls are bounded, not the whole transfer
+    (timeout,) = spider.session.timeouts
+    assert timeout.total is None
+    assert (timeout.sock_connect, timeout.sock_read) == (30, 60)
+    assert spider.stats["bytes_downloaded"] == len(PDF_BODY)
+
+
+@pytest.mark.asyncio
+async def test_download_200_rejects_non_pdf(spider):
+    """A body without the %PDF magic is dropped after its first bytes"""
+    spider.session = StubSession(StubResponse(200, [b"<html>", b"error page"]))
+
+    assert await spider._download_pdf(PDF_URL, "uu.pdf") is False
+
+    assert list(spider.raw_laws_dir.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_download_206_resumes_partial_file(spider):
+    """An existing .part file is resumed with a Range request"""
+    (spider.raw_laws_dir / "uu.pdf.part").write_bytes(PDF_BODY[:8])
+    response = StubResponse(
+        206,
+        _chunks(PDF_BODY[8:]),
+        headers={"Content-Range": f"bytes 8-22/{len(PDF_BODY)}"},
+    )
+    spider.session = StubSession(response)
+
+    assert await spider._download_pdf(PDF_URL, "uu.pdf") is True
+
+    assert spider.session.requests == [{"Range": "bytes=8-"}]
+    assert (spider.raw_laws_dir / "uu.pdf").read_bytes() == PDF_BODY
+    assert spider.stats["pdfs_resumed"] == 1
+    assert spider.stats["bytes_downloaded"] == len(PDF_BODY) - 8
+
+
+@pytest.mark.asyncio
+async def test_download_206_wrong_range_restarts(spider):
+    """A 206 that does not continue at the offset restarts from scratch"""
+    (spider.raw_laws_dir / "uu.pdf.part").write_bytes(PDF_BODY[:8])
+    spider.session = StubSession(
+        StubResponse(206, [b"junk"], headers={"Content-Range": "bytes 0-3/23"}),
+        StubResponse(200, _chunks(PDF_BODY)),
+    )
+
+    assert await spider._download_pdf(PDF_URL, "uu.pdf") is True
+
+    assert spider.session.requests == [{"Range": "bytes=8-"}, {}]
+    assert (spider.raw_laws_dir / "uu.pdf").read_bytes() == PDF_BODY
+
+
+@pytest.mark.asyncio
+async def test_download_416_finalizes_complete_part(spider):
+    """416 on a resume means the .part file already holds the whole PDF"""
+    (spider.raw_laws_dir / "uu.pdf.part").write_bytes(PDF_BODY)
+    spider.session = StubSession(StubResponse(416))
+
+    assert await spider._download_pdf(PDF_URL, "uu.pdf") is True
+
+    assert (spider.raw_laws_dir / "uu.pdf").read_bytes() == PDF_BODY
+    assert spider.stats["bytes_downloaded"] == 0
+
+
+@pytest.mark.asyncio
+async def test_download_resumes_after_mid_stream_error(spider):
+    """A connection drop keeps the received bytes, counts them and resumes from there"""
+    spider.session = StubSession(
+        StubResponse(
+            200,
+            _chunks(PDF_BODY[:12]),
+            error=aiohttp.ClientPayloadError("Connection reset"),
+        ),
+        StubResponse(
+            206, _chunks(PDF_BODY[12:]), headers={"Content-Range": "bytes 12-22/23"}
+        ),
+    )
+
+    assert await spider._download_pdf(PDF_URL, "uu.pdf") is True
+
+    assert spider.session.requests == [{}, {"Range": "bytes=12-"}]
+    assert (spider.raw_laws_dir / "uu.pdf").read_bytes() == PDF_BODY
+    # Bytes of the failed attempt are part of the throughput too
+    assert spider.stats["bytes_downloaded"] == len(PDF_BODY)
+    assert spider.stats["pdfs_resumed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_duplicate_content_is_not_kept(spider):
+    """A PDF with the same SHA-256 as an earlier download is recorded as a duplicate"""
+    spider.session = StubSession(
+        StubResponse(200, _chunks(PDF_BODY)), StubResponse(200, _chunks(PDF_BODY))
+    )
+
+    assert await spider._download_pdf(PDF_URL, "uu.pdf") is True
+    assert await spider._download_pdf(PDF_URL, "uu copy.pdf") is True
+
+    assert not (spider.raw_laws_dir / "uu copy.pdf").exists()
+    assert spider.duplicate_of == {"uu copy.pdf": "uu.pdf"}
+    assert spider.stats["pdfs_deduplicated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_crawl_visits_every_page_until_end_markers(spider, monkeypatch):
+    """All listing pages are walked and every worker stops at its end marker"""
+    site = StubSite(spider, monkeypatch, [_details(1, 2, 3), _details(4, 5)])
+
+    items = await _crawl(spider, workers=3, download_workers=2)
+
+    assert sorted(item["url"] for item in items) == _details(1, 2, 3, 4, 5)
+    assert sorted(site.extracted) == _details(1, 2, 3, 4, 5)
+    assert len(site.downloaded) == 5
+    assert spider._load_visited() == set(_details(1, 2, 3, 4, 5))
+
+
+@pytest.mark.asyncio
+async def test_crawl_stops_on_max_items(spider, monkeypatch):
+    """Workers stop at max_items while pagination is still going"""
+    listing = [_details(*range(page * 10, page * 10 + 10)) for page in range(50)]
+    site = StubSite(spider, monkeypatch, listing)
+
+    items = await _crawl(spider, max_items=3, workers=2)
+
+    assert len(items) == 3
+    assert site.page_number < len(listing) - 1
+    assert len(spider._load_visited()) == 3
+
+
+@pytest.mark.asyncio
+async def test_crawl_resumes_from_visited_set(spider, monkeypatch):
+    """A second crawl skips detail pages finished by the first one"""
+    StubSite(spider, monkeypatch, [_details(1, 2)])
+    await _crawl(spider, workers=1)
+
+    site = StubSite(spider, monkeypatch, [_details(1, 2, 3)])
+    items = await _crawl(spider, workers=1)
+
+    assert site.extracted == _details(3)
+    assert [item["url"] for item in items] == _details(3)
+
+
+@pytest.mark.asyncio
+async def test_crawl_failed_download_is_not_visited(spider, monkeypatch):
+    """A page whose PDF did not download is crawled again by the next run"""
+    failing = _details(2)[0]
+    StubSite(spider, monkeypatch, [_details(1, 2)], failing_pdfs=[failing])
+    await _crawl(spider, workers=1)
+
+    assert spider._load_visited() == set(_details(1))
+
+    site = StubSite(spider, monkeypatch, [_details(1, 2)])
+    await _crawl(spider, workers=1)
+
+    assert site.extracted == [failing]
+    assert spider._load_visited() == set(_details(1, 2))
+
+
+@pytest.mark.asyncio
+async def test_crawl_skip_log_follows_jenis_filter(spider, monkeypatch):
+    """A page rejected by the jenis filter is skipped only while the filter excludes it"""
+    pp_url = _details(2)[0]
+    listing = [_details(1, 2)]
+    types = {pp_url: "Peraturan Pemerintah"}
+    StubSite(spider, monkeypatch, listing, types=types)
+    items = await _crawl(spider, jenis_filter="UU", workers=1)
+
+    assert [item["url"] for item in items] == _details(1)
+    assert spider.skipped_file.read_text(encoding="utf-8") == (
+        f"jenis:Peraturan Pemerintah\t{pp_url}\n"
+    )
+
+    # Same filter: the rejected page is not visited again
+    site = StubSite(spider, monkeypatch, listing, types=types)
+    await _crawl(spider, jenis_filter="UU", workers=1)
+    assert site.extracted == []
+
+    # A filter that accepts it visits the page again
+    site = StubSite(spider, monkeypatch, listing, types=types)
+    items = await _crawl(spider, jenis_filter="PP", workers=1)
+    assert site.extracted == [pp_url]
+    assert [item["url"] for item in items] == [pp_url]
+
+
+@pytest.mark.asyncio
+async def test_crawl_producer_failure_does_not_hang(spider, monkeypatch):
+    """An error on the listing page still releases the workers"""
+    site = StubSite(spider, monkeypatch, [_details(1)])
+
+    async def broken_listing(page, url):
+        raise RuntimeError("listing page timed out")
+
+    monkeypatch.setattr(spider, "_find_detail_links", broken_listing)
+
+    items = await _crawl(spider, workers=3)
+
+    assert items == []
+    assert site.extracted == []
+    assert spider.stats["errors"] == 1